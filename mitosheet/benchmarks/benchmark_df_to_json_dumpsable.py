@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long it takes to turn a 1,500 row by 200 column window of a 
+mixed dtype dataframe into the JSON sheet data sent to the front-end, when
+going through df.to_json and json.loads (the old behavior), when converting
+each column directly from its values, and when sending the columns in binary
+buffers. Also reports the size of the data sent in each case.
+
+Run with: python benchmarks/benchmark_df_to_json_dumpsable.py [num_rows] [num_columns] [num_runs]
+"""
+import json
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.sheet_functions.types.utils import get_float_dt_td_columns
+from mitosheet.utils import df_to_json_dumpsable
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_500
+NUM_COLUMNS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+NUM_RUNS = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+
+def old_df_to_json_dumpsable(original_df: pd.DataFrame, column_headers_to_column_ids: Dict[Any, str]) -> Dict[str, Any]:
+    df = original_df.head(NUM_ROWS).copy(deep=True)
+    float_columns, date_columns, timedelta_columns = get_float_dt_td_columns(df)
+    for column_header in date_columns:
+        df[column_header] = df[column_header].dt.strftime('%Y-%m-%d %X')
+    for column_header in timedelta_columns:
+        df[column_header] = df[column_header].apply(lambda x: str(x))
+    for column_header in float_columns:
+        df[column_header] = df[column_header].apply(lambda x: x if np.isnan(x) else str(x))
+
+    json_obj = json.loads(df.to_json(orient="split"))
+    for d in json_obj['data']:
+        for idx, e in enumerate(d):
+            if e is None:
+                d[idx] = 'NaN'
+
+    final_data = []
+    for column_index, column_header in enumerate(json_obj['columns']):
+        column_final_data: Dict[str, Any] = {
+            'columnID': column_headers_to_column_ids[column_header],
+            'columnHeader': column_header,
+            'columnDtype': str(original_df[column_header].dtype),
+            'columnData': []
+        }
+        for row in json_obj['data']:
+            column_final_data['columnData'].append(row[column_index])
+        final_data.append(column_final_data)
+
+    return {'data': final_data, 'index': json_obj['index']}
+
+
+def get_mixed_df() -> pd.DataFrame:
+    columns = {
+        'int': lambda: np.random.randint(0, 1000, NUM_ROWS),
+        'float': lambda: np.where(np.random.rand(NUM_ROWS) < .1, np.NaN, np.random.rand(NUM_ROWS) * 1000),
+        'bool': lambda: np.random.rand(NUM_ROWS) < .5,
+        'string': lambda: pd.Series(np.random.randint(0, 1000, NUM_ROWS)).astype('str') + ' name',
+        'datetime': lambda: pd.Series(pd.to_datetime(np.random.randint(0, 10 ** 9, NUM_ROWS), unit='s')),
+        'timedelta': lambda: pd.Series(pd.to_timedelta(np.random.randint(0, 10 ** 6, NUM_ROWS), unit='s')),
+    }
+    column_types = list(columns.keys())
+    return pd.DataFrame({
+        f'{column_types[i % len(column_types)]}_{i}': columns[column_types[i % len(column_types)]]()
+        for i in range(NUM_COLUMNS)
+    })
+
+
+def get_json_and_buffers(df: pd.DataFrame, column_headers_to_column_ids: Dict[Any, str]) -> Tuple[str, List[bytes]]:
+    buffers: List[bytes] = []
+    sheet_data = df_to_json_dumpsable(df, 'df', 'passed', {}, {}, column_headers_to_column_ids, {}, buffers=buffers)
+    return json.dumps(sheet_data), buffers
+
+
+def time_function(function: Callable[[], Any]) -> float:
+    start_time = perf_counter()
+    for _ in range(NUM_RUNS):
+        function()
+    return (perf_counter() - start_time) / NUM_RUNS
+
+
+def main() -> None:
+    df = get_mixed_df()
+    column_headers_to_column_ids = {column_header: column_header for column_header in df.columns}
+
+    old_json = json.dumps(old_df_to_json_dumpsable(df, column_headers_to_column_ids))
+    new_sheet_data = df_to_json_dumpsable(df, 'df', 'passed', {}, {}, column_headers_to_column_ids, {})
+    assert old_json == json.dumps({'data': new_sheet_data['data'], 'index': new_sheet_data['index']})
+
+    old_time = time_function(lambda: json.dumps(old_df_to_json_dumpsable(df, column_headers_to_column_ids)))
+    new_time = time_function(lambda: json.dumps(df_to_json_dumpsable(df, 'df', 'passed', {}, {}, column_headers_to_column_ids, {})))
+    binary_time = time_function(lambda: get_json_and_buffers(df, column_headers_to_column_ids))
+
+    new_json = json.dumps(df_to_json_dumpsable(df, 'df', 'passed', {}, {}, column_headers_to_column_ids, {}))
+    binary_json, buffers = get_json_and_buffers(df, column_headers_to_column_ids)
+    binary_size = len(binary_json) + sum(len(buffer) for buffer in buffers)
+
+    print(f'{NUM_ROWS} rows, {NUM_COLUMNS} mixed dtype columns')
+    print(f'    to_json and json.loads: {old_time:8.3f} s    {len(old_json) / 1e6:6.2f} MB')
+    print(f'    columnar:               {new_time:8.3f} s    {len(new_json) / 1e6:6.2f} MB    {old_time / new_time:6.1f}x')
+    print(f'    binary buffers:         {binary_time:8.3f} s    {binary_size / 1e6:6.2f} MB    {old_time / binary_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
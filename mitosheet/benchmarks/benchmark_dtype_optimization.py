@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how much memory importing a CSV file takes up, with and without
+optimizing the dtypes of the imported dataframe, and how long the import takes.
+
+Run with: python benchmarks/benchmark_dtype_optimization.py [num_rows ...]
+"""
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.dtype_optimization import get_num_bytes_string, set_optimize_imported_dtypes
+from mitosheet.steps_manager import StepsManager
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [100_000, 1_000_000]
+FILE_NAME = 'benchmark_dtype_optimization.csv'
+
+
+def write_file(num_rows: int) -> None:
+    pd.DataFrame({
+        'fruit': np.random.choice(['Apple', 'Banana', 'Blueberry', 'Cherry', 'Strawberry'], num_rows),
+        'name': [f'name {i}' for i in range(num_rows)],
+        'ints': np.random.randint(0, 10_000, num_rows),
+        'quarters': np.random.randint(0, 10_000, num_rows) / 4,
+        'floats': np.random.rand(num_rows),
+    }).to_csv(FILE_NAME, index=False)
+
+
+def import_file(optimize: bool) -> None:
+    set_optimize_imported_dtypes(optimize)
+    start_time = perf_counter()
+    steps_manager = StepsManager([FILE_NAME])
+    import_time = perf_counter() - start_time
+    set_optimize_imported_dtypes(False)
+    num_bytes = steps_manager.dfs[0].memory_usage(deep=True).sum()
+    print(f'    optimized: {str(optimize):5}    import: {import_time:8.3f} s    memory: {get_num_bytes_string(num_bytes):>10}')
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        write_file(num_rows)
+        print(f'{num_rows} rows')
+        import_file(optimize=False)
+        import_file(optimize=True)
+        os.remove(FILE_NAME)
+
+
+if __name__ == '__main__':
+    main()
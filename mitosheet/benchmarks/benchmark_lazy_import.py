@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long it takes to import CSV files of different sizes until the
+sheet can be displayed, when the file is read fully, and when it is imported
+lazily, along with how long it takes to scroll to the end of a lazy file.
+
+Run with: python benchmarks/benchmark_lazy_import.py [num_rows ...]
+"""
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.sheet_data import get_sheet_data_window
+from mitosheet.step_performers.import_steps.simple_import import set_lazy_import_min_file_size
+from mitosheet.steps_manager import StepsManager
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [1_000_000, 5_000_000]
+FILE_NAME = 'benchmark_lazy_import.csv'
+
+
+def write_file(num_rows: int) -> None:
+    pd.DataFrame({
+        'fruit': np.random.choice(['Apple', 'Banana', 'Blueberry', 'Cherry', 'Strawberry'], num_rows),
+        'ints': np.random.randint(0, 10_000, num_rows),
+        'floats': np.random.rand(num_rows),
+    }).to_csv(FILE_NAME, index=False)
+
+
+def time_import(lazy: bool) -> float:
+    set_lazy_import_min_file_size(0 if lazy else None)
+    start_time = perf_counter()
+    steps_manager = StepsManager([FILE_NAME])
+    get_sheet_data_window(steps_manager.curr_step.final_defined_state, 0, (0, 1500, 0, 100))
+    import_time = perf_counter() - start_time
+    set_lazy_import_min_file_size(None)
+    return import_time
+
+
+def time_scroll_to_end() -> float:
+    set_lazy_import_min_file_size(0)
+    steps_manager = StepsManager([FILE_NAME])
+    set_lazy_import_min_file_size(None)
+    state = steps_manager.curr_step.final_defined_state
+    num_rows = state.lazy_files[0].get_num_rows()
+    start_time = perf_counter()
+    get_sheet_data_window(state, 0, (num_rows - 1500, num_rows, 0, 100))
+    return perf_counter() - start_time
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        write_file(num_rows)
+        print(f'{num_rows} rows ({os.path.getsize(FILE_NAME) / 1_000_000:.0f} MB)')
+        full_time = time_import(lazy=False)
+        lazy_time = time_import(lazy=True)
+        print(f'    import    full: {full_time:8.3f} s    lazy: {lazy_time:8.3f} s    {full_time / lazy_time:6.1f}x')
+        print(f'    scroll to end of lazy file: {time_scroll_to_end():8.3f} s')
+        os.remove(FILE_NAME)
+
+
+if __name__ == '__main__':
+    main()
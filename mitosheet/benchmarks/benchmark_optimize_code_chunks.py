@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long it takes to optimize the code chunks of analyses with 
+different numbers of code chunks, with the optimizer that makes passes over 
+all of the code chunks until none combine (the old behavior), and with the 
+optimizer that only combines each code chunk with its neighbours.
+
+Each analysis adds a block of columns, renames them, sets formulas in them, 
+and then deletes some of them, again and again, so many of the code chunks 
+combine, but only after the code chunks between them combine.
+
+Run with: python benchmarks/benchmark_optimize_code_chunks.py [num_code_chunks ...]
+"""
+import sys
+import warnings
+from copy import copy
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import pandas as pd
+
+from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.code_chunks.code_chunk_utils import get_step_code_chunks
+from mitosheet.pro.code_chunks.code_chunk_pro_utils import optimize_code_chunks
+from mitosheet.steps_manager import StepsManager
+from mitosheet.utils import get_new_id
+
+NUM_CODE_CHUNKS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [1_000, 2_000, 5_000, 10_000]
+# The number of columns added at once, before they are renamed, set and deleted
+BLOCK_SIZE = 200
+
+
+def old_optimize_code_chunks_combine_right(code_chunks_to_optimize: List[CodeChunk]) -> Tuple[bool, List[CodeChunk]]:
+    code_chunks_to_optimize = copy(code_chunks_to_optimize)
+    code_chunks_to_optimize.reverse()
+    code_chunks_list: List[CodeChunk] = []
+    optimized = False
+    while len(code_chunks_to_optimize) >= 2:
+        later_code_chunk = code_chunks_to_optimize.pop()
+        earlier_code_chunk = code_chunks_to_optimize.pop()
+        combined_chunk = later_code_chunk.combine_right(earlier_code_chunk)
+        if combined_chunk is not None:
+            optimized = True
+            code_chunks_to_optimize.append(combined_chunk)
+        else:
+            code_chunks_list.append(later_code_chunk)
+            code_chunks_to_optimize.append(earlier_code_chunk)            
+    if len(code_chunks_to_optimize) == 1:
+        code_chunks_list.append(code_chunks_to_optimize[0])
+    return optimized, code_chunks_list
+
+def old_optimize_code_chunks_combine_left(code_chunks_to_optimize: List[CodeChunk]) -> Tuple[bool, List[CodeChunk]]:
+    code_chunks_to_optimize = copy(code_chunks_to_optimize)
+    code_chunks_list: List[CodeChunk] = []
+    optimized = False
+    while len(code_chunks_to_optimize) >= 2:
+        later_code_chunk = code_chunks_to_optimize.pop()
+        earlier_code_chunk = code_chunks_to_optimize.pop()
+        combined_chunk = later_code_chunk.combine_left(earlier_code_chunk)
+        if combined_chunk is not None:
+            optimized = True
+            code_chunks_to_optimize.append(combined_chunk)
+        else:
+            code_chunks_list.append(later_code_chunk)
+            code_chunks_to_optimize.append(earlier_code_chunk)            
+    if len(code_chunks_to_optimize) == 1:
+        code_chunks_list.append(code_chunks_to_optimize[0])
+    code_chunks_list.reverse()
+    return optimized, code_chunks_list
+
+def old_optimize_code_chunks(all_code_chunks: List[CodeChunk]) -> List[CodeChunk]:
+    optimized_right, code_chunks_list = old_optimize_code_chunks_combine_right(all_code_chunks)
+    optimized_left, code_chunks_list = old_optimize_code_chunks_combine_left(code_chunks_list)
+    if optimized_right or optimized_left:
+        return old_optimize_code_chunks(code_chunks_list)
+    return code_chunks_list
+
+
+def make_edit_event(step_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'event': 'edit_event',
+        'id': get_new_id(),
+        'type': f'{step_type}_edit',
+        'step_id': get_new_id(),
+        'params': params
+    }
+
+
+def get_block_code_chunks(block_size: int) -> List[CodeChunk]:
+    """
+    Returns the code chunks of an analysis that adds block_size columns, renames 
+    them, sets formulas in them, and then deletes half of them, last added first.
+    """
+    steps_manager = StepsManager([pd.DataFrame({'A': [1, 2, 3]})])
+    column_ids = []
+    for index in range(block_size):
+        steps_manager.handle_edit_event(make_edit_event('add_column', {
+            'sheet_index': 0, 'column_header': f'C{index}', 'column_header_index': -1
+        }))
+        column_ids.append(steps_manager.curr_step.column_ids.get_column_id_by_header(0, f'C{index}'))
+    for index, column_id in enumerate(column_ids):
+        steps_manager.handle_edit_event(make_edit_event('rename_column', {
+            'sheet_index': 0, 'column_id': column_id, 'new_column_header': f'R{index}'
+        }))
+    for index, column_id in enumerate(column_ids):
+        steps_manager.handle_edit_event(make_edit_event('set_column_formula', {
+            'sheet_index': 0, 'column_id': column_id, 'old_formula': '=0', 'new_formula': f'=A + {index}'
+        }))
+    for column_id in reversed(column_ids[block_size // 2:]):
+        steps_manager.handle_edit_event(make_edit_event('delete_column', {
+            'sheet_index': 0, 'column_ids': [column_id]
+        }))
+
+    return [code_chunk for code_chunks in get_step_code_chunks(steps_manager.steps) for code_chunk in code_chunks]
+
+
+def get_code_chunks(block_code_chunks: List[CodeChunk], num_code_chunks: int) -> List[CodeChunk]:
+    """
+    Returns at least num_code_chunks code chunks, by repeating the code chunks
+    of the block, as if the block was done again and again.
+    """
+    return block_code_chunks * -(-num_code_chunks // len(block_code_chunks))
+
+
+def time_function(function: Callable, code_chunks: List[CodeChunk]) -> Tuple[float, List[CodeChunk]]:
+    start_time = perf_counter()
+    result = function(code_chunks)
+    return perf_counter() - start_time, result
+
+
+def main() -> None:
+    # Adding many columns fragments the dataframe, which does not matter here
+    warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+    block_code_chunks = get_block_code_chunks(BLOCK_SIZE)
+    for num_code_chunks in NUM_CODE_CHUNKS:
+        code_chunks = get_code_chunks(block_code_chunks, num_code_chunks)
+        old_time, old_result = time_function(old_optimize_code_chunks, code_chunks)
+        new_time, new_result = time_function(optimize_code_chunks, code_chunks)
+        assert [code_chunk.get_code() for code_chunk in old_result] == [code_chunk.get_code() for code_chunk in new_result]
+        print(f'{len(code_chunks):>6} code chunks -> {len(new_result):>5}    old: {old_time:8.3f} s    new: {new_time:8.3f} s    {old_time / new_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long it takes to find all the matches of a search in sheets of
+different sizes, when searching 2k rows at a time a cell at a time (the old
+behavior, where the front-end requested each 2k rows), and with the search
+index, both the first time the sheet is searched and once it is indexed.
+
+Run with: python benchmarks/benchmark_search.py [num_rows ...]
+"""
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.search_index import SearchIndexCache, get_search_cell_indexes
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [100_000, 1_000_000]
+SEARCH_STRINGS = ['berry', '123']
+
+
+def old_get_search_cell_indexes(df: pd.DataFrame, search_string: str) -> List[Tuple[int, int]]:
+    search_string = search_string.lower()
+    cell_indexes = []
+    for starting_row_index in range(0, len(df) + 2000, 2000):
+        rows_df = df.iloc[starting_row_index:].head(n=2000)
+        rows_df.index = np.arange(starting_row_index, len(rows_df) + starting_row_index)
+        for column_index, column in enumerate(rows_df.columns):
+            if len(rows_df[column]) == 0:
+                break
+            new_df = rows_df[rows_df[column].apply(str).str.lower().str.contains(search_string)]
+            cell_indexes.extend([
+                (row_index, column_index) for row_index in new_df.index.to_list()
+            ])
+    return cell_indexes
+
+
+def get_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'fruit': np.random.choice(['Apple', 'Banana', 'Blueberry', 'Cherry', 'Strawberry'], num_rows),
+        'name': pd.Series(np.random.randint(0, 10_000, num_rows)).astype('str') + ' Street',
+        'ints': np.random.randint(0, 10_000, num_rows),
+        'floats': np.round(np.random.rand(num_rows) * 1000, 2),
+    })
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        print(f'{num_rows} rows')
+        df = get_df(num_rows)
+        search_index_cache = SearchIndexCache()
+        for search_string in SEARCH_STRINGS:
+            start_time = perf_counter()
+            old_cell_indexes = old_get_search_cell_indexes(df, search_string)
+            old_time = perf_counter() - start_time
+
+            start_time = perf_counter()
+            cell_indexes, _ = get_search_cell_indexes(df, search_string, search_index_cache)
+            new_time = perf_counter() - start_time
+
+            assert sorted(old_cell_indexes) == cell_indexes, search_string
+            print(f'    {search_string:<10} old: {old_time:8.3f} s    new: {new_time:8.3f} s    {old_time / new_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
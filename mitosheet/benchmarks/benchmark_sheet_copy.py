@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how much memory and time it takes to pass a dataframe to the sheet
+when it is copied, and when it is not, as well as after editing a column.
+
+Run with: python benchmarks/benchmark_sheet_copy.py [num_rows ...]
+"""
+import sys
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.dtype_optimization import get_num_bytes_string
+from mitosheet.steps_manager import StepsManager
+from mitosheet.utils import get_new_id
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [1_000_000, 10_000_000]
+
+
+def get_df(num_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'fruit': np.random.choice(['Apple', 'Banana', 'Blueberry', 'Cherry', 'Strawberry'], num_rows),
+        **{f'ints_{i}': np.random.randint(0, 10_000, num_rows) for i in range(5)},
+        **{f'floats_{i}': np.random.rand(num_rows) for i in range(5)},
+    })
+
+
+def create_sheet(df: pd.DataFrame, copy: bool) -> None:
+    tracemalloc.start()
+    start_time = perf_counter()
+    steps_manager = StepsManager([df], copy=copy)
+    create_time = perf_counter() - start_time
+    _, create_num_bytes = tracemalloc.get_traced_memory()
+
+    steps_manager.handle_edit_event({
+        'event': 'edit_event', 'id': get_new_id(), 'type': 'set_cell_value_edit', 'step_id': get_new_id(),
+        'params': {'sheet_index': 0, 'column_id': 'ints_0', 'row_index': 0, 'old_value': None, 'new_value': '1'}
+    })
+    _, edit_num_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'    copy: {str(copy):5}    create: {create_time:8.3f} s {get_num_bytes_string(create_num_bytes):>10}    after edit: {get_num_bytes_string(edit_num_bytes):>10}')
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        df = get_df(num_rows)
+        print(f'{num_rows} rows ({get_num_bytes_string(df.memory_usage(deep=True).sum())})')
+        create_sheet(df, copy=True)
+        create_sheet(df, copy=False)
+
+
+if __name__ == '__main__':
+    main()
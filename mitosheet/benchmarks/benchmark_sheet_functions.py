@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long IF, FIND, LEFT, RIGHT and MID take on columns of different
+sizes, with the implementations that build their result a value at a time
+(the old behavior), and with the vectorized implementations.
+
+The sheet function decorators (type conversion, NaN filtering) are the same
+for both, so we time the undecorated functions on already converted series.
+
+Run with: python benchmarks/benchmark_sheet_functions.py [num_rows ...]
+"""
+import inspect
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.sheet_functions.control_functions import IF
+from mitosheet.sheet_functions.sheet_function_utils import try_extend_series_to_index
+from mitosheet.sheet_functions.string_functions import FIND, LEFT, MID, RIGHT
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [10_000, 1_000_000, 10_000_000]
+
+
+def old_IF(condition: pd.Series, true_series: pd.Series, false_series: pd.Series) -> pd.Series:
+    true_series = try_extend_series_to_index(true_series, condition.index)
+    false_series = try_extend_series_to_index(false_series, condition.index)
+    return pd.Series(
+        data=[true_series.loc[i] if c else false_series.loc[i] for i, c in condition.iteritems()],
+        index=condition.index
+    )
+
+def old_FIND(series: pd.Series, substrings: pd.Series) -> pd.Series:
+    substrings = try_extend_series_to_index(substrings, series.index)
+    return pd.Series(
+        [string.find(substring) + 1 for string, substring in zip(series, substrings)],
+        index=series.index
+    )
+
+def old_LEFT(series: pd.Series, num_chars: pd.Series) -> pd.Series:
+    num_chars = try_extend_series_to_index(num_chars, series.index)
+    return pd.Series(
+        [string[:int(num_char)] for string, num_char in zip(series, num_chars)],
+        index=series.index
+    )
+
+def old_RIGHT(series: pd.Series, num_chars: pd.Series) -> pd.Series:
+    num_chars = try_extend_series_to_index(num_chars, series.index)
+    return pd.Series(
+        [string[-int(num_char):] if num_char > 0 else '' for string, num_char in zip(series, num_chars)],
+        index=series.index
+    )
+
+def old_MID(series: pd.Series, start_loc: pd.Series, num_chars: pd.Series) -> pd.Series:
+    start_loc = try_extend_series_to_index(start_loc, series.index)
+    num_chars = try_extend_series_to_index(num_chars, series.index)
+    return pd.Series(
+        [
+            string[start - 1: start - 1 + int(num_char)] for string, start, num_char
+            in zip(series, start_loc, num_chars)
+        ],
+        index=series.index
+    )
+
+
+def get_benchmarks(num_rows: int) -> Dict[str, Tuple[Callable, Callable, List[Any]]]:
+    numbers = pd.Series(np.random.randint(0, 1000, num_rows))
+    strings = numbers.astype('str') + ' is a number'
+    return {
+        'IF(A > 500, A, 0)': (old_IF, IF, [numbers > 500, numbers, pd.Series([0])]),
+        'IF(A > 500, "big", "small")': (old_IF, IF, [numbers > 500, pd.Series(['big']), pd.Series(['small'])]),
+        'FIND(A, "5")': (old_FIND, FIND, [strings, pd.Series(['5'])]),
+        'LEFT(A, 2)': (old_LEFT, LEFT, [strings, pd.Series([2])]),
+        'RIGHT(A, 6)': (old_RIGHT, RIGHT, [strings, pd.Series([6])]),
+        'MID(A, 2, 3)': (old_MID, MID, [strings, pd.Series([2]), pd.Series([3])]),
+    }
+
+
+def time_function(function: Callable, args: List[Any]) -> Tuple[float, pd.Series]:
+    start_time = perf_counter()
+    result = function(*args)
+    return perf_counter() - start_time, result
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        print(f'{num_rows} rows')
+        for name, (old_function, new_function, args) in get_benchmarks(num_rows).items():
+            old_time, old_result = time_function(old_function, args)
+            new_time, new_result = time_function(inspect.unwrap(new_function), args)
+            assert old_result.equals(new_result), name
+            print(f'    {name:<30} old: {old_time:8.3f} s    new: {new_time:8.3f} s    {old_time / new_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
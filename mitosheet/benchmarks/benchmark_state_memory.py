@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how much memory the step history holds after a number of 
+column edits, with the copy-on-write State, and with a State that 
+deep copies the edited sheet on each step (the old behavior).
+
+Run with: python benchmarks/benchmark_state_memory.py [num_rows] [num_columns] [num_edits]
+"""
+import sys
+import tracemalloc
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.state import State
+from mitosheet.steps_manager import StepsManager
+from mitosheet.utils import get_new_id
+
+NUM_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+NUM_COLUMNS = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+NUM_EDITS = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+
+def make_edit_event(step_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'event': 'edit_event',
+        'id': get_new_id(),
+        'type': f'{step_type}_edit',
+        'step_id': get_new_id(),
+        'params': params
+    }
+
+
+def run_edits(steps_manager: StepsManager) -> None:
+    """
+    Adds a column, and then repeatedly edits its formula and some
+    of its cells, which are the most common single column edits.
+    """
+    steps_manager.handle_edit_event(make_edit_event('add_column', {
+        'sheet_index': 0, 'column_header': 'new', 'column_header_index': -1
+    }))
+    for i in range(NUM_EDITS - 1):
+        if i % 2 == 0:
+            steps_manager.handle_edit_event(make_edit_event('set_column_formula', {
+                'sheet_index': 0, 'column_id': 'new', 'old_formula': '', 'new_formula': f'=c0 + {i}'
+            }))
+        else:
+            steps_manager.handle_edit_event(make_edit_event('set_cell_value', {
+                'sheet_index': 0, 'column_id': 'c1', 'row_index': i, 'new_value': str(i)
+            }))
+
+
+def measure(deep_copy: bool) -> float:
+    original_copy = State.copy
+    if deep_copy:
+        # Simulate the old behavior, where every sheet that is modified is deep copied
+        def copy(self, deep_sheet_indexes=None, modified_sheet_indexes=None, column_ids_to_copy=None):  # type: ignore
+            sheet_indexes = set(deep_sheet_indexes or []).union(modified_sheet_indexes or []).union((column_ids_to_copy or {}).keys())
+            return original_copy(self, deep_sheet_indexes=list(sheet_indexes))
+        State.copy = copy # type: ignore
+
+    df = pd.DataFrame(
+        np.random.rand(NUM_ROWS, NUM_COLUMNS), 
+        columns=[f'c{i}' for i in range(NUM_COLUMNS)]
+    )
+
+    tracemalloc.start()
+    try:
+        steps_manager = StepsManager([df])
+        steps_manager.handle_update_event({'event': 'update_event', 'type': 'args_update', 'args': ['df']})
+        run_edits(steps_manager)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        State.copy = original_copy # type: ignore
+
+    del steps_manager
+    return current / 1024 / 1024
+
+
+def main() -> None:
+    df_size = NUM_ROWS * NUM_COLUMNS * 8 / 1024 / 1024
+    print(f'{NUM_ROWS} rows x {NUM_COLUMNS} float columns ({df_size:.1f} MB), {NUM_EDITS} edits')
+    print(f'Deep copy of edited sheet:  {measure(deep_copy=True):.1f} MB retained')
+    print(f'Copy-on-write columns:      {measure(deep_copy=False):.1f} MB retained')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Measures how long it takes to convert string columns of different sizes to
+float columns, when converting each string one at a time (the old behavior),
+and when converting the whole column at once.
+
+Run with: python benchmarks/benchmark_to_float_series.py [num_rows ...]
+"""
+import sys
+from time import perf_counter
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.sheet_functions.types.to_float_series import (
+    convert_string_to_float, to_float_series_from_string_series)
+
+NUM_ROWS = [int(arg) for arg in sys.argv[1:]] if len(sys.argv) > 1 else [10_000, 1_000_000]
+ON_UNCASTABLE_ARG_ELEMENT = ('default', np.NaN)
+
+
+def old_to_float_series_from_string_series(string_series: pd.Series) -> pd.Series:
+    return string_series.apply(convert_string_to_float, on_uncastable_arg_element=ON_UNCASTABLE_ARG_ELEMENT).astype('float64')
+
+
+def get_benchmarks(num_rows: int) -> Dict[str, pd.Series]:
+    numbers = pd.Series(np.random.rand(num_rows) * 10000)
+    strings = numbers.astype('str')
+    return {
+        'Numbers': strings,
+        'Mostly numbers': strings.where(numbers > 100, '$' + strings),
+        'Currency': '$' + strings + 'M',
+        'Accounting': '(' + strings.str.slice(0, 5) + ')',
+        'Invalid': strings + ' dollars',
+    }
+
+
+def time_function(function: Callable, string_series: pd.Series) -> Tuple[float, pd.Series]:
+    start_time = perf_counter()
+    result = function(string_series)
+    return perf_counter() - start_time, result
+
+
+def main() -> None:
+    for num_rows in NUM_ROWS:
+        print(f'{num_rows} rows')
+        for name, string_series in get_benchmarks(num_rows).items():
+            old_time, old_result = time_function(old_to_float_series_from_string_series, string_series)
+            new_time, new_result = time_function(
+                lambda s: to_float_series_from_string_series(s, ON_UNCASTABLE_ARG_ELEMENT), string_series
+            )
+            assert old_result.equals(new_result), name
+            print(f'    {name:<20} old: {old_time:8.3f} s    new: {new_time:8.3f} s    {old_time / new_time:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
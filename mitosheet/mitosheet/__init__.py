@@ -49,6 +49,16 @@ from mitosheet.sheet_functions.types import *
 from mitosheet.api.get_column_summary_graph import (
     filter_df_to_safe_size_external as filter_df_to_safe_size,
 )
+from mitosheet.step_performers.import_steps.simple_import import (
+    set_csv_import_engine,
+    set_lazy_import_min_file_size,
+)
+from mitosheet.step_performers.import_steps.excel_import import (
+    set_excel_import_engine,
+)
+from mitosheet.dtype_optimization import (
+    set_optimize_imported_dtypes,
+)
 
 # Make sure the user is initalized
 initialize_user()
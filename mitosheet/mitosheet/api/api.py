@@ -6,9 +6,10 @@
 """
 Contains handlers for the Mito API
 """
-from queue import Queue
-from threading import Thread
-from typing import Any, Callable, Dict, List, NoReturn, Union
+from collections import deque
+import json
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Dict, Hashable, List, NoReturn, Optional, Tuple, Union
 from mitosheet.api.get_params import get_params
 from mitosheet.api.get_column_describe import get_column_describe
 from mitosheet.api.get_datafiles import get_datafiles
@@ -18,6 +19,8 @@ from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
 from mitosheet.api.get_path_contents import get_path_contents
 from mitosheet.api.get_path_join import get_path_join
 from mitosheet.api.get_search_matches import get_search_matches
+from mitosheet.api.get_sheet_data import get_sheet_data
+from mitosheet.api.get_sheet_data_array import get_sheet_data_array
 from mitosheet.api.get_unique_value_counts import get_unique_value_counts
 from mitosheet.api.get_column_summary_graph import get_column_summary_graph
 from mitosheet.mito_analytics import log_event_processed
@@ -26,82 +29,191 @@ from mitosheet.steps_manager import StepsManager
 # As the column summary statistics tab does three calls, we defaulted to this max
 MAX_QUEUED_API_CALLS = 3
 
+# The number of threads that handle API calls, so that one slow call (e.g. a 
+# graph of a big dataframe) does not hold up all the other calls
+MAX_API_WORKERS = 3
+
 # NOTE: BE CAREFUL WITH THIS. When in development mode, you can set it to False
 # so the API calls are handled in the main thread, to make printing easy
 THREADED = True
 
 
+class APICall:
+    """
+    An API call that is queued or being handled, along with the ids of all
+    the identical API calls that are waiting for its result.
+    """
+
+    def __init__(self, event: Dict[str, Any], step_id: str):
+        self.event = event
+        self.ids: List[str] = [event['id']]
+        self.key = get_api_call_key(event, step_id)
+        self.supersede_key = get_api_call_supersede_key(event)
+        self.cancelled = False
+
+
+def get_api_call_key(event: Dict[str, Any], step_id: str) -> str:
+    """
+    Returns a key that is the same for API calls with the same type and params
+    that are made at the step with step_id, as calls made after the sheet 
+    changes must not get the result of a call about the old sheet.
+    """
+    return json.dumps(
+        {'step_id': step_id, 'event': {key: value for key, value in event.items() if key != 'id'}}, 
+        sort_keys=True, 
+        default=str
+    )
+
+
+def get_api_call_supersede_key(event: Dict[str, Any]) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Returns the (type, sheet_index, column_id) of an API call about a sheet, as 
+    a newer call with the same key makes the result of an older call out of 
+    date (e.g. as the user types a search, or clicks to another column). Returns 
+    None for API calls that are not about a sheet.
+    """
+    if 'sheet_index' not in event:
+        return None
+    return (event['type'], event['sheet_index'], event.get('column_id'))
+
+
 class API:
     """
-    The API provides a wrapper around a thread that responds to API calls.
+    The API provides a wrapper around a pool of threads that respond to API calls.
 
     Some notes:
     -   We allow at most MAX_QUEUED_API_CALLS API calls to be in the queue, which practically
         Stops a backlog of calls from building up.
+    -   API calls with the key 'priority' (e.g. lazy loading data) go in their own queue,
+        which is never evicted from, and which the workers handle before the other calls.
+    -   An API call that is the same as a call that is queued or being handled is not 
+        handled again; instead, it gets the result of that call. 
+    -   An API call supersedes the calls with the same type, sheet_index and column_id; 
+        they are removed from the queue, or if they are being handled, their result 
+        is not sent. As threads cannot be interrupted, a call that is being handled 
+        still runs to completion.
+    -   API calls that are superseded or evicted get a response with 'superseded'
+        set and no data, so the frontend does not wait for them.
     -   All API calls should only be reads. This stops us from having to worry
         about most concurrency issues
     -   Note that printing inside of a thread does not work properly! Use sys.stdout.flush() after the print statement.
         See here: https://stackoverflow.com/questions/18234469/python-multithreaded-print-statements-delayed-until-all-threads-complete-executi
     """
 
-    def __init__(self, steps_manager: StepsManager, send: Callable):
-        self.api_queue: Queue = Queue(MAX_QUEUED_API_CALLS)
-        # Note that we make the thread a daemon thread, which practically means that when
-        # The process that starts this thread terminate, our API will terminate as well.
-        self.thread = Thread(
-            target=handle_api_event_thread,
-            args=(self.api_queue, steps_manager, send),
-            daemon=True,
-        )
-        self.thread.start()
+    def __init__(self, steps_manager: StepsManager, send: Callable, num_workers: int=MAX_API_WORKERS):
+        self.condition = Condition()
+        self.priority_api_calls: Deque[APICall] = deque()
+        self.api_calls: Deque[APICall] = deque()
+        # The API calls that are queued or being handled, by their key and supersede key
+        self.api_calls_by_key: Dict[str, APICall] = {}
+        self.api_calls_by_supersede_key: Dict[Tuple[Hashable, ...], APICall] = {}
 
         # Save some variables for ease
         self.steps_manager = steps_manager
         self.send = send
 
+        # Note that we make the threads daemon threads, which practically means that when
+        # The process that starts them terminates, our API will terminate as well.
+        self.threads = [
+            Thread(target=self.handle_api_calls, daemon=True)
+            for _ in range(num_workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
     def process_new_api_call(self, event: Dict[str, Any]) -> None:
         """
-        We privilege new API calls over old calls, and evict the old ones
+        We privilege new API calls over old calls, and evict the oldest one
         if the API queue is full.
 
-        Because we are using a queue, only events that have not been started
-        being processed will get removed.
-
-        If the key 'priority' is in the event, then we handle it in the main
-        thread, as we don't want to drop the event. For example, lazy loading
-        data has priority!
+        If the key 'priority' is in the event, then it goes in the priority
+        queue, and it is never evicted. For example, lazy loading data has priority!
         """
-        if THREADED and "priority" not in event:
-            if self.api_queue.full():
-                self.api_queue.get()
-            self.api_queue.put(event)
-        else:
+        if not THREADED:
             handle_api_event(self.send, event, self.steps_manager)
+            return
 
+        api_call = APICall(event, self.steps_manager.curr_step.step_id)
+        cancelled_api_calls: List[APICall] = []
+        with self.condition:
+            identical_api_call = self.api_calls_by_key.get(api_call.key)
+            if identical_api_call is not None:
+                identical_api_call.ids.append(event['id'])
+                return
 
-def handle_api_event_thread(
-    queue: Queue, steps_manager: StepsManager, send: Callable
-) -> NoReturn:
-    """
-    This is the worker thread function, that actually is
-    responsible for handling at the API call events.
+            if api_call.supersede_key is not None:
+                superseded_api_call = self.api_calls_by_supersede_key.get(api_call.supersede_key)
+                if superseded_api_call is not None:
+                    cancelled_api_calls.append(self._cancel_api_call(superseded_api_call))
+                self.api_calls_by_supersede_key[api_call.supersede_key] = api_call
+            self.api_calls_by_key[api_call.key] = api_call
 
-    It lives forever, and just handles events as it
-    receives them from the queue
-    """
-    while True:
-        # Note that this blocks when there is nothing in the queue,
-        # and waits till there is something there - so no infinite
-        # loop as it is waiting!
-        event = queue.get()
-        # We place the API handling inside of a try catch,
-        # because otherwise if an error is thrown, then the entire thread crashes,
-        # and then the API never works again
-        try:
-            handle_api_event(send, event, steps_manager)
-        except:
-            # Log in error if it occurs
-            log_event_processed(event, steps_manager, failed=True)
+            if 'priority' in event:
+                self.priority_api_calls.append(api_call)
+            else:
+                if len(self.api_calls) >= MAX_QUEUED_API_CALLS:
+                    cancelled_api_calls.append(self._cancel_api_call(self.api_calls[0]))
+                self.api_calls.append(api_call)
+            self.condition.notify()
+
+        for cancelled_api_call in cancelled_api_calls:
+            for id in cancelled_api_call.ids:
+                self.send({"event": "api_response", "id": id, "superseded": True})
+
+    def _cancel_api_call(self, api_call: APICall) -> APICall:
+        """
+        Removes the API call from the queue, or if it is being handled, makes
+        sure its result is not sent, and returns it. Must be called with the 
+        condition held.
+        """
+        api_call.cancelled = True
+        if api_call in self.api_calls:
+            self.api_calls.remove(api_call)
+        if api_call in self.priority_api_calls:
+            self.priority_api_calls.remove(api_call)
+        self._forget_api_call(api_call)
+        return api_call
+
+    def _forget_api_call(self, api_call: APICall) -> None:
+        if self.api_calls_by_key.get(api_call.key) is api_call:
+            del self.api_calls_by_key[api_call.key]
+        if api_call.supersede_key is not None and self.api_calls_by_supersede_key.get(api_call.supersede_key) is api_call:
+            del self.api_calls_by_supersede_key[api_call.supersede_key]
+
+    def handle_api_calls(self) -> NoReturn:
+        """
+        This is the worker thread function, that actually is
+        responsible for handling the API calls.
+
+        It lives forever, and just handles calls as they are
+        added to the queues, priority calls first
+        """
+        while True:
+            with self.condition:
+                # Note that this blocks when there is nothing in the queues,
+                # and waits till there is something there - so no infinite
+                # loop as it is waiting!
+                while not self.priority_api_calls and not self.api_calls:
+                    self.condition.wait()
+                api_queue = self.priority_api_calls if self.priority_api_calls else self.api_calls
+                api_call = api_queue.popleft()
+
+            # We place the API handling inside of a try catch,
+            # because otherwise if an error is thrown, then the entire thread crashes,
+            # and then the API never works again
+            result = None
+            try:
+                result = get_api_result(api_call.event, self.steps_manager)
+            except:
+                # Log in error if it occurs
+                log_event_processed(api_call.event, self.steps_manager, failed=True)
+
+            with self.condition:
+                self._forget_api_call(api_call)
+                ids = [] if api_call.cancelled or result is None else list(api_call.ids)
+            
+            for id in ids:
+                self.send({"event": "api_response", "id": id, "data": result})
 
 
 def handle_api_event(
@@ -112,6 +224,16 @@ def handle_api_event(
     API must return the same ID that the incoming message contains,
     so that the frontend knows how to match the responses.
     """
+    result = get_api_result(event, steps_manager)
+    send({"event": "api_response", "id": event["id"], "data": result})
+
+
+def get_api_result(
+    event: Dict[str, Any], steps_manager: StepsManager
+) -> Union[str, List[str]]:
+    """
+    Returns the result of the API call.
+    """
     result: Union[str, List[str]]
     if event["type"] == "datafiles":
         result = get_datafiles(event)
@@ -135,7 +257,11 @@ def handle_api_event(
         result = get_search_matches(event, steps_manager)
     elif event["type"] == "get_dataframe_as_excel":
         result = get_dataframe_as_excel(event, steps_manager)
+    elif event["type"] == "get_sheet_data":
+        result = get_sheet_data(event, steps_manager)
+    elif event["type"] == "get_sheet_data_array":
+        result = get_sheet_data_array(event, steps_manager)
     else:
         raise Exception(f"Event: {event} is not a valid API call")
 
-    send({"event": "api_response", "id": event["id"], "data": result})
+    return result
@@ -7,10 +7,13 @@ import json
 from typing import Any, Dict
 
 import pandas as pd
+from mitosheet.api_result_cache import cache_api_result
+from mitosheet.lazy_file import get_lazy_file
 from mitosheet.sheet_functions.types.utils import is_number_dtype
 from mitosheet.types import StepsManagerType
 
 
+@cache_api_result
 def get_column_describe(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
     Sends back a string that can be parsed to a JSON object that
@@ -21,7 +24,9 @@ def get_column_describe(event: Dict[str, Any], steps_manager: StepsManagerType)
     column_id = event['column_id']
     column_header = steps_manager.curr_step.get_column_header_by_id(sheet_index, column_id)
     
-    series: pd.Series = steps_manager.dfs[sheet_index][column_header]
+    # If the sheet is backed by a lazy file, we read just this column of the file
+    lazy_file = get_lazy_file(steps_manager.curr_step.final_defined_state, sheet_index)
+    series: pd.Series = lazy_file.read_column(column_header) if lazy_file is not None else steps_manager.dfs[sheet_index][column_header]
     column_dtype = str(series.dtype)
     describe = series.describe()
 
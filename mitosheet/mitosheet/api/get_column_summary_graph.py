@@ -9,6 +9,8 @@ import pandas as pd
 from typing import Any, Dict, List
 import plotly.express as px
 import plotly.graph_objects as go
+from mitosheet.api_result_cache import cache_api_result
+from mitosheet.lazy_file import get_lazy_file
 from mitosheet.step_performers.graph_steps.graph_utils import (
     get_html_and_script_from_figure,
 )
@@ -24,6 +26,7 @@ from mitosheet.step_performers.graph_steps.graph_utils import BAR, BOX, SCATTER
 MAX_UNIQUE_NON_NUMBER_VALUES = 10_000
 
 
+@cache_api_result
 def get_column_summary_graph(event: Dict[str, Any], steps_manager: StepsManager) -> str:
     """
     Creates a column summary graph and sends it back as a PNG
@@ -35,10 +38,13 @@ def get_column_summary_graph(event: Dict[str, Any], steps_manager: StepsManager)
     width = event['width']
 
 
-    # Create a copy of the dataframe, just for safety.
-    df: pd.DataFrame = steps_manager.dfs[sheet_index].copy()
-
     column_header = steps_manager.curr_step.final_defined_state.column_ids.get_column_header_by_id(sheet_index, column_id)
+
+    # NOTE: we don't copy the dataframe, as making the graph only reads it. If the sheet 
+    # is backed by a lazy file, we read just this column of the file
+    lazy_file = get_lazy_file(steps_manager.curr_step.final_defined_state, sheet_index)
+    df: pd.DataFrame = lazy_file.read_column(column_header).to_frame() if lazy_file is not None else steps_manager.dfs[sheet_index]
+
     fig = _get_column_summary_graph(df, column_header)
         
     # Get rid of some of the default white space
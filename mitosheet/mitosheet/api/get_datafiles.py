@@ -22,13 +22,16 @@ def get_filenames_with_suffix(*suffixes: str) -> List[str]:
 
 def get_datafiles(event: Dict[str, Any]) -> List[str]:
     """
-    Handles a `datafiles` api call, and returns all the csv files
-    in the current folder.
+    Handles a `datafiles` api call, and returns all the csv, parquet 
+    and feather files in the current folder.
     """
-    csv_files = get_filenames_with_suffix(
+    datafiles = get_filenames_with_suffix(
         '.csv', 
         '.tsv',
         '.tab',
+        '.parquet',
+        '.feather',
+        '.arrow',
     )
     # TODO: also get the XLSX files, when we can import them
-    return csv_files
\ No newline at end of file
+    return datafiles
\ No newline at end of file
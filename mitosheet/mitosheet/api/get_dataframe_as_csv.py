@@ -4,6 +4,7 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 from typing import Any, Dict
+from mitosheet.lazy_file import get_full_df
 from mitosheet.types import StepsManagerType
 
 
@@ -12,6 +13,7 @@ def get_dataframe_as_csv(event: Dict[str, Any], steps_manager: StepsManagerType)
     Sends a dataframe as a CSV string
     """
     sheet_index = event['sheet_index']
-    df = steps_manager.dfs[sheet_index]
+    # We download all the rows of a sheet backed by a lazy file
+    df = get_full_df(steps_manager.curr_step.final_defined_state, sheet_index)
 
     return df.to_csv(index=False)
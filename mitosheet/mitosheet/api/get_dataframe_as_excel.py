@@ -8,6 +8,7 @@ import io
 from typing import Any, Dict
 
 import pandas as pd
+from mitosheet.lazy_file import get_full_df
 from mitosheet.pro.download.formatting import add_formatting_to_excel_sheet
 from mitosheet.types import StepsManagerType
 from mitosheet.user import is_pro
@@ -20,14 +21,16 @@ def get_dataframe_as_excel(event: Dict[str, Any], steps_manager: StepsManagerTyp
     sheet_indexes = event['sheet_indexes']
     is_pro_user = is_pro()
 
+    state = steps_manager.curr_step.final_defined_state
+
     # We write to a buffer so that we don't have to save the file
     # to the file system for no reason
     buffer = io.BytesIO()
     with pd.ExcelWriter(buffer) as writer:
         for sheet_index in sheet_indexes:
-            # First, write the tab in the Excel file
-            df = steps_manager.dfs[sheet_index]
-            sheet_name = steps_manager.curr_step.df_names[sheet_index]
+            # First, write the tab in the Excel file, with all the rows of a sheet backed by a lazy file
+            df = get_full_df(state, sheet_index)
+            sheet_name = state.df_names[sheet_index]
             df.to_excel(
                 writer, 
                 sheet_name=sheet_name, 
@@ -7,7 +7,8 @@ import json
 import os
 from typing import Any, Dict
 
-import pandas as pd
+from mitosheet.step_performers.import_steps.excel_import import \
+    get_excel_sheet_names
 from mitosheet.types import StepsManagerType
 
 
@@ -19,14 +20,17 @@ def get_excel_file_metadata(event: Dict[str, Any], steps_manager: StepsManagerTy
     For now, this is just the sheets this file contains, 
     but in the future we may be able to request more about 
     the workbook
+
+    We only read the workbook XML to get the sheet names, rather
+    than opening the workbook, as the user might not import it.
+    If the file is not an XLSX file, the workbook has to be opened
+    to get the sheet names.
     """
     file_name = event['file_name']
 
-    file = pd.ExcelFile(file_name, engine='openpyxl')
-    sheet_names = file.sheet_names
+    sheet_names = get_excel_sheet_names(file_name)
+
     return json.dumps({
         'sheet_names': sheet_names,
         'size': os.path.getsize(file_name)
     })
-
-
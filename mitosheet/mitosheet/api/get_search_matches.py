@@ -5,10 +5,14 @@
 # Distributed under the terms of the GPL License.
 import json
 from typing import Any, Dict, List, Tuple
+from mitosheet.lazy_file import get_full_df
+from mitosheet.search_index import get_search_cell_indexes
 from mitosheet.types import StepsManagerType
-import numpy as np
 import pandas as pd
 
+# The maximum number of matching cells we send to the front-end
+MAX_SEARCH_MATCHES = 100_000
+
 
 def get_search_header_indexes(df: pd.DataFrame, search_string: str) -> List[Tuple[int, int]]:
     search_string = search_string.lower()
@@ -17,44 +21,32 @@ def get_search_header_indexes(df: pd.DataFrame, search_string: str) -> List[Tupl
         if search_string in str(column_header).lower()
     ]
 
-def get_search_cell_indexes(df: pd.DataFrame, search_string: str) -> List[Tuple[int, int]]:
-    search_string = search_string.lower()
-
-    cell_indexes = []
-    for column_index, column in enumerate(df.columns):
-        # If there is no data, there are no matches
-        if len(df[column]) == 0:
-            return []
-        new_df = df[df[column].apply(str).str.lower().str.contains(search_string)]
-        cell_indexes.extend([
-            (row_index, column_index) for row_index in new_df.index.to_list()
-        ])
-    return cell_indexes
-
-
 def get_search_matches(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
     Returns the cell indexes of the cells / headers that match the passed
-    search string, only searching at most 2k cells at once. Use pagination 
-    to set the starting_row_index if you want to search more.
+    search string, in order of row and then column. As there can be very 
+    many matches, only the first MAX_SEARCH_MATCHES cells are returned, 
+    along with the total number of matching cells.
+
+    The cells are found with the search index of the sheet, which is built
+    the first time the sheet is searched. See search_index.py.
 
     Params:
     -   sheet_index: number - the sheet to search
     -   search_string: string - the string to search for
-    -   starting_row_index: number - where to actually start the search from, as
-        this only searches 2k columns at once
+    -   starting_row_index: number - optionally, the row to start the search from
     """
     sheet_index = event['sheet_index']
     search_string = event['search_string']
-    starting_row_index = event['starting_row_index']
+    starting_row_index = event.get('starting_row_index', 0)
 
-    df: pd.DataFrame = steps_manager.dfs[sheet_index]
-    df = df.iloc[starting_row_index:].head(n=2000) # Take only 2k rows from the starting location
-    # Reindex, so that the indexes in the dataframe correspond to frontend locations
-    df.index = np.arange(starting_row_index, len(df) + starting_row_index) 
+    # Searching reads every row, so we read in the whole file of a sheet backed by a lazy file
+    df = get_full_df(steps_manager.curr_step.final_defined_state, sheet_index)
 
     header_indexes = get_search_header_indexes(df, search_string)
-    cell_indexes = get_search_cell_indexes(df, search_string)
+    cell_indexes, num_cell_matches = get_search_cell_indexes(
+        df, search_string, steps_manager.search_index_cache, starting_row_index=starting_row_index, max_matches=MAX_SEARCH_MATCHES
+    )
 
     return json.dumps({
         "columnHeaderIndexes": [{
@@ -65,4 +57,5 @@ def get_search_matches(event: Dict[str, Any], steps_manager: StepsManagerType) -
             "rowIndex": row_index,
             "columnIndex": column_index
         } for (row_index, column_index) in cell_indexes],
+        "numCellMatches": num_cell_matches
     })
\ No newline at end of file
@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.types import StepsManagerType
+
+
+def get_sheet_data(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
+    """
+    Sends back a string that can be parsed to a JSON object that
+    contains the sheet data for the window of the sheet at sheet_index
+    from row_start to row_end and column_start to column_end. 
+
+    The front-end requests this window as the user scrolls, and then
+    this window is sent with the sheet data when the sheet changes.
+
+    NOTE: at most 1,500 rows and 1,500 columns are sent.
+    """
+    sheet_index = event['sheet_index']
+    window = (event['row_start'], event['row_end'], event['column_start'], event['column_end'])
+    return steps_manager.get_sheet_data_json(sheet_index, window)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.types import StepsManagerType
+
+
+def get_sheet_data_array(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
+    """
+    Sends back a string that can be parsed to a JSON object that contains
+    all of the sheet data that was last sent to the front-end, along with 
+    its version.
+
+    The front-end usually only receives patches to the sheet data it has, 
+    and so it requests this when it does not have the sheet data that a 
+    patch applies to.
+    """
+    return steps_manager.get_sent_sheet_data_json()
@@ -7,6 +7,8 @@ import json
 from typing import Any, Dict
 
 import pandas as pd
+from mitosheet.api_result_cache import cache_api_result
+from mitosheet.lazy_file import get_lazy_file
 from mitosheet.types import StepsManagerType
 from mitosheet.utils import df_to_json_dumpsable
 
@@ -14,6 +16,7 @@ from mitosheet.utils import df_to_json_dumpsable
 # See comments in function description below.
 MAX_UNIQUE_VALUES = 1_000
 
+@cache_api_result
 def get_unique_value_counts(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
     Sends back a string that can be parsed to a JSON object that
@@ -35,10 +38,14 @@ def get_unique_value_counts(event: Dict[str, Any], steps_manager: StepsManagerTy
 
     column_header = steps_manager.curr_step.column_ids.get_column_header_by_id(sheet_index, column_id)
     
-    series: pd.Series = steps_manager.dfs[sheet_index][column_header]
-
-    unique_value_counts_percents_series = series.value_counts(normalize=True, dropna=False)
-    unique_value_counts_series = series.value_counts(dropna=False)
+    lazy_file = get_lazy_file(steps_manager.curr_step.final_defined_state, sheet_index)
+    if lazy_file is not None:
+        # If the sheet is backed by a lazy file, we count the values in the file without reading it all in
+        unique_value_counts_series = lazy_file.get_value_counts(column_header)
+    else:
+        series: pd.Series = steps_manager.dfs[sheet_index][column_header]
+        unique_value_counts_series = series.value_counts(dropna=False)
+    unique_value_counts_percents_series = unique_value_counts_series / unique_value_counts_series.sum()
     
     unique_value_counts_df = pd.DataFrame({
         'values': unique_value_counts_percents_series.index,
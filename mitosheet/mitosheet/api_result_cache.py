@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains a cache of the results of the API calls that summarize a column,
+like its unique value counts, its describe and its summary graph.
+
+The user often opens the same column's filter or summary panel again and
+again, and each of these calls reads the whole column, so we cache their
+results for each version of the sheet they were computed from.
+"""
+from collections import OrderedDict
+from functools import wraps
+import json
+from threading import Lock
+from typing import Any, Callable, Dict, Tuple
+
+from mitosheet.sheet_data import get_sheet_version
+from mitosheet.types import StepsManagerType
+
+MAX_API_RESULT_CACHE_BYTES = 32_000_000
+
+# The keys of an API call that are not params of the call
+NON_PARAM_KEYS = ['event', 'id', 'type', 'sheet_index', 'column_id', 'priority']
+
+
+def get_api_call_params(event: Dict[str, Any]) -> str:
+    return json.dumps({key: value for key, value in event.items() if key not in NON_PARAM_KEYS}, sort_keys=True, default=str)
+
+
+class APIResultCache():
+    """
+    A least recently used cache of the results of API calls, that holds at
+    most max_bytes of results.
+
+    Each result is cached for the version of the sheet it was computed from
+    (see get_sheet_version), so a result is reused by every step that does not
+    change that sheet, and is never reused once the sheet changes. We only keep
+    the metadata maps of the sheet, and not the dataframe, so the cache does
+    not keep old dataframes in memory.
+
+    NOTE: many API threads use this cache, so all access to the entries is
+    behind a lock.
+    """
+
+    def __init__(self, max_bytes: int=MAX_API_RESULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.cache: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[Any, ...], str]]" = OrderedDict()
+        self.num_bytes = 0
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, steps_manager: StepsManagerType, event: Dict[str, Any], get_result: Callable[[], str]) -> str:
+        """
+        Returns the result of the API call event on the sheet at event['sheet_index']
+        in the current step, calling get_result to compute it if it is not cached.
+        """
+        state = steps_manager.curr_step.final_defined_state
+        sheet_index = event['sheet_index']
+        sheet_version = get_sheet_version(state, sheet_index)
+        # As each entry holds on to the objects in its sheet version, their ids
+        # cannot be reused while the entry is in the cache
+        key = (
+            event['type'], sheet_index, event.get('column_id'), get_api_call_params(event),
+            tuple(id(sheet_object) for sheet_object in sheet_version)
+        )
+
+        with self.lock:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+
+        result = get_result()
+
+        # If the user edited the sheet while we were computing the result, it might
+        # have been computed from the new version of the sheet, so we don't cache it.
+        # We also don't cache empty results, which API calls return when they fail
+        if result == '' or steps_manager.curr_step.final_defined_state is not state or len(result) > self.max_bytes:
+            return result
+
+        with self.lock:
+            if key not in self.cache:
+                self.cache[key] = (sheet_version, result)
+                self.num_bytes += len(result)
+            while self.num_bytes > self.max_bytes:
+                _, (_, evicted_result) = self.cache.popitem(last=False)
+                self.num_bytes -= len(evicted_result)
+        return result
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+            self.num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.cache),
+            'num_bytes': self.num_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+
+def cache_api_result(get_api_result: Callable[[Dict[str, Any], StepsManagerType], str]) -> Callable[[Dict[str, Any], StepsManagerType], str]:
+    """
+    A decorator for API calls on a sheet that only read the sheet, which caches
+    their results in the api_result_cache of the steps manager.
+    """
+    @wraps(get_api_result)
+    def wrapper(event: Dict[str, Any], steps_manager: StepsManagerType) -> str:
+        return steps_manager.api_result_cache.get(steps_manager, event, lambda: get_api_result(event, steps_manager))
+
+    return wrapper
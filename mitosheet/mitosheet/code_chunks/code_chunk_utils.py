@@ -6,7 +6,7 @@
 
 
 from copy import copy
-from typing import TYPE_CHECKING, List, Optional, Any, Type
+from typing import TYPE_CHECKING, List, Optional, Any, Set, Tuple, Type
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk import DeleteColumnsCodeChunk
@@ -20,30 +20,49 @@ else:
     Step = Any
     
 
-def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChunk]:
+def get_step_code_chunks(all_steps: List[Step], step_indexes_to_skip: Optional[Set[int]]=None) -> List[List[CodeChunk]]:
+    """
+    Returns the list of CodeChunks of each of the steps that are not skipped, 
+    not including the initialize step. 
+
+    NOTE: the lists of CodeChunks are cached on each step, and so must not be changed.
+
+    If step_indexes_to_skip is not passed, it is computed from all_steps.
+    """
+    if step_indexes_to_skip is None:
+        from mitosheet.steps_manager import get_step_indexes_to_skip
+        step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
+
+    return [
+        step.get_code_chunks() for step_index, step in enumerate(all_steps)
+        # Skip the initalize step, or any step we should skip
+        if step.step_type != 'initialize' and step_index not in step_indexes_to_skip
+    ]
+
+
+def get_code_chunks(
+        all_steps: List[Step], 
+        optimize: bool=True, 
+        step_indexes_to_skip: Optional[Set[int]]=None, 
+        code_chunks_optimizer: Optional["CodeChunksOptimizer"]=None
+    ) -> List[CodeChunk]:
     """
     A utility for taking all the steps in the steps manager, and returning a list
     of CodeChunks that correspond to these steps. 
 
     optimize is by default True, which results in these CodeChunks being optimized
     down to the smallest possible list of CodeChunks that implements the same ops.
-    """
-    from mitosheet.steps_manager import get_step_indexes_to_skip
-    step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
+    If a code_chunks_optimizer is passed, it is used to only optimize the CodeChunks
+    of the steps that were added since it last optimized.
 
-    all_code_chunks: List[CodeChunk] = []
-    for step_index, step in enumerate(all_steps):
-        # Skip the initalize step, or any step we should skip
-        if step.step_type == 'initialize' or step_index in step_indexes_to_skip:
-            continue
+    If step_indexes_to_skip is not passed, it is computed from all_steps.
+    """
+    step_code_chunks = get_step_code_chunks(all_steps, step_indexes_to_skip)
 
-        all_code_chunks.extend(step.step_performer.transpile(
-            step.prev_state, # type: ignore
-            step.post_state, # type: ignore
-            step.params,
-            step.execution_data,
-        ))
+    if optimize and code_chunks_optimizer is not None:
+        return code_chunks_optimizer.optimize(step_code_chunks)
 
+    all_code_chunks: List[CodeChunk] = [code_chunk for code_chunks in step_code_chunks for code_chunk in code_chunks]
     if optimize:
         code_chunks_list = optimize_code_chunks(all_code_chunks)
     else:
@@ -52,6 +71,67 @@ def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChun
     return code_chunks_list
 
 
+MAX_CACHED_OPTIMIZED_CODE_CHUNKS = 8
+
+def is_prefix(items: List[Any], other_items: List[Any]) -> bool:
+    """
+    Returns True if other_items starts with the same objects as items.
+    """
+    return len(items) <= len(other_items) and all(item is other_item for item, other_item in zip(items, other_items))
+
+
+class CodeChunksOptimizer():
+    """
+    Optimizes the CodeChunks of lists of steps, keeping the optimized CodeChunks 
+    of the last few lists of steps it optimized.
+
+    As a step is only transpiled again when it is executed again, a list of steps 
+    that starts with the same steps as a list we optimized starts with the same 
+    lists of CodeChunks. In this case, we only optimize the CodeChunks of the steps 
+    after these, appended to the already optimized CodeChunks. If the new CodeChunks 
+    combine with the already optimized ones, optimizing all the CodeChunks at once 
+    might combine them differently, so we then optimize all the CodeChunks.
+    
+    Thus, after most edits we only optimize the CodeChunks of the new step, and
+    undos and redos can use the lists of steps they return to.
+    """
+
+    def __init__(self, max_size: int=MAX_CACHED_OPTIMIZED_CODE_CHUNKS):
+        self.max_size = max_size
+        # The lists of CodeChunks of the steps that were optimized, and the optimized CodeChunks
+        self.optimized: List[Tuple[List[List[CodeChunk]], List[CodeChunk]]] = []
+
+    def optimize(self, step_code_chunks: List[List[CodeChunk]]) -> List[CodeChunk]:
+        """
+        Returns the optimized CodeChunks of the steps with step_code_chunks.
+        """
+        num_shared_steps, optimized_code_chunks = 0, []
+        for optimized_step_code_chunks, optimized_result in self.optimized:
+            if len(optimized_step_code_chunks) >= num_shared_steps and is_prefix(optimized_step_code_chunks, step_code_chunks):
+                num_shared_steps, optimized_code_chunks = len(optimized_step_code_chunks), optimized_result
+        
+        if num_shared_steps < len(step_code_chunks) or len(step_code_chunks) == 0:
+            new_code_chunks = [code_chunk for code_chunks in step_code_chunks[num_shared_steps:] for code_chunk in code_chunks]
+            new_optimized_code_chunks = optimize_code_chunks(optimized_code_chunks + new_code_chunks)
+
+            # If the new CodeChunks combined with the already optimized CodeChunks, then optimizing
+            # all of the CodeChunks might combine them differently, so we do so
+            if not is_prefix(optimized_code_chunks, new_optimized_code_chunks):
+                new_optimized_code_chunks = optimize_code_chunks(
+                    [code_chunk for code_chunks in step_code_chunks for code_chunk in code_chunks]
+                )
+            optimized_code_chunks = new_optimized_code_chunks
+
+        # Keep the most recently used lists of steps at the end
+        self.optimized = [
+            (optimized_step_code_chunks, optimized_result) for optimized_step_code_chunks, optimized_result in self.optimized
+            if not (len(optimized_step_code_chunks) == len(step_code_chunks) and is_prefix(optimized_step_code_chunks, step_code_chunks))
+        ] + [(step_code_chunks, optimized_code_chunks)]
+        self.optimized = self.optimized[-self.max_size:]
+
+        return copy(optimized_code_chunks)
+
+
 # NOTE: we cannot use get_right_combine_with_column_delete_code_chunk on sort/filter, 
 # as sort potentially changes the indexes of the dataframe, which is a lasting change
 # that occurs even after this column is deleted. Hence, we throw errors in this util 
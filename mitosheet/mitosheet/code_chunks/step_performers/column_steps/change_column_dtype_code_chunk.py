@@ -8,8 +8,7 @@ from typing import List
 from mitosheet.code_chunks.code_chunk import CodeChunk
 
 from mitosheet.errors import make_invalid_column_type_change_error
-from mitosheet.sheet_functions.types.utils import (get_datetime_format,
-                                                   is_bool_dtype,
+from mitosheet.sheet_functions.types.utils import (is_bool_dtype,
                                                    is_datetime_dtype,
                                                    is_float_dtype,
                                                    is_int_dtype,
@@ -41,8 +40,6 @@ class ChangeColumnDtypeCodeChunk(CodeChunk):
         column_header = self.post_state.column_ids.get_column_header_by_id(sheet_index, column_id)
         transpiled_column_header = column_header_to_transpiled_code(column_header)
 
-        column = self.prev_state.dfs[sheet_index][column_header]
-
         conversion_code = f'{df_name}[{transpiled_column_header}]'
         if is_bool_dtype(old_dtype):
             if is_bool_dtype(new_dtype):
@@ -101,8 +98,8 @@ class ChangeColumnDtypeCodeChunk(CodeChunk):
             elif is_string_dtype(new_dtype):
                 pass
             elif is_datetime_dtype(new_dtype):
-                # Guess the datetime format to the best of Pandas abilities
-                datetime_format = get_datetime_format(column)
+                # Use the datetime format that was guessed when executing the step
+                datetime_format = self.get_execution_data('datetime_format')
                 if datetime_format is not None:
                     conversion_code = f'pd.to_datetime({df_name}[{transpiled_column_header}], format=\'{datetime_format}\', errors=\'coerce\')'
                 else:
@@ -7,6 +7,7 @@
 from typing import List
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.dtype_optimization import get_optimized_dtypes_comment, get_optimized_dtypes_code
 
 
 class ExcelImportCodeChunk(CodeChunk):
@@ -17,13 +18,16 @@ class ExcelImportCodeChunk(CodeChunk):
     def get_description_comment(self) -> str:
         file_name = self.get_param('file_name')
         sheet_names = self.get_param('sheet_names')
-        return f'Imported {", ".join(sheet_names)} from {file_name}'
+        return f'Imported {", ".join(sheet_names)} from {file_name}{get_optimized_dtypes_comment(self.get_execution_data("num_bytes_saved"))}'
 
     def get_code(self) -> List[str]:
         file_name = self.get_param('file_name')
         sheet_names = self.get_param('sheet_names')
         has_headers = self.get_param('has_headers')
         skiprows = self.get_param('skiprows')
+        # Steps from before the engine was saved were read with openpyxl
+        engine = self.get_execution_data('engine')
+        engine = engine if engine is not None else 'openpyxl'
 
         read_excel_params = {
             'sheet_name': sheet_names,
@@ -34,11 +38,13 @@ class ExcelImportCodeChunk(CodeChunk):
         if not has_headers:
             read_excel_params['header'] = None
 
-        read_excel_line = f'sheet_df_dictonary = pd.read_excel(\'{file_name}\', engine=\'openpyxl\''
+        read_excel_line = f'sheet_df_dictonary = pd.read_excel(\'{file_name}\', engine=\'{engine}\''
         for key, value in read_excel_params.items():
             read_excel_line += f', {key}={value}'
         read_excel_line += ')'
 
+        sheet_dtypes = self.get_execution_data('sheet_dtypes')
+
         df_definitions = []
         for index, sheet_name in enumerate(sheet_names):
             adjusted_index = len(self.post_state.df_names) - len(sheet_names) + index
@@ -46,6 +52,11 @@ class ExcelImportCodeChunk(CodeChunk):
                 f'{self.post_state.df_names[adjusted_index]} = sheet_df_dictonary[\'{sheet_name}\']'
             )
 
+            # If the dtypes of the sheet were optimized, we turn the columns into the same dtypes
+            optimized_dtypes_code = get_optimized_dtypes_code(self.post_state.df_names[adjusted_index], sheet_dtypes[index] if sheet_dtypes is not None else None)
+            if optimized_dtypes_code is not None:
+                df_definitions.append(optimized_dtypes_code)
+
         return [
             'import pandas as pd',
             read_excel_line
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from mitosheet.code_chunks.code_chunk import CodeChunk
+
+# The file endings of Feather files, which are Arrow IPC files
+FEATHER_FILE_ENDINGS = ['.feather', '.arrow', '.ipc']
+
+# The operators that pyarrow can filter the rows of a parquet file with
+PARQUET_FILTER_OPERATORS = ['==', '=', '!=', '<', '<=', '>', '>=', 'in', 'not in']
+
+
+def is_feather_file(file_name: str) -> bool:
+    return os.path.splitext(file_name)[1].lower() in FEATHER_FILE_ENDINGS
+
+
+def get_read_parquet_params(columns: Optional[List[str]], filters: Optional[List[List[Any]]]) -> Dict[str, Any]:
+    """
+    Returns the params that pd.read_parquet reads the file with, which the
+    generated code also uses, so that it reads exactly the same dataframe.
+    """
+    read_parquet_params: Dict[str, Any] = {
+        'engine': 'pyarrow'
+    }
+    if columns is not None:
+        read_parquet_params['columns'] = columns
+    if filters is not None and len(filters) > 0:
+        read_parquet_params['filters'] = get_parquet_filters(filters)
+    return read_parquet_params
+
+
+def get_parquet_filters(filters: List[List[Any]]) -> List[Tuple[Any, ...]]:
+    """
+    Turns the [column, operator, value] filters from the frontend into the
+    (column, operator, value) tuples that pyarrow filters with.
+    """
+    parquet_filters = []
+    for column, operator, value in filters:
+        if operator not in PARQUET_FILTER_OPERATORS:
+            raise ValueError(f'{operator} is not a valid parquet filter operator')
+        if operator in ['in', 'not in']:
+            value = list(value)
+        parquet_filters.append((column, operator, value))
+    return parquet_filters
+
+
+class ParquetImportCodeChunk(CodeChunk):
+
+    def get_display_name(self) -> str:
+        return 'Imported'
+    
+    def get_description_comment(self) -> str:
+        file_name = self.get_param('file_name')
+        return f'Imported {file_name}'
+
+    def get_code(self) -> List[str]:
+        file_name = self.get_param('file_name')
+        columns = self.get_param('columns')
+        filters = self.get_param('filters')
+        df_name = self.post_state.df_names[-1]
+
+        # NOTE: we add a r in front of the string so that it is a raw string
+        # and file slashes are not interpreted as a unicode sequence
+        if is_feather_file(file_name):
+            read_code = f'{df_name} = pd.read_feather(r\'{file_name}\''
+            if columns is not None:
+                read_code += f', columns={repr(columns)}'
+        else:
+            read_code = f'{df_name} = pd.read_parquet(r\'{file_name}\''
+            for key, value in get_read_parquet_params(columns, filters).items():
+                read_code += f', {key}={repr(value)}'
+        read_code += ')'
+
+        return [
+            'import pandas as pd',
+            read_code
+        ]
+
+    def get_created_sheet_indexes(self) -> List[int]:
+        return [len(self.post_state.dfs) - 1]
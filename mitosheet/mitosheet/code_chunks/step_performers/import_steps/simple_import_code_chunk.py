@@ -5,30 +5,32 @@
 # Distributed under the terms of the GPL License.
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.dtype_optimization import get_optimized_dtypes_comment, get_optimized_dtypes_code
+from mitosheet.types import ColumnHeader
 
 
-def generate_read_csv_code(file_name: str, df_name: str, delimeter: str, encoding: str) -> str:
+def generate_read_csv_code(file_name: str, df_name: str, delimeter: str, encoding: str, engine: Optional[str]=None) -> str:
     """
     Helper function for generating minimal read_csv code 
-    depending on the delimeter and the encoding of a file
+    depending on the delimeter, the encoding and the engine 
+    used to read a file
     """
-    if encoding != 'default' and delimeter != ',':
-        # If there is a non comma delimieter and an encoding, we use both.
-        # NOTE: we add a r in front of the string so that it is a raw string
-        # and file slashes are not interpreted as a unicode sequence
-        return f'{df_name} = pd.read_csv(r\'{file_name}\', sep=\'{delimeter}\', encoding=\'{encoding}\')'
-    elif encoding != 'default':
-        # If there is a comma delimieter and an encoding, we set the encoding
-        return f'{df_name} = pd.read_csv(r\'{file_name}\', encoding=\'{encoding}\')'
-    elif delimeter != ',':
+    # NOTE: we add a r in front of the string so that it is a raw string
+    # and file slashes are not interpreted as a unicode sequence
+    read_csv_args = [f'r\'{file_name}\'']
+    if delimeter != ',':
         # If there is a delimeter for this file, we use it
-        return f'{df_name} = pd.read_csv(r\'{file_name}\', sep=\'{delimeter}\')'
-    else:
-        # We don't add or encoding if they are the Default.
-        return f'{df_name} = pd.read_csv(r\'{file_name}\')'
+        read_csv_args.append(f'sep=\'{delimeter}\'')
+    if encoding != 'default':
+        # We don't add the encoding if it is the default
+        read_csv_args.append(f'encoding=\'{encoding}\'')
+    if engine is not None:
+        read_csv_args.append(f'engine=\'{engine}\'')
+
+    return f'{df_name} = pd.read_csv({", ".join(read_csv_args)})'
 
 
 class SimpleImportCodeChunk(CodeChunk):
@@ -39,12 +41,14 @@ class SimpleImportCodeChunk(CodeChunk):
     def get_description_comment(self) -> str:
         file_names = self.get_param('file_names')
         base_names = [os.path.basename(path) for path in file_names]
-        return f'Imported {", ".join(base_names)}'
+        return f'Imported {", ".join(base_names)}{get_optimized_dtypes_comment(self.get_execution_data("num_bytes_saved"))}'
 
     def get_code(self) -> List[str]:
         file_names = self.get_param('file_names')
         file_delimeters = self.get_execution_data('file_delimeters')
         file_encodings = self.get_execution_data('file_encodings')
+        file_engines = self.get_execution_data('file_engines')
+        file_dtypes = self.get_execution_data('file_dtypes')
 
         code = ['import pandas as pd']
 
@@ -53,10 +57,16 @@ class SimpleImportCodeChunk(CodeChunk):
 
             delimeter = file_delimeters[index]
             encoding = file_encodings[index]
+            engine = file_engines[index] if file_engines is not None else None
 
             code.append(
-                generate_read_csv_code(file_name, df_name, delimeter, encoding)
+                generate_read_csv_code(file_name, df_name, delimeter, encoding, engine=engine)
             )
+
+            # If the dtypes of the file were optimized, we turn the columns into the same dtypes
+            optimized_dtypes_code = get_optimized_dtypes_code(df_name, file_dtypes[index] if file_dtypes is not None else None)
+            if optimized_dtypes_code is not None:
+                code.append(optimized_dtypes_code)
             
             index += 1
 
@@ -71,6 +81,9 @@ class SimpleImportCodeChunk(CodeChunk):
         file_names = self.get_param('file_names') + other_code_chunk.get_param('file_names')
         new_file_delimeters = self.get_execution_data('file_delimeters') + other_code_chunk.get_execution_data('file_delimeters')
         new_file_encodings = self.get_execution_data('file_encodings') + other_code_chunk.get_execution_data('file_encodings')
+        new_file_engines = self._get_file_engines() + other_code_chunk._get_file_engines()
+        new_file_dtypes = self._get_file_dtypes() + other_code_chunk._get_file_dtypes()
+        new_num_bytes_saved = (self.get_execution_data('num_bytes_saved') or 0) + (other_code_chunk.get_execution_data('num_bytes_saved') or 0)
 
         return SimpleImportCodeChunk(
             self.prev_state,
@@ -79,9 +92,20 @@ class SimpleImportCodeChunk(CodeChunk):
             {
                 'file_delimeters': new_file_delimeters,
                 'file_encodings': new_file_encodings,
+                'file_engines': new_file_engines,
+                'file_dtypes': new_file_dtypes,
+                'num_bytes_saved': new_num_bytes_saved,
             }
         )
 
+    def _get_file_engines(self) -> List[Optional[str]]:
+        file_engines = self.get_execution_data('file_engines')
+        return file_engines if file_engines is not None else [None for _ in self.get_param('file_names')]
+
+    def _get_file_dtypes(self) -> List[Optional[Dict[ColumnHeader, str]]]:
+        file_dtypes = self.get_execution_data('file_dtypes')
+        return file_dtypes if file_dtypes is not None else [None for _ in self.get_param('file_names')]
+
     def combine_right(self, other_code_chunk: "CodeChunk") -> Optional["CodeChunk"]:
         if isinstance(other_code_chunk, SimpleImportCodeChunk):
             return self._combine_right_simple_import(other_code_chunk)
@@ -11,6 +11,7 @@ from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk
 from mitosheet.sheet_functions.types.utils import (is_bool_dtype,
                                                    is_datetime_dtype,
                                                    is_int_dtype,
+                                                   is_new_category,
                                                    is_number_dtype,
                                                    is_timedelta_dtype)
 from mitosheet.transpiler.transpile_utils import \
@@ -50,6 +51,10 @@ class SetCellValueCodeChunk(CodeChunk):
         if new_value is not None and '.' in new_value and is_int_dtype(column_dtype):
             code.append(f'{self.post_state.df_names[sheet_index]}[{transpiled_column_header}] = {self.post_state.df_names[sheet_index]}[\'{column_header}\'].astype(\'float\')')
 
+        # If the series is a category, but the new value is not one of the categories, add it to the categories before adding the new value
+        if type_corrected_new_value is not None and is_new_category(self.prev_state.dfs[sheet_index][column_header], type_corrected_new_value):
+            code.append(f'{self.post_state.df_names[sheet_index]}[{transpiled_column_header}] = {self.post_state.df_names[sheet_index]}[{transpiled_column_header}].cat.add_categories([\"{type_corrected_new_value}\"])')
+
         # Actually set the new value
         # We don't need to wrap the value in " if its None, a Boolean Series, or a Number Series.
         if type_corrected_new_value is None or is_bool_dtype(column_dtype) or is_number_dtype(column_dtype):
@@ -129,6 +129,23 @@ class ColumnIDMap():
                 self.column_id_to_column_header[sheet_index][column_id] = column_header
                 self.column_header_to_column_id[sheet_index][column_header] = column_id
 
+    def copy(self, copied_sheet_indexes: Collection[int]) -> "ColumnIDMap":
+        """
+        Returns a copy of this map that shares the mappings for all sheets
+        not in copied_sheet_indexes with this map, so these must not be
+        mutated in the copy.
+        """
+        new_column_id_map = ColumnIDMap([])
+        new_column_id_map.column_id_to_column_header = [
+            dict(id_map) if sheet_index in copied_sheet_indexes else id_map
+            for sheet_index, id_map in enumerate(self.column_id_to_column_header)
+        ]
+        new_column_id_map.column_header_to_column_id = [
+            dict(header_map) if sheet_index in copied_sheet_indexes else header_map
+            for sheet_index, header_map in enumerate(self.column_header_to_column_id)
+        ]
+        return new_column_id_map
+
     def set_column_header(self, sheet_index: int, column_id: ColumnID, column_header: ColumnHeader) -> None:
         """
         Sets a column id and column header to match to eachother. 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains utilities for optimizing the dtypes of imported dataframes, which
+makes them take up much less memory.
+
+Imported dataframes have int64, float64 and object columns by default. Every
+step keeps a state with the dataframes, so the memory the dataframes take up
+is multiplied by the number of steps that change them. We make the string 
+columns with few unique values into category columns, which store each unique 
+string once.
+
+We do not downcast int64 and float64 columns, even if all their values fit in 
+32 bits, as formulas on them would then overflow or lose precision (e.g. A * A 
+overflows an int32 column with values over 46,341, and F / 3 on a float32 column
+is only precise to 7 digits).
+
+The generated code turns the columns into the same dtypes with astype.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.transpiler.transpile_utils import column_header_map_to_string
+from mitosheet.types import ColumnHeader
+
+# Whether imported dataframes have their dtypes optimized. See set_optimize_imported_dtypes
+OPTIMIZE_IMPORTED_DTYPES = False
+
+# String columns are turned into category columns if at most this fraction of their values are unique
+MAX_CATEGORY_UNIQUE_FRACTION = 0.5
+
+
+def set_optimize_imported_dtypes(optimize: bool) -> None:
+    """
+    Sets whether the dtypes of imported dataframes are optimized, so that they
+    take up less memory. This includes files imported in the sheet, and the
+    dataframes and files passed to mitosheet.sheet.
+
+    String columns with few unique values are turned into category columns. The
+    generated code turns the columns into the same dtypes.
+
+    NOTE: this is off by default, as the dtypes of the dataframes in the generated
+    code are then different than the dtypes pandas reads the data with.
+    """
+    global OPTIMIZE_IMPORTED_DTYPES
+    OPTIMIZE_IMPORTED_DTYPES = optimize
+
+
+def get_optimize_imported_dtypes() -> bool:
+    return OPTIMIZE_IMPORTED_DTYPES
+
+
+def get_optimized_dtype(series: pd.Series) -> Optional[str]:
+    """
+    Returns the dtype that the series takes up the least memory as without any
+    values changing, or None if the dtype of the series is already the best.
+    """
+    if series.dtype == object:
+        num_values = series.count()
+        if num_values > 0 and series.nunique() <= num_values * MAX_CATEGORY_UNIQUE_FRACTION \
+                and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            return 'category'
+    return None
+
+
+def get_optimized_dtypes(df: pd.DataFrame) -> Dict[ColumnHeader, str]:
+    """
+    Returns the optimized dtype of each column of the df whose dtype can be optimized.
+    """
+    # Columns with the same header cannot be turned into different dtypes with astype
+    if not df.columns.is_unique:
+        return {}
+
+    optimized_dtypes = {}
+    for column_header in df.columns:
+        optimized_dtype = get_optimized_dtype(df[column_header])
+        if optimized_dtype is not None:
+            optimized_dtypes[column_header] = optimized_dtype
+    return optimized_dtypes
+
+
+def optimize_dtypes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[ColumnHeader, str], int]:
+    """
+    Returns the df with the dtypes of its columns optimized, the dtypes that were
+    changed, and the number of bytes of memory this saves.
+
+    NOTE: category columns with few values can take up more memory than strings, 
+    and so we only change the dtypes of the columns that take up less memory after.
+    """
+    optimized_dtypes = get_optimized_dtypes(df)
+    if len(optimized_dtypes) == 0:
+        return df, optimized_dtypes, 0
+
+    column_headers = list(optimized_dtypes.keys())
+    num_bytes_before = df[column_headers].memory_usage(index=False, deep=True)
+    num_bytes_after = df[column_headers].astype(optimized_dtypes).memory_usage(index=False, deep=True)
+    optimized_dtypes = {
+        column_header: dtype for column_header, dtype in optimized_dtypes.items()
+        if num_bytes_after[column_header] < num_bytes_before[column_header]
+    }
+    if len(optimized_dtypes) == 0:
+        return df, optimized_dtypes, 0
+
+    num_bytes_saved = sum(int(num_bytes_before[column_header] - num_bytes_after[column_header]) for column_header in optimized_dtypes)
+    return df.astype(optimized_dtypes), optimized_dtypes, num_bytes_saved
+
+
+def optimize_imported_dtypes(df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[Dict[ColumnHeader, str]], int]:
+    """
+    Optimizes the dtypes of the imported df if imported dtypes are optimized. Otherwise,
+    returns the df, with None as the dtypes.
+    """
+    if not get_optimize_imported_dtypes():
+        return df, None, 0
+    return optimize_dtypes(df)
+
+
+def get_optimized_dtypes_code(df_name: str, optimized_dtypes: Optional[Dict[ColumnHeader, str]]) -> Optional[str]:
+    """
+    Returns the code that turns the columns of the dataframe with df_name into
+    the optimized dtypes, or None if there are none.
+    """
+    if optimized_dtypes is None or len(optimized_dtypes) == 0:
+        return None
+    column_header_to_dtype: Dict[ColumnHeader, ColumnHeader] = dict(optimized_dtypes)
+    return f'{df_name} = {df_name}.astype({column_header_map_to_string(column_header_to_dtype)})'
+
+
+def get_num_bytes_string(num_bytes: int) -> str:
+    if num_bytes < 1_000_000:
+        return f'{num_bytes / 1_000:.1f} KB'
+    return f'{num_bytes / 1_000_000:.1f} MB'
+
+
+def get_optimized_dtypes_comment(num_bytes_saved: Optional[int]) -> str:
+    """
+    Returns a note on the memory that was saved by optimizing dtypes, for the
+    description comment of an import, or an empty string if none was saved.
+    """
+    if num_bytes_saved is None or num_bytes_saved <= 0:
+        return ''
+    return f' and optimized their dtypes to save {get_num_bytes_string(num_bytes_saved)}'
@@ -387,6 +387,34 @@ def make_is_directory_error(file_name: str) -> MitoError:
     )
 
 
+def make_invalid_import_filter_error(file_name: str) -> MitoError:
+    """
+    Helper function for creating invalid_import_filter_error
+
+    Occurs when:
+    - the user tries to filter the rows of a Feather file while importing it
+    """
+    return MitoError(
+        'invalid_import_filter_error',
+        f'Remove the Filters',
+        f'Sorry, the rows of {file_name} cannot be filtered while importing it, as only Parquet files can be filtered while importing. Please import the file without filters, and then filter it in Mito.'
+    )
+
+
+def make_missing_parquet_engine_error(file_name: str) -> MitoError:
+    """
+    Helper function for creating missing_parquet_engine_error
+
+    Occurs when:
+    - the user tries to import a Parquet or Feather file, and pyarrow is not installed
+    """
+    return MitoError(
+        'missing_parquet_engine_error',
+        f'Install pyarrow',
+        f'Sorry, {file_name} cannot be imported, as reading Parquet and Feather files requires pyarrow. Please run `pip install pyarrow`, restart your kernel, and then import the file again.'
+    )
+
+
 def make_no_analysis_error(analysis_id: str, error_modal: bool=True) -> MitoError:
     """
     Helper function for creating a no_analysis_error.
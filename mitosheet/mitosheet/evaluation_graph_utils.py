@@ -9,11 +9,10 @@ the representation {node: set(adj nodes)}. Note that all
 nodes must be in the graph, even if they have no adj nodes, and
 should just have an empty set in this case.
 """
-from copy import deepcopy
 from typing import Collection, Dict, List, Set
 
 
-from mitosheet.errors import MitoError, make_circular_reference_error
+from mitosheet.errors import make_circular_reference_error
 from mitosheet.parser import parse_formula
 from mitosheet.state import State
 from mitosheet.types import ColumnID
@@ -48,6 +47,60 @@ def create_column_evaluation_graph(post_state: State, sheet_index: int) -> Dict[
     return column_evaluation_graph
 
 
+def get_column_evaluation_graph(state: State, sheet_index: int) -> Dict[ColumnID, Set[ColumnID]]:
+    """
+    Returns the column evaluation graph that is stored on the state for this
+    sheet, building it if it has not been built yet.
+
+    NOTE: this graph is not a copy, and so it must only be changed on a state
+    that has copied the metadata of this sheet, and then should be changed with
+    the functions below, so it stays in sync with the formulas in this sheet.
+    """
+    column_evaluation_graph = state.column_evaluation_graph[sheet_index]
+    if column_evaluation_graph is None:
+        column_evaluation_graph = create_column_evaluation_graph(state, sheet_index)
+        state.column_evaluation_graph[sheet_index] = column_evaluation_graph
+    return column_evaluation_graph
+
+
+def add_column_to_evaluation_graph(state: State, sheet_index: int, column_id: ColumnID) -> None:
+    """
+    Adds a new column with no formula dependencies to the evaluation graph.
+    """
+    column_evaluation_graph = state.column_evaluation_graph[sheet_index]
+    if column_evaluation_graph is not None:
+        column_evaluation_graph[column_id] = set()
+
+
+def delete_column_from_evaluation_graph(state: State, sheet_index: int, column_id: ColumnID) -> None:
+    """
+    Removes a column that no other column depends on from the evaluation graph.
+    """
+    column_evaluation_graph = state.column_evaluation_graph[sheet_index]
+    if column_evaluation_graph is not None:
+        del column_evaluation_graph[column_id]
+        for dependents in column_evaluation_graph.values():
+            dependents.discard(column_id)
+
+
+def update_column_dependencies_in_evaluation_graph(
+        state: State, 
+        sheet_index: int, 
+        column_id: ColumnID,
+        old_dependencies: Collection[ColumnID],
+        new_dependencies: Collection[ColumnID]
+    ) -> None:
+    """
+    Updates the evaluation graph after the formula of column_id changes
+    from depending on the old_dependencies to the new_dependencies.
+    """
+    column_evaluation_graph = state.column_evaluation_graph[sheet_index]
+    if column_evaluation_graph is not None:
+        for old_dependency in old_dependencies:
+            column_evaluation_graph[old_dependency].discard(column_id)
+        for new_dependency in new_dependencies:
+            column_evaluation_graph[new_dependency].add(column_id)
+
 
 def visit(column_evaluation_graph: Dict[ColumnID, Set[ColumnID]], node: ColumnID, visited: Dict[ColumnID, bool], finished_order: List[ColumnID], visited_loop: Set[ColumnID]) -> None:
     """
@@ -121,7 +174,7 @@ def topological_sort_dependent_columns(state: State, sheet_index: int, column_id
     Returns a topological sort of all columns that are downstream of
     the passed column_id
     """
-    column_evaluation_graph = create_column_evaluation_graph(state, sheet_index)
+    column_evaluation_graph = get_column_evaluation_graph(state, sheet_index)
     subgraph = subgraph_from_starting_column_id(column_evaluation_graph, column_id)
     return topological_sort_columns(subgraph)
 
@@ -138,23 +191,27 @@ def creates_circularity(
 
     Returns False if there is not a circular reference, and returns
     True if there is a circular reference.
-    """
-    # Copy, so we don't modify
-    _column_evaluation_graph = deepcopy(column_evaluation_graph)
-
-    for old_dependency in old_dependencies:
-        _column_evaluation_graph[old_dependency].remove(column_id)
-    for new_dependency in new_dependencies:
-        _column_evaluation_graph[new_dependency].add(column_id)
-
-    try:
-        # Errors if there is no toplogical sort possible
-        topological_sort_columns(_column_evaluation_graph)
 
+    As the graph has no cycles before the change, any new cycle must go through 
+    column_id, and then through one of the edges from a new dependency to column_id. 
+    So, there is a cycle exactly when a new dependency can be reached from column_id. 
+    Removing the old dependencies only removes edges into column_id, which no path
+    from column_id uses to reach a new dependency without looping through column_id
+    first, so we do not need to remove them, and thus do not copy the graph.
+    """
+    new_dependencies = set(new_dependencies)
+    if len(new_dependencies) == 0:
         return False
-    except MitoError as e:
-        # Reports this error
-        return True
-    except Exception as e:
-        # TODO: handle this case with a general error?
-        return True
+
+    reached_column_ids = set([column_id])
+    column_ids_to_visit = [column_id]
+    while len(column_ids_to_visit) > 0:
+        curr_column_id = column_ids_to_visit.pop()
+        if curr_column_id in new_dependencies:
+            return True
+        for dependent in column_evaluation_graph[curr_column_id]:
+            if dependent not in reached_column_ids:
+                reached_column_ids.add(dependent)
+                column_ids_to_visit.append(dependent)
+
+    return False
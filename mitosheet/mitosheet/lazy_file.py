@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains lazy files, which let us import CSV files that are larger than
+memory without reading the whole file before the sheet is displayed.
+
+A sheet that is backed by a lazy file only has the first rows of the file
+in its dataframe, along with the lazy file. The front-end is sent windows
+of rows that are read from the file as they are displayed, and an estimate
+of the number of rows in the file, and the column summaries and value counts
+stream over the file in chunks.
+
+The first time a step reads a sheet backed by a lazy file, the whole file
+is read into the sheet, which is then just a normal sheet. See
+materialize_lazy_sheets.
+"""
+import os
+from threading import Lock
+from typing import Any, Collection, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from mitosheet.state import State
+
+# The number of rows at the start of the file that are read when it is imported
+LAZY_FILE_WINDOW_NUM_ROWS = 10_000
+
+# The number of rows read at once when streaming over the file
+LAZY_FILE_CHUNK_NUM_ROWS = 1_000_000
+
+
+class LazyFile():
+    """
+    A CSV file that is read lazily. It has the column headers and dtypes of
+    the file and the first LAZY_FILE_WINDOW_NUM_ROWS rows in window_df, and
+    reads the rest of the file only when asked.
+
+    The number of rows in the file is estimated from the size of the first rows
+    until the whole file is read once, at which point it is exact.
+
+    NOTE: the same lazy file is shared by every state that has the sheet, and
+    is used by API threads, so the file is read fully at most once, behind a lock.
+    """
+
+    def __init__(self, file_name: str, read_csv_params: Dict[str, Any], window_df: pd.DataFrame, engine: Optional[str]=None):
+        self.file_name = file_name
+        self.read_csv_params = read_csv_params
+        # The engine is only used to read the whole file, as only the default engine reads files in chunks
+        self.engine = engine
+        self.window_df = window_df
+
+        self.num_rows: Optional[int] = len(window_df) if len(window_df) < LAZY_FILE_WINDOW_NUM_ROWS else None
+        self.estimated_num_rows = self.num_rows if self.num_rows is not None else get_estimated_num_rows(file_name, len(window_df))
+
+        self.df: Optional[pd.DataFrame] = None
+        self.lock = Lock()
+
+    def get_num_rows(self) -> int:
+        return self.num_rows if self.num_rows is not None else self.estimated_num_rows
+
+    def read_df(self) -> pd.DataFrame:
+        """
+        Returns the whole file as a dataframe, reading it the first time.
+        """
+        with self.lock:
+            if self.df is None:
+                read_csv_kwargs = {'engine': self.engine} if self.engine is not None else {}
+                self.df = pd.read_csv(self.file_name, **self.read_csv_params, **read_csv_kwargs)
+                self.num_rows = len(self.df)
+            return self.df
+
+    def read_rows(self, row_start: int, row_end: int) -> pd.DataFrame:
+        """
+        Returns the rows from row_start to row_end of the file, with an index
+        of their row numbers, only reading these rows of the file.
+        """
+        if self.df is not None:
+            return self.df.iloc[row_start:row_end]
+        if row_end <= len(self.window_df) or self.num_rows is not None and row_start >= self.num_rows:
+            return self.window_df.iloc[row_start:row_end]
+
+        # We skip the header and then the rows before the window, and so name the columns ourselves
+        rows_df = pd.read_csv(
+            self.file_name,
+            header=None,
+            names=list(self.window_df.columns),
+            skiprows=row_start + 1,
+            nrows=row_end - row_start,
+            **self.read_csv_params
+        )
+        rows_df.index = pd.RangeIndex(row_start, row_start + len(rows_df))
+        return rows_df
+
+    def iter_column_chunks(self, column_header: Any) -> Iterator[pd.Series]:
+        """
+        Yields the column with column_header in chunks of rows, reading only
+        this column of the file.
+        """
+        if self.df is not None:
+            yield self.df[column_header]
+            return
+
+        # We find the column by its position, as pandas renames duplicated column headers
+        column_index = list(self.window_df.columns).index(column_header)
+        num_rows = 0
+        for chunk_df in pd.read_csv(self.file_name, usecols=[column_index], chunksize=LAZY_FILE_CHUNK_NUM_ROWS, **self.read_csv_params):
+            num_rows += len(chunk_df)
+            yield chunk_df.iloc[:, 0].rename(column_header)
+        self.num_rows = num_rows
+
+    def read_column(self, column_header: Any) -> pd.Series:
+        """
+        Returns the column with column_header, reading only this column of the file.
+        """
+        chunks: List[pd.Series] = list(self.iter_column_chunks(column_header))
+        if len(chunks) == 1:
+            return chunks[0]
+        if len(chunks) == 0:
+            return self.window_df[column_header].iloc[:0]
+        return pd.concat(chunks, ignore_index=True)
+
+    def get_value_counts(self, column_header: Any) -> pd.Series:
+        """
+        Returns the value counts of the column with column_header, with the NaN
+        values counted, streaming over the column in chunks.
+        """
+        value_counts: Optional[pd.Series] = None
+        for chunk in self.iter_column_chunks(column_header):
+            chunk_value_counts = chunk.value_counts(dropna=False)
+            value_counts = chunk_value_counts if value_counts is None else value_counts.add(chunk_value_counts, fill_value=0)
+        if value_counts is None:
+            return self.window_df[column_header].iloc[:0].value_counts(dropna=False)
+        return value_counts.astype('int64').sort_values(ascending=False)
+
+
+def get_estimated_num_rows(file_name: str, num_rows_read: int) -> int:
+    """
+    Estimates the number of rows in the file from the number of bytes that
+    the header and the first num_rows_read rows take up.
+    """
+    file_size = os.path.getsize(file_name)
+    with open(file_name, 'rb') as f:
+        header_bytes = len(f.readline())
+        rows_bytes = sum(len(f.readline()) for _ in range(num_rows_read))
+    if rows_bytes == 0:
+        return num_rows_read
+    return max(num_rows_read, round((file_size - header_bytes) * num_rows_read / rows_bytes))
+
+
+def get_lazy_file(state: State, sheet_index: int) -> Optional[LazyFile]:
+    """
+    Returns the lazy file that backs the sheet at sheet_index, or None if
+    the sheet is not backed by a lazy file.
+    """
+    return state.lazy_files[sheet_index] if 0 <= sheet_index < len(state.lazy_files) else None
+
+
+def get_full_df(state: State, sheet_index: int) -> pd.DataFrame:
+    """
+    Returns all the rows of the sheet at sheet_index, reading the whole file
+    if the sheet is backed by a lazy file.
+
+    Unlike materialize_lazy_sheets, this does not change the state, and so
+    it is safe to call from the API threads.
+    """
+    lazy_file = get_lazy_file(state, sheet_index)
+    if lazy_file is not None:
+        return lazy_file.read_df()
+    return state.dfs[sheet_index]
+
+
+def materialize_lazy_sheets(state: State, sheet_indexes: Optional[Collection[int]]=None) -> None:
+    """
+    Reads the whole file of each sheet in sheet_indexes that is backed by a lazy
+    file into the sheet, or of every sheet if sheet_indexes is None.
+
+    This changes the state in place, which is safe as the sheet has the same
+    data before and after, it is just all in memory after. As it changes the 
+    state, it must only be called when executing steps, and not from the API 
+    threads, which should use get_full_df instead.
+    """
+    if sheet_indexes is None:
+        sheet_indexes = range(len(state.lazy_files))
+
+    for sheet_index in sheet_indexes:
+        lazy_file = get_lazy_file(state, sheet_index)
+        if lazy_file is not None:
+            state.dfs[sheet_index] = lazy_file.read_df()
+            state.lazy_files[sheet_index] = None
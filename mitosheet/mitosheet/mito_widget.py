@@ -44,20 +44,42 @@ class MitoWidget(DOMWidget):
     _view_module = t.Unicode(module_name).tag(sync=True)
     _view_module_version = t.Unicode(module_version).tag(sync=True)
 
-    sheet_data_json = t.Unicode('').tag(sync=True)
+    sheet_data_patch_json = t.Unicode('').tag(sync=True)
+    sheet_data_buffers = t.List(t.List(t.Bytes())).tag(sync=True)
     analysis_data_json = t.Unicode('').tag(sync=True)
     user_profile_json = t.Unicode('').tag(sync=True)
     
-    def __init__(self, *args: List[Union[pd.DataFrame, str]], analysis_to_replay: str=None):
+    def __init__(
+            self, 
+            *args: List[Union[pd.DataFrame, str]], 
+            analysis_to_replay: str=None, 
+            max_history_bytes: Optional[int]=None, 
+            binary_sheet_data: bool=False,
+            copy: bool=True
+        ):
         """
         Takes a list of dataframes and strings that are paths to CSV files
         passed through *args.
+
+        If max_history_bytes is passed, the dataframes of historical steps
+        are evicted to keep the step history under this many bytes.
+
+        If binary_sheet_data is True, the data of numeric, string and date 
+        columns are sent to the front-end in binary buffers, rather than as JSON.
+
+        If copy is False, the passed dataframes are not copied. See mitosheet.sheet.
         """
         # Call the DOMWidget constructor to set up the widget properly
         super(MitoWidget, self).__init__()
             
         # Set up the state container to hold private widget state
-        self.steps_manager = StepsManager(args, analysis_to_replay=analysis_to_replay)
+        self.steps_manager = StepsManager(
+            args, 
+            analysis_to_replay=analysis_to_replay, 
+            max_history_bytes=max_history_bytes, 
+            binary_sheet_data=binary_sheet_data,
+            copy=copy
+        )
 
         # Set up message handler
         self.on_msg(self.receive_message)
@@ -81,13 +103,20 @@ class MitoWidget(DOMWidget):
     def analysis_name(self):
         return self.steps_manager.analysis_name
 
+    @property
+    def sheet_data_json(self) -> str:
+        return self.steps_manager.sheet_data_json
+
 
     def update_shared_state_variables(self) -> None:
         """
         Helper function for updating all the variables that are shared
         between the backend and the frontend through trailets.
         """
-        self.sheet_data_json = self.steps_manager.sheet_data_json
+        # NOTE: we only send the front-end a patch to the sheet data it has, and 
+        # ipywidgets sends any bytes in a traitlet as binary buffers
+        self.sheet_data_patch_json = self.steps_manager.get_sheet_data_patch_json()
+        self.sheet_data_buffers = self.steps_manager.sheet_data_patch_buffers
         self.analysis_data_json = self.steps_manager.analysis_data_json
         self.user_profile_json = json.dumps({
             # Dynamic, update each time
@@ -250,6 +279,9 @@ def sheet(
         *args: Any,
         analysis_to_replay: str=None, # This is the parameter that tracks the analysis that you want to replay (NOTE: requires a frontend to be replayed!)
         view_df: bool=False, # We use this param to log if the mitosheet.sheet call is created from the df output button,
+        max_history_bytes: Optional[int]=None, # If passed, bounds the memory that the dataframes of previous steps can use
+        binary_sheet_data: bool=False, # If True, sends the sheet data to the front-end in binary buffers where possible
+        copy: bool=True, # If False, the passed dataframes are not copied, so large dataframes only take up memory once
         # NOTE: if you add named variables to this function, make sure argument parsing on the front-end still
         # works by updating the getArgsFromCellContent function.
     ) -> MitoWidget:
@@ -268,6 +300,10 @@ def sheet(
 
     Then, restart your JupyterLab instance, and refresh your browser. Mito should now render.
 
+    If you pass copy=False, Mito does not copy the dataframes you pass, and instead only 
+    makes copies of the columns that you edit. Mito never changes the dataframes you pass, 
+    but if you change them after calling this function, the sheet might change as well.
+
     NOTE: if you have any issues with installation, please email jake@sagacollab.com
     """
     # We throw a custom error message if we're sure the user is in
@@ -279,7 +315,13 @@ def sheet(
 
     try:
         # We pass in the dataframes directly to the widget
-        widget = MitoWidget(*args, analysis_to_replay=analysis_to_replay) 
+        widget = MitoWidget(
+            *args, 
+            analysis_to_replay=analysis_to_replay, 
+            max_history_bytes=max_history_bytes, 
+            binary_sheet_data=binary_sheet_data,
+            copy=copy
+        )
 
         # Log they have personal data in the tool if they passed a dataframe
         # that is not tutorial data or sample data from import docs
@@ -303,7 +345,10 @@ def sheet(
                 'params_num_str_args': len([arg for arg in args if isinstance(arg, str)]),
                 'params_num_df_args': len([arg for arg in args if isinstance(arg, pd.DataFrame)]),
                 'params_df_index_type': [str(type(arg.index)) for arg in args if isinstance(arg, pd.DataFrame)],
-                'params_view_df': view_df
+                'params_view_df': view_df,
+                'params_max_history_bytes': max_history_bytes,
+                'params_binary_sheet_data': binary_sheet_data,
+                'params_copy': copy
             }
         )
     )
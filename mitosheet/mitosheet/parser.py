@@ -9,7 +9,9 @@ as well as the original dataframe, and returns the current state
 of the sheet as a dataframe
 """
 import re
-from typing import Any, Collection, List, Optional, Set, Tuple, Union
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Collection, Dict, Hashable, List, Optional, Set, Tuple, Union
 
 from mitosheet.column_headers import get_column_header_display
 from mitosheet.errors import make_invalid_formula_error
@@ -352,7 +354,7 @@ def replace_functions(
     return formula_with_functions, functions
 
 
-def parse_formula(
+def _parse_formula(
         formula: Optional[str], 
         column_header: ColumnHeader, 
         column_headers: List[ColumnHeader],
@@ -361,12 +363,7 @@ def parse_formula(
         include_df_set: bool=True,
     ) -> Tuple[str, Set[str], Set[ColumnHeader]]:
     """
-    Returns a representation of the formula that is easy to handle, specifically
-    by returning (python_code, functions, column_header_dependencies), where column_headers
-    is a list of dependencies that the formula references.
-
-    If include_df_set, then will return {df_name}[{column_header}] = {parsed formula}, and if
-    not then will just return {parsed formula}
+    Parses the formula without checking the parsed formula cache. See parse_formula.
     """
     # If the column doesn't have a formula, then there are no dependencies, duh!
     if formula is None or formula == '':
@@ -401,4 +398,186 @@ def parse_formula(
         final_code = f'{df_name}[{transpiled_column_header}] = {code_with_functions}'
     else:
         final_code = f'{code_with_functions}'
-    return final_code, functions, column_header_dependencies
\ No newline at end of file
+    return final_code, functions, column_header_dependencies
+
+
+# The maximum number of parsed formulas that we keep in the cache
+PARSED_FORMULA_CACHE_MAX_SIZE = 2048
+
+class ParsedFormulaCache():
+    """
+    A least recently used cache of parsed formulas, as well as the code
+    objects they compile to. 
+
+    Parsing a formula searches the formula for every column header in the 
+    dataframe, and formulas are reparsed every time a step that contains 
+    them is reexecuted, or a column they depend on is refreshed, so caching
+    them saves a lot of repeated work on wide dataframes.
+
+    Keeps track of the number of hits and misses, so we can see how often
+    the cache is used.
+    """
+
+    def __init__(self, max_size: int=PARSED_FORMULA_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self.cache: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.cache.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, entry: List[Any]) -> None:
+        self.cache[key] = entry
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.cache),
+            'max_size': self.max_size
+        }
+
+PARSED_FORMULA_CACHE = ParsedFormulaCache()
+
+
+def get_typed_column_header(column_header: ColumnHeader) -> Tuple[type, ColumnHeader]:
+    # NOTE: we include the type, as True == 1 == 1.0 in Python, but these column 
+    # headers are displayed differently, and so formulas parse differently
+    return (type(column_header), column_header)
+
+
+def get_parsed_formula_cache_key(
+        formula: str, 
+        column_header: ColumnHeader, 
+        column_headers: Collection[ColumnHeader],
+        throw_errors: bool,
+        df_name: str,
+        include_df_set: bool,
+    ) -> Optional[Hashable]:
+    """
+    Returns the key for this formula in the parsed formula cache, or None if
+    the column headers are not hashable, and so the formula cannot be cached.
+    """
+    try:
+        key = (
+            formula, 
+            get_typed_column_header(column_header), 
+            frozenset(get_typed_column_header(ch) for ch in column_headers),
+            throw_errors,
+            df_name,
+            include_df_set
+        )
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+def get_cached_parsed_formula(
+        formula: str, 
+        column_header: ColumnHeader, 
+        column_headers: Collection[ColumnHeader],
+        throw_errors: bool,
+        df_name: str,
+        include_df_set: bool,
+    ) -> List[Any]:
+    """
+    Returns the [python_code, functions, column_header_dependencies, compiled_code] entry
+    for this formula from the parsed formula cache, parsing it and adding it to the cache
+    if it is not there. The compiled_code is None until compile_formula is called.
+
+    NOTE: formulas that throw errors are not cached, so the errors are thrown every time.
+    """
+    key = get_parsed_formula_cache_key(formula, column_header, column_headers, throw_errors, df_name, include_df_set)
+    entry = PARSED_FORMULA_CACHE.get(key) if key is not None else None
+    if entry is not None:
+        return entry
+    
+    python_code, functions, column_header_dependencies = _parse_formula(
+        formula, 
+        column_header,
+        list(column_headers),
+        throw_errors=throw_errors,
+        df_name=df_name,
+        include_df_set=include_df_set
+    )
+    entry = [python_code, functions, column_header_dependencies, None]
+    if key is not None:
+        PARSED_FORMULA_CACHE.set(key, entry)
+    return entry
+
+
+def parse_formula(
+        formula: Optional[str], 
+        column_header: ColumnHeader, 
+        column_headers: Collection[ColumnHeader],
+        throw_errors: bool=True,
+        df_name: str='df',
+        include_df_set: bool=True,
+    ) -> Tuple[str, Set[str], Set[ColumnHeader]]:
+    """
+    Returns a representation of the formula that is easy to handle, specifically
+    by returning (python_code, functions, column_header_dependencies), where column_headers
+    is a list of dependencies that the formula references.
+
+    If include_df_set, then will return {df_name}[{column_header}] = {parsed formula}, and if
+    not then will just return {parsed formula}
+
+    NOTE: parsed formulas are cached, see ParsedFormulaCache.
+    """
+    # If the column doesn't have a formula, then there are no dependencies, duh!
+    if formula is None or formula == '':
+        return '', set(), set()
+
+    python_code, functions, column_header_dependencies, _ = get_cached_parsed_formula(
+        formula, column_header, column_headers, throw_errors, df_name, include_df_set
+    )
+    # We return copies of the sets, so callers cannot change the cached sets
+    return python_code, set(functions), set(column_header_dependencies)
+
+
+def parse_and_compile_formula(
+        formula: str, 
+        column_header: ColumnHeader, 
+        column_headers: Collection[ColumnHeader],
+        df_name: str='df',
+    ) -> Tuple[CodeType, Set[ColumnHeader]]:
+    """
+    Returns the compiled code that sets the column_header to the value of the 
+    formula, as well as the column headers the formula depends on. The compiled
+    code is cached with the parsed formula, so it can be exec-ed repeatedly
+    without being parsed or compiled again.
+    """
+    entry = get_cached_parsed_formula(
+        formula, column_header, column_headers, True, df_name, True
+    )
+    if entry[3] is None:
+        entry[3] = compile(entry[0], '<formula>', 'exec')
+    return entry[3], set(entry[2])
+
+
+def get_parsed_formula_cache_stats() -> Dict[str, int]:
+    """
+    Returns the number of hits and misses of the parsed formula cache, as
+    well as its size.
+    """
+    return PARSED_FORMULA_CACHE.get_stats()
+
+
+def clear_parsed_formula_cache() -> None:
+    PARSED_FORMULA_CACHE.clear()
@@ -5,16 +5,67 @@
 # Distributed under the terms of the Modified BSD License.
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Dict, Collection, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from mitosheet.dtype_optimization import (get_num_bytes_string,
+                                          get_optimized_dtypes_code,
+                                          optimize_imported_dtypes)
 from mitosheet.preprocessing.preprocess_step_performer import \
     PreprocessStepPerformer
-from mitosheet.types import StepsManagerType
+from mitosheet.types import ColumnHeader, StepsManagerType
+
+
+def _get_read_only_array(values: np.ndarray) -> np.ndarray:
+    read_only_values = values.view()
+    read_only_values.flags.writeable = False
+    return read_only_values
+
+
+def get_read_only_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a dataframe that shares the memory of the passed dataframe without
+    copying it, but whose column buffers are read-only views. 
+
+    Steps are copy-on-write at the column level (see State.copy), and so they only
+    write to private copies of the columns they change. If any code still tries to 
+    write to the shared memory in place, it errors, rather than changing the 
+    passed dataframe.
+
+    NOTE: pandas errors when comparing read-only object arrays, so object columns 
+    are copied. This only copies the pointers to the values, and not the values
+    themselves, which are immutable. Columns stored in extension arrays that are
+    not backed by a numpy array (e.g. nullable ints) cannot be made read-only, so
+    they are copied. On versions of pandas where we cannot access the blocks of 
+    the dataframe, the whole dataframe is copied.
+    """
+    mgr = getattr(df, '_mgr', None)
+    if mgr is None or not hasattr(mgr, 'blocks'):
+        return df.copy(deep=True)
+
+    blocks = []
+    for block in mgr.blocks:
+        values = block.values
+        if isinstance(values, np.ndarray) and values.dtype != object:
+            blocks.append(block.make_block_same_class(_get_read_only_array(values)))
+        elif isinstance(getattr(values, '_ndarray', None), np.ndarray) and hasattr(values, '_from_backing_data'):
+            # Datetimes and timedeltas are stored in extension arrays backed by a numpy array
+            blocks.append(block.make_block_same_class(values._from_backing_data(_get_read_only_array(values._ndarray))))
+        else:
+            blocks.append(block.copy(deep=True))
+
+    return df._constructor(type(mgr)(blocks, mgr.axes))
 
 
 class CopyPreprocessStepPerformer(PreprocessStepPerformer):
     """
     This preprocessing step is responsible for making a copy of all of the
     passed arguments, so that dataframes aren't modified incorrectly.
+
+    If copy is False, the dataframes are not copied, and are instead turned
+    into read-only views of the passed dataframes. See get_read_only_view.
+
+    If imported dtypes are optimized, the copies of the dataframes are made 
+    with the optimized dtypes. See set_optimize_imported_dtypes.
     """
 
     @classmethod
@@ -26,19 +77,48 @@ class CopyPreprocessStepPerformer(PreprocessStepPerformer):
         return 'copy'
 
     @classmethod
-    def execute(cls, args: Collection[Any]) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
-        
+    def execute(cls, args: Collection[Any], copy: bool=True) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+
         new_args = []
+        arg_dtypes: List[Optional[Dict[ColumnHeader, str]]] = []
+        num_bytes_saved = 0
         for arg in args:
+            optimized_dtypes = None
             if isinstance(arg, pd.DataFrame):
-                # Do a pandas copy if it's a dataframe
-                arg_copy = arg.copy(deep=True)
+                # Turning the columns into the optimized dtypes copies them, so we only 
+                # do a pandas copy if no dtypes were optimized
+                arg_copy, optimized_dtypes, arg_num_bytes_saved = optimize_imported_dtypes(arg)
+                num_bytes_saved += arg_num_bytes_saved
+                if optimized_dtypes is None or len(optimized_dtypes) == 0:
+                    arg_copy = arg.copy(deep=True) if copy else get_read_only_view(arg)
             else:
                 # Simple deepcopy if it's a string
                 arg_copy = deepcopy(arg)
             new_args.append(arg_copy)
-        return new_args, None
+            arg_dtypes.append(optimized_dtypes)
+        return new_args, {
+            'arg_dtypes': arg_dtypes,
+            'num_bytes_saved': num_bytes_saved
+        }
 
     @classmethod
     def transpile(cls, steps_manager: StepsManagerType, execution_data: Optional[Dict[str, Any]]) -> List[str]:
-        return []
+        """
+        Transpiles turning the columns of the passed dataframes into the
+        optimized dtypes, if their dtypes were optimized.
+        """
+        arg_dtypes = execution_data.get('arg_dtypes') if execution_data is not None else None
+        if arg_dtypes is None:
+            return []
+
+        code = []
+        for df_name, optimized_dtypes in zip(steps_manager.steps[0].df_names, arg_dtypes):
+            optimized_dtypes_code = get_optimized_dtypes_code(df_name, optimized_dtypes)
+            if optimized_dtypes_code is not None:
+                code.append(optimized_dtypes_code)
+
+        if len(code) > 0:
+            num_bytes_saved = execution_data['num_bytes_saved'] if execution_data is not None else 0
+            code.insert(0, f'# Optimize the dtypes of the passed dataframes to save {get_num_bytes_string(num_bytes_saved)}')
+
+        return code
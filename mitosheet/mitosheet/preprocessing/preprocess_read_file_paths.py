@@ -8,13 +8,16 @@ from typing import (Any, Collection, Dict, List, Optional,
 
 import pandas as pd
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import generate_read_csv_code
+from mitosheet.dtype_optimization import get_optimized_dtypes_code, optimize_imported_dtypes
 from mitosheet.errors import get_recent_traceback_as_list
+from mitosheet.lazy_file import LazyFile
 from mitosheet.mito_analytics import log
 from mitosheet.preprocessing.preprocess_step_performer import \
     PreprocessStepPerformer
 from mitosheet.step_performers.import_steps.simple_import import (
-    get_valid_dataframe_names, read_csv_get_delimeter_and_encoding)
-from mitosheet.types import StepsManagerType
+    get_csv_import_engine, get_valid_dataframe_names,
+    read_csv_or_lazy_file)
+from mitosheet.types import ColumnHeader, StepsManagerType
 
 
 class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
@@ -22,6 +25,9 @@ class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
     This preprocessor reads in any arguments that are
     strings, treats them as file paths, and attempts
     to read them in a dataframes.
+
+    Large files are read in as lazy files, if lazy imports are
+    turned on. See set_lazy_import_min_file_size.
     """
 
     @classmethod
@@ -33,24 +39,33 @@ class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
         return 'read_file_paths'
 
     @classmethod
-    def execute(cls, args: Collection[Any]) -> Tuple[List[Any], Dict[str, Any]]:
-        df_args: List[pd.DataFrame] = []
+    def execute(cls, args: Collection[Any], copy: bool=True) -> Tuple[List[Any], Dict[str, Any]]:
+        df_args: List[Union[pd.DataFrame, LazyFile]] = []
         delimeters: List[Optional[str]] = []
         encodings: List[Optional[str]] = []
+        file_dtypes: List[Optional[Dict[ColumnHeader, str]]] = []
+        engine = get_csv_import_engine()
         for arg in args:
             if isinstance(arg, pd.DataFrame):
                 df_args.append(arg)
                 delimeters.append(None)
                 encodings.append(None)
+                file_dtypes.append(None)
             elif isinstance(arg, str):
                 # If it is a string, we try and read it in as a dataframe
                 try:
                     # We use the simple import 
-                    df, delimeter, encoding = read_csv_get_delimeter_and_encoding(arg)
+                    df, delimeter, encoding = read_csv_or_lazy_file(arg, engine=engine)
+
+                    # We only optimize the dtypes of files that are read fully
+                    optimized_dtypes = None
+                    if isinstance(df, pd.DataFrame):
+                        df, optimized_dtypes, _ = optimize_imported_dtypes(df)
 
                     df_args.append(
                         df
                     )
+                    file_dtypes.append(optimized_dtypes)
 
                     delimeters.append(delimeter)
                     encodings.append(encoding)
@@ -67,7 +82,9 @@ class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
                 
         return df_args, {
             'delimeters': delimeters,
-            'encodings': encodings
+            'encodings': encodings,
+            'file_dtypes': file_dtypes,
+            'engine': engine
         }
 
     @classmethod
@@ -90,6 +107,8 @@ class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
 
         delimeters = execution_data['delimeters'] if execution_data is not None else [None for _ in range(len(df_names))]
         encodings = execution_data['encodings'] if execution_data is not None else [None for _ in range(len(df_names))]
+        engine = execution_data.get('engine') if execution_data is not None else None
+        file_dtypes = execution_data.get('file_dtypes') if execution_data is not None else None
 
         num_strs = 0
         for arg_index, arg in enumerate(steps_manager.original_args):
@@ -98,13 +117,18 @@ class ReadFilePathsPreprocessStepPerformer(PreprocessStepPerformer):
                 num_strs += 1
 
                 read_csv_code = generate_read_csv_code(
-                    arg, df_name, delimeters[arg_index], encodings[arg_index]
+                    arg, df_name, delimeters[arg_index], encodings[arg_index], engine=engine
                 )
 
                 code.append(
                     read_csv_code
                 )
 
+                # If the dtypes of the file were optimized, we turn the columns into the same dtypes
+                optimized_dtypes_code = get_optimized_dtypes_code(df_name, file_dtypes[arg_index] if file_dtypes is not None else None)
+                if optimized_dtypes_code is not None:
+                    code.append(optimized_dtypes_code)
+
         if len(code) > 0:
             code.insert(0, '# Read in filepaths as dataframes')
                 
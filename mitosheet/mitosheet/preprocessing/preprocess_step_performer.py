@@ -31,10 +31,13 @@ class PreprocessStepPerformer(ABC, object):
 
     @classmethod
     @abstractmethod
-    def execute(cls, args: Collection[Any]) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    def execute(cls, args: Collection[Any], copy: bool=True) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
         """
         Execute always returns the new list of arguments, as well as execution_data
         for this preprocess step.
+
+        If copy is False, the passed dataframes must not be copied, as they may be 
+        too large to fit in memory twice. See mitosheet.sheet.
         """
         pass
 
@@ -1,99 +1,46 @@
-
-from copy import copy
-from typing import List, Tuple
+from typing import List, Optional
 from mitosheet.code_chunks.code_chunk import CodeChunk
 
 
-
-def optimize_code_chunks_combine_right(code_chunks_to_optimize: List[CodeChunk]) -> Tuple[bool, List[CodeChunk]]:
+def combine_code_chunks(earlier_code_chunk: CodeChunk, later_code_chunk: CodeChunk) -> Optional[CodeChunk]:
     """
-    Given a list of code chunks, will attempt to optimize them right
-    with a single pass.
+    Given two neighbouring code chunks, returns the code chunk they combine
+    into, or None if they cannot be combined. A combine_right on the earlier 
+    code chunk is tried before a combine_left on the later code chunk.
     """
-
-    code_chunks_to_optimize = copy(code_chunks_to_optimize)
-    code_chunks_to_optimize.reverse() # Reverse the list so we can pop from the old front quickly
-
-    code_chunks_list: List[CodeChunk] = []
-
-    optimized = False
-    while len(code_chunks_to_optimize) >= 2:
-        later_code_chunk = code_chunks_to_optimize.pop()
-        earlier_code_chunk = code_chunks_to_optimize.pop()
-
-        combined_chunk = later_code_chunk.combine_right(earlier_code_chunk)
-
-        if combined_chunk is not None:
-            # If we can combine the two chunks into one, take that
-            optimized = True
-            code_chunks_to_optimize.append(combined_chunk)
-        else:
-            # If we cannot combine the two chunks, take the first chunk, 
-            # and reset the second one to the new first chunk for the next loop
-            code_chunks_list.append(later_code_chunk)
-            code_chunks_to_optimize.append(earlier_code_chunk)            
-    
-    # Make sure we take the final item in the code chunks list, 
-    # as it has nothing to combine_right with
-    if len(code_chunks_to_optimize) == 1:
-        code_chunks_list.append(code_chunks_to_optimize[0])
-
-    return optimized, code_chunks_list
-
-def optimize_code_chunks_combine_left(code_chunks_to_optimize: List[CodeChunk]) -> Tuple[bool, List[CodeChunk]]:
-    """
-    Given a list of code chunks, will attempt to optimize them left
-    with a single pass.
-    """
-
-    code_chunks_to_optimize = copy(code_chunks_to_optimize)
-    code_chunks_list: List[CodeChunk] = []
-
-    optimized = False
-    while len(code_chunks_to_optimize) >= 2:
-        later_code_chunk = code_chunks_to_optimize.pop()
-        earlier_code_chunk = code_chunks_to_optimize.pop()
-
-        combined_chunk = later_code_chunk.combine_left(earlier_code_chunk)
-
-        if combined_chunk is not None:
-            # If we can combine the two chunks into one, take that
-            optimized = True
-            code_chunks_to_optimize.append(combined_chunk)
-        else:
-            # If we cannot combine the two chunks, take the first chunk, 
-            # and reset the second one to the new first chunk for the next loop
-            code_chunks_list.append(later_code_chunk)
-            code_chunks_to_optimize.append(earlier_code_chunk)            
-    
-    # Make sure we take the final item in the code chunks list, 
-    # as it has nothing to combine_left with
-    if len(code_chunks_to_optimize) == 1:
-        code_chunks_list.append(code_chunks_to_optimize[0])
-
-    # Since we build the result backwards, we have to reverse it at the end
-    code_chunks_list.reverse()
-
-    return optimized, code_chunks_list
+    combined_code_chunk = earlier_code_chunk.combine_right(later_code_chunk)
+    if combined_code_chunk is not None:
+        return combined_code_chunk
+    return later_code_chunk.combine_left(earlier_code_chunk)
 
 
 def optimize_code_chunks(all_code_chunks: List[CodeChunk]) -> List[CodeChunk]:
     """
-    Given a list of code chunks, will recursively attempt to optimize them 
-    down to the smallest list of code chunks that have the same effects
-    as the original list. 
-
-    This is necessarily recursive, because of a situation like [A, A, B, B], 
-    where A and B can be combined to a No-op. Thus, after one call, we end with 
-    [A, B], and we need to recurse to finish the optimization.
+    Given a list of code chunks, will attempt to optimize them down to the 
+    smallest list of code chunks that have the same effects as the original
+    list, by combining neighbouring code chunks until no more can be combined.
+
+    We keep a stack of the optimized code chunks, and push each code chunk onto
+    it. If the code chunk combines with the code chunk on top of the stack, we
+    pop that code chunk, and then try to combine the combined code chunk with the
+    new top of the stack, as these are now neighbours. Thus, in a situation like 
+    [A, A, B, B], where A and B can be combined to a No-op, the second A and first 
+    B combine to a No-op, which combines with the second B to B, which combines 
+    with the first A to a No-op. 
+    
+    Every combination removes a code chunk from the stack, so this takes time 
+    linear in the number of code chunks.
     """
+    optimized_code_chunks: List[CodeChunk] = []
+    for code_chunk in all_code_chunks:
+        while len(optimized_code_chunks) > 0:
+            combined_code_chunk = combine_code_chunks(optimized_code_chunks[-1], code_chunk)
+            if combined_code_chunk is None:
+                break
 
-    optimized_right, code_chunks_list = optimize_code_chunks_combine_right(all_code_chunks)
-    optimized_left, code_chunks_list = optimize_code_chunks_combine_left(code_chunks_list)
+            optimized_code_chunks.pop()
+            code_chunk = combined_code_chunk
 
-    # As long as we optimized in this iteration, recurse as we might
-    # need to optimize again
-    if optimized_right or optimized_left:
-        return optimize_code_chunks(code_chunks_list)
+        optimized_code_chunks.append(code_chunk)
 
-    return code_chunks_list
\ No newline at end of file
+    return optimized_code_chunks
@@ -11,7 +11,7 @@ in analyses.
 from mitosheet.step import Step
 import os
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from mitosheet._version import __version__
 from mitosheet.mito_analytics import log
 from mitosheet.types import StepsManagerType
@@ -133,7 +133,8 @@ def write_saved_analysis(analysis_path: str, steps_data: List[Dict[str, Any]], v
 
 
 def make_steps_json_obj(
-        steps: List[Step]
+        steps: List[Step],
+        step_indexes_to_skip: Optional[Set[int]]=None
     ) -> List[Dict[str, Any]]:
     """
     Given a steps dictonary from a steps_manager, puts the steps
@@ -155,13 +156,14 @@ def make_steps_json_obj(
 
     Notably, does not return any skipped steps, which is necessary
     because we don't save the step id, so then we cannot detect
-    which should be skipped properly
+    which should be skipped properly. If step_indexes_to_skip is not
+    passed, it is computed from the steps.
     """
     from mitosheet.steps_manager import get_step_indexes_to_skip
 
     steps_json_obj = []
 
-    skipped_step_indexes = get_step_indexes_to_skip(steps)
+    skipped_step_indexes = step_indexes_to_skip if step_indexes_to_skip is not None else get_step_indexes_to_skip(steps)
 
     for step_index, step in enumerate(steps):
         # Skip the initialize step
@@ -204,7 +206,7 @@ def write_analysis(steps_manager: StepsManagerType, analysis_name: str=None) ->
         analysis_name = steps_manager.analysis_name
 
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
-    steps = make_steps_json_obj(steps_manager.steps)
+    steps = make_steps_json_obj(steps_manager.steps, steps_manager.get_step_indexes_to_skip())
 
     # Actually write the file
     write_saved_analysis(analysis_path, steps)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains a search index of the columns of the sheets, which lets us find
+all the cells of a sheet that match a search string at once.
+
+Searching matches the search string against each cell turned into a lowercase
+string. Turning every cell into a string is slow, and most columns have far
+fewer unique values than rows, so the index of a column is the lowercase string
+of each unique value in the column, and the code of the unique value of each row.
+A search then only matches the unique strings, and finds the rows with numpy.
+
+The index of a column is built the first time a sheet with that column is
+searched, and is reused for every step where the column is unchanged, so after
+an edit only the columns that the edit changed are indexed again.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.utils import get_column_data_fingerprint
+
+MAX_SEARCH_INDEX_BYTES = 256_000_000
+
+# The lowercase string of each unique value in a column, and the index into
+# these strings of the value in each row. NOTE: if a row has a value that
+# is not turned into a string, its string is None
+ColumnSearchIndex = Tuple[np.ndarray, np.ndarray]
+
+
+def get_column_search_index(series: pd.Series) -> ColumnSearchIndex:
+    """
+    Returns the search index of the column, where the string of each value is
+    the same as the string that series.apply(str) gives for that value.
+    """
+    values = series.to_numpy()
+    if values.dtype.kind in 'iub':
+        codes, unique_values = pd.factorize(values)
+        strings = np.array([str(value).lower() for value in unique_values.tolist()], dtype=object)
+    elif values.dtype.kind == 'f':
+        # We find the unique bits of the floats, as 0.0 and -0.0 are equal but
+        # turn into different strings
+        codes, unique_bits = pd.factorize(values.view(f'i{values.dtype.itemsize}'))
+        strings = np.array([str(value).lower() for value in unique_bits.view(values.dtype).tolist()], dtype=object)
+    else:
+        codes, unique_strings = pd.factorize(series.apply(str))
+        lowercase_strings: List[Optional[str]] = [str(string).lower() for string in np.asarray(unique_strings, dtype=object)]
+        if (codes == -1).any():
+            # Values like NaN in categories are not turned into strings
+            lowercase_strings.append(None)
+            codes = np.where(codes == -1, len(lowercase_strings) - 1, codes)
+        strings = np.array(lowercase_strings, dtype=object)
+
+    return codes.astype(get_codes_dtype(len(strings))), strings
+
+
+def get_codes_dtype(num_strings: int) -> Any:
+    if num_strings <= np.iinfo(np.int8).max:
+        return np.int8
+    if num_strings <= np.iinfo(np.int16).max:
+        return np.int16
+    if num_strings <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def get_column_search_index_bytes(column_search_index: ColumnSearchIndex) -> int:
+    codes, strings = column_search_index
+    return codes.nbytes + strings.nbytes + sum(len(string) for string in strings if string is not None)
+
+
+def get_matching_rows(column_search_index: ColumnSearchIndex, search_string: str) -> np.ndarray:
+    """
+    Returns the indexes of the rows that contain the search_string, which must
+    be lowercase. Like str.contains, the search_string is a regular expression.
+    """
+    codes, strings = column_search_index
+    is_match = pd.Series(strings, dtype=object).str.contains(search_string, na=False).to_numpy(dtype=bool)
+    if not is_match.any():
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(is_match[codes])
+
+
+class SearchIndexCache():
+    """
+    A least recently used cache of the search indexes of columns, that holds
+    at most max_bytes of indexes.
+
+    The index of a column is cached by the fingerprint of the column's data (see
+    get_column_data_fingerprint), so it is reused by every step and every sheet
+    that has the same column data, and it is never reused once the data changes.
+
+    NOTE: many API threads use this cache, so all access to the entries is
+    behind a lock. Indexes are also built behind a lock, so if the user types
+    a new search while the sheet is being indexed, the new search waits for
+    the indexes, rather than building them again.
+    """
+
+    def __init__(self, max_bytes: int=MAX_SEARCH_INDEX_BYTES):
+        self.max_bytes = max_bytes
+        self.cache: "OrderedDict[Hashable, Tuple[weakref.ref, ColumnSearchIndex, int]]" = OrderedDict()
+        self.num_bytes = 0
+        self.lock = Lock()
+        self.build_lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, series: pd.Series) -> ColumnSearchIndex:
+        """
+        Returns the search index of the column, building it if it is not cached.
+        """
+        fingerprint, fingerprint_array_ref = get_column_data_fingerprint(series)
+        if fingerprint is None or fingerprint_array_ref is None:
+            return get_column_search_index(series)
+
+        with self.build_lock:
+            column_search_index = self._get_entry(fingerprint)
+            if column_search_index is not None:
+                return column_search_index
+
+            column_search_index = get_column_search_index(series)
+            num_bytes = get_column_search_index_bytes(column_search_index)
+            if num_bytes > self.max_bytes:
+                return column_search_index
+
+            with self.lock:
+                # We drop the indexes of columns whose memory was freed, as they can never be used again
+                for dead_fingerprint in [key for key, entry in self.cache.items() if entry[0]() is None]:
+                    self.num_bytes -= self.cache.pop(dead_fingerprint)[2]
+
+                self.cache[fingerprint] = (fingerprint_array_ref, column_search_index, num_bytes)
+                self.num_bytes += num_bytes
+                while self.num_bytes > self.max_bytes:
+                    _, (_, _, evicted_num_bytes) = self.cache.popitem(last=False)
+                    self.num_bytes -= evicted_num_bytes
+            return column_search_index
+
+    def _get_entry(self, fingerprint: Hashable) -> Optional[ColumnSearchIndex]:
+        with self.lock:
+            entry = self.cache.get(fingerprint)
+            if entry is not None and entry[0]() is None:
+                # The memory of the column was freed, and so might be reused by other values
+                del self.cache[fingerprint]
+                self.num_bytes -= entry[2]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.cache.move_to_end(fingerprint)
+            return entry[1]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+            self.num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.cache),
+            'num_bytes': self.num_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+
+def get_search_cell_indexes(
+        df: pd.DataFrame,
+        search_string: str,
+        search_index_cache: SearchIndexCache,
+        starting_row_index: int=0,
+        max_matches: Optional[int]=None
+    ) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Returns the (row index, column index) of the cells in the df from starting_row_index
+    on that contain the search_string, case insensitively, in order of row and then column,
+    along with the number of these cells. If max_matches is passed, returns at most the
+    first max_matches of these cells.
+    """
+    search_string = search_string.lower()
+
+    all_row_indexes: List[np.ndarray] = []
+    all_column_indexes: List[np.ndarray] = []
+    for column_index in range(len(df.columns)):
+        row_indexes = get_matching_rows(search_index_cache.get(df.iloc[:, column_index]), search_string)
+        row_indexes = row_indexes[row_indexes >= starting_row_index]
+        all_row_indexes.append(row_indexes)
+        all_column_indexes.append(np.full(len(row_indexes), column_index))
+
+    if len(all_row_indexes) == 0:
+        return [], 0
+
+    row_indexes = np.hstack(all_row_indexes)
+    column_indexes = np.hstack(all_column_indexes)
+    order = np.argsort(row_indexes * len(df.columns) + column_indexes, kind='stable')[:max_matches]
+    cell_indexes: List[Tuple[Any, Any]] = list(zip(row_indexes[order].tolist(), column_indexes[order].tolist()))
+    return cell_indexes, len(row_indexes)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains utilities for sending windows of the sheets to the front-end.
+
+The front-end only displays some of the rows and columns of a sheet at
+once, and so it requests the window of each sheet that it is displaying,
+and we only send the sheet data for this window. As the user scrolls
+back and forth, and undos and redos, the same windows get requested
+again, so we cache the windows that we render.
+
+When the sheets change, we only send the front-end a patch with the data of 
+the columns that changed since we last sent the sheets. See get_sheet_data_patch.
+"""
+from collections import OrderedDict
+import json
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from mitosheet.lazy_file import get_lazy_file
+from mitosheet.state import State
+from mitosheet.types import SheetDataWindow
+from mitosheet.utils import (MAX_COLUMNS, MAX_ROWS, ColumnData, RenderedColumn,
+                             df_to_json_dumpsable, get_column_final_data)
+
+# By default, we display the first rows and columns of a sheet
+DEFAULT_SHEET_DATA_WINDOW: SheetDataWindow = (0, MAX_ROWS, 0, MAX_COLUMNS)
+
+MAX_CACHED_SHEET_DATA_WINDOWS = 32
+
+# The sheet data for a window, that sheet data turned into JSON, the binary buffers 
+# that the sheet data refers to if the data is sent in binary buffers, and the 
+# fingerprint and data of each column in the sheet data
+RenderedSheetData = Tuple[Dict[str, Any], str, Optional[List[bytes]], List[RenderedColumn]]
+
+
+def get_valid_sheet_data_window(window: Sequence[int]) -> SheetDataWindow:
+    """
+    Returns the window (row_start, row_end, column_start, column_end), with
+    no negative indexes, and at most MAX_ROWS rows and MAX_COLUMNS columns.
+    """
+    row_start, row_end, column_start, column_end = (max(int(index), 0) for index in window)
+    row_end = min(max(row_end, row_start), row_start + MAX_ROWS)
+    column_end = min(max(column_end, column_start), column_start + MAX_COLUMNS)
+    return (row_start, row_end, column_start, column_end)
+
+
+def get_sheet_data_window(
+        state: State, 
+        sheet_index: int, 
+        window: SheetDataWindow, 
+        buffers: Optional[List[bytes]]=None,
+        rendered_columns: Optional[List[RenderedColumn]]=None,
+        reusable_column_data: Optional[Dict[Hashable, ColumnData]]=None
+    ) -> Dict[str, Any]:
+    """
+    Returns the sheet data for the window of the sheet at sheet_index, in the format
+    that df_to_json_dumpsable returns. If buffers is passed, the columns that can be
+    are sent in these binary buffers. See df_to_json_dumpsable for rendered_columns
+    and reusable_column_data.
+
+    If the sheet is backed by a lazy file, the rows of the window are read from the
+    file, and the number of rows is the estimate of the number of rows in the file.
+    """
+    row_start, row_end, column_start, column_end = window
+
+    # If the sheet is backed by a lazy file, we read just the rows in the window from the file
+    lazy_file = get_lazy_file(state, sheet_index)
+    if lazy_file is not None:
+        sheet_data = df_to_json_dumpsable(
+            lazy_file.read_rows(row_start, row_end),
+            state.df_names[sheet_index],
+            state.df_sources[sheet_index],
+            state.column_spreadsheet_code[sheet_index],
+            state.column_filters[sheet_index],
+            state.column_ids.column_header_to_column_id[sheet_index],
+            state.column_format_types[sheet_index],
+            max_length=row_end - row_start,
+            max_columns=column_end - column_start,
+            column_start=column_start,
+            buffers=buffers,
+            rendered_columns=rendered_columns,
+            reusable_column_data=reusable_column_data
+        )
+        sheet_data['rowStart'] = row_start
+        sheet_data['numRows'] = lazy_file.get_num_rows()
+        return sheet_data
+
+    return df_to_json_dumpsable(
+        state.dfs[sheet_index],
+        state.df_names[sheet_index],
+        state.df_sources[sheet_index],
+        state.column_spreadsheet_code[sheet_index],
+        state.column_filters[sheet_index],
+        state.column_ids.column_header_to_column_id[sheet_index],
+        state.column_format_types[sheet_index],
+        max_length=row_end - row_start,
+        max_columns=column_end - column_start,
+        row_start=row_start,
+        column_start=column_start,
+        buffers=buffers,
+        rendered_columns=rendered_columns,
+        reusable_column_data=reusable_column_data
+    )
+
+
+def get_sheet_version(state: State, sheet_index: int) -> Tuple[Any, ...]:
+    """
+    Returns the objects that the sheet data of the sheet at sheet_index is created
+    from. As states are copy-on-write, if a step changes a sheet, it creates new
+    metadata maps for it, so if these are the same objects, the dataframe and so
+    the sheet data is the same. See is_sheet_unchanged in the steps manager.
+    """
+    return (
+        state.column_ids.column_id_to_column_header[sheet_index],
+        state.column_ids.column_header_to_column_id[sheet_index],
+        state.column_spreadsheet_code[sheet_index],
+        state.column_filters[sheet_index],
+        state.column_format_types[sheet_index],
+        state.df_names[sheet_index],
+        state.df_sources[sheet_index],
+        get_lazy_file(state, sheet_index),
+    )
+
+
+def get_sheet_data_patch(
+        rendered_sheet_data: RenderedSheetData, 
+        previous_rendered_sheet_data: Optional[RenderedSheetData]
+    ) -> Tuple[Optional[Dict[str, Any]], List[bytes]]:
+    """
+    Returns the sheet data to send to a front-end that has the previous sheet data,
+    along with the binary buffers it refers to. 
+    
+    If the sheet data is the same as the previous sheet data, returns None. Otherwise,
+    returns the sheet data, where each column that has the same data as the column with
+    the same id in the previous sheet data has an empty columnData and columnDataUnchanged 
+    set to True, and so the front-end takes the columnData of the previous column.
+    """
+    sheet_data, _, buffers, rendered_columns = rendered_sheet_data
+    if previous_rendered_sheet_data is None:
+        return sheet_data, buffers if buffers is not None else []
+    if rendered_sheet_data is previous_rendered_sheet_data:
+        return None, []
+
+    previous_sheet_data, _, _, previous_rendered_columns = previous_rendered_sheet_data
+    if sheet_data['rowStart'] != previous_sheet_data['rowStart'] or len(sheet_data['index']) != len(previous_sheet_data['index']):
+        # The columns have data for different rows
+        return sheet_data, buffers if buffers is not None else []
+
+    previous_fingerprints = {
+        column['columnID']: fingerprint 
+        for column, (fingerprint, fingerprint_array_ref, _) in zip(previous_sheet_data['data'], previous_rendered_columns)
+        if fingerprint is not None and fingerprint_array_ref is not None and fingerprint_array_ref() is not None
+    }
+    if not any(
+        fingerprint is not None and previous_fingerprints.get(column['columnID']) == fingerprint
+        for column, (fingerprint, _, _) in zip(sheet_data['data'], rendered_columns)
+    ):
+        return sheet_data, buffers if buffers is not None else []
+    
+    patch_buffers: List[bytes] = []
+    patch_data = []
+    for column, (fingerprint, _, column_data) in zip(sheet_data['data'], rendered_columns):
+        if fingerprint is not None and previous_fingerprints.get(column['columnID']) == fingerprint:
+            patch_data.append({
+                'columnID': column['columnID'],
+                'columnHeader': column['columnHeader'],
+                'columnDtype': column['columnDtype'],
+                'columnData': [],
+                'columnDataUnchanged': True
+            })
+        else:
+            patch_data.append(get_column_final_data(
+                column['columnID'], column['columnHeader'], column['columnDtype'], column_data, patch_buffers if buffers is not None else None
+            ))
+
+    return {**sheet_data, 'data': patch_data}, patch_buffers
+
+
+class SheetDataWindowCache():
+    """
+    A least recently used cache of the sheet data for windows of sheets.
+
+    Each window is cached for the version of the sheet it was rendered from,
+    so windows rendered for one step are reused for other steps that don't
+    change that sheet. We only keep the metadata maps of the sheet, and not
+    the dataframe, so the cache does not keep old dataframes in memory.
+
+    We also keep each window turned into JSON, so that each window is only
+    ever turned into JSON once, no matter how many times it is sent. When a
+    window of a new version of a sheet is rendered, the columns with the same
+    fingerprint as a column in a cached window of that sheet are reused.
+
+    NOTE: the API thread and the main thread both use this cache, so all
+    access to the entries is behind a lock.
+    """
+
+    def __init__(self, max_size: int=MAX_CACHED_SHEET_DATA_WINDOWS):
+        self.max_size = max_size
+        self.cache: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[Any, ...], RenderedSheetData]]" = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, state: State, sheet_index: int, window: SheetDataWindow) -> Dict[str, Any]:
+        """
+        Returns the sheet data for the window of the sheet at sheet_index, rendering
+        it if it is not cached.
+
+        NOTE: the returned sheet data is shared, and so must not be changed.
+        """
+        return self._get_or_render(state, sheet_index, window)[0]
+
+    def get_json(self, state: State, sheet_index: int, window: SheetDataWindow) -> str:
+        """
+        Returns the sheet data for the window of the sheet at sheet_index, turned
+        into JSON with json.dumps, rendering it if it is not cached.
+        """
+        return self._get_or_render(state, sheet_index, window)[1]
+
+    def get_rendered(self, state: State, sheet_index: int, window: SheetDataWindow, binary: bool=False) -> RenderedSheetData:
+        """
+        Returns the sheet data for the window of the sheet at sheet_index, along with
+        the sheet data turned into JSON, its binary buffers if binary is True, and its
+        columns, rendering it if it is not cached.
+        """
+        return self._get_or_render(state, sheet_index, window, binary=binary)
+
+    def _get_or_render(self, state: State, sheet_index: int, window: SheetDataWindow, binary: bool=False) -> RenderedSheetData:
+        sheet_version = get_sheet_version(state, sheet_index)
+        # As each entry holds on to the objects in its sheet version, their ids 
+        # cannot be reused while the entry is in the cache
+        key = (sheet_index, window, binary, tuple(id(sheet_object) for sheet_object in sheet_version))
+
+        with self.lock:
+            rendered_sheet_data = self._get_entry(key)
+            reusable_column_data = self._get_reusable_column_data(key[:3]) if rendered_sheet_data is None else {}
+        if rendered_sheet_data is not None:
+            return rendered_sheet_data
+
+        buffers: Optional[List[bytes]] = [] if binary else None
+        rendered_columns: List[RenderedColumn] = []
+        sheet_data = get_sheet_data_window(
+            state, sheet_index, window, buffers=buffers, rendered_columns=rendered_columns, reusable_column_data=reusable_column_data
+        )
+        rendered_sheet_data = (sheet_data, json.dumps(sheet_data), buffers, rendered_columns)
+        with self.lock:
+            self.cache[key] = (sheet_version, rendered_sheet_data)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+        return rendered_sheet_data
+
+    def _get_entry(self, key: Tuple[Any, ...]) -> Optional[RenderedSheetData]:
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.cache.move_to_end(key)
+        return entry[1]
+
+    def _get_reusable_column_data(self, window_key: Tuple[Any, ...]) -> Dict[Hashable, ColumnData]:
+        """
+        Returns the data of the columns in the cached windows with the window_key,
+        which is the sheet index, window and binary, by the fingerprint of each column.
+        """
+        return {
+            fingerprint: column_data
+            for key, (_, rendered_sheet_data) in self.cache.items() if key[:3] == window_key
+            for fingerprint, fingerprint_array_ref, column_data in rendered_sheet_data[3] 
+            if fingerprint is not None and fingerprint_array_ref is not None and fingerprint_array_ref() is not None
+        }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.cache),
+            'max_size': self.max_size
+        }
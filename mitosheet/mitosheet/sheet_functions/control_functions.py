@@ -15,9 +15,11 @@ NOTE: This file is alphabetical order!
 """
 import functools
 
+import numpy as np
 import pandas as pd
 from mitosheet.sheet_functions.sheet_function_utils import (
-    fill_series_with_one_index, try_extend_series_to_index)
+    fill_series_with_one_index, has_numeric_numpy_dtype, has_numpy_dtype,
+    try_extend_series_to_index)
 from mitosheet.sheet_functions.types.decorators import (
     convert_arg_to_series_type, convert_args_to_series_type, fill_nans,
     filter_nans, handle_sheet_function_errors)
@@ -134,10 +136,31 @@ def IF(condition: pd.Series, true_series: pd.Series, false_series: pd.Series) ->
     true_series = try_extend_series_to_index(true_series, condition.index)
     false_series = try_extend_series_to_index(false_series, condition.index)
 
+    # If the series are not aligned with the condition, we look up each value by its index
+    if not true_series.index.equals(condition.index) or not false_series.index.equals(condition.index):
+        return pd.Series(
+            data=[true_series.loc[i] if c else false_series.loc[i] for i, c in condition.iteritems()],
+            index=condition.index
+        )
+
+    # Otherwise, we select the values in one go. Note that we make sure the result has
+    # the dtype pandas would infer from the selected values, like when building it value
+    # by value, so e.g. selecting only ints from an object series gives an int series
+    condition_array = condition.to_numpy(dtype=bool)
+    if condition_array.all() or not condition_array.any():
+        selected_series = true_series if condition_array.all() else false_series
+        if has_numpy_dtype(selected_series):
+            return pd.Series(selected_series.to_numpy(), index=condition.index)
+        return pd.Series(selected_series.to_numpy(dtype=object), index=condition.index).infer_objects()
+
+    if has_numpy_dtype(true_series) and has_numpy_dtype(false_series) and \
+        (true_series.dtype == false_series.dtype or (has_numeric_numpy_dtype(true_series) and has_numeric_numpy_dtype(false_series))):
+        return pd.Series(np.where(condition_array, true_series.to_numpy(), false_series.to_numpy()), index=condition.index)
+
     return pd.Series(
-        data=[true_series.loc[i] if c else false_series.loc[i] for i, c in condition.iteritems()],
+        np.where(condition_array, true_series.to_numpy(dtype=object), false_series.to_numpy(dtype=object)), 
         index=condition.index
-    )
+    ).infer_objects()
 
 
 @handle_sheet_function_errors
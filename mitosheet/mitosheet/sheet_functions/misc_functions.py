@@ -58,6 +58,11 @@ def FILLNAN(series: pd.Series, replacement: pd.Series) -> pd.Series:
     # Make sure the replacement series is long enough
     replacement = try_extend_series_to_index(replacement, series.index)
 
+    # A category series can only be filled with its categories, so we add the replacements to them
+    if str(series.dtype) == 'category':
+        new_categories = replacement[series.isna() & ~replacement.isin(series.cat.categories)].dropna().unique()
+        series = series.cat.add_categories(new_categories)
+
     return series.fillna(replacement)
 
 
@@ -20,6 +20,9 @@ def try_extend_series_to_index(series: pd.Series, index_to_fill: Union[pd.Index,
     """
     if series.size > 1:
         return series
+    # If the series has a numpy dtype, we can repeat its value without creating a list
+    if has_numpy_dtype(series):
+        return pd.Series(np.repeat(series.to_numpy(), len(index_to_fill)), index=index_to_fill)
     return pd.Series([series.iloc[0]] * len(index_to_fill), index=index_to_fill)
 
 
@@ -60,4 +63,20 @@ def is_series_of_constant(series: pd.Series) -> bool:
     We need to make sure to extend these series, so that we can operate on
     them with sheet functions properly. 
     """
-    return series.size == 1 and series.index.tolist() == [0]
\ No newline at end of file
+    return series.size == 1 and series.index.tolist() == [0]
+
+
+def has_numpy_dtype(series: pd.Series) -> bool:
+    """
+    Returns True if the series has a numpy dtype that is not object, and so
+    is not an object series or backed by a pandas extension array (e.g. a 
+    categorical series, or a series of nullable integers).
+    """
+    return isinstance(series.dtype, np.dtype) and series.dtype != object
+
+
+def has_numeric_numpy_dtype(series: pd.Series) -> bool:
+    """
+    Returns True if the series has a numpy int, unsigned int, or float dtype.
+    """
+    return has_numpy_dtype(series) and series.dtype.kind in 'iuf'
@@ -6,19 +6,22 @@
 """
 For going to a float series.
 """
-from typing import Any
+import re
+from typing import Any, Tuple
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import infer_dtype
 from mitosheet.sheet_functions.types.utils import (
-    get_billion_identifier_in_string, get_million_identifier_in_string,
-    is_bool_dtype, is_datetime_dtype, is_number_dtype, is_string_dtype)
+    BILLION_IDENTIFIERS, MILLION_IDENTIFIERS, get_billion_identifier_in_string,
+    get_million_identifier_in_string, is_bool_dtype, is_datetime_dtype,
+    is_number_dtype, is_string_dtype)
 
 
 def convert_string_to_float(
-        s, 
-        on_uncastable_arg_element, #Union[Literal['error'], Tuple[Literal['default'], any]]
-    ):
+        s: Any, 
+        on_uncastable_arg_element: Any, #Union[Literal['error'], Tuple[Literal['default'], any]]
+    ) -> Any:
     """
     NOTE: The approach for this function is to start as a string, and then we try
     and turn each element into a number 1-by-1. We attempt to handle:
@@ -91,6 +94,89 @@ def convert_string_to_float(
                 # Return the given default value in this case
                 return on_uncastable_arg_element[1]
 
+# Matches each line that is a string with a common formatting, that convert_string_to_float 
+# turns into a number, namely: an optional -, $, and parentheses around a number with commas 
+# every three digits, and then an optional million or billion identifier. Any other line is 
+# matched by the last alternative, so there is a match for every line
+FORMATTED_NUMBER_LINE_REGEX = re.compile(
+    r'^ *(?:(-?\$?-?\(?)([0-9]+)((?:,[0-9]{3})*)((?:\.[0-9]*)?)(\)| ?(?:' + 
+    '|'.join(MILLION_IDENTIFIERS + BILLION_IDENTIFIERS) + 
+    r'))? *|.*)$',
+    re.MULTILINE
+)
+
+# The number of strings we look at to decide how to convert a string series
+CONVERSION_SAMPLE_SIZE = 1000
+
+
+def get_formatted_number_prefix_and_suffix_data(prefix: str, suffix: str) -> Tuple[bool, int, int]:
+    """
+    For the prefix and suffix around a number matched by FORMATTED_NUMBER_LINE_REGEX,
+    returns if convert_string_to_float can handle it, and the sign and multiplier
+    of the number.
+    """
+    has_open_parenthesis = prefix.endswith('(')
+    identifier = suffix.strip(' )')
+
+    multiplier = 1
+    if identifier in MILLION_IDENTIFIERS:
+        multiplier = 1000000
+    elif identifier in BILLION_IDENTIFIERS:
+        multiplier = 1000000000
+
+    sign = -1 if prefix.startswith('-') or has_open_parenthesis else 1
+    # A - after the first - or the $ is part of the number, and so also makes it negative
+    has_number_minus = prefix.count('-') == 2 or prefix.startswith('$-')
+    if has_number_minus:
+        sign = -sign
+
+    # The parentheses are only removed if they wrap the entire string
+    is_handled = has_open_parenthesis == suffix.endswith(')') and not (has_open_parenthesis and has_number_minus)
+    return is_handled, sign, multiplier
+
+
+def convert_formatted_number_strings_to_float(strings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts the strings that match FORMATTED_NUMBER_LINE_REGEX to floats, giving the 
+    exact same result as convert_string_to_float. Returns which strings were converted,
+    and the floats, which are NaN for the other strings.
+
+    We match all the strings at once, by joining them into lines, and then read the 
+    number, sign and multiplier for each string from the match.
+    """
+    floats = np.full(len(strings), np.NaN)
+    lines = '\n'.join(strings)
+    if len(strings) == 0 or lines.count('\n') != len(strings) - 1:
+        # If there are newlines in the strings, we can't match them all at once
+        return np.zeros(len(strings), dtype=bool), floats
+
+    matches = pd.DataFrame(FORMATTED_NUMBER_LINE_REGEX.findall(lines), dtype=object)
+    prefix, integer, commas, decimal, suffix = (matches[column].to_numpy() for column in matches.columns)
+
+    # There are only a few different prefixes and suffixes, so we handle each of them once
+    prefix_codes, prefixes = pd.factorize(prefix)
+    suffix_codes, suffixes = pd.factorize(suffix)
+    prefix_and_suffix_data = np.array([
+        [get_formatted_number_prefix_and_suffix_data(p, s) for s in suffixes] for p in prefixes
+    ]).reshape(len(prefixes), len(suffixes), 3)[prefix_codes, suffix_codes]
+    is_handled, signs, multipliers = prefix_and_suffix_data.T
+
+    is_formatted_number = (integer != '') & is_handled.astype(bool)
+    # If there is an identifier after the number, there are not 3 characters after the 
+    # last comma, so if there is also no period, the commas are treated as European, 
+    # which means that numbers with more than one comma cannot be converted
+    has_commas = commas != ''
+    is_european = has_commas & (decimal == '') & (multipliers != 1)
+    is_formatted_number[is_european] &= np.array([len(c) == 4 for c in commas[is_european]], dtype=bool)
+
+    commas[has_commas & ~is_european] = [c.replace(',', '') for c in commas[has_commas & ~is_european]]
+    commas[is_european] = [c.replace(',', '.') for c in commas[is_european]]
+    numbers = (integer + commas + decimal)[is_formatted_number]
+
+    floats[is_formatted_number] = numbers.astype('float64') * signs[is_formatted_number] * multipliers[is_formatted_number]
+    return is_formatted_number, floats
+
+
 def to_float_series_from_string_series(
         string_series: pd.Series, 
         on_uncastable_arg_element: Any #: Union[Literal['error'], Tuple[Literal['default'], any]]
@@ -99,9 +185,57 @@ def to_float_series_from_string_series(
     Converts a string series to a number series, using a helper that
     handles special formatting of strings. 
 
-    Takes a default value, so the tranformation can occur elementwise
+    Takes a default value, so the tranformation can occur elementwise.
+
+    We first optimistically try to convert the entire series at once. If this
+    fails, we convert each distinct string once: first the basic numbers, which
+    we find with pd.to_numeric, then the formatted numbers, which we find with
+    FORMATTED_NUMBER_LINE_REGEX, and then the rest of the strings one by one. 
+    We only look for basic or formatted numbers if most of a sample of the 
+    strings are, as otherwise converting them one by one is quicker.
+
+    NOTE: pd.to_numeric does not always parse the same float from a string as
+    float does, so we only use it to find the basic numbers. Converting an array 
+    with numpy calls float on each element, so the results are the same as 
+    convert_string_to_float.
     """
-    return string_series.apply(convert_string_to_float, on_uncastable_arg_element=on_uncastable_arg_element).astype('float64')
+    values = string_series.to_numpy(dtype=object)
+    try:
+        # Try to handle case 1 for the whole series, optimistically
+        return pd.Series(values.astype('float64'), index=string_series.index, name=string_series.name)
+    except (ValueError, TypeError):
+        pass
+
+    if infer_dtype(values, skipna=False) != 'string':
+        # If there are values that are not strings, we handle them one by one
+        floats = np.array([
+            convert_string_to_float(value, on_uncastable_arg_element) for value in values
+        ], dtype=object).astype('float64')
+        return pd.Series(floats, index=string_series.index, name=string_series.name)
+
+    codes, unique_values = pd.factorize(values)
+    unique_floats = np.full(len(unique_values), np.NaN)
+    is_converted = np.zeros(len(unique_values), dtype=bool)
+
+    if pd.to_numeric(pd.Series(unique_values[:CONVERSION_SAMPLE_SIZE]), errors='coerce').notna().mean() > .5:
+        is_converted = pd.to_numeric(pd.Series(unique_values), errors='coerce').notna().to_numpy()
+        try:
+            unique_floats[is_converted] = unique_values[is_converted].astype('float64')
+        except (ValueError, TypeError):
+            is_converted[:] = False
+
+    other_indexes = np.flatnonzero(~is_converted)
+    if len(other_indexes) > 0 and convert_formatted_number_strings_to_float(unique_values[other_indexes[:CONVERSION_SAMPLE_SIZE]])[0].mean() > .5:
+        is_formatted_number, formatted_floats = convert_formatted_number_strings_to_float(unique_values[other_indexes])
+        unique_floats[other_indexes[is_formatted_number]] = formatted_floats[is_formatted_number]
+        other_indexes = other_indexes[~is_formatted_number]
+
+    unique_floats[other_indexes] = np.array([
+        convert_string_to_float(value, on_uncastable_arg_element) for value in unique_values[other_indexes]
+    ], dtype=object).astype('float64')
+
+    return pd.Series(unique_floats[codes], index=string_series.index, name=string_series.name)
+
 
 def to_float_series_from_boolean_series(boolean_series: pd.Series) -> pd.Series:
     """
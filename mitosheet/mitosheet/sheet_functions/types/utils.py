@@ -29,7 +29,7 @@ def is_float_dtype(dtype: str) -> bool:
     return 'float' in dtype
 
 def is_string_dtype(dtype: str) -> bool:
-    return dtype == 'object' or dtype == 'str' or dtype == 'string'
+    return dtype == 'object' or dtype == 'str' or dtype == 'string' or dtype == 'category'
 
 def is_datetime_dtype(dtype: str) -> bool:
     # NOTE: this should handle all different datetime columns, no matter
@@ -42,6 +42,13 @@ def is_timedelta_dtype(dtype: str) -> bool:
 def is_number_dtype(dtype: str) -> bool:
     return is_int_dtype(dtype) or is_float_dtype(dtype)
 
+def is_new_category(series: pd.Series, value: Any) -> bool:
+    """
+    Returns True if the series is a category, and the value is not one of its
+    categories, and so must be added to the categories before it can be set
+    """
+    return str(series.dtype) == 'category' and value not in series.cat.categories
+
 def is_none_type(value: Union[str, None]) -> bool:
     """
     Helper function for determining if a value should be treated as None
@@ -131,16 +138,17 @@ def get_datetime_format(string_series: pd.Series) -> Optional[str]:
             return '%m-%d-%Y'
 
 
+# The million and billion identifiers, sorted so that the biggest identifiers come first
+MILLION_IDENTIFIERS = list(sorted(["Million", 'Mil', 'M', 'million', 'mil', 'm'], key=len, reverse=True))
+BILLION_IDENTIFIERS = list(sorted(["Billion", 'Bil', 'B', 'billion', 'bil', 'b'], key=len, reverse=True))
+
 def get_million_identifier_in_string(string: str) -> Union[str, None]:
     """
     Given a string, returns the million identifier in it. 
     Returns '' if none exist. 
     """
-    million_identifiers = ["Million", 'Mil', 'M', 'million', 'mil', 'm']
     # So that we return the biggest matching element
-    million_identifiers = list(sorted(million_identifiers, key = len, reverse=True))
-
-    for identifier in million_identifiers:
+    for identifier in MILLION_IDENTIFIERS:
         if identifier in string:
             return identifier
 
@@ -152,12 +160,8 @@ def get_billion_identifier_in_string(string: str) -> Union[str, None]:
     Given a string, returns the billion identifier in it. 
     Returns '' if none exist. 
     """
-
-    billion_identifiers = ["Billion", 'Bil', 'B', 'billion', 'bil', 'b']
     # So that we return the biggest matching element
-    billion_identifiers = list(sorted(billion_identifiers, key = len, reverse=True))
-
-    for identifier in billion_identifiers:
+    for identifier in BILLION_IDENTIFIERS:
         if identifier in string:
             return identifier
 
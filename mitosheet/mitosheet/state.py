@@ -5,13 +5,17 @@
 # Distributed under the terms of the GPL License.
 from collections import OrderedDict
 from copy import deepcopy
-from typing import Any, Collection, List, Dict, Optional, Set
+import warnings
+from typing import TYPE_CHECKING, Any, Collection, List, Dict, Optional, Set
 import pandas as pd
 
 from mitosheet.column_headers import ColumnIDMap
-from mitosheet.types import ColumnID
+from mitosheet.types import ColumnHeader, ColumnID
 from mitosheet.utils import get_first_unused_dataframe_name
 
+if TYPE_CHECKING:
+    from mitosheet.lazy_file import LazyFile
+
 # Constants for where the dataframe in the state came from
 DATAFRAME_SOURCE_PASSED = "passed"  # passed in mitosheet.sheet
 DATAFRAME_SOURCE_IMPORTED = "imported"  # imported through a simple import
@@ -51,7 +55,9 @@ class State:
         column_spreadsheet_code: List[Dict[ColumnID, str]] = None,
         column_filters: List[Dict[ColumnID, Any]] = None,
         column_format_types: List[Dict[ColumnID, Dict[str, Any]]] = None,
-        graph_data_dict: "OrderedDict[str, Dict[str, Any]]" = None
+        graph_data_dict: "OrderedDict[str, Dict[str, Any]]" = None,
+        column_evaluation_graph: Optional[List[Optional[Dict[ColumnID, Set[ColumnID]]]]] = None,
+        lazy_files: Optional[List[Optional["LazyFile"]]] = None
     ):
 
         # The dataframes that are in the state
@@ -119,28 +125,111 @@ class State:
             ]
         )
 
+        # For each sheet, a mapping from column id -> the column ids with formulas that depend
+        # on it. It is None for sheets where it has not been built yet, and otherwise must be
+        # kept in sync with the formulas. See evaluation_graph_utils.get_column_evaluation_graph
+        self.column_evaluation_graph: List[Optional[Dict[ColumnID, Set[ColumnID]]]] = (
+            column_evaluation_graph
+            if column_evaluation_graph is not None
+            else [None for _ in range(len(dfs))]
+        )
+
+        # For each sheet, the lazy file that backs it if it was imported lazily and has not 
+        # been read in fully yet, in which case the dataframe only has the first rows of the
+        # file. See lazy_file.materialize_lazy_sheets
+        self.lazy_files: List[Optional["LazyFile"]] = (
+            lazy_files
+            if lazy_files is not None
+            else [None for _ in range(len(dfs))]
+        )
+
         # We put this in an ordered dict so we can easily figure out the last graph that was edited at each step. 
         # This is helpful for undoing, for example. 
         self.graph_data_dict: OrderedDict[str, Dict[str, Any]] = graph_data_dict if graph_data_dict is not None else OrderedDict()
 
-    def copy(self, deep_sheet_indexes: Optional[List[int]]=None) -> "State":
+        # If the dataframes of this state have been evicted to bound the memory of the step
+        # history, they are replaced by empty dataframes with the same columns and dtypes. 
+        # See StepsManager.enforce_max_history_bytes
+        self.dfs_evicted = False
+
+    def evict_dfs(self) -> None:
+        """
+        Replaces the dataframes in this state with empty dataframes that have
+        the same column headers and dtypes, releasing the references this state
+        holds to the column data.
+
+        The metadata of the state is untouched, so that transpiling and 
+        describing the steps that use this state still works. The dataframes
+        can be restored with restore_dfs.
+        """
+        self.dfs = [df.head(0).copy(deep=True) for df in self.dfs]
+        self.dfs_evicted = True
+
+    def restore_dfs(self, dfs: List[pd.DataFrame]) -> None:
         """
-        Returns a copy of the state, while only making deep copies of
-        those dataframes in the deep_sheet_indexes. Ideally, we'd copy
-        even less than that deeply.
+        Restores the dataframes of an evicted state, which should have
+        been recreated by reexecuting the step that created this state.
+        """
+        self.dfs = list(dfs)
+        self.dfs_evicted = False
+
+    def copy(
+        self, 
+        deep_sheet_indexes: Optional[List[int]]=None,
+        modified_sheet_indexes: Optional[List[int]]=None,
+        column_ids_to_copy: Optional[Dict[int, Collection[ColumnID]]]=None
+    ) -> "State":
+        """
+        Returns a copy of the state that is copy-on-write at the column level.
+
+        The new state shares as much as possible with this state, and so the 
+        caller must declare what it is going to change:
+        1.  modified_sheet_indexes are the sheets whose metadata (formulas, filters, 
+            formats, column ids) or whose dataframe axes will be changed. The per sheet
+            metadata maps get copied, and the dataframe is a new object that shares
+            all of its column buffers with this state. 
+        2.  column_ids_to_copy is a mapping from sheet index to the column ids whose 
+            values will be written in place (e.g. by df[column_header] = ... or df.at).
+            Only these columns get private buffers. These sheets are also modified.
+        3.  deep_sheet_indexes are sheets that are copied entirely.
+
+        All other sheets share their metadata maps with this state, and so must
+        not be mutated. 
         """
         if deep_sheet_indexes is None:
             deep_sheet_indexes = []
+        if modified_sheet_indexes is None:
+            modified_sheet_indexes = []
+        if column_ids_to_copy is None:
+            column_ids_to_copy = {}
+
+        copied_sheet_indexes = set(deep_sheet_indexes).union(modified_sheet_indexes).union(column_ids_to_copy.keys())
+
+        dfs = []
+        for sheet_index, df in enumerate(self.dfs):
+            if sheet_index in deep_sheet_indexes:
+                dfs.append(df.copy(deep=True))
+            elif sheet_index in column_ids_to_copy:
+                column_headers = self.column_ids.get_column_headers_by_ids(sheet_index, list(column_ids_to_copy[sheet_index]))
+                dfs.append(_copy_df_with_private_columns(df, column_headers))
+            else:
+                dfs.append(df.copy(deep=False))
         
         return State(
-            [df.copy(deep=True) if index in deep_sheet_indexes else df.copy(deep=False) for index, df in enumerate(self.dfs)],
-            df_names=deepcopy(self.df_names),
-            df_sources=deepcopy(self.df_sources),
-            column_ids=deepcopy(self.column_ids),
-            column_spreadsheet_code=deepcopy(self.column_spreadsheet_code),
-            column_filters=deepcopy(self.column_filters),
-            column_format_types=deepcopy(self.column_format_types),
-            graph_data_dict=deepcopy(self.graph_data_dict)
+            dfs,
+            df_names=list(self.df_names),
+            df_sources=list(self.df_sources),
+            column_ids=self.column_ids.copy(copied_sheet_indexes),
+            column_spreadsheet_code=_copy_sheet_maps(self.column_spreadsheet_code, copied_sheet_indexes, deep_sheet_indexes),
+            column_filters=_copy_sheet_maps(self.column_filters, copied_sheet_indexes, deep_sheet_indexes),
+            column_format_types=_copy_sheet_maps(self.column_format_types, copied_sheet_indexes, deep_sheet_indexes),
+            graph_data_dict=deepcopy(self.graph_data_dict),
+            column_evaluation_graph=[
+                {column_id: set(dependents) for column_id, dependents in graph.items()}
+                if graph is not None and sheet_index in copied_sheet_indexes else graph
+                for sheet_index, graph in enumerate(self.column_evaluation_graph)
+            ],
+            lazy_files=list(self.lazy_files)
         )
 
     def add_df_to_state(
@@ -194,6 +283,10 @@ class State:
                 if format_types is None
                 else format_types
             )
+            self.column_evaluation_graph.append(
+                {column_id: set() for column_id in column_ids}
+            )
+            self.lazy_files.append(None)
 
             # Return the index of this sheet
             return len(self.dfs) - 1
@@ -229,6 +322,10 @@ class State:
                 if format_types is None
                 else format_types
             )
+            self.column_evaluation_graph[sheet_index] = {
+                column_id: set() for column_id in column_ids
+            }
+            self.lazy_files[sheet_index] = None
 
             # Return the index of this sheet
             return sheet_index
@@ -257,12 +354,60 @@ class State:
         # Loop over all the attributes of this object
         for key, value in self.__dict__.items():
             # And for anything defined on columns, update it to the new id schema
-            if key.startswith("column") and key != "column_ids":
+            if key.startswith("column") and key != "column_ids" and key != "column_evaluation_graph":
                 new_value = [
                     {make_valid_header(k): v for k, v in column_map.items()}
                     for column_map in value
                 ]
                 self.__setattr__(key, new_value)
 
+        # The column evaluation graphs also have ids as values, so we just rebuild them
+        self.column_evaluation_graph = [None for _ in range(len(self.dfs))]
+
         # Then, update the column ids mapping object itself
         self.column_ids.move_to_deprecated_id_format()
+
+
+
+def _copy_sheet_maps(sheet_maps: List[Dict[ColumnID, Any]], copied_sheet_indexes: Set[int], deep_sheet_indexes: List[int]) -> List[Dict[ColumnID, Any]]:
+    """
+    Copies a per sheet column metadata map, structurally sharing it with the
+    original. Only the maps for the copied sheets are copied, and the values
+    in them are shared, as they are replaced rather than mutated by steps.
+    """
+    return [
+        (deepcopy(sheet_map) if sheet_index in deep_sheet_indexes else dict(sheet_map))
+        if sheet_index in copied_sheet_indexes else sheet_map
+        for sheet_index, sheet_map in enumerate(sheet_maps)
+    ]
+
+
+def _copy_df_with_private_columns(df: pd.DataFrame, column_headers: Collection[ColumnHeader]) -> pd.DataFrame:
+    """
+    Returns a shallow copy of the dataframe that shares all column buffers with
+    the original dataframe, except for the passed column_headers, which get their 
+    own copies so that they can be written to in place without changing the
+    original dataframe.
+
+    We do this by deleting and reinserting the columns, as pandas will otherwise
+    write to the shared block when a column is set with a value of the same dtype.
+    """
+    # If we cannot identify columns uniquely, we fall back to a full copy
+    if not df.columns.is_unique:
+        return df.copy(deep=True)
+
+    new_df = df.copy(deep=False)
+    if len(column_headers) == 0:
+        return new_df
+
+    with warnings.catch_warnings():
+        # Reinserting many columns can fragment the dataframe, which pandas warns about
+        warnings.simplefilter('ignore')
+        for column_header in column_headers:
+            column_index = new_df.columns.get_loc(column_header)
+            del new_df[column_header]
+            new_df.insert(column_index, column_header, df[column_header].copy(deep=True))
+
+    # Keep the original column index type (e.g. a RangeIndex)
+    new_df.columns = df.columns
+    return new_df
@@ -4,8 +4,10 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
-from typing import Any, Dict, List, Optional, Set, Type
-from mitosheet.evaluation_graph_utils import create_column_evaluation_graph
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.evaluation_graph_utils import get_column_evaluation_graph
+from mitosheet.lazy_file import materialize_lazy_sheets
 
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.column_steps.set_column_formula import SetColumnFormulaStepPerformer
@@ -35,6 +37,9 @@ class Step:
     for easy transpiling of the step! For example, a simple import
     stores what the delimeters used in the files it read in are, so
     that it can transpile this easily.
+
+    As the step only changes when it is executed, the code chunks it
+    transpiles to and its summary are cached until it is executed again.
     """
 
     def __init__(
@@ -64,6 +69,10 @@ class Step:
         # work if it has already been done. See simple_import for an example
         self.execution_data = execution_data
 
+        # The code chunks this step transpiles to, and its display name and 
+        # description, which are cached until the step is executed again
+        self._cache: Dict[str, Any] = {}
+
     @property
     def dfs(self):
         return self.post_state.dfs
@@ -87,7 +96,7 @@ class Step:
     @property
     def column_evaluation_graph(self):
         return [
-            create_column_evaluation_graph(self.post_state, sheet_index)
+            get_column_evaluation_graph(self.post_state, sheet_index)
             for sheet_index in range(len(self.dfs))
         ]
     
@@ -139,6 +148,10 @@ class Step:
         NOTE: this is the only function you should use to get a step
         to execute!
         """        
+        # Read in fully the sheets backed by lazy files that this step reads all the rows of
+        if any(lazy_file is not None for lazy_file in new_prev_state.lazy_files):
+            materialize_lazy_sheets(new_prev_state, self.step_performer.get_materialized_dataframe_indexes(**self.params))
+
         # Saturate the event to get up to date parameters
         params = self.step_performer.saturate(new_prev_state, self.params)
 
@@ -160,43 +173,60 @@ class Step:
         self.post_state = new_post_state
         self.execution_data = execution_data
         self.params = params
-    
+        self._cache = {}
 
-    def step_indexes_to_skip(self, all_steps_before_this_step: List['Step']) -> Set[int]:
+    def get_code_chunks(self) -> List[CodeChunk]:
         """
-        Given the steps that come before it, any step has the ability
-        to skip these steps. 
+        Returns the code chunks that this step transpiles to, which are
+        only transpiled again after this step is executed again.
 
-        Currently, a step only skips the steps before it if:
-        1. This step is a filter step that is trying to replace an older filter step
-        2. This step has the same id as any step before it (like for pivot tables)
-        3. This step is a formula step overwriting the step that came just before it
+        NOTE: the returned list is shared, and so must not be changed.
         """
+        if 'code_chunks' not in self._cache:
+            self._cache['code_chunks'] = self.step_performer.transpile(
+                self.prev_state, # type: ignore
+                self.post_state, # type: ignore
+                self.params,
+                self.execution_data,
+            )
+        return self._cache['code_chunks']
+
+    def get_summary(self) -> Tuple[str, str]:
+        """
+        Returns the display name and description of this step, which come
+        from the first code chunk it transpiles to.
 
-        step_indexes_to_skip = set()
+        NOTE: we cannot and should not optimize the code chunks here, as
+        rely on getting data out of them is to label the steps correctly
+        """
+        if 'summary' not in self._cache:
+            code_chunks = self.get_code_chunks()
+            self._cache['summary'] = (code_chunks[0].get_display_name(), code_chunks[0].get_description_comment())
+        return self._cache['summary']
 
-        for step_index, step in enumerate(all_steps_before_this_step):
-            # Check (1)
-            if step.step_type == FilterStepPerformer.step_type() and self.step_type == FilterStepPerformer.step_type():
-                if step.params['sheet_index'] == self.params['sheet_index'] \
-                    and step.params['column_id'] == self.params['column_id']:
-                   step_indexes_to_skip.add(step_index) 
-            
-            # Check (2)
-            elif step.step_id == self.step_id:
-                step_indexes_to_skip.add(step_index)
+    def rematerialize_post_state(self) -> None:
+        """
+        Restores the dataframes of the post_state of this step after they
+        have been evicted, by reexecuting this step on its prev_state.
 
-        if len(all_steps_before_this_step) > 0:
-            previous_step: Step = all_steps_before_this_step[-1]
-            
-            # Check (3)
-            if self.step_type == SetColumnFormulaStepPerformer.step_type():
-                if self.step_type == previous_step.step_type \
-                    and self.params['sheet_index'] == previous_step.params['sheet_index'] \
-                    and self.params['column_id'] == previous_step.params['column_id']:
-                    step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
+        NOTE: the prev_state must not be evicted, and the params are already
+        saturated for this prev_state, so we do not saturate them again. The
+        post_state object itself is kept, as the next step uses it as its prev_state.
+        """
+        if self.post_state is None or self.prev_state is None or not self.post_state.dfs_evicted:
+            return
 
-        return step_indexes_to_skip
+        post_state_and_execution_data = self.step_performer.execute(self.prev_state, **self.params)
+        if post_state_and_execution_data is not None:
+            # Reexecuting a lazy import gives the first rows of the file, so we read in fully 
+            # the sheets that were read in fully since this step was first executed
+            new_post_state = post_state_and_execution_data[0]
+            materialize_lazy_sheets(new_post_state, [
+                sheet_index for sheet_index, lazy_file in enumerate(self.post_state.lazy_files) if lazy_file is None
+            ])
+            self.post_state.restore_dfs(new_post_state.dfs)
+        else:
+            self.post_state.restore_dfs(self.prev_state.dfs)
 
     def get_column_headers_by_ids(self, sheet_index: int, column_ids: List[ColumnID]) -> List[Any]:
         """
@@ -220,3 +250,146 @@ class Step:
         return self.final_defined_state.column_ids.get_column_id_by_header(sheet_index, column_header)
 
 
+def get_num_shared_steps(steps: List[Step], other_steps: List[Step]) -> int:
+    """
+    Returns the length of the longest prefix that the two step lists share.
+
+    NOTE: the steps lists that the StepsManager creates are made by adding
+    or removing steps from other step lists, so if the step at some index is
+    the same object in both lists, all the steps before it are the same too.
+    Thus, we only check the steps that are not shared.
+    """
+    num_shared_steps = min(len(steps), len(other_steps))
+    while num_shared_steps > 0 and steps[num_shared_steps - 1] is not other_steps[num_shared_steps - 1]:
+        num_shared_steps -= 1
+    return num_shared_steps
+
+
+class StepSkipIndex:
+    """
+    The StepSkipIndex keeps track of which steps in a list of steps are
+    skipped, as steps are appended to or popped off the end of this list.
+
+    A step skips the steps before it if:
+    1. This step is a filter step that is trying to replace an older filter step
+    2. This step has the same id as any step before it (like for pivot tables)
+    3. This step is a formula step overwriting the step that came just before it
+
+    Rather than checking every step before a new step, we keep the last filter
+    step on each column, and the steps that are not skipped yet for each step 
+    id, so that appending a step takes constant amortized time. Each append
+    also records how to undo it, so popping a step takes constant time too.
+    """
+
+    def __init__(self, steps: Optional[List[Step]]=None):
+        self.steps: List[Step] = []
+        # A mapping from a skipped step index to the index of the first step that skips it
+        self.skipped_by: Dict[int, int] = dict()
+
+        self.last_filter_step_index: Dict[Tuple[int, ColumnID], int] = dict()
+        # For each step id, the indexes of the non-filter and filter steps with that id that are not skipped for having it
+        self.unskipped_step_indexes_by_id: Dict[str, Tuple[List[int], List[int]]] = dict()
+
+        # For each step, the functions that undo the changes appending it made
+        self.undo_functions: List[List[Callable[[], None]]] = []
+
+        if steps is not None:
+            for step in steps:
+                self.append(step)
+
+    def append(self, step: Step) -> None:
+        step_index = len(self.steps)
+        undo_functions: List[Callable[[], None]] = []
+
+        def skip(skipped_step_index: int) -> None:
+            if skipped_step_index not in self.skipped_by:
+                self.skipped_by[skipped_step_index] = step_index
+                undo_functions.append(lambda: self.skipped_by.__delitem__(skipped_step_index))
+
+        def set_value(d: Dict[Any, Any], key: Any, value: Any) -> None:
+            if key in d:
+                old_value = d[key]
+                undo_functions.append(lambda: d.__setitem__(key, old_value))
+            else:
+                undo_functions.append(lambda: d.__delitem__(key))
+            d[key] = value
+
+        is_filter = step.step_type == FilterStepPerformer.step_type()
+
+        # Check (1)
+        if is_filter:
+            filter_key = (step.params['sheet_index'], step.params['column_id'])
+            if filter_key in self.last_filter_step_index:
+                skip(self.last_filter_step_index[filter_key])
+            set_value(self.last_filter_step_index, filter_key, step_index)
+
+        # Check (2), noting that filter steps do not skip filter steps with the same 
+        # id unless they are on the same column, which (1) handles
+        non_filter_step_indexes, filter_step_indexes = self.unskipped_step_indexes_by_id.get(step.step_id, ([], []))
+        for skipped_step_index in non_filter_step_indexes:
+            skip(skipped_step_index)
+        if is_filter:
+            filter_step_indexes.append(step_index)
+            undo_functions.append(lambda: filter_step_indexes.__delitem__(-1))
+            set_value(self.unskipped_step_indexes_by_id, step.step_id, ([], filter_step_indexes))
+        else:
+            for skipped_step_index in filter_step_indexes:
+                skip(skipped_step_index)
+            set_value(self.unskipped_step_indexes_by_id, step.step_id, ([step_index], []))
+
+        # Check (3)
+        if step.step_type == SetColumnFormulaStepPerformer.step_type() and step_index > 0:
+            previous_step = self.steps[-1]
+            if previous_step.step_type == step.step_type \
+                and previous_step.params['sheet_index'] == step.params['sheet_index'] \
+                and previous_step.params['column_id'] == step.params['column_id']:
+                skip(step_index - 1)
+
+        self.steps.append(step)
+        self.undo_functions.append(undo_functions)
+
+    def pop(self) -> Step:
+        for undo_function in reversed(self.undo_functions.pop()):
+            undo_function()
+        return self.steps.pop()
+
+    def update(self, steps: List[Step]) -> Set[int]:
+        """
+        Updates the index to the given steps, by popping the steps that are not 
+        shared with the current steps, and then appending the new steps.
+
+        Returns the step indexes that are newly skipped or are no longer skipped.
+        """
+        num_shared_steps = get_num_shared_steps(self.steps, steps)
+        
+        changed_step_indexes: Set[int] = set()
+        while len(self.steps) > num_shared_steps:
+            changed_step_indexes.update(
+                skipped_step_index for skipped_step_index, step_index in self.skipped_by.items()
+                if step_index == len(self.steps) - 1
+            )
+            self.pop()
+
+        for step in steps[num_shared_steps:]:
+            num_skipped_steps = len(self.skipped_by)
+            self.append(step)
+            if len(self.skipped_by) > num_skipped_steps:
+                changed_step_indexes.update(
+                    skipped_step_index for skipped_step_index, step_index in self.skipped_by.items()
+                    if step_index == len(self.steps) - 1
+                )
+        
+        return changed_step_indexes
+
+    def get_step_indexes_to_skip(self, num_steps: Optional[int]=None) -> Set[int]:
+        """
+        Returns the indexes of the steps that are skipped. If num_steps is
+        passed, returns the steps that are skipped by only the first num_steps
+        steps.
+        """
+        if num_steps is None or num_steps >= len(self.steps):
+            return set(self.skipped_by.keys())
+        return {
+            skipped_step_index for skipped_step_index, step_index in self.skipped_by.items() 
+            if step_index < num_steps
+        }
@@ -10,6 +10,7 @@ from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.add_column_code_chunk import AddColumnCodeChunk
 
 from mitosheet.errors import make_column_exists_error, make_no_sheet_error
+from mitosheet.evaluation_graph_utils import add_column_to_evaluation_graph
 from mitosheet.state import FORMAT_DEFAULT, State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.transpiler.transpile_utils import column_header_to_transpiled_code
@@ -51,7 +52,7 @@ class AddColumnStepPerformer(StepPerformer):
             raise make_column_exists_error(column_header)
 
         # We add a new step with the added column
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         # If the column_header_index is out of range, then make the new column the last column
         if column_header_index < 0 or len(prev_state.dfs[sheet_index].columns) <= column_header_index:
@@ -62,6 +63,7 @@ class AddColumnStepPerformer(StepPerformer):
         post_state.column_spreadsheet_code[sheet_index][column_id] = '=0'
         post_state.column_filters[sheet_index][column_id] = {'operator': 'And', 'filters': []}
         post_state.column_format_types[sheet_index][column_id] = {'type': FORMAT_DEFAULT}
+        add_column_to_evaluation_graph(post_state, sheet_index, column_id)
             
         # Update the dataframe
         pandas_start_time = perf_counter()
@@ -93,4 +95,12 @@ class AddColumnStepPerformer(StepPerformer):
         column_header_index: int,
         **params
     ) -> Set[int]:
+        return {sheet_index}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
         return {sheet_index}
\ No newline at end of file
@@ -12,6 +12,7 @@ from mitosheet.code_chunks.step_performers.column_steps.change_column_dtype_code
 from mitosheet.code_chunks.step_performers.column_steps.refresh_dependant_columns_code_chunk import RefreshDependantColumnsCodeChunk
 
 from mitosheet.errors import get_recent_traceback, make_invalid_column_type_change_error
+from mitosheet.evaluation_graph_utils import topological_sort_dependent_columns
 from mitosheet.sheet_functions.types import to_int_series
 from mitosheet.sheet_functions.types.to_boolean_series import to_boolean_series
 from mitosheet.sheet_functions.types.to_float_series import to_float_series
@@ -65,13 +66,18 @@ class ChangeColumnDtypeStepPerformer(StepPerformer):
         new_dtype: str,
         **params
     ) -> Tuple[State, Optional[Dict[str, Any]]]:
-        # Create the post state
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        # Create the post state, copying only the columns that get rewritten
+        post_state = prev_state.copy(column_ids_to_copy={
+            sheet_index: topological_sort_dependent_columns(prev_state, sheet_index, column_id)
+        })
 
         column_header = prev_state.column_ids.get_column_header_by_id(sheet_index, column_id)
         
         column: pd.Series = prev_state.dfs[sheet_index][column_header]
         new_column = column
+
+        # We save the datetime format we guess, so we can transpile without rereading the column
+        datetime_format = None
         
         # How we handle the type conversion depends on what type it is
         try:
@@ -206,7 +212,8 @@ class ChangeColumnDtypeStepPerformer(StepPerformer):
             refresh_dependant_columns(post_state, post_state.dfs[sheet_index], sheet_index, column_id)
 
             return post_state, {
-                'pandas_processing_time': pandas_processing_time
+                'pandas_processing_time': pandas_processing_time,
+                'datetime_format': datetime_format
             }
         except:
             print(get_recent_traceback())
@@ -249,4 +256,12 @@ class ChangeColumnDtypeStepPerformer(StepPerformer):
         new_dtype: str,
         **params
     ) -> Set[int]:
+        return {sheet_index}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
         return {sheet_index}
\ No newline at end of file
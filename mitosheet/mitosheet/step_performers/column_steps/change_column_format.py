@@ -38,8 +38,8 @@ class ChangeColumnFormatStepPerformer(StepPerformer):
         **params
     ) -> Tuple[State, Optional[Dict[str, Any]]]:
 
-        # Make a post state, that is a deep copy
-        post_state = prev_state.copy()
+        # Make a post state, copying the metadata of the modified sheet
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         # Actually update the format of the columns
         for column_id in column_ids:
@@ -78,6 +78,21 @@ class ChangeColumnFormatStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
+    @classmethod
+    def get_materialized_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only changes the metadata
+
 def update_column_id_format(
     post_state: State,
     sheet_index: int,
@@ -12,7 +12,7 @@ from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk
 from mitosheet.errors import make_invalid_column_delete_error
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
-from mitosheet.evaluation_graph_utils import create_column_evaluation_graph, topological_sort_columns
+from mitosheet.evaluation_graph_utils import delete_column_from_evaluation_graph, get_column_evaluation_graph, topological_sort_columns
 from mitosheet.transpiler.transpile_utils import column_header_list_to_transpiled_code
 from mitosheet.types import ColumnID
 
@@ -43,8 +43,8 @@ class DeleteColumnStepPerformer(StepPerformer):
         **params
     ) -> Tuple[State, Optional[Dict[str, Any]]]:
 
-        # Make a post state, that is a deep copy
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        # Make a post state, copying the metadata of the modified sheet
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         # Actually delete the columns and update state
         post_state, pandas_processing_time = delete_column_ids(post_state, sheet_index, column_ids)
@@ -76,6 +76,14 @@ class DeleteColumnStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 def delete_column_ids(
     state: State,
     sheet_index: int,
@@ -87,7 +95,7 @@ def delete_column_ids(
     if not set(column_ids).issubset(set(state.column_ids.get_column_ids_map(sheet_index).keys())):
         raise make_invalid_column_delete_error(column_ids)
 
-    column_evaluation_graph = create_column_evaluation_graph(state, sheet_index)
+    column_evaluation_graph = get_column_evaluation_graph(state, sheet_index)
 
     # Put the columns in a topological sorting so we delete columns that reference
     # other columns in column_ids first, in order to avoid make_invalid_column_delete_error
@@ -122,7 +130,7 @@ def _delete_column_id(
     column_id: ColumnID
 ) -> Tuple[State, bool, float]:
     
-    column_evaluation_graph = create_column_evaluation_graph(state, sheet_index)
+    column_evaluation_graph = get_column_evaluation_graph(state, sheet_index)
     column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
 
     # Return False if there are any columns that currently rely on this column, 
@@ -141,9 +149,7 @@ def _delete_column_id(
     del state.column_format_types[sheet_index][column_id]
 
     # We also have to delete the places in the graph where this node is 
-    for dependents in column_evaluation_graph.values():
-        if column_id in dependents:
-            dependents.remove(column_id)
+    delete_column_from_evaluation_graph(state, sheet_index, column_id)
     # Clean up the IDs
     state.column_ids.delete_column_id(sheet_index, column_id)
     
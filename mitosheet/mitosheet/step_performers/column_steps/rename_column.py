@@ -12,7 +12,7 @@ from mitosheet.code_chunks.no_op_code_chunk import NoOpCodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.rename_columns_code_chunk import RenameColumnsCodeChunk
 
 from mitosheet.errors import make_column_exists_error
-from mitosheet.evaluation_graph_utils import create_column_evaluation_graph
+from mitosheet.evaluation_graph_utils import get_column_evaluation_graph
 from mitosheet.parser import safe_replace
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
@@ -60,7 +60,7 @@ class RenameColumnStepPerformer(StepPerformer):
             return prev_state, None
 
         # Create a new post state for this step
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         old_level_value, pandas_processing_time = rename_column_headers_in_state(
             post_state,
@@ -116,6 +116,14 @@ class RenameColumnStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 
 def rename_column_headers_in_state(
         post_state: State,
@@ -132,7 +140,7 @@ def rename_column_headers_in_state(
 
     # Save original column headers and eval graph, so we can use them below
     original_column_headers = list(post_state.dfs[sheet_index].keys())
-    column_evaluation_graph = create_column_evaluation_graph(post_state, sheet_index)
+    column_evaluation_graph = get_column_evaluation_graph(post_state, sheet_index)
 
     # If the level is not set, just do a simple rename
     post_state.dfs[sheet_index].rename(columns={old_column_header: new_column_header}, inplace=True)
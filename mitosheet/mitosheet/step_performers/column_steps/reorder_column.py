@@ -61,7 +61,7 @@ class ReorderColumnStepPerformer(StepPerformer):
         new_column_index = get_valid_index(prev_state.dfs, sheet_index, new_column_index)
             
         # Create a new post state
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         # Actually execute the column reordering
         pandas_start_time = perf_counter()
@@ -100,6 +100,14 @@ class ReorderColumnStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 
 def _execute_reorder_column(df: pd.DataFrame, column_header: ColumnHeader, new_column_index: int) -> pd.DataFrame:
     """
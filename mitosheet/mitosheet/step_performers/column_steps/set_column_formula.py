@@ -14,11 +14,11 @@ from mitosheet.errors import (MitoError, make_circular_reference_error,
                               make_execution_error, make_no_column_error,
                               make_operator_type_error,
                               make_unsupported_function_error)
-from mitosheet.parser import parse_formula
+from mitosheet.parser import parse_and_compile_formula, parse_formula
 from mitosheet.sheet_functions import FUNCTIONS
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
-from mitosheet.evaluation_graph_utils import (create_column_evaluation_graph, creates_circularity, topological_sort_dependent_columns)
+from mitosheet.evaluation_graph_utils import (creates_circularity, get_column_evaluation_graph, topological_sort_dependent_columns, update_column_dependencies_in_evaluation_graph)
 from mitosheet.types import ColumnHeader, ColumnID
 
 
@@ -100,7 +100,7 @@ class SetColumnFormulaStepPerformer(StepPerformer):
         _, _, old_dependencies_column_headers = parse_formula(old_formula, column_header, column_headers)
         old_dependencies = set(prev_state.column_ids.get_column_ids(sheet_index, old_dependencies_column_headers))
 
-        column_evaluation_graph = create_column_evaluation_graph(prev_state, sheet_index)
+        column_evaluation_graph = get_column_evaluation_graph(prev_state, sheet_index)
 
         # Before changing any variables, we make sure this edit didn't
         # introduct any circularity
@@ -113,12 +113,15 @@ class SetColumnFormulaStepPerformer(StepPerformer):
         if circularity:
             raise make_circular_reference_error(error_modal=False)
 
-        # We check out a new step
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        # We check out a new step, copying only the columns that get recalculated
+        post_state = prev_state.copy(column_ids_to_copy={
+            sheet_index: topological_sort_dependent_columns(prev_state, sheet_index, column_id)
+        })
 
         # Update the column formula, and then execute the new formula graph
         try:
             post_state.column_spreadsheet_code[sheet_index][column_id] = new_formula
+            update_column_dependencies_in_evaluation_graph(post_state, sheet_index, column_id, old_dependencies, new_dependencies)
             pandas_start_time = perf_counter()
             refresh_dependant_columns(post_state, post_state.dfs[sheet_index], sheet_index, column_id)
             pandas_processing_time = perf_counter() - pandas_start_time
@@ -159,6 +162,14 @@ class SetColumnFormulaStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 
 
 def _get_fixed_invalid_formula(
@@ -261,7 +272,7 @@ def refresh_dependant_columns(post_state: State, df: pd.DataFrame, sheet_index:
             continue
 
         column_header = post_state.column_ids.get_column_header_by_id(sheet_index, column_id)
-        python_code, _, _ = parse_formula(
+        compiled_code, _ = parse_and_compile_formula(
             post_state.column_spreadsheet_code[sheet_index][column_id], 
             column_header,
             column_headers
@@ -271,7 +282,7 @@ def refresh_dependant_columns(post_state: State, df: pd.DataFrame, sheet_index:
         # See explination here: https://www.tutorialspoint.com/exec-in-python
         try:
             exec(
-                python_code,
+                compiled_code,
                 {'df': df}, 
                 FUNCTIONS
             )
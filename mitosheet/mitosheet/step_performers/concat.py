@@ -81,3 +81,11 @@ class ConcatStepPerformer(StepPerformer):
         sheet_indexes: List[int],
     ) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_indexes: List[int],
+        **params
+    ) -> Optional[Set[int]]:
+        return set(sheet_indexes)
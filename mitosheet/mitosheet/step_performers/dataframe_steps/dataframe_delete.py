@@ -48,9 +48,11 @@ class DataframeDeleteStepPerformer(StepPerformer):
         post_state.column_spreadsheet_code.pop(sheet_index)
         post_state.column_filters.pop(sheet_index)
         post_state.column_format_types.pop(sheet_index)
+        post_state.column_evaluation_graph.pop(sheet_index)
         post_state.dfs.pop(sheet_index)
         post_state.df_names.pop(sheet_index)
         post_state.df_sources.pop(sheet_index)
+        post_state.lazy_files.pop(sheet_index)
 
         return post_state, {
             'pandas_processing_time': 0 # No time spent on pandas, only metadata changes
@@ -86,3 +88,18 @@ class DataframeDeleteStepPerformer(StepPerformer):
         **params
     ) -> Set[int]:
         return set() # Redo all of them, as order shifts
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
+    @classmethod
+    def get_materialized_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only removes the sheet
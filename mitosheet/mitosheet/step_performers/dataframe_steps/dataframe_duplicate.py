@@ -43,7 +43,8 @@ class DataframeDuplicateStepPerformer(StepPerformer):
 
         # Execute the step
         pandas_start_time = perf_counter()
-        df_copy = post_state.dfs[sheet_index].copy(deep=True)
+        # As states are copy-on-write, the duplicate can share its column buffers
+        df_copy = post_state.dfs[sheet_index].copy(deep=False)
         pandas_processing_time = perf_counter() - pandas_start_time
         new_name = get_first_unused_dataframe_name(post_state.df_names, post_state.df_names[sheet_index] + '_copy')
 
@@ -83,3 +84,11 @@ class DataframeDuplicateStepPerformer(StepPerformer):
         **params
     ) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
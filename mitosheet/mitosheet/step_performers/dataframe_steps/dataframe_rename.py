@@ -76,4 +76,11 @@ class DataframeRenameStepPerformer(StepPerformer):
         new_dataframe_name: str,
         **params
     ) -> Set[int]:
-        return {sheet_index}
\ No newline at end of file
+        return {sheet_index}
+
+    @classmethod
+    def get_materialized_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only changes the name
\ No newline at end of file
@@ -52,7 +52,7 @@ class DropDuplicatesStepPerformer(StepPerformer):
             return None
 
         # We make a new state to modify it
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         pandas_start_time = perf_counter()
         final_df = post_state.dfs[sheet_index].drop_duplicates(
@@ -88,3 +88,11 @@ class DropDuplicatesStepPerformer(StepPerformer):
         **params
     ) -> Set[int]:
         return {sheet_index}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
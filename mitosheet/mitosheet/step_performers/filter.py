@@ -97,7 +97,7 @@ class FilterStepPerformer(StepPerformer):
         )
 
         # If no errors we create a new step for this filter
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         # Execute the filter
         final_df, pandas_processing_time = _execute_filter(
@@ -106,8 +106,7 @@ class FilterStepPerformer(StepPerformer):
         post_state.dfs[sheet_index] = final_df
 
         # Keep track of which columns are filtered
-        post_state.column_filters[sheet_index][column_id]["operator"] = operator
-        post_state.column_filters[sheet_index][column_id]["filters"] = filters
+        post_state.column_filters[sheet_index][column_id] = {'operator': operator, 'filters': filters}
 
         return post_state, {
             'pandas_processing_time': pandas_processing_time
@@ -132,6 +131,14 @@ class FilterStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 
 def get_applied_filter(
     df: pd.DataFrame, column_header: ColumnHeader, filter_: Dict[str, Any]
@@ -210,3 +210,11 @@ class GraphStepPerformer(StepPerformer):
     @classmethod
     def get_modified_dataframe_indexes(cls, graph_creation, **params) -> Set[int]:  # type: ignore
         return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        graph_creation: Dict[str, Any],
+        **params
+    ) -> Optional[Set[int]]:
+        return {graph_creation['sheet_index']}
@@ -84,3 +84,10 @@ class GraphDuplicateStepPerformer(StepPerformer):
         **params
     ) -> Set[int]:
         return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only reads the graph data
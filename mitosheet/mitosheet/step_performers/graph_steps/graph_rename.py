@@ -85,4 +85,11 @@ class GraphRenameStepPerformer(StepPerformer):
         new_graph_tab_name: str,
         **params
     ) -> Set[int]:
-        return {-1}
\ No newline at end of file
+        return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only reads the graph data
\ No newline at end of file
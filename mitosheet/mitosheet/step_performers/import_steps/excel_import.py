@@ -3,17 +3,23 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-from copy import copy
 from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple
+from xml.etree import ElementTree
+import zipfile
 import pandas as pd
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.excel_import_code_chunk import ExcelImportCodeChunk
 
+from mitosheet.dtype_optimization import optimize_imported_dtypes
 from mitosheet.utils import get_valid_dataframe_name
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
 from mitosheet.step_performers.step_performer import StepPerformer
 
+# The engine that pd.read_excel uses to read Excel files. See set_excel_import_engine
+DEFAULT_EXCEL_IMPORT_ENGINE = 'openpyxl'
+EXCEL_IMPORT_ENGINE = DEFAULT_EXCEL_IMPORT_ENGINE
+
 
 class ExcelImportStepPerformer(StepPerformer):
     """
@@ -55,11 +61,19 @@ class ExcelImportStepPerformer(StepPerformer):
         if not has_headers:
             read_excel_params['header'] = None
 
+        engine = get_excel_import_engine()
+
         pandas_start_time = perf_counter()
-        df_dictonary = pd.read_excel(file_name, **read_excel_params, engine='openpyxl') 
+        df_dictonary = pd.read_excel(file_name, engine=engine, **read_excel_params)
         pandas_processing_time = perf_counter() - pandas_start_time
 
+        sheet_dtypes = []
+        num_bytes_saved = 0
         for sheet_name, df in df_dictonary.items():
+            df, optimized_dtypes, df_num_bytes_saved = optimize_imported_dtypes(df)
+            sheet_dtypes.append(optimized_dtypes)
+            num_bytes_saved += df_num_bytes_saved
+
             post_state.add_df_to_state(
                 df, 
                 DATAFRAME_SOURCE_IMPORTED, 
@@ -67,6 +81,9 @@ class ExcelImportStepPerformer(StepPerformer):
             )
 
         return post_state, {
+            'engine': engine,
+            'sheet_dtypes': sheet_dtypes,
+            'num_bytes_saved': num_bytes_saved,
             'pandas_processing_time': pandas_processing_time
         }
 
@@ -91,4 +108,77 @@ class ExcelImportStepPerformer(StepPerformer):
         use_deprecated_id_algorithm: bool=False,
         **params
     ) -> Set[int]:
-        return {-1} # changes the new dataframe(s - there might be multiple made in this step)
\ No newline at end of file
+        return {-1} # changes the new dataframe(s - there might be multiple made in this step)
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only reads the file
+
+def set_excel_import_engine(engine: Optional[str]) -> None:
+    """
+    Sets the engine that pd.read_excel uses to read imported Excel files. Pass 'calamine'
+    to read files with python-calamine, which is much faster than openpyxl for large 
+    files. If python-calamine is not installed, or pandas is older than 2.2, files are
+    read with openpyxl instead.
+
+    NOTE: the generated code uses the same engine as the import.
+
+    Pass None to go back to openpyxl.
+    """
+    global EXCEL_IMPORT_ENGINE
+    EXCEL_IMPORT_ENGINE = engine if engine is not None else DEFAULT_EXCEL_IMPORT_ENGINE
+
+
+def get_excel_import_engine() -> str:
+    """
+    Returns the engine that imports read Excel files with.
+    """
+    if EXCEL_IMPORT_ENGINE == 'calamine' and not is_calamine_excel_engine_available():
+        return DEFAULT_EXCEL_IMPORT_ENGINE
+    return EXCEL_IMPORT_ENGINE
+
+
+def is_calamine_excel_engine_available() -> bool:
+    try:
+        import python_calamine
+    except ImportError:
+        return False
+    # The calamine engine was added to pd.read_excel in pandas 2.2
+    return tuple(int(part) for part in pd.__version__.split('.')[:2] if part.isdigit()) >= (2, 2)
+
+
+def get_excel_sheet_names(file_name: str) -> List[str]:
+    """
+    Returns the names of the worksheets in the Excel file at file_name, in order, 
+    by only reading the workbook XML of the file, rather than opening the workbook. 
+    If the file is not an XLSX file, opens the workbook to get its sheet names.
+    """
+    try:
+        with zipfile.ZipFile(file_name) as excel_zip:
+            workbook = ElementTree.fromstring(excel_zip.read('xl/workbook.xml'))
+            relationships = ElementTree.fromstring(excel_zip.read('xl/_rels/workbook.xml.rels'))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        with pd.ExcelFile(file_name, engine=get_excel_import_engine()) as excel_file:
+            return excel_file.sheet_names
+
+    relationship_types = {
+        relationship.attrib.get('Id'): relationship.attrib.get('Type', '') for relationship in relationships
+    }
+
+    sheet_names = []
+    for sheet in workbook.iter():
+        if get_xml_local_name(sheet.tag) != 'sheet':
+            continue
+        relationship_id = next((value for key, value in sheet.attrib.items() if get_xml_local_name(key) == 'id'), None)
+        # Like pandas, we skip sheets that are not worksheets, like chartsheets
+        if relationship_types.get(relationship_id, '').endswith('/worksheet'):
+            sheet_names.append(sheet.attrib['name'])
+    return sheet_names
+
+
+def get_xml_local_name(name: str) -> str:
+    # Removes the {namespace} from the front of a tag or attribute name
+    return name.rsplit('}', 1)[-1]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+import os
+from os.path import basename, normpath
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+import pandas as pd
+from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.code_chunks.step_performers.import_steps.parquet_import_code_chunk import (
+    ParquetImportCodeChunk, get_read_parquet_params, is_feather_file)
+
+from mitosheet.errors import make_invalid_import_filter_error, make_missing_parquet_engine_error
+from mitosheet.utils import get_valid_dataframe_name
+from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
+from mitosheet.step_performers.step_performer import StepPerformer
+
+
+class ParquetImportStepPerformer(StepPerformer):
+    """
+    Imports a Parquet file, a directory of Parquet files (a dataset),
+    or a Feather file, with the given file_name.
+
+    Only the given columns are read, if any are given. Filters are a
+    list of [column, operator, value], and only the rows that match all
+    the filters are read. pyarrow skips the row groups of a Parquet file
+    whose statistics show that none of their rows match the filters,
+    so large files with selective filters are read much faster.
+    """
+
+    @classmethod
+    def step_version(cls) -> int:
+        return 1
+
+    @classmethod
+    def step_type(cls) -> str:
+        return 'parquet_import'
+
+    @classmethod
+    def saturate(cls, prev_state: State, params: Dict[str, Any]) -> Dict[str, Any]:
+        return params
+
+    @classmethod
+    def execute( # type: ignore
+        cls,
+        prev_state: State,
+        file_name: str,
+        columns: Optional[List[str]]=None,
+        filters: Optional[List[List[Any]]]=None,
+        **params
+    ) -> Tuple[State, Optional[Dict[str, Any]]]:
+        # Create a new step
+        post_state = prev_state.copy()
+
+        pandas_start_time = perf_counter()
+        try:
+            if is_feather_file(file_name):
+                if filters is not None and len(filters) > 0:
+                    raise make_invalid_import_filter_error(file_name)
+                df = read_feather(file_name, columns=columns)
+            else:
+                df = pd.read_parquet(file_name, **get_read_parquet_params(columns, filters))
+        except ImportError:
+            # pandas raises an ImportError if the pyarrow engine is not installed
+            raise make_missing_parquet_engine_error(file_name)
+        pandas_processing_time = perf_counter() - pandas_start_time
+
+        post_state.add_df_to_state(
+            df,
+            DATAFRAME_SOURCE_IMPORTED,
+            df_name=get_valid_dataframe_name(post_state.df_names, get_parquet_file_df_name(file_name)),
+        )
+
+        return post_state, {
+            'pandas_processing_time': pandas_processing_time
+        }
+
+    @classmethod
+    def transpile(
+        cls,
+        prev_state: State,
+        post_state: State,
+        params: Dict[str, Any],
+        execution_data: Optional[Dict[str, Any]],
+    ) -> List[CodeChunk]:
+        return [
+            ParquetImportCodeChunk(prev_state, post_state, params, execution_data)
+        ]
+
+    @classmethod
+    def get_modified_dataframe_indexes( # type: ignore
+        cls,
+        file_name: str,
+        **params
+    ) -> Set[int]:
+        return {-1} # changes the new dataframe
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls,
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only reads the file
+
+
+def get_parquet_file_df_name(file_name: str) -> str:
+    # We don't put the file ending in the dataframe name
+    return os.path.splitext(basename(normpath(file_name)))[0]
+
+
+def read_feather(file_name: str, columns: Optional[List[str]]=None) -> pd.DataFrame:
+    """
+    Reads the Feather file at file_name the same way that pd.read_feather does,
+    except that the file is memory mapped rather than read into memory, as
+    pd.read_feather opens the file itself, and so cannot memory map it.
+    """
+    from pyarrow import feather
+    return feather.read_feather(file_name, columns=columns, use_threads=True, memory_map=True)
@@ -3,23 +3,65 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import codecs
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import csv
 import json
+import mmap
+import string
 from os.path import normpath, basename
 import os
 from copy import copy
+from threading import Lock
 from time import perf_counter
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import chardet
 import pandas as pd
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import SimpleImportCodeChunk
 
+from mitosheet.dtype_optimization import optimize_imported_dtypes
 from mitosheet.utils import get_valid_dataframe_names
 from mitosheet.errors import make_is_directory_error
+from mitosheet.lazy_file import LAZY_FILE_WINDOW_NUM_ROWS, LazyFile
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
 from mitosheet.step_performers.step_performer import StepPerformer
 
+# The most files that are read at the same time when importing multiple files
+MAX_IMPORT_WORKERS = 4
+
+# The size of the blocks we read files in when checking their encoding
+ENCODING_CHECK_BLOCK_SIZE = 1_000_000
+
+# We guess the delimeter and encoding of a file from the bytes at the start of the
+# file, and from a few windows of bytes spread through the rest of the file
+SNIFF_HEAD_BYTES = 64_000
+SNIFF_WINDOW_BYTES = 4_000
+NUM_SNIFF_WINDOWS = 3
+
+# We only use the encoding chardet guesses if it is at least this confident in it,
+# and otherwise read files that are not UTF-8 as latin-1
+MIN_ENCODING_CONFIDENCE = 0.5
+
+# The characters that can be guessed as delimeters, as letters and numbers are not delimeters
+SNIFF_DELIMETERS = string.punctuation + ' \t'
+
+# The delimeter and encoding that each file was read with, by the path, modified time
+# and size of the file, so that reading the same file again (e.g. when replaying an
+# analysis) does not guess them again. See read_csv_get_delimeter_and_encoding
+MAX_CACHED_DELIMETERS_AND_ENCODINGS = 128
+DELIMETER_AND_ENCODING_CACHE: "OrderedDict[Tuple[str, int, int], Tuple[str, str]]" = OrderedDict()
+DELIMETER_AND_ENCODING_CACHE_LOCK = Lock()
+
+# The engine that pd.read_csv uses to read CSV files, or None for the default engine. 
+# See set_csv_import_engine
+CSV_IMPORT_ENGINE: Optional[str] = None
+
+# Files with at least this many bytes are imported lazily, or None to read every file fully. 
+# See set_lazy_import_min_file_size
+LAZY_IMPORT_MIN_FILE_BYTES: Optional[int] = None
+
 
 class SimpleImportStepPerformer(StepPerformer):
     """
@@ -59,32 +101,54 @@ class SimpleImportStepPerformer(StepPerformer):
 
         file_delimeters = []
         file_encodings = []
+        file_dtypes = []
+        num_bytes_saved = 0
 
         just_final_file_names = [basename(normpath(file_name)) for file_name in file_names]
 
-        pandas_processing_time = 0.0
-        for file_name, df_name in zip(file_names, get_valid_dataframe_names(post_state.df_names, just_final_file_names)):
-            
-            partial_pandas_start_time = perf_counter()
-            df, delimeter, encoding = read_csv_get_delimeter_and_encoding(file_name)
-            pandas_processing_time += (perf_counter() - partial_pandas_start_time)
+        engine = get_csv_import_engine()
+
+        # We read the files at the same time, as reading a file mostly releases the GIL
+        pandas_start_time = perf_counter()
+        if len(file_names) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(file_names), MAX_IMPORT_WORKERS), thread_name_prefix='mito_import') as executor:
+                read_files = list(executor.map(lambda file_name: read_csv_or_lazy_file(file_name, engine=engine), file_names))
+        else:
+            read_files = [read_csv_or_lazy_file(file_name, engine=engine) for file_name in file_names]
+        pandas_processing_time = perf_counter() - pandas_start_time
+
+        for (df_or_lazy_file, delimeter, encoding), df_name in zip(read_files, get_valid_dataframe_names(post_state.df_names, just_final_file_names)):
 
             # Save the delimeter and encodings for transpiling
             file_delimeters.append(delimeter)
             file_encodings.append(encoding)
+
+            # A lazy file is added to the state with just the first rows of the file, and so we 
+            # cannot optimize its dtypes, as the rest of the file might not fit in them
+            if isinstance(df_or_lazy_file, LazyFile):
+                df, optimized_dtypes = df_or_lazy_file.window_df, None
+            else:
+                df, optimized_dtypes, df_num_bytes_saved = optimize_imported_dtypes(df_or_lazy_file)
+                num_bytes_saved += df_num_bytes_saved
+            file_dtypes.append(optimized_dtypes)
             
-            post_state.add_df_to_state(
+            sheet_index = post_state.add_df_to_state(
                 df, 
                 DATAFRAME_SOURCE_IMPORTED, 
                 df_name=df_name,
                 use_deprecated_id_algorithm=use_deprecated_id_algorithm
             )   
+            if isinstance(df_or_lazy_file, LazyFile):
+                post_state.lazy_files[sheet_index] = df_or_lazy_file
  
         # Save the renames that have occured in the step, for transpilation reasons
         # and also save the seperator that we used for each file
         return post_state, {
             'file_delimeters': file_delimeters,
             'file_encodings': file_encodings,
+            'file_engines': [engine for _ in file_names],
+            'file_dtypes': file_dtypes,
+            'num_bytes_saved': num_bytes_saved,
             'pandas_processing_time': pandas_processing_time
         }
 
@@ -109,52 +173,280 @@ class SimpleImportStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {-1} # changes the new dataframe(s - there might be multiple made in this step)
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        **params
+    ) -> Optional[Set[int]]:
+        return set() # only reads the files
+
+
+def set_csv_import_engine(engine: Optional[str]) -> None:
+    """
+    Sets the engine that pd.read_csv uses to read imported CSV files. Pass 'pyarrow'
+    to read files with multiple threads, which is much faster for large files. If
+    pyarrow is not installed, or pandas is older than 1.4, files are read with the
+    default engine instead.
+
+    NOTE: the pyarrow engine parses some columns to different dtypes than the default 
+    engine (e.g. dates), so the generated code uses the same engine as the import.
+
+    Pass None to go back to the default engine.
+    """
+    global CSV_IMPORT_ENGINE
+    CSV_IMPORT_ENGINE = engine
+
+
+def get_csv_import_engine() -> Optional[str]:
+    """
+    Returns the engine that imports read CSV files with, or None for the default.
+    """
+    if CSV_IMPORT_ENGINE == 'pyarrow' and not is_pyarrow_csv_engine_available():
+        return None
+    return CSV_IMPORT_ENGINE
+
+
+def is_pyarrow_csv_engine_available() -> bool:
+    try:
+        import pyarrow
+    except ImportError:
+        return False
+    # The pyarrow engine was added to pd.read_csv in pandas 1.4
+    return tuple(int(part) for part in pd.__version__.split('.')[:2] if part.isdigit()) >= (1, 4)
+
+
+def set_lazy_import_min_file_size(num_bytes: Optional[int]) -> None:
+    """
+    Sets the size in bytes from which imported CSV files, and CSV files passed
+    to mitosheet.sheet, are imported lazily. A lazy import only reads the first 
+    rows of the file, so the sheet is displayed right away, and the rest of the
+    file is read as the user scrolls, or in full once an edit needs all the rows.
+    See mitosheet/lazy_file.py.
+
+    NOTE: the number of rows is an estimate until the file is read fully, and
+    the delimeter and encoding are only guessed from the start of the file.
+
+    Pass None to read every file fully, which is the default.
+    """
+    global LAZY_IMPORT_MIN_FILE_BYTES
+    LAZY_IMPORT_MIN_FILE_BYTES = num_bytes
+
+
+def should_import_lazily(file_name: str) -> bool:
+    return LAZY_IMPORT_MIN_FILE_BYTES is not None and os.path.getsize(file_name) >= LAZY_IMPORT_MIN_FILE_BYTES
+
+
+def read_csv_or_lazy_file(file_name: str, engine: Optional[str]=None) -> Tuple[Union[pd.DataFrame, LazyFile], str, str]:
+    """
+    Reads the file with the given file_name lazily if it is large enough
+    to be imported lazily, and otherwise reads it fully.
+    """
+    if should_import_lazily(file_name):
+        return read_lazy_file_get_delimeter_and_encoding(file_name, engine=engine)
+    return read_csv_get_delimeter_and_encoding(file_name, engine=engine)
+
 
-def read_csv_get_delimeter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, str, str]:
+def read_lazy_file_get_delimeter_and_encoding(file_name: str, engine: Optional[str]=None) -> Tuple[LazyFile, str, str]:
+    """
+    Given a file_name, will read the first rows of the file as a CSV, and
+    return a lazy file for it, and the delimeter and encoding of the file.
+
+    Unlike read_csv_get_delimeter_and_encoding, we only check the start of 
+    the file is UTF-8, as checking the whole file would read all of it.
+    """
+    cache_key = get_delimeter_and_encoding_cache_key(file_name)
+    with DELIMETER_AND_ENCODING_CACHE_LOCK:
+        cached_delimeter_and_encoding = DELIMETER_AND_ENCODING_CACHE.get(cache_key)
+    if cached_delimeter_and_encoding is not None:
+        delimeter, encoding = cached_delimeter_and_encoding
+    else:
+        head, _ = read_sniff_sample(file_name)
+        encoding = 'default'
+        if not can_decode_sample(head, 'utf-8'):
+            guessed_encoding = guess_encoding(file_name)
+            encoding = guessed_encoding if guessed_encoding is not None and can_decode_sample(head, guessed_encoding) else 'latin-1'
+        delimeter = guess_delimeter(file_name, encoding=None if encoding == 'default' else encoding)
+
+    read_csv_params: Dict[str, Any] = {'sep': delimeter} if encoding == 'default' else {'sep': delimeter, 'encoding': encoding}
+    window_df = pd.read_csv(file_name, nrows=LAZY_FILE_WINDOW_NUM_ROWS, **read_csv_params)
+
+    cache_delimeter_and_encoding(cache_key, delimeter, encoding)
+    return LazyFile(file_name, read_csv_params, window_df, engine=engine), delimeter, encoding
+
+
+def read_csv_get_delimeter_and_encoding(file_name: str, engine: Optional[str]=None) -> Tuple[pd.DataFrame, str, str]:
     """
     Given a file_name, will read in the file as a CSV, and
     return the df, delimeter, and encoding of the file
+
+    We check if the file is UTF-8 before we read it, rather than reading
+    it and then reading it again if reading it failed, so that large files
+    are only ever parsed once. If the file was read before, and has not
+    changed since, we read it with the same delimeter and encoding.
     """
+    read_csv_kwargs = {'engine': engine} if engine is not None else {}
+
+    cache_key = get_delimeter_and_encoding_cache_key(file_name)
+    with DELIMETER_AND_ENCODING_CACHE_LOCK:
+        cached_delimeter_and_encoding = DELIMETER_AND_ENCODING_CACHE.get(cache_key)
+    if cached_delimeter_and_encoding is not None:
+        delimeter, encoding = cached_delimeter_and_encoding
+        if encoding == 'default':
+            df = pd.read_csv(file_name, sep=delimeter, **read_csv_kwargs)
+        else:
+            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding, **read_csv_kwargs)
+        return df, delimeter, encoding
+
     # We use 'default' instead of None to ensure that we log the encoding even when we don't need to set one.
     encoding = 'default'
     # Also set a default delemeter
     delimeter = ','
-    try:
-        # First attempt to read csv without specifying an encoding, just with a delimeter
+    if is_utf_8_file(file_name):
+        # If the file can be read without specifying an encoding, just use a delimeter
         delimeter = guess_delimeter(file_name)
-        df = pd.read_csv(file_name, sep=delimeter)
-    except UnicodeDecodeError:
-        # If we have an encoding error, try and get the encoding
+        df = pd.read_csv(file_name, sep=delimeter, **read_csv_kwargs)
+    else:
+        # Otherwise, try and get the encoding
         try: 
-            encoding = guess_encoding(file_name)
+            # Sometimes guess_encoding, guesses 'ascii' when we want 'latin-1', or 
+            # is not confident in any encoding, and so then we use latin-1
+            guessed_encoding = guess_encoding(file_name)
+            encoding = guessed_encoding if guessed_encoding is not None and can_decode_file(file_name, guessed_encoding) else 'latin-1'
             delimeter = guess_delimeter(file_name, encoding=encoding)
 
             # Read the file as dataframe 
-            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
+            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding, **read_csv_kwargs)
         except: 
-            # Sometimes guess_encoding, guesses 'ascii' when we want 'latin-1', 
-            # so if guess_encoding fails, we try latin-1
+            # If reading the file failed for any other reason, we try latin-1
             encoding = 'latin-1'
-            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
-        
+            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding, **read_csv_kwargs)
+
+    cache_delimeter_and_encoding(cache_key, delimeter, encoding)
     return df, delimeter, encoding
 
 
-def guess_delimeter(file_name: str, encoding: str=None) -> str:
+def get_delimeter_and_encoding_cache_key(file_name: str) -> Tuple[str, int, int]:
+    stat = os.stat(file_name)
+    return (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+
+
+def cache_delimeter_and_encoding(cache_key: Tuple[str, int, int], delimeter: str, encoding: str) -> None:
+    with DELIMETER_AND_ENCODING_CACHE_LOCK:
+        DELIMETER_AND_ENCODING_CACHE[cache_key] = (delimeter, encoding)
+        while len(DELIMETER_AND_ENCODING_CACHE) > MAX_CACHED_DELIMETERS_AND_ENCODINGS:
+            DELIMETER_AND_ENCODING_CACHE.popitem(last=False)
+
+
+def is_utf_8_file(file_name: str) -> bool:
+    """
+    Returns True if the file at file_name can be decoded as UTF-8, which
+    is the encoding pd.read_csv uses by default.
+    """
+    return can_decode_file(file_name, 'utf-8')
+
+
+def can_decode_file(file_name: str, encoding: Optional[str]) -> bool:
+    """
+    Returns True if the file at file_name can be decoded with the encoding. 
+    Reads the file in blocks, and stops at the first block that cannot be 
+    decoded, which is much faster than reading the file with pd.read_csv.
+    """
+    if encoding is None:
+        return False
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)()
+    except LookupError:
+        return False
+
+    with open(file_name, 'rb') as f:
+        try:
+            while True:
+                block = f.read(ENCODING_CHECK_BLOCK_SIZE)
+                decoder.decode(block, final=len(block) == 0)
+                if len(block) == 0:
+                    return True
+        except UnicodeDecodeError:
+            return False
+
+
+def can_decode_sample(sample: bytes, encoding: Optional[str]) -> bool:
+    """
+    Returns True if the sample from the start of a file can be decoded with the 
+    encoding, where the last character of the sample might be cut off.
+    """
+    if encoding is None:
+        return False
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
+def read_sniff_sample(file_name: str) -> Tuple[bytes, List[bytes]]:
+    """
+    Returns the first SNIFF_HEAD_BYTES bytes of the file, and NUM_SNIFF_WINDOWS 
+    windows of SNIFF_WINDOW_BYTES bytes spread evenly through the rest of the file, 
+    without reading the rest of the file.
+    """
+    with open(file_name, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size == 0:
+            # Empty files cannot be memory mapped
+            return b'', []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_map:
+            head = file_map[:SNIFF_HEAD_BYTES]
+            windows = []
+            for window_index in range(1, NUM_SNIFF_WINDOWS + 1):
+                # We start windows at even offsets, so they don't split the characters of UTF-16 files
+                window_start = (file_size * window_index // (NUM_SNIFF_WINDOWS + 1)) // 2 * 2
+                if window_start >= SNIFF_HEAD_BYTES:
+                    windows.append(file_map[window_start:window_start + SNIFF_WINDOW_BYTES])
+            return head, windows
+
+
+def guess_delimeter(file_name: str, encoding: Optional[str]=None) -> str:
     """
     Given a path to a file that is assumed to exist and be a CSV, this
-    function guesses the delimeter that is used by that file
+    function guesses the delimeter that is used by that file, from the 
+    complete lines at the start of the file. If there is no delimeter 
+    that is consistent across these lines, guesses from the first line,
+    and if there is no delimeter in the first line either (e.g. for a 
+    file with a single column), returns a comma.
     """
+    head, _ = read_sniff_sample(file_name)
+    text = head.decode(encoding if encoding is not None else 'utf-8', errors='ignore')
+    lines = text.splitlines(keepends=True)
+    if len(head) == SNIFF_HEAD_BYTES and len(lines) > 1:
+        # The last line might be cut off
+        lines = lines[:-1]
+
     s = csv.Sniffer()
-    with open(file_name, 'r', encoding=encoding) as f:
-        return s.sniff(f.readline()).delimiter
+    for sample in [''.join(lines), lines[0] if len(lines) > 0 else '']:
+        try:
+            return s.sniff(sample, delimiters=SNIFF_DELIMETERS).delimiter
+        except csv.Error:
+            pass
+    return ','
+
 
-def guess_encoding(file_name: str) -> str:
+def guess_encoding(file_name: str) -> Optional[str]:
     """
     Uses chardet to guess the encoding of the the file
-    at the given file_name
+    at the given file_name, from the start of the file
+    and from a few windows spread through the file.
+
+    Returns None if chardet is not confident in its guess, as any single 
+    byte encoding can decode any file, and so a wrong guess would silently
+    import the wrong characters.
     """
-    # Attempt to determine the encoding and try again. 
-    with open(file_name, 'rb') as f:
-        result = chardet.detect(f.readline())
-        return result['encoding']
+    head, windows = read_sniff_sample(file_name)
+    detector = chardet.UniversalDetector()
+    for sample in [head] + windows:
+        detector.feed(sample)
+        if detector.done:
+            break
+    result = detector.close()
+    if result['encoding'] is None or result['confidence'] < MIN_ENCODING_CONFIDENCE:
+        return None
+    return result['encoding']
@@ -109,6 +109,15 @@ class MergeStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {-1}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index_one: int,
+        sheet_index_two: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index_one, sheet_index_two}
+
 def _execute_merge(
         dfs: List[pd.DataFrame], 
         df_names: List[str],
@@ -166,6 +166,17 @@ class PivotStepPerformer(StepPerformer):
         if destination_sheet_index: # If editing an existing sheet, that is what is changed
             return {destination_sheet_index}
         return {-1}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        destination_sheet_index: Optional[int]=None,
+        **params
+    ) -> Optional[Set[int]]:
+        if destination_sheet_index is not None: # If editing an existing sheet, we overwrite it
+            return {sheet_index, destination_sheet_index}
+        return {sheet_index}
     
 def values_to_functions(values: Dict[ColumnHeader, Collection[str]]) -> Dict[ColumnHeader, List[Callable]]:
     """
@@ -15,8 +15,11 @@ from mitosheet.code_chunks.step_performers.set_cell_value_code_chunk import \
     SetCellValueCodeChunk
 from mitosheet.errors import (make_cast_value_to_type_error,
                               make_no_column_error)
+from mitosheet.evaluation_graph_utils import \
+    topological_sort_dependent_columns
 from mitosheet.sheet_functions.types import get_function_to_convert_to_series
-from mitosheet.sheet_functions.types.utils import (is_int_dtype, is_none_type,
+from mitosheet.sheet_functions.types.utils import (is_int_dtype, is_new_category,
+                                                   is_none_type,
                                                    is_number_dtype,
                                                    is_string_dtype)
 from mitosheet.state import State
@@ -77,7 +80,10 @@ class SetCellValueStepPerformer(StepPerformer):
         if old_value == new_value:
             return prev_state, None
 
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        # We only copy the columns that are written to, which is this column and its dependents
+        post_state = prev_state.copy(column_ids_to_copy={
+            sheet_index: topological_sort_dependent_columns(prev_state, sheet_index, column_id)
+        })
 
         column_header = post_state.column_ids.get_column_header_by_id(sheet_index, column_id)
 
@@ -89,6 +95,10 @@ class SetCellValueStepPerformer(StepPerformer):
         column_dtype = str(post_state.dfs[sheet_index][column_header].dtype)
         if new_value is not None and '.' in new_value and is_int_dtype(column_dtype):
             post_state.dfs[sheet_index][column_header] = post_state.dfs[sheet_index][column_header].astype('float')
+
+        # If the series is a category, but the new value is not one of the categories, add it to the categories before adding the new value
+        if type_corrected_new_value is not None and is_new_category(post_state.dfs[sheet_index][column_header], type_corrected_new_value):
+            post_state.dfs[sheet_index][column_header] = post_state.dfs[sheet_index][column_header].cat.add_categories([type_corrected_new_value])
         
         # Actually update the cell's value
         pandas_start_time = perf_counter()
@@ -140,6 +150,14 @@ class SetCellValueStepPerformer(StepPerformer):
     ) -> Set[int]:
         return {sheet_index}
 
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
+        return {sheet_index}
+
 
 def cast_value_to_type(value: Union[str, None], column_dtype: str) -> Optional[Any]:
     """
@@ -167,3 +185,4 @@ def cast_value_to_type(value: Union[str, None], column_dtype: str) -> Optional[A
         return type_corrected_new_value
     except:
         raise make_cast_value_to_type_error(value, column_dtype, error_modal=False)
+
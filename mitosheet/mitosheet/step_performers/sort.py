@@ -58,7 +58,7 @@ class SortStepPerformer(StepPerformer):
         column_header = prev_state.column_ids.get_column_header_by_id(sheet_index, column_id)
 
         # We make a new state to modify it
-        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+        post_state = prev_state.copy(modified_sheet_indexes=[sheet_index])
 
         try: 
             pandas_start_time = perf_counter()
@@ -102,4 +102,12 @@ class SortStepPerformer(StepPerformer):
         sort_direction: str,
         **params
     ) -> Set[int]:
+        return {sheet_index}
+
+    @classmethod
+    def get_read_dataframe_indexes( # type: ignore
+        cls, 
+        sheet_index: int,
+        **params
+    ) -> Optional[Set[int]]:
         return {sheet_index}
\ No newline at end of file
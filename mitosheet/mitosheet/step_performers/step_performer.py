@@ -90,4 +90,28 @@ class StepPerformer(ABC, object):
         If it returned -1, then it modified all new dataframes (on
         the left side of the dfs array).
         """
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def get_read_dataframe_indexes(cls, **params: Any) -> Optional[Set[int]]:
+        """
+        Returns a set of all the sheet indexes that this step reads
+        the data or metadata of when it executes, which must include 
+        every existing sheet that it modifies.
+
+        If it returns None, then this step reads every dataframe. This
+        is the default, and is always safe.
+        """
+        return None
+
+    @classmethod
+    def get_materialized_dataframe_indexes(cls, **params: Any) -> Optional[Set[int]]:
+        """
+        Returns a set of all the sheet indexes that this step reads all
+        the rows of, so the sheets backed by a lazy file must be read fully
+        before the step executes (see mitosheet/lazy_file.py).
+
+        If it returns None, then this step reads all the rows of every
+        dataframe. By default, this is the dataframes the step reads.
+        """
+        return cls.get_read_dataframe_indexes(**params)
\ No newline at end of file
@@ -9,45 +9,156 @@ import random
 import string
 import uuid
 from copy import copy, deepcopy
-from typing import Any, Collection, Dict, List, Set, Tuple, Union
+from threading import Lock
+from typing import (Any, Collection, Dict, List, Optional, Sequence, Set, Tuple,
+                    Union)
 
+import numpy as np
 import pandas as pd
 
+from mitosheet.api_result_cache import APIResultCache
+from mitosheet.code_chunks.code_chunk_utils import CodeChunksOptimizer
+from mitosheet.column_headers import ColumnIDMap
 from mitosheet.data_in_mito import DataTypeInMito, get_data_type_in_mito
+from mitosheet.lazy_file import LazyFile
 from mitosheet.mito_analytics import log
 from mitosheet.preprocessing import PREPROCESS_STEP_PERFORMERS
 from mitosheet.saved_analyses.save_utils import get_analysis_exists
+from mitosheet.search_index import SearchIndexCache
+from mitosheet.sheet_data import (DEFAULT_SHEET_DATA_WINDOW, RenderedSheetData,
+                                  SheetDataWindowCache, get_sheet_data_patch,
+                                  get_valid_sheet_data_window)
 from mitosheet.state import State
-from mitosheet.step import Step
+from mitosheet.step import Step, StepSkipIndex, get_num_shared_steps
 from mitosheet.step_performers import EVENT_TYPE_TO_STEP_PERFORMER
+from mitosheet.step_performers.dataframe_steps.dataframe_delete import \
+    DataframeDeleteStepPerformer
 from mitosheet.step_performers.import_steps.excel_import import \
     ExcelImportStepPerformer
+from mitosheet.step_performers.import_steps.parquet_import import \
+    ParquetImportStepPerformer
 from mitosheet.step_performers.import_steps.simple_import import \
     SimpleImportStepPerformer
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.updates import UPDATES
+from mitosheet.types import SheetDataWindow
 from mitosheet.user.utils import is_pro, is_running_test
-from mitosheet.utils import (dfs_to_array_for_json, get_new_id,
-                             is_default_df_names)
+from mitosheet.utils import get_new_id, is_default_df_names
 
 
 def get_step_indexes_to_skip(step_list: List[Step]) -> Set[int]:
     """
     Given a list of steps, will collect all of the steps
     from this list that should be skipped.
+
+    NOTE: the StepsManager keeps a StepSkipIndex of its steps up to date, 
+    which should be used instead where possible.
     """
-    step_indexes_to_skip: Set[int] = set()
+    return StepSkipIndex(step_list).get_step_indexes_to_skip()
 
-    for step_index, step in enumerate(step_list):
-        step_indexes_to_skip = step_indexes_to_skip.union(
-            step.step_indexes_to_skip(step_list[:step_index])
-        )
 
-    return step_indexes_to_skip
+def is_sheet_unchanged(state: State, other_state: State, sheet_index: int) -> bool:
+    """
+    Returns True if the sheet at sheet_index is the same in both states.
+
+    As states are copy-on-write, any step that changes a sheet makes new
+    metadata maps for that sheet, and so if the maps of a sheet are the 
+    same objects in both states, the dataframe is the same as well.
+    """
+    return state.column_ids.column_id_to_column_header[sheet_index] is other_state.column_ids.column_id_to_column_header[sheet_index] \
+        and state.column_spreadsheet_code[sheet_index] is other_state.column_spreadsheet_code[sheet_index] \
+        and state.column_filters[sheet_index] is other_state.column_filters[sheet_index] \
+        and state.column_format_types[sheet_index] is other_state.column_format_types[sheet_index] \
+        and state.df_names[sheet_index] == other_state.df_names[sheet_index] \
+        and state.df_sources[sheet_index] == other_state.df_sources[sheet_index] \
+        and state.lazy_files[sheet_index] is other_state.lazy_files[sheet_index]
+
+
+def get_reusable_post_state(step: Step, new_prev_state: State) -> Optional[State]:
+    """
+    Given a step that was executed before, and the new_prev_state it is about
+    to be reexecuted on, returns the post_state that reexecuting the step would
+    create, without executing it, if this is possible. Otherwise, returns None.
+
+    This is possible if the sheets that the step reads are unchanged between 
+    the prev_state it was executed on and the new_prev_state. In this case, the 
+    sheets the step modified are taken from its old post_state, and all other 
+    sheets are taken from the new_prev_state. 
+    
+    This means that when an earlier step is changed, only the steps that depend 
+    on the sheets it changed, directly or through other steps, are reexecuted.
+    """
+    old_prev_state = step.prev_state
+    old_post_state = step.post_state
+    if old_prev_state is None or old_post_state is None or old_post_state.dfs_evicted:
+        return None
+    
+    if len(new_prev_state.dfs) != len(old_prev_state.dfs):
+        return None
+
+    read_sheet_indexes = step.step_performer.get_read_dataframe_indexes(**step.params)
+    if read_sheet_indexes is None:
+        read_sheet_indexes = set(range(len(old_prev_state.dfs)))
+
+    for sheet_index in read_sheet_indexes:
+        if not is_sheet_unchanged(new_prev_state, old_prev_state, sheet_index):
+            return None
+
+    # If the step did nothing, it does nothing again
+    if old_post_state is old_prev_state:
+        return new_prev_state
+
+    # Graphs are not per sheet, so we can only reuse them if either this step or the 
+    # steps before it changed them
+    if old_post_state.graph_data_dict == old_prev_state.graph_data_dict:
+        graph_data_dict = new_prev_state.graph_data_dict
+    elif new_prev_state.graph_data_dict == old_prev_state.graph_data_dict:
+        graph_data_dict = old_post_state.graph_data_dict
+    else:
+        return None
+
+    # If the step deleted sheets, the sheet indexes shift, so we only reuse it if nothing changed
+    if len(old_post_state.dfs) < len(old_prev_state.dfs):
+        if all(is_sheet_unchanged(new_prev_state, old_prev_state, sheet_index) for sheet_index in range(len(old_prev_state.dfs))):
+            return old_post_state
+        return None
+
+    # New sheets get names that are unique among all the dataframe names
+    if len(old_post_state.dfs) > len(old_prev_state.dfs) and new_prev_state.df_names != old_prev_state.df_names:
+        return None
+
+    modified_sheet_indexes = {
+        sheet_index for sheet_index in range(len(old_prev_state.dfs)) 
+        if not is_sheet_unchanged(old_post_state, old_prev_state, sheet_index)
+    }
+    if not modified_sheet_indexes.issubset(read_sheet_indexes):
+        return None
+
+    # Then, we build the post state a sheet at a time, from the state that has the up to date sheet
+    sheet_states = [
+        old_post_state if sheet_index >= len(old_prev_state.dfs) or sheet_index in modified_sheet_indexes else new_prev_state
+        for sheet_index in range(len(old_post_state.dfs))
+    ]
+    column_ids = ColumnIDMap([])
+    column_ids.column_id_to_column_header = [state.column_ids.column_id_to_column_header[sheet_index] for sheet_index, state in enumerate(sheet_states)]
+    column_ids.column_header_to_column_id = [state.column_ids.column_header_to_column_id[sheet_index] for sheet_index, state in enumerate(sheet_states)]
+
+    return State(
+        [state.dfs[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        df_names=[state.df_names[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        df_sources=[state.df_sources[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        column_ids=column_ids,
+        column_spreadsheet_code=[state.column_spreadsheet_code[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        column_filters=[state.column_filters[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        column_format_types=[state.column_format_types[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        graph_data_dict=graph_data_dict,
+        column_evaluation_graph=[state.column_evaluation_graph[sheet_index] for sheet_index, state in enumerate(sheet_states)],
+        lazy_files=[state.lazy_files[sheet_index] for sheet_index, state in enumerate(sheet_states)]
+    )
 
 
 def execute_step_list_from_index(
-    step_list: List[Step], start_index: int = None
+    step_list: List[Step], start_index: int = None, step_indexes_to_skip: Optional[Set[int]] = None
 ) -> List[Step]:
     """
     Given a list of steps, and a specific index to start from, will assume that
@@ -58,13 +169,19 @@ def execute_step_list_from_index(
     means that the returned step list will only have valid prev_state/post_states
     for the steps that are not skipped.
 
-    If start_index is not given, will start from the initialize step.
+    Moreover, steps that only read sheets that are unchanged since they were last
+    executed are not reexecuted, and instead reuse their previous post_state for
+    the sheets they modified. See get_reusable_post_state.
+
+    If start_index is not given, will start from the initialize step. If the 
+    step_indexes_to_skip are not given, they are computed from the step_list.
     """
     if start_index is None or start_index < 0:
         start_index = 0
 
     # Get the steps to skip, so that we can skip them
-    step_indexes_to_skip = get_step_indexes_to_skip(step_list)
+    if step_indexes_to_skip is None:
+        step_indexes_to_skip = get_step_indexes_to_skip(step_list)
 
     # Get the steps that are valid, and the last valid step, so we can execute from there
     new_step_list = step_list[: start_index + 1]
@@ -78,12 +195,20 @@ def execute_step_list_from_index(
             new_step_list.append(step)
             continue
 
-        # Create a new step with the same params
-        new_step = Step(step.step_type, step.step_id, step.params)
+        new_prev_state = last_valid_step.final_defined_state
+
+        # If none of the sheets this step reads changed, we reuse its previous result
+        reusable_post_state = get_reusable_post_state(step, new_prev_state)
+        if reusable_post_state is not None:
+            new_step = Step(step.step_type, step.step_id, step.params, new_prev_state, reusable_post_state, step.execution_data)
+        else:
+            # Create a new step with the same params
+            new_step = Step(step.step_type, step.step_id, step.params)
 
-        # Set the previous state of the new step, and then update
-        # what the last valid step is
-        new_step.set_prev_state_and_execute(last_valid_step.final_defined_state)
+            # Set the previous state of the new step, and then execute it
+            new_step.set_prev_state_and_execute(new_prev_state)
+        
+        # Then update what the last valid step is
         last_valid_step = new_step
 
         new_step_list.append(new_step)
@@ -91,45 +216,29 @@ def execute_step_list_from_index(
     return new_step_list
 
 
-def get_modified_sheet_indexes(
-    steps: List[Step], starting_step_index: int, ending_step_index: int
-) -> Set[int]:
+def get_column_buffers(state: State) -> Dict[Any, int]:
     """
-    Returns a best guess for which sheets have been modified starting at
-    starting_step_index and ending at (and including) ending_step_index.
+    Returns a mapping from an identifier of each of the column buffers
+    in the dataframes of the state to the number of bytes in that buffer.
 
-    This is a best guess for caching reasons, and so may return sheets that
-    have in fact not been modified. If a sheet index has been modified, it should
-    always be returned.
-    """
-    # If only one step has been performed, we can calculate the modified sheet indexes,
-    # otherwise we just say all of them (undo, replay might interact weird)
-    if starting_step_index == ending_step_index - 1:
-        step = steps[ending_step_index]
-        modified_indexes = step.step_performer.get_modified_dataframe_indexes(
-            **step.params
-        )
+    As states are copy-on-write, the same buffer is often shared by many 
+    states, and so the memory used by a group of states is the total size 
+    of the union of their buffers. 
 
-        # If the set is empty, then we modified everything
-        if len(modified_indexes) == 0:
-            modified_indexes = {j for j in range(len(step.dfs))}
-        # If -1 is modified, then all new dataframes are modified, which
-        # if nothing new was created, means there was a live updated event,
-        # and so we should just take the last element
-        elif -1 in modified_indexes:
-            prev_step = steps[ending_step_index - 1]
-            modified_indexes.remove(-1)
-
-            if len(prev_step.dfs) != len(step.dfs):
-                modified_indexes.update(
-                    {j for j in range(len(prev_step.dfs), len(step.dfs))}
-                )
+    NOTE: for object columns, only the pointers are counted, so this is
+    a lower bound on the memory these columns use.
+    """
+    column_buffers: Dict[Any, int] = {}
+    for sheet_index, df in enumerate(state.dfs):
+        for column_index, (_, column) in enumerate(df.items()):
+            values = column.values
+            if isinstance(values, np.ndarray):
+                column_buffers[(values.__array_interface__['data'][0], values.nbytes)] = values.nbytes
             else:
-                modified_indexes.add(len(step.dfs) - 1)
-    else:
-        modified_indexes = {i for i in range(len(steps[ending_step_index].dfs))}
-
-    return modified_indexes
+                # Extension arrays don't expose a single buffer, so we count them as private to this state
+                column_buffers[(id(state), sheet_index, column_index)] = column.memory_usage(index=False, deep=False)
+    
+    return column_buffers
 
 
 class StepsManager:
@@ -163,13 +272,30 @@ class StepsManager:
     and parameters stay the same and are append-only.
     """
 
-    def __init__(self, args: Collection[Union[pd.DataFrame, str]], analysis_to_replay: str=None):
+    def __init__(
+            self, 
+            args: Collection[Union[pd.DataFrame, str]], 
+            analysis_to_replay: str=None, 
+            max_history_bytes: Optional[int]=None,
+            binary_sheet_data: bool=False,
+            copy: bool=True
+        ):
         """
         When initalizing the StepsManager, we also do preprocessing
         of the arguments that were passed to the mitosheet.
 
         All preprocessing can be found in mitosheet/preprocessing, and each of
         the transformations are applied before the data is considered imported.
+
+        If max_history_bytes is passed, the dataframes of historical steps are 
+        evicted to keep the memory of the step history under this bound, and are 
+        recreated when they are needed. See enforce_max_history_bytes.
+
+        If binary_sheet_data is True, the data of the columns that can be is sent
+        in binary buffers, rather than in the sheet data JSON. See sheet_data_patch_buffers.
+
+        If copy is False, the passed dataframes are not copied, and the initial state
+        instead has read-only views of them. See CopyPreprocessStepPerformer.
         """
         # We just randomly generate analysis names as a string of 10 letters
         self.analysis_name = 'id-' + ''.join(random.choice(string.ascii_lowercase) for _ in range(10))
@@ -180,9 +306,10 @@ class StepsManager:
         self.analysis_to_replay_exists = get_analysis_exists(analysis_to_replay)
 
         # The args are a tuple of dataframes or strings, and we start by making them
-        # into a list, and making copies of them for safe keeping
+        # into a list, and making copies of them for safe keeping, unless we were told
+        # not to copy the dataframes
         self.original_args = [
-            arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
+            (arg.copy(deep=True) if copy else arg) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
             for arg in args
         ]
 
@@ -190,14 +317,18 @@ class StepsManager:
         # saving any data that we need to transpilate it later this
         self.preprocess_execution_data = {}
         for preprocess_step_performers in PREPROCESS_STEP_PERFORMERS:
-            args, execution_data = preprocess_step_performers.execute(args)
+            args, execution_data = preprocess_step_performers.execute(args, copy=copy)
             self.preprocess_execution_data[
                 preprocess_step_performers.preprocess_step_type()
             ] = execution_data
 
-        # Then we initialize the analysis with just a simple initialize step
+        # Then we initialize the analysis with just a simple initialize step, where the 
+        # files that were read in lazily start with just their first rows
         self.steps: List[Step] = [
-            Step("initialize", "initialize", {}, None, State(args), {})
+            Step("initialize", "initialize", {}, None, State(
+                [arg.window_df if isinstance(arg, LazyFile) else arg for arg in args],
+                lazy_files=[arg if isinstance(arg, LazyFile) else None for arg in args]
+            ), {})
         ]
 
         """
@@ -220,15 +351,39 @@ class StepsManager:
         """
         self.undone_step_list_store: List[Tuple[str, List[Step]]] = []
 
+        # We keep track of which steps are skipped as steps are added and removed, 
+        # so we don't have to recompute this from all the steps
+        self.step_skip_index = StepSkipIndex(self.steps)
+
         # We display the state that exists after the curr_step_idx is applied,
         # which means you can never see before the initalize step
         self.curr_step_idx = 0
 
-        # We also cache some of the sheet data in a form suitable to turn
-        # into json, so that we can package it and send it to the front-end
-        # faster and with less work
-        self.saved_sheet_data: List[Dict] = []
-        self.last_step_index_we_wrote_sheet_json_on = 0
+        # The version of the sheet data we last sent to the front-end, the state and windows
+        # it was rendered from, and the rendered window of each sheet, so that we only send 
+        # the front-end a patch with what changed. See get_sheet_data_patch_json
+        self.sheet_data_version = 0
+        self.sent_sheet_data: Tuple[int, Optional[State], List[SheetDataWindow], List[RenderedSheetData]] = (0, None, [], [])
+        self.sheet_data_patch_buffers: List[List[bytes]] = []
+        self.binary_sheet_data = binary_sheet_data
+
+        # Optimizes the code of the steps, only optimizing the code of the steps that
+        # were added since the last time it optimized
+        self.code_chunks_optimizer = CodeChunksOptimizer()
+
+        # The window of each sheet that the front-end is displaying, which is the
+        # only part of the sheet that we send, and a cache of the rendered windows.
+        # NOTE: the windows are set by API calls, which run on another thread than 
+        # edits, so they are only read or changed while holding the lock
+        self.sheet_data_windows: Dict[int, SheetDataWindow] = {}
+        self.sheet_data_windows_lock = Lock()
+        self.sheet_data_window_cache = SheetDataWindowCache()
+
+        # A cache of the results of the API calls that summarize a column
+        self.api_result_cache = APIResultCache()
+
+        # The search index of the columns of the sheets, see search_index.py
+        self.search_index_cache = SearchIndexCache()
 
         # We store the number of update events that have been processed successfully,
         # which allows us to have some awareness about undos and redos in the front-end
@@ -240,6 +395,12 @@ class StepsManager:
         # that corresponds to that backend
         self.render_count = 0
 
+        # The bound on the bytes of the dataframes in the step history, if there is one, 
+        # and a count of how often we evicted and then recreated the dataframes of a state
+        self.max_history_bytes: Optional[int] = max_history_bytes
+        self.num_state_evictions = 0
+        self.num_state_rematerializations = 0
+
     @property
     def curr_step(self) -> Step:
         """
@@ -262,30 +423,124 @@ class StepsManager:
         sheet_json contains a serialized representation of the data
         frames that is then fed into the Endo in the front-end.
 
-        NOTE: we only display the _first_ 1,500 rows of the dataframe
-        for speed reasons. This results in way less data getting
-        passed around
+        NOTE: we only send the window of each sheet that the front-end 
+        is displaying, which by default is the first 1,500 rows and 
+        columns of the dataframe, for speed reasons. This results in 
+        way less data getting passed around
+
+        NOTE: we actually send the front-end patches to the sheet data
+        it already has, see get_sheet_data_patch_json.
         """
-        modified_sheet_indexes = get_modified_sheet_indexes(
-            self.steps, self.last_step_index_we_wrote_sheet_json_on, self.curr_step_idx
-        )
+        # NOTE: each window is already JSON, so we just put them in a list, 
+        # exactly as json.dumps would 
+        return '[' + ', '.join(
+            self.get_sheet_data_json(sheet_index) for sheet_index in range(len(self.curr_step.dfs))
+        ) + ']'
+
+    def get_sheet_data_patch_json(self) -> str:
+        """
+        Returns a patch that turns the sheet data that we last sent to the front-end
+        into the current sheet data, in the format:
+        {
+            version: number;
+            baseVersion: number | null;
+            sheetDataArray: (SheetData | null)[];
+        }
+        where the patch applies to the sheet data with version baseVersion, or has 
+        all of the sheet data if baseVersion is null. A sheet data that is null is 
+        unchanged, and otherwise only the columns that changed have their data, as 
+        described in get_sheet_data_patch. 
+        
+        If we send the sheet data in binary buffers, the buffers of each sheet are in 
+        sheet_data_patch_buffers.
 
-        array = dfs_to_array_for_json(
-            modified_sheet_indexes,
-            self.saved_sheet_data,
-            self.curr_step.dfs,
-            self.curr_step.df_names,
-            self.curr_step.df_sources,
-            self.curr_step.column_spreadsheet_code,
-            self.curr_step.column_filters,
-            self.curr_step.column_ids,
-            self.curr_step.column_format_types,
+        NOTE: the returned patch must be sent to the front-end, as the next patch
+        will apply to it.
+        """
+        state = self.curr_step.final_defined_state
+        sheet_data_windows = self.get_sheet_data_windows()
+        windows = [sheet_data_windows.get(sheet_index, DEFAULT_SHEET_DATA_WINDOW) for sheet_index in range(len(state.dfs))]
+        rendered_sheet_data_array = [
+            self.sheet_data_window_cache.get_rendered(state, sheet_index, window, binary=self.binary_sheet_data)
+            for sheet_index, window in enumerate(windows)
+        ]
+
+        base_version, _, _, previous_rendered_sheet_data_array = self.sent_sheet_data
+        patch_jsons = []
+        patch_buffers = []
+        for sheet_index, rendered_sheet_data in enumerate(rendered_sheet_data_array):
+            previous_rendered_sheet_data = previous_rendered_sheet_data_array[sheet_index] if sheet_index < len(previous_rendered_sheet_data_array) else None
+            sheet_data_patch, sheet_data_patch_buffers = get_sheet_data_patch(rendered_sheet_data, previous_rendered_sheet_data)
+            # If we send the entire sheet data, it is already JSON
+            patch_jsons.append(rendered_sheet_data[1] if sheet_data_patch is rendered_sheet_data[0] else json.dumps(sheet_data_patch))
+            patch_buffers.append(sheet_data_patch_buffers)
+
+        self.sheet_data_version += 1
+        self.sent_sheet_data = (self.sheet_data_version, state, windows, rendered_sheet_data_array)
+        self.sheet_data_patch_buffers = patch_buffers
+
+        return '{"version": %d, "baseVersion": %s, "sheetDataArray": [%s]}' % (
+            self.sheet_data_version, 
+            json.dumps(base_version if len(previous_rendered_sheet_data_array) > 0 else None), 
+            ', '.join(patch_jsons)
         )
 
-        self.saved_sheet_data = array
-        self.last_step_index_we_wrote_sheet_json_on = self.curr_step_idx
+    def get_sent_sheet_data_json(self) -> str:
+        """
+        Returns all of the sheet data that we last sent to the front-end, along with
+        its version, in the format {version: number; sheetDataArray: SheetData[]}. 
+        
+        The front-end uses this when it does not have the sheet data that a patch 
+        applies to, e.g. when the page is refreshed.
 
-        return json.dumps(array)
+        NOTE: the sheet data we last sent is for the checked out step, and so its
+        dataframes have not been evicted. 
+        """
+        version, state, windows, _ = self.sent_sheet_data
+        sheet_data_jsons = [
+            self.sheet_data_window_cache.get_json(state, sheet_index, window) for sheet_index, window in enumerate(windows)
+        ] if state is not None else []
+        return '{"version": %d, "sheetDataArray": [%s]}' % (version, ', '.join(sheet_data_jsons))
+
+    def get_sheet_data_windows(self) -> Dict[int, SheetDataWindow]:
+        with self.sheet_data_windows_lock:
+            return dict(self.sheet_data_windows)
+
+    def get_sheet_data_window(self, sheet_index: int) -> SheetDataWindow:
+        with self.sheet_data_windows_lock:
+            return self.sheet_data_windows.get(sheet_index, DEFAULT_SHEET_DATA_WINDOW)
+
+    def set_sheet_data_window(self, sheet_index: int, window: Sequence[int]) -> SheetDataWindow:
+        valid_window = get_valid_sheet_data_window(window)
+        with self.sheet_data_windows_lock:
+            self.sheet_data_windows[sheet_index] = valid_window
+        return valid_window
+
+    def get_sheet_data(self, sheet_index: int, window: Optional[Sequence[int]]=None) -> Dict[str, Any]:
+        """
+        Returns the sheet data for the window of the sheet at sheet_index in the
+        current step. If a window is passed, the front-end is now displaying this
+        window, and so we send it with the sheet data from now on.
+        """
+        if window is not None:
+            sheet_data_window = self.set_sheet_data_window(sheet_index, window)
+        else:
+            sheet_data_window = self.get_sheet_data_window(sheet_index)
+        return self.sheet_data_window_cache.get(
+            self.curr_step.final_defined_state, sheet_index, sheet_data_window
+        )
+
+    def get_sheet_data_json(self, sheet_index: int, window: Optional[Sequence[int]]=None) -> str:
+        """
+        The same as get_sheet_data, but returns the sheet data turned into JSON.
+        """
+        if window is not None:
+            sheet_data_window = self.set_sheet_data_window(sheet_index, window)
+        else:
+            sheet_data_window = self.get_sheet_data_window(sheet_index)
+        return self.sheet_data_window_cache.get_json(
+            self.curr_step.final_defined_state, sheet_index, sheet_data_window
+        )
 
     @property
     def analysis_data_json(self):
@@ -313,7 +568,7 @@ class StepsManager:
         the skipped steps
         """
         step_summary_list = []
-        step_indexes_to_skip = get_step_indexes_to_skip(self.steps)
+        step_indexes_to_skip = self.get_step_indexes_to_skip()
         for index, step in enumerate(self.steps):
             if step.step_type == "initialize":
                 step_summary_list.append(
@@ -330,22 +585,14 @@ class StepsManager:
             if index in step_indexes_to_skip:
                 continue
             
-            # NOTE: we cannot and should not optimize the code chunks here, as
-            # rely on getting data out of them is to label the steps correctly
-            code_chunks = step.step_performer.transpile(
-                step.prev_state, # type: ignore
-                step.post_state, # type: ignore
-                step.params,
-                step.execution_data,
-            )
-
+            step_display_name, step_description = step.get_summary()
             step_summary_list.append(
                 {
                     "step_id": step.step_id,
                     "step_idx": index,
                     "step_type": step.step_type,
-                    "step_display_name": code_chunks[0].get_display_name(),
-                    "step_description": code_chunks[0].get_description_comment(),
+                    "step_display_name": step_display_name,
+                    "step_description": step_description,
                 }
             )
 
@@ -373,8 +620,20 @@ class StepsManager:
 
         new_steps = self.steps + [new_step]
 
+        sheet_data_windows = self.get_sheet_data_windows()
         self.execute_and_update_steps(new_steps)
 
+        # If a dataframe was deleted, the sheets after it move down one sheet index, 
+        # and so their windows have to move with them
+        if new_step.step_type == DataframeDeleteStepPerformer.step_type():
+            deleted_sheet_index = new_step.params['sheet_index']
+            with self.sheet_data_windows_lock:
+                self.sheet_data_windows = {
+                    sheet_index if sheet_index < deleted_sheet_index else sheet_index - 1: window
+                    for sheet_index, window in sheet_data_windows.items()
+                    if sheet_index != deleted_sheet_index
+                }
+
         # If we add a new step, then we clear the last_undone_list_store, as
         # you cannot redo something after you make a new edit
         self.undone_step_list_store = []
@@ -409,46 +668,36 @@ class StepsManager:
 
         raise Exception(f"{update_event} is not an update event!")
 
+    def get_step_indexes_to_skip(self, up_to_step_idx: Optional[int]=None) -> Set[int]:
+        """
+        Returns the indexes of the steps that are skipped. If up_to_step_idx
+        is passed, returns the indexes that are skipped in the steps up to and
+        including this step.
+        """
+        self.step_skip_index.update(self.steps)
+        return self.step_skip_index.get_step_indexes_to_skip(
+            up_to_step_idx + 1 if up_to_step_idx is not None else None
+        )
+
     def find_last_valid_index(self, new_steps: List[Step]) -> int:
         """
         Given the new_steps, this function performs some logic to figure
         out what the last valid index in the steps is (that execution can
         then start from).
-        """
 
-        # Currently, we only remove steps in an undo
-        if len(new_steps) < len(self.steps):
-            # If we are removing steps, then we figure out what skipped steps
-            # we are losing, and run from right before where we are no longer
-            # skipped steps
-            no_longer_skipped_indexes: Set[int] = set()
-            for step_index, removed_step in enumerate(self.steps[len(new_steps) :]):
-                previous_steps = self.steps[: len(new_steps) + step_index]
-                no_longer_skipped_indexes = no_longer_skipped_indexes.union(
-                    removed_step.step_indexes_to_skip(previous_steps)
-                )
+        This is right before the first step that the new_steps do not share 
+        with the current steps, or right before the first step that is newly 
+        skipped or no longer skipped, as the steps after this need to be rerun.
 
-            last_valid_index = (
-                min(no_longer_skipped_indexes.union({len(new_steps)})) - 1
-            )
-        else:
-            # Otherwise, if we're adding steps, we figure out which skipped steps
-            # we're adding, and run from right before the oldest new skipped step
-
-            # Collect anything that is newly skipped
-            newly_skipped_indexes: Set[int] = set()
-            for step_index, new_step in enumerate(new_steps[len(self.steps) :]):
-                previous_steps = new_steps[: len(self.steps) + step_index]
-                newly_skipped_indexes = newly_skipped_indexes.union(
-                    new_step.step_indexes_to_skip(previous_steps)
-                )
+        NOTE: this updates the step_skip_index to the new_steps.
+        """
+        # Make sure the skip index is up to date with the current steps, in case
+        # the last steps we tried to execute failed
+        self.step_skip_index.update(self.steps)
+        changed_skip_indexes = self.step_skip_index.update(new_steps)
 
-            # The last valid index is the minimum of the newly skipped things - 1
-            # or the last valid step (if nothing is skipped)
-            # TODO: we can improve this in the future to remember what it executed last time
-            # and so do less work!
-            last_valid_index = min(newly_skipped_indexes.union({len(self.steps)})) - 1
-        return last_valid_index
+        num_shared_steps = get_num_shared_steps(self.steps, new_steps)
+        return min(changed_skip_indexes.union({num_shared_steps})) - 1
 
     def execute_undo(self):
         """
@@ -525,6 +774,7 @@ class StepsManager:
                 step.step_type == "initialize"
                 or step.step_type == SimpleImportStepPerformer.step_type()
                 or step.step_type == ExcelImportStepPerformer.step_type()
+                or step.step_type == ParquetImportStepPerformer.step_type()
             )
         ]
 
@@ -555,13 +805,142 @@ class StepsManager:
         """
         if last_valid_index is None:
             last_valid_index = self.find_last_valid_index(new_steps)
+        else:
+            self.step_skip_index.update(new_steps)
+
+        # Make sure the state we execute from has not been evicted
+        self.rematerialize_step(new_steps, max(last_valid_index, 0))
 
         final_steps = execute_step_list_from_index(
-            new_steps, start_index=last_valid_index
+            new_steps, start_index=last_valid_index, step_indexes_to_skip=self.step_skip_index.get_step_indexes_to_skip()
         )
+        prev_num_sheets = len(self.curr_step.dfs)
         self.steps = final_steps
         self.curr_step_idx = len(self.steps) - 1
 
+        self.rematerialize_step(self.steps, self.curr_step_idx)
+        self.enforce_max_history_bytes()
+        self.clear_stale_sheet_data_windows(prev_num_sheets)
+
+    def execute_checkout_step_by_idx(self, step_idx: int) -> None:
+        """
+        Checks out the step at step_idx, recreating the dataframes 
+        of this step if they were evicted.
+        """
+        prev_num_sheets = len(self.curr_step.dfs)
+        self.curr_step_idx = step_idx
+
+        self.rematerialize_step(self.steps, self.curr_step_idx)
+        self.enforce_max_history_bytes()
+        self.clear_stale_sheet_data_windows(prev_num_sheets)
+
+    def clear_stale_sheet_data_windows(self, prev_num_sheets: int) -> None:
+        """
+        The windows of the sheets are stored by sheet index, so if the sheets 
+        change (e.g. an undo brings back a deleted sheet), a window might now 
+        belong to a different sheet. In this case, we go back to the default 
+        windows, and the front-end requests the windows it is displaying again.
+        """
+        if len(self.curr_step.dfs) != prev_num_sheets:
+            with self.sheet_data_windows_lock:
+                self.sheet_data_windows = {}
+
+    def rematerialize_step(self, step_list: List[Step], step_index: int) -> None:
+        """
+        Makes sure that the dataframes of the final defined state of 
+        step_list[step_index] are not evicted. 
+        
+        If they are, we walk back through the steps that created this state 
+        to find the closest state that is not evicted, and then reexecute
+        the steps from there. 
+        """
+        state = step_list[step_index].final_defined_state
+        steps_to_reexecute: List[Step] = []
+        for step in reversed(step_list[:step_index + 1]):
+            if not state.dfs_evicted:
+                break
+            
+            # A step that is a no-op has the same prev_state and post_state, 
+            # so it did not create the state
+            if step.post_state is state and step.prev_state is not None and step.prev_state is not state:
+                steps_to_reexecute.append(step)
+                state = step.prev_state
+
+        for step in reversed(steps_to_reexecute):
+            step.rematerialize_post_state()
+            self.num_state_rematerializations += 1
+
+    def enforce_max_history_bytes(self) -> None:
+        """
+        If there is a max_history_bytes, evicts the dataframes of the post_states
+        of historical steps until the column buffers held by all the states in 
+        the step history take up at most max_history_bytes.
+
+        We never evict the initialize step, the checked out step or the last step,
+        nor the states of skipped steps, as they cannot be reexecuted. We evict the 
+        states furthest from the checked out step first, as users mostly step 
+        through the steps close to the one they are looking at.
+
+        NOTE: the metadata of evicted states is kept, so the steps can still
+        be transpiled and described without rematerializing them.
+        """
+        if self.max_history_bytes is None:
+            return
+
+        # Collect all the states that still have their dataframes, as a step's 
+        # prev_state is usually the post_state of the step before it
+        states: Dict[int, State] = {}
+        for step in self.steps:
+            for state in [step.prev_state, step.post_state]:
+                if state is not None and not state.dfs_evicted:
+                    states[id(state)] = state
+
+        # Then, count how many of these states reference each column buffer
+        state_column_buffers = {state_id: get_column_buffers(state) for state_id, state in states.items()}
+        buffer_reference_counts: Dict[Any, int] = {}
+        total_bytes = 0
+        for column_buffers in state_column_buffers.values():
+            for buffer_id, num_bytes in column_buffers.items():
+                if buffer_id not in buffer_reference_counts:
+                    buffer_reference_counts[buffer_id] = 0
+                    total_bytes += num_bytes
+                buffer_reference_counts[buffer_id] += 1
+
+        if total_bytes <= self.max_history_bytes:
+            return
+
+        pinned_state_ids = {
+            id(self.steps[0].final_defined_state),
+            id(self.curr_step.final_defined_state),
+            id(self.steps[-1].final_defined_state)
+        }
+        step_indexes_to_skip = self.get_step_indexes_to_skip()
+        evictable_step_indexes = sorted(
+            [
+                step_index for step_index in range(1, len(self.steps))
+                if step_index not in step_indexes_to_skip
+            ],
+            key=lambda step_index: abs(step_index - self.curr_step_idx),
+            reverse=True
+        )
+
+        for step_index in evictable_step_indexes:
+            if total_bytes <= self.max_history_bytes:
+                break
+
+            state = self.steps[step_index].post_state
+            if state is None or state.dfs_evicted or id(state) in pinned_state_ids:
+                continue
+
+            # Only the buffers that no other state references are freed
+            for buffer_id, num_bytes in state_column_buffers[id(state)].items():
+                buffer_reference_counts[buffer_id] -= 1
+                if buffer_reference_counts[buffer_id] == 0:
+                    total_bytes -= num_bytes
+
+            state.evict_dfs()
+            self.num_state_evictions += 1
+
     def execute_steps_data(self, new_steps_data: List[Dict[str, Any]] = None) -> None:
         """
         Given steps data (e.g. from a saved analysis), will turn
@@ -22,6 +22,11 @@ IF_TESTS = [
     (pd.Series(data=[True, False]), pd.Series(data=['A', 'B']), pd.Series(data=['C', 'D']), pd.Series(data=['A', 'D'])),
     (pd.Series(data=[True, False]), pd.Series(data=[True, True]), pd.Series(data=[False, False]), pd.Series(data=[True, False])),
     (pd.Series(data=[True, False]), pd.Series(data=[pd.Timestamp('2017-01-01'), pd.Timestamp('2017-01-02')]), pd.Series(data=[pd.Timestamp('2017-01-03'), pd.Timestamp('2017-01-04')]), pd.Series(data=[pd.Timestamp('2017-01-01'), pd.Timestamp('2017-01-04')])),
+    (pd.Series(data=[True, False]), pd.Series(data=[1, 2]), pd.Series(data=[3.5, 4.5]), pd.Series(data=[1.0, 4.5])),
+    (pd.Series(data=[True, False]), pd.Series(data=[1, 2]), pd.Series(data=['C', 'D']), pd.Series(data=[1, 'D'])),
+    (pd.Series(data=[True, False]), pd.Series(data=[True, False]), pd.Series(data=[3, 4]), pd.Series(data=[True, 4])),
+    (pd.Series(data=[True, True]), pd.Series(data=[1, 2]), pd.Series(data=['C', 'D']), pd.Series(data=[1, 2])),
+    (pd.Series(data=[False, False]), pd.Series(data=[1, 2]), pd.Series(data=['C', 'D']), pd.Series(data=['C', 'D'])),
 ]
 @pytest.mark.parametrize("condition,true_series,false_series,result", IF_TESTS)
 def test_if_direct(condition,true_series,false_series,result):
@@ -119,4 +124,17 @@ def test_if_with_and_or(A, formula, result):
         'A': A,
     }))
     mito.set_formula(f'{formula}', 0, 'B', add_column=True)
-    assert mito.get_column(0, 'B', as_list=False).equals(result)
\ No newline at end of file
+    assert mito.get_column(0, 'B', as_list=False).equals(result)
+
+
+def test_if_constant_results_extended_to_condition():
+    condition = pd.Series(data=[True, False, True])
+    assert IF(condition, pd.Series(data=[1]), pd.Series(data=[2])).equals(pd.Series(data=[1, 2, 1]))
+
+
+def test_if_all_values_from_object_series_infers_dtype():
+    condition = pd.Series(data=[True, True])
+    true_series = pd.Series(data=[1, 2], dtype='object')
+    false_series = pd.Series(data=['A', 'B'])
+    assert IF(condition, true_series, false_series).equals(pd.Series(data=[1, 2]))
+
@@ -20,6 +20,8 @@ FILLNAN_TESTS = [
     (pd.Series(['1', None, '3']), '5',  ['1', '5', '3']),
     (pd.Series([None, 2, 3]), 5,  [5.0, 2.0, 3.0]),
     (pd.Series([None, '2', '3']), '5',  ['5', '2', '3']),
+    (pd.Series([None, '2', '3'], dtype='category'), '5',  ['5', '2', '3']),
+    (pd.Series([None, '2', '3'], dtype='category'), '2',  ['2', '2', '3']),
 ]
 
 @pytest.mark.parametrize("series, replacement, result_series", FILLNAN_TESTS)
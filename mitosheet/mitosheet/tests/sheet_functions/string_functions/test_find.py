@@ -7,6 +7,8 @@
 Contains tests for the FIND function.
 """
 
+import inspect
+
 import pytest
 import pandas as pd
 
@@ -43,4 +45,33 @@ def test_FIND_valid_input_direct(data, substring, indexes):
 def test_FIND_valid_input_sheet_function(data, substring, indexes):
     mito = create_mito_wrapper(data)
     mito.set_formula(f'=FIND(A, \"{substring}\")', 0, 'B', add_column=True)
-    assert mito.get_column(0, 'B', as_list=True) == indexes
\ No newline at end of file
+    assert mito.get_column(0, 'B', as_list=True) == indexes
+
+FIND_SERIES_TESTS = [
+    (['abc', 'abc', 'bca'], ['a', 'c', 'a'], [1, 3, 3]),
+    (['abc', 'abc'], ['d', ''], [0, 1]),
+]
+
+@pytest.mark.parametrize("data,substrings,indexes", FIND_SERIES_TESTS)
+def test_FIND_valid_input_direct_series(data, substrings, indexes):
+    series = pd.Series(data=data)
+    assert FIND(series, pd.Series(data=substrings)).tolist() == indexes
+
+def test_FIND_empty_series_same_dtype_for_constant_and_series_substrings():
+    # Skip the decorators, as they never pass an empty series with a series of substrings
+    find = inspect.unwrap(FIND)
+    series = pd.Series([], dtype=object)
+    constant_result = find(series, pd.Series(['a']))
+    series_result = find(series, pd.Series(['a', 'b']))
+
+    assert constant_result.tolist() == []
+    assert constant_result.dtype == series_result.dtype
+
+@pytest.mark.parametrize("data", [[], [None, None]])
+def test_FIND_empty_or_all_nan_input(data):
+    result = FIND(pd.Series(data, dtype=object), 'a')
+    assert len(result) == len(data)
+    assert result.isna().all()
+    # The NaNs are put back into the empty result of FIND, so it has the dtype of the general path
+    series_result = inspect.unwrap(FIND)(pd.Series([], dtype=object), pd.Series(['a', 'b']))
+    assert result.dtype == series_result.reindex(result.index).dtype
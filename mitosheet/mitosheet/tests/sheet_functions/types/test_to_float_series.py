@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for converting string series to float series.
+"""
+import random
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+from mitosheet.sheet_functions.types.to_float_series import (
+    convert_formatted_number_strings_to_float, convert_string_to_float,
+    to_float_series_from_string_series)
+
+TO_FLOAT_SERIES_TESTS = [
+    (['1', '2.5', '-3'], [1.0, 2.5, -3.0]),
+    (['$1', '-$2.5', '$-3'], [1.0, -2.5, -3.0]),
+    (['(1)', '$(2.50)', '-(3)'], [-1.0, -2.5, -3.0]),
+    (['1,000', '1,000,000.5', '1,5'], [1000.0, 1000000.5, 1.5]),
+    (['1M', '2 Million', '3B', '4 billion', '5mil'], [1000000.0, 2000000.0, 3000000000.0, 4000000000.0, 5000000.0]),
+    (['  1  ', 'abc', ''], [1.0, np.NaN, np.NaN]),
+    (['nan', 'inf', '1e500', '1_000'], [np.NaN, np.inf, np.inf, 1000.0]),
+]
+
+@pytest.mark.parametrize("strings, floats", TO_FLOAT_SERIES_TESTS)
+def test_to_float_series_from_string_series(strings, floats):
+    string_series = pd.Series(strings, index=[f'r{i}' for i in range(len(strings))], name='A')
+    result = to_float_series_from_string_series(string_series, on_uncastable_arg_element=('default', np.NaN))
+    pd.testing.assert_series_equal(result, pd.Series(floats, index=string_series.index, name='A'))
+
+
+def test_to_float_series_from_string_series_errors_on_uncastable():
+    with pytest.raises(Exception):
+        to_float_series_from_string_series(pd.Series(['1', '$2', 'abc']), on_uncastable_arg_element='error')
+
+
+def test_to_float_series_from_string_series_with_non_strings():
+    result = to_float_series_from_string_series(pd.Series(['$1', 2, 3.5, True]), on_uncastable_arg_element=('default', np.NaN))
+    pd.testing.assert_series_equal(result, pd.Series([1.0, 2.0, 3.5, 1.0]))
+
+
+def get_random_strings(num_strings: int) -> List[str]:
+    random.seed(0)
+    parts = ['-', '$', '(', ')', ',', '.', ' ', 'M', 'mil', 'B', 'Billion', 'e', 'nan', 'x'] + [str(i) for i in range(10)] * 3
+    return [''.join(random.choices(parts, k=random.randint(1, 12))) for _ in range(num_strings)]
+
+
+def get_random_formatted_number_strings(num_strings: int) -> List[str]:
+    random.seed(0)
+    signs = ['', '-', '$', '-$', '$-', '--', '-$-', '$--']
+    suffixes = ['', 'M', ' Million', 'm', 'b', ' bil', 'Billion', ' ', 'x']
+    strings = []
+    for _ in range(num_strings):
+        number = f'{random.randint(0, 10 ** random.randint(1, 10)):,}' + random.choice(['', '.', '.5', f'.{random.randint(0, 10 ** 9)}'])
+        if random.random() < .3:
+            number = number.replace(',', '')
+        if random.random() < .3:
+            strings.append(random.choice(signs) + random.choice(['(', '']) + number + random.choice([')', ')M', '']))
+        else:
+            strings.append(random.choice(signs) + number + random.choice(suffixes))
+    return strings
+
+
+def assert_same_floats(floats, expected_floats):
+    # Check that the floats are exactly the same, including the bits of any NaNs
+    assert np.array_equal(np.asarray(floats).view('int64'), np.asarray(expected_floats).view('int64'))
+
+
+@pytest.mark.parametrize("strings", [
+    get_random_strings(5000),
+    get_random_formatted_number_strings(5000),
+    get_random_strings(2000) + get_random_formatted_number_strings(5000),
+    [str(i / 7) for i in range(2000)] + get_random_strings(500),
+])
+def test_to_float_series_from_string_series_matches_convert_string_to_float(strings):
+    string_series = pd.Series(strings)
+    result = to_float_series_from_string_series(string_series, on_uncastable_arg_element=('default', np.NaN))
+    expected = string_series.apply(convert_string_to_float, on_uncastable_arg_element=('default', np.NaN)).astype('float64')
+    assert_same_floats(result, expected)
+
+
+@pytest.mark.parametrize("strings", [
+    get_random_strings(5000),
+    get_random_formatted_number_strings(5000),
+])
+def test_convert_formatted_number_strings_to_float_matches_convert_string_to_float(strings):
+    strings = np.array(strings, dtype=object)
+    is_formatted_number, floats = convert_formatted_number_strings_to_float(strings)
+    expected = [convert_string_to_float(string, ('default', np.NaN)) for string in strings[is_formatted_number]]
+    assert is_formatted_number.any()
+    assert_same_floats(floats[is_formatted_number], expected)
+
+
+def test_convert_formatted_number_strings_to_float_with_newlines():
+    is_formatted_number, _ = convert_formatted_number_strings_to_float(np.array(['$1', '$2\n3'], dtype=object))
+    assert not is_formatted_number.any()
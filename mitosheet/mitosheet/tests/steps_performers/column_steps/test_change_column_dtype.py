@@ -123,6 +123,14 @@ def test_string_to_other_types(new_dtype, result, code):
     else:
         assert len(mito.transpiled_code) == 0
 
+# Category columns are string columns, so they are changed the same way
+@pytest.mark.parametrize("new_dtype, result, code", STRING_TESTS)
+def test_category_to_other_types(new_dtype, result, code):
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': pd.Series(STRING_ARRAY, dtype='category')}))
+    mito.change_column_dtype(0, 'A', new_dtype)
+    assert mito.get_column(0, 'A', as_list=True) == result
+    assert mito.transpiled_code[-1] == code
+
 # Little helper function for less writing
 def ts(y: Optional[int]=None, m: Optional[int]=None, d: Optional[int]=None) -> pd.Timestamp:
     return pd.Timestamp(year=y, month=m, day=d)
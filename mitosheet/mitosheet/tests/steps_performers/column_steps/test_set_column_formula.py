@@ -8,6 +8,7 @@ Contains tests for set column formula edit events
 """
 from mitosheet.step_performers.sort import SORT_DIRECTION_ASCENDING
 import pandas as pd
+import pytest
 
 from mitosheet.utils import get_new_id
 from mitosheet.tests.test_utils import create_mito_wrapper_dfs, create_mito_wrapper
@@ -22,6 +23,26 @@ def test_edit_cell_formula_on_message_receive():
     assert 'B' in mito.dfs[0]
     assert mito.dfs[0]['B'].equals(mito.dfs[0]['A'])
 
+CATEGORY_FORMULA_TESTS = [
+    ('=A', ['a', 'bb', 'a']),
+    ('=UPPER(A)', ['A', 'BB', 'A']),
+    ('=CONCAT(A, "!")', ['a!', 'bb!', 'a!']),
+    ('=LEN(A)', [1, 2, 1]),
+    ('=LEFT(A, 1)', ['a', 'b', 'a']),
+    ('=SUBSTITUTE(A, "b", "c")', ['a', 'cc', 'a']),
+    ('=IF(A == "a", 1, 0)', [1, 0, 1]),
+]
+@pytest.mark.parametrize("formula, result", CATEGORY_FORMULA_TESTS)
+def test_formula_on_category_column(formula, result):
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': pd.Series(['a', 'bb', 'a'], dtype='category')}))
+    mito.set_formula(formula, 0, 'B', add_column=True)
+
+    assert mito.get_column(0, 'B', as_list=True) == result
+
+    # Changing the category column refreshes the formula
+    mito.set_cell_value(0, 'A', 1, 'a')
+    assert mito.get_column(0, 'B', as_list=True) == [result[0]] * 3
+
 def test_overwrite_on_double_set():
     mito = create_mito_wrapper([123])
     mito.add_column(0, 'B')
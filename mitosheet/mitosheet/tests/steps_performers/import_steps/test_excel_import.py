@@ -3,9 +3,17 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import json
 import os
+import openpyxl
 import pandas as pd
+import pytest
 
+import mitosheet.step_performers.import_steps.excel_import as excel_import
+from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
+from mitosheet.step_performers.import_steps.excel_import import (
+    get_excel_sheet_names, is_calamine_excel_engine_available, 
+    set_excel_import_engine)
 from mitosheet.tests.test_utils import create_mito_wrapper_dfs
 from mitosheet.tests.decorators import pandas_post_1_only, python_post_3_6_only
 
@@ -181,4 +189,93 @@ def test_remove_multiple_one_by_one_does_not_optimize_till_all_gone():
     assert mito.transpiled_code == []
 
     # Remove the test file
-    os.remove(TEST_FILE)
\ No newline at end of file
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_gets_sheet_names_from_workbook_xml():
+    workbook = openpyxl.Workbook()
+    workbook.active.title = 'First & <Sheet>'
+    workbook.create_sheet('Second')
+    workbook.create_sheet('Hidden').sheet_state = 'hidden'
+    workbook.save(TEST_FILE)
+
+    sheet_names = get_excel_sheet_names(TEST_FILE)
+    assert sheet_names == ['First & <Sheet>', 'Second', 'Hidden']
+    assert sheet_names == pd.ExcelFile(TEST_FILE, engine='openpyxl').sheet_names
+
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_metadata_call_does_not_open_workbook(monkeypatch):
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    with pd.ExcelWriter(TEST_FILE) as writer:  
+        df.to_excel(writer, sheet_name='Sheet1', index=False)
+        df.to_excel(writer, sheet_name='Sheet2', index=False)
+
+    def open_excel_file(*args, **kwargs):
+        raise Exception('The workbook should not be opened')
+    monkeypatch.setattr(pd, 'ExcelFile', open_excel_file)
+
+    mito = create_mito_wrapper_dfs()
+    metadata = json.loads(get_excel_file_metadata({'file_name': TEST_FILE}, mito.mito_widget.steps_manager))
+    assert metadata['sheet_names'] == ['Sheet1', 'Sheet2']
+
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_import_reads_file_that_changed_after_metadata_call():
+    pd.DataFrame(data={'A': [1, 2, 3]}).to_excel(TEST_FILE, index=False)
+    mito = create_mito_wrapper_dfs()
+    get_excel_file_metadata({'file_name': TEST_FILE}, mito.mito_widget.steps_manager)
+
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_excel(TEST_FILE, index=False)
+
+    mito.excel_import(TEST_FILE, ['Sheet1'], True, 0)
+    assert mito.dfs[0].equals(df)
+
+    os.remove(TEST_FILE)
+
+
+@pandas_post_1_only
+@python_post_3_6_only
+def test_excel_import_engine_falls_back_to_openpyxl_when_unavailable(monkeypatch):
+    monkeypatch.setattr(excel_import, 'is_calamine_excel_engine_available', lambda: False)
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_excel(TEST_FILE, index=False)
+
+    set_excel_import_engine('calamine')
+    try:
+        mito = create_mito_wrapper_dfs()
+        mito.excel_import(TEST_FILE, ['Sheet1'], True, 0)
+    finally:
+        set_excel_import_engine(None)
+
+    assert mito.dfs[0].equals(df)
+    assert mito.transpiled_code[-2] == "sheet_df_dictonary = pd.read_excel('file.xlsx', engine='openpyxl', sheet_name=['Sheet1'], skiprows=0)"
+
+    os.remove(TEST_FILE)
+
+
+@pytest.mark.skipif(not is_calamine_excel_engine_available(), reason='requires python-calamine and pandas>=2.2')
+def test_imports_with_calamine_engine():
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': ['a', 'b', 'c']})
+    df.to_excel(TEST_FILE, index=False)
+
+    set_excel_import_engine('calamine')
+    try:
+        mito = create_mito_wrapper_dfs()
+        mito.excel_import(TEST_FILE, ['Sheet1'], True, 0)
+    finally:
+        set_excel_import_engine(None)
+
+    assert mito.dfs[0].equals(df)
+    assert mito.transpiled_code[-2] == "sheet_df_dictonary = pd.read_excel('file.xlsx', engine='calamine', sheet_name=['Sheet1'], skiprows=0)"
+
+    os.remove(TEST_FILE)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for parquet import.
+"""
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_datafiles import get_datafiles
+from mitosheet.code_chunks.step_performers.import_steps.parquet_import_code_chunk import get_read_parquet_params
+from mitosheet.errors import MitoError
+import mitosheet.step_performers.import_steps.parquet_import as parquet_import
+from mitosheet.step_performers.import_steps.parquet_import import ParquetImportStepPerformer
+from mitosheet.tests.test_utils import create_mito_wrapper_dfs
+
+try:
+    import pyarrow
+    PYARROW_INSTALLED = True
+except ImportError:
+    PYARROW_INSTALLED = False
+
+requires_pyarrow = pytest.mark.skipif(not PYARROW_INSTALLED, reason='requires pyarrow')
+
+TEST_FILE = 'test_file.parquet'
+TEST_FEATHER_FILE = 'test_file.feather'
+TEST_DATASET = 'test_dataset'
+
+TEST_DF = pd.DataFrame({
+    'A': [1, 2, 3, 4, 5, 6],
+    'B': ['a', 'b', 'c', 'd', 'e', 'f'],
+    'C': [1.5, 2.5, 3.5, 4.5, 5.5, 6.5],
+})
+
+
+def test_read_parquet_params():
+    assert get_read_parquet_params(None, None) == {'engine': 'pyarrow'}
+    assert get_read_parquet_params(['A'], []) == {'engine': 'pyarrow', 'columns': ['A']}
+    assert get_read_parquet_params(None, [['A', '>', 1], ['B', 'in', ['a', 'b']]]) == {
+        'engine': 'pyarrow', 'filters': [('A', '>', 1), ('B', 'in', ['a', 'b'])]
+    }
+    with pytest.raises(ValueError):
+        get_read_parquet_params(None, [['A', 'like', 1]])
+
+
+def test_datafiles_lists_parquet_and_feather_files():
+    file_names = ['test_file.csv', TEST_FILE, TEST_FEATHER_FILE, 'test_file.arrow', 'test_file.txt']
+    for file_name in file_names:
+        with open(file_name, 'w') as f:
+            f.write('')
+
+    datafiles = get_datafiles({})
+    for file_name in file_names[:-1]:
+        assert file_name in datafiles
+    assert 'test_file.txt' not in datafiles
+
+    for file_name in file_names:
+        os.remove(file_name)
+
+
+def test_cannot_filter_feather_files():
+    with open(TEST_FEATHER_FILE, 'w') as f:
+        f.write('')
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_FEATHER_FILE, filters=[['A', '>', 1]])
+    assert len(mito.dfs) == 0
+
+    os.remove(TEST_FEATHER_FILE)
+
+
+@pytest.mark.parametrize("file_name", [TEST_FILE, TEST_FEATHER_FILE])
+def test_missing_pyarrow_is_mito_error(monkeypatch, file_name):
+    def read_without_pyarrow(*args, **kwargs):
+        raise ImportError("Unable to find a usable engine; tried using: 'pyarrow'.")
+    monkeypatch.setattr(pd, 'read_parquet', read_without_pyarrow)
+    monkeypatch.setattr(parquet_import, 'read_feather', read_without_pyarrow)
+
+    mito = create_mito_wrapper_dfs()
+    with pytest.raises(MitoError) as e_info:
+        ParquetImportStepPerformer.execute(mito.mito_widget.steps_manager.curr_step.post_state, file_name)
+    assert e_info.value.type_ == 'missing_parquet_engine_error'
+    assert 'pip install pyarrow' in e_info.value.to_fix
+
+    mito.parquet_import(file_name)
+    assert len(mito.dfs) == 0
+
+
+@requires_pyarrow
+def test_can_import_parquet_file():
+    TEST_DF.to_parquet(TEST_FILE)
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_FILE)
+
+    assert mito.curr_step.step_type == 'parquet_import'
+    assert mito.dfs[0].equals(TEST_DF)
+    assert mito.df_names == ['test_file']
+    assert mito.transpiled_code == [
+        'import pandas as pd',
+        "test_file = pd.read_parquet(r'test_file.parquet', engine='pyarrow')",
+    ]
+
+    os.remove(TEST_FILE)
+
+
+@requires_pyarrow
+def test_can_import_parquet_file_with_columns_and_filters():
+    # Small row groups, so that the filters skip some of them
+    TEST_DF.to_parquet(TEST_FILE, row_group_size=2)
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_FILE, columns=['A', 'B'], filters=[['A', '>=', 2], ['B', 'in', ['b', 'e', 'f']]])
+
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [2, 5, 6], 'B': ['b', 'e', 'f']}))
+    assert mito.transpiled_code[-1] == \
+        "test_file = pd.read_parquet(r'test_file.parquet', engine='pyarrow', columns=['A', 'B'], filters=[('A', '>=', 2), ('B', 'in', ['b', 'e', 'f'])])"
+
+    os.remove(TEST_FILE)
+
+
+@requires_pyarrow
+def test_can_import_parquet_dataset():
+    os.mkdir(TEST_DATASET)
+    TEST_DF.iloc[:3].to_parquet(os.path.join(TEST_DATASET, 'part_0.parquet'), index=False)
+    TEST_DF.iloc[3:].to_parquet(os.path.join(TEST_DATASET, 'part_1.parquet'), index=False)
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_DATASET, filters=[['C', '<', 5]])
+
+    assert mito.dfs[0].equals(TEST_DF.iloc[:4])
+    assert mito.df_names == ['test_dataset']
+
+    shutil.rmtree(TEST_DATASET)
+
+
+@requires_pyarrow
+def test_can_import_feather_file_with_columns():
+    TEST_DF.to_feather(TEST_FEATHER_FILE)
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_FEATHER_FILE, columns=['C', 'A'])
+
+    assert mito.dfs[0].equals(TEST_DF[['C', 'A']])
+    assert mito.transpiled_code[-1] == "test_file = pd.read_feather(r'test_file.feather', columns=['C', 'A'])"
+
+    os.remove(TEST_FEATHER_FILE)
+
+
+@requires_pyarrow
+def test_clear_keeps_parquet_imports():
+    TEST_DF.to_parquet(TEST_FILE)
+
+    mito = create_mito_wrapper_dfs()
+    mito.parquet_import(TEST_FILE)
+    mito.add_column(0, 'D')
+    mito.clear()
+
+    assert mito.curr_step.step_type == 'parquet_import'
+    assert mito.dfs[0].equals(TEST_DF)
+
+    os.remove(TEST_FILE)
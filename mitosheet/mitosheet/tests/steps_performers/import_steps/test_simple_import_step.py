@@ -10,6 +10,11 @@ import pytest
 import pandas as pd
 import os
 
+import mitosheet.step_performers.import_steps.simple_import as simple_import
+from mitosheet.step_performers.import_steps.simple_import import (
+    guess_delimeter, is_pyarrow_csv_engine_available, is_utf_8_file,
+    read_csv_get_delimeter_and_encoding, read_lazy_file_get_delimeter_and_encoding, 
+    read_sniff_sample, set_csv_import_engine)
 from mitosheet.tests.test_utils import create_mito_wrapper_dfs
 
 TEST_FILE_PATHS = [
@@ -50,7 +55,6 @@ def test_can_import_a_single_csv():
     # Remove the test file
     os.remove(TEST_FILE_PATHS[0])
 
-@pytest.mark.skip('Error in delimeter detection, just noting')
 def test_can_import_a_single_csv_with_a_single_column():
     df = pd.DataFrame(data={'date': [1, 2, 3]})
     df.to_csv(TEST_FILE_PATHS[0], index=False)
@@ -395,4 +399,179 @@ def test_multiple_imports_optimize_stopped_by_rename():
     assert len(mito.transpiled_code) > 2
 
     # Remove the test file
-    os.remove(TEST_FILE_PATHS[0])
\ No newline at end of file
+    os.remove(TEST_FILE_PATHS[0])
+
+def test_imports_with_latin_1_after_first_encoding_check_block():
+    num_rows = simple_import.ENCODING_CHECK_BLOCK_SIZE // 4
+    df = pd.DataFrame(data={'A': ['a'] * num_rows + ['Ñ'], 'B': [1] * (num_rows + 1)})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, encoding='latin-1')
+    assert not is_utf_8_file(TEST_FILE_PATHS[0])
+
+    mito = create_mito_wrapper_dfs()
+    mito.simple_import([TEST_FILE_PATHS[0]])
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_encodings'] == ['latin-1']
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+@pytest.mark.parametrize("encoding, is_utf_8", [
+    ('utf-8', True),
+    ('utf-8-sig', True),
+    ('latin-1', False),
+    ('utf-16', False),
+])
+def test_is_utf_8_file(encoding, is_utf_8):
+    pd.DataFrame(data={'A': ['Ñ', 'a', '文']}).to_csv(TEST_FILE_PATHS[0], index=False, encoding=encoding, errors='replace')
+    assert is_utf_8_file(TEST_FILE_PATHS[0]) == is_utf_8
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_can_import_many_csvs_in_order():
+    dfs = [pd.DataFrame(data={'A': [i] * 100, 'B': ['abc'] * 100}) for i in range(10)]
+    file_names = [f'test_file_{i}.csv' for i in range(10)]
+    for df, file_name in zip(dfs, file_names):
+        df.to_csv(file_name, index=False, sep=';' if len(file_name) % 2 else ',')
+
+    mito = create_mito_wrapper_dfs()
+    mito.simple_import(file_names)
+
+    assert len(mito.dfs) == 10
+    for df, imported_df in zip(dfs, mito.dfs):
+        assert imported_df.equals(df)
+    assert mito.df_names == [f'test_file_{i}' for i in range(10)]
+
+    for file_name in file_names:
+        os.remove(file_name)
+
+
+def test_csv_import_engine_falls_back_to_default_when_unavailable(monkeypatch):
+    monkeypatch.setattr(simple_import, 'is_pyarrow_csv_engine_available', lambda: False)
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False)
+
+    set_csv_import_engine('pyarrow')
+    try:
+        mito = create_mito_wrapper_dfs()
+        mito.simple_import([TEST_FILE_PATHS[0]])
+    finally:
+        set_csv_import_engine(None)
+
+    assert mito.dfs[0].equals(df)
+    assert mito.transpiled_code[-1] == "test_file = pd.read_csv(r'test_file.csv')"
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+@pytest.mark.skipif(not is_pyarrow_csv_engine_available(), reason='requires pyarrow and pandas>=1.4')
+def test_imports_with_pyarrow_engine():
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2.5, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';')
+
+    set_csv_import_engine('pyarrow')
+    try:
+        mito = create_mito_wrapper_dfs()
+        mito.simple_import([TEST_FILE_PATHS[0], TEST_FILE_PATHS[0]])
+    finally:
+        set_csv_import_engine(None)
+
+    assert mito.dfs[0].equals(df)
+    assert mito.transpiled_code[-2:] == [
+        "test_file = pd.read_csv(r'test_file.csv', sep=';', engine='pyarrow')",
+        "test_file_1 = pd.read_csv(r'test_file.csv', sep=';', engine='pyarrow')",
+    ]
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_guesses_delimeter_from_many_lines():
+    # The first line has no delimeter that the rest of the file uses
+    with open(TEST_FILE_PATHS[0], 'w') as f:
+        f.write('Name and Age\n' + ''.join(f'Person {i};{i}\n' for i in range(100)))
+    assert guess_delimeter(TEST_FILE_PATHS[0]) == ';'
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_read_sniff_sample():
+    with open(TEST_FILE_PATHS[0], 'w') as f:
+        f.write('A,B\n' + '1,2\n' * (simple_import.SNIFF_HEAD_BYTES))
+    head, windows = read_sniff_sample(TEST_FILE_PATHS[0])
+    assert head == open(TEST_FILE_PATHS[0], 'rb').read(simple_import.SNIFF_HEAD_BYTES)
+    assert len(windows) == simple_import.NUM_SNIFF_WINDOWS
+    assert all(len(window) == simple_import.SNIFF_WINDOW_BYTES for window in windows)
+
+    open(TEST_FILE_PATHS[0], 'w').close()
+    assert read_sniff_sample(TEST_FILE_PATHS[0]) == (b'', [])
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_reuses_delimeter_and_encoding_of_unchanged_file(monkeypatch):
+    df = pd.DataFrame(data={'A': ['Ñ', 'B'], 'B': [2, 3]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', encoding='latin-1')
+    _, guessed_delimeter, guessed_encoding = read_csv_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert guessed_delimeter == ';'
+
+    def fail(*args, **kwargs):
+        raise Exception('Guessed again')
+
+    monkeypatch.setattr(simple_import, 'guess_delimeter', fail)
+    monkeypatch.setattr(simple_import, 'guess_encoding', fail)
+    monkeypatch.setattr(simple_import, 'is_utf_8_file', fail)
+    imported_df, delimeter, encoding = read_csv_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert imported_df.equals(df)
+    assert (delimeter, encoding) == (guessed_delimeter, guessed_encoding)
+
+    # Once the file changes, we guess again
+    monkeypatch.undo()
+    df = pd.DataFrame(data={'A': [1, 2, 3], 'B': [2, 3, 4]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False)
+    imported_df, delimeter, encoding = read_csv_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert imported_df.equals(df)
+    assert (delimeter, encoding) == (',', 'default')
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+def test_lazy_import_reuses_delimeter_and_encoding_of_unchanged_file(monkeypatch):
+    df = pd.DataFrame(data={'A': ['Ñ', 'B'], 'B': [2, 3]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, sep=';', encoding='latin-1')
+    _, guessed_delimeter, guessed_encoding = read_lazy_file_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert guessed_delimeter == ';'
+
+    def fail(*args, **kwargs):
+        raise Exception('Guessed again')
+
+    monkeypatch.setattr(simple_import, 'guess_delimeter', fail)
+    monkeypatch.setattr(simple_import, 'guess_encoding', fail)
+    monkeypatch.setattr(simple_import, 'read_sniff_sample', fail)
+    lazy_file, delimeter, encoding = read_lazy_file_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert lazy_file.read_df().equals(df)
+    assert (delimeter, encoding) == (guessed_delimeter, guessed_encoding)
+
+    # And the file is read fully with them too
+    imported_df, delimeter, encoding = read_csv_get_delimeter_and_encoding(TEST_FILE_PATHS[0])
+    assert imported_df.equals(df)
+    assert (delimeter, encoding) == (guessed_delimeter, guessed_encoding)
+
+    os.remove(TEST_FILE_PATHS[0])
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_does_not_use_encoding_guessed_without_confidence(monkeypatch, lazy):
+    df = pd.DataFrame(data={'A': ['Ñ', 'B'], 'B': [2, 3]})
+    df.to_csv(TEST_FILE_PATHS[0], index=False, encoding='latin-1')
+
+    # Any single byte encoding can decode the file, so a wrong guess would read the wrong characters
+    monkeypatch.setattr(simple_import.chardet.UniversalDetector, 'close', lambda self: {'encoding': 'Windows-1251', 'confidence': 0.0025})
+    simple_import.set_lazy_import_min_file_size(1 if lazy else None)
+    try:
+        mito = create_mito_wrapper_dfs()
+        mito.simple_import([TEST_FILE_PATHS[0]])
+    finally:
+        simple_import.set_lazy_import_min_file_size(None)
+
+    assert mito.dfs[0].equals(df)
+    assert mito.curr_step.execution_data['file_encodings'] == ['latin-1']
+
+    os.remove(TEST_FILE_PATHS[0])
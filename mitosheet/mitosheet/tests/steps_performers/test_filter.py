@@ -719,6 +719,27 @@ def test_mixed_type_contains_filter():
     assert mito.dfs[0].equals(pd.DataFrame({"A": ["aaron"]}, index=[0]))
 
 
+CATEGORY_FILTER_TESTS = [
+    (FC_STRING_CONTAINS, "a", ["aaron", "jake", "nate"]),
+    (FC_STRING_DOES_NOT_CONTAIN, "a", ["jon", None]),
+    (FC_STRING_EXACTLY, "jake", ["jake"]),
+    (FC_STRING_NOT_EXACTLY, "jake", ["aaron", "jon", "nate", None]),
+    (FC_STRING_STARTS_WITH, "j", ["jake", "jon"]),
+    (FC_STRING_ENDS_WITH, "e", ["jake", "nate"]),
+    (FC_EMPTY, None, [None]),
+    (FC_NOT_EMPTY, None, ["aaron", "jake", "jon", "nate"]),
+]
+@pytest.mark.parametrize("condition, value, result", CATEGORY_FILTER_TESTS)
+def test_filter_category_column(condition, value, result):
+    df = pd.DataFrame({"A": pd.Series(["aaron", "jake", "jon", "nate", None], dtype="category")})
+    mito = create_mito_wrapper_dfs(df)
+
+    mito.filter(0, "A", "And", condition, value)
+
+    assert str(mito.dfs[0]["A"].dtype) == "category"
+    assert mito.dfs[0]["A"].astype(object).where(mito.dfs[0]["A"].notnull(), None).tolist() == result
+
+
 def test_not_exactly_collapses_to_one_clause():
     df = pd.DataFrame(
         {
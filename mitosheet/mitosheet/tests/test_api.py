@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the pool of threads that handles API calls.
+"""
+from threading import Event, Lock
+import time
+
+import pandas as pd
+import pytest
+
+import mitosheet.api.api as api_module
+from mitosheet.api.api import API
+from mitosheet.steps_manager import StepsManager
+
+
+class FakeHandler():
+    """
+    Stands in for get_api_result, and records the API calls it handles. Calls
+    with the type 'block' do not return until unblock is called.
+    """
+
+    def __init__(self):
+        self.handled = []
+        self.started = Event()
+        self.unblocked = Event()
+
+    def __call__(self, event, steps_manager):
+        self.handled.append(event['id'])
+        if event['type'] == 'block':
+            self.started.set()
+            self.unblocked.wait(5)
+        return f'result of {event["id"]}'
+
+    def unblock(self):
+        self.unblocked.set()
+
+
+class FakeSend():
+
+    def __init__(self):
+        self.lock = Lock()
+        self.responses = {}
+        self.superseded = set()
+
+    def __call__(self, message):
+        with self.lock:
+            if message.get('superseded'):
+                self.superseded.add(message['id'])
+            else:
+                self.responses[message['id']] = message['data']
+
+    def wait_for(self, ids):
+        for _ in range(500):
+            with self.lock:
+                if all(id in self.responses or id in self.superseded for id in ids):
+                    return
+            time.sleep(.01)
+        raise Exception(f'No response to {ids}')
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = FakeHandler()
+    monkeypatch.setattr(api_module, 'get_api_result', handler)
+    yield handler
+    handler.unblock()
+
+
+def get_api(num_workers):
+    send = FakeSend()
+    api = API(StepsManager([pd.DataFrame({'A': [1, 2, 3]})]), send, num_workers=num_workers)
+    return api, send
+
+
+def test_api_responds_to_calls():
+    api, send = get_api(2)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'get_column_describe', 'sheet_index': 0, 'column_id': 'A'})
+    send.wait_for(['1'])
+    assert 'count' in send.responses['1']
+
+
+def test_api_does_not_block_on_slow_call(handler):
+    api, send = get_api(2)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'block'})
+    handler.started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': '2', 'type': 'get_search_matches', 'sheet_index': 0})
+    send.wait_for(['2'])
+    assert '1' not in send.responses
+
+    handler.unblock()
+    send.wait_for(['1'])
+
+
+def test_api_coalesces_identical_calls(handler):
+    api, send = get_api(1)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'block'})
+    handler.started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': '2', 'type': 'block'})
+    api.process_new_api_call({'event': 'api_call', 'id': '3', 'type': 'datafiles'})
+    api.process_new_api_call({'event': 'api_call', 'id': '4', 'type': 'datafiles'})
+
+    handler.unblock()
+    send.wait_for(['1', '2', '3', '4'])
+    assert handler.handled == ['1', '3']
+    assert send.responses == {'1': 'result of 1', '2': 'result of 1', '3': 'result of 3', '4': 'result of 3'}
+
+
+def test_api_does_not_coalesce_calls_made_at_different_steps(handler):
+    api, send = get_api(1)
+    api.process_new_api_call({'event': 'api_call', 'id': '0', 'type': 'block'})
+    handler.started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'datafiles'})
+    api.steps_manager.handle_edit_event({
+        'event': 'edit_event',
+        'id': 'edit',
+        'type': 'add_column_edit',
+        'step_id': 'new_step',
+        'params': {'sheet_index': 0, 'column_header': 'B', 'column_header_index': -1}
+    })
+    api.process_new_api_call({'event': 'api_call', 'id': '2', 'type': 'datafiles'})
+
+    handler.unblock()
+    send.wait_for(['0', '1', '2'])
+    assert handler.handled == ['0', '1', '2']
+    assert send.responses['2'] == 'result of 2'
+
+
+def test_api_drops_superseded_calls(handler):
+    api, send = get_api(1)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'block', 'sheet_index': 0, 'column_id': 'A'})
+    handler.started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': '2', 'type': 'get_search_matches', 'sheet_index': 0, 'search_string': 'a'})
+    api.process_new_api_call({'event': 'api_call', 'id': '3', 'type': 'get_search_matches', 'sheet_index': 0, 'search_string': 'ab'})
+    api.process_new_api_call({'event': 'api_call', 'id': '4', 'type': 'block', 'sheet_index': 0, 'column_id': 'A', 'other': True})
+    api.process_new_api_call({'event': 'api_call', 'id': '5', 'type': 'block', 'sheet_index': 0, 'column_id': 'B'})
+
+    # The superseded calls are told so right away
+    send.wait_for(['1', '2'])
+    assert send.superseded == {'1', '2'}
+
+    handler.unblock()
+    send.wait_for(['3', '4', '5'])
+    assert handler.handled == ['1', '3', '4', '5']
+    # The running call was superseded, so its result is not sent
+    assert set(send.responses) == {'3', '4', '5'}
+
+
+def test_api_evicts_oldest_queued_call(handler):
+    api, send = get_api(1)
+    api.process_new_api_call({'event': 'api_call', 'id': '0', 'type': 'block'})
+    handler.started.wait(5)
+    for id in range(1, api_module.MAX_QUEUED_API_CALLS + 2):
+        api.process_new_api_call({'event': 'api_call', 'id': str(id), 'type': 'datafiles', 'path': str(id)})
+
+    handler.unblock()
+    send.wait_for([str(id) for id in range(2, api_module.MAX_QUEUED_API_CALLS + 2)])
+    assert '1' not in handler.handled
+    assert send.superseded == {'1'}
+
+
+def test_api_handles_priority_calls_first(handler):
+    api, send = get_api(1)
+    api.process_new_api_call({'event': 'api_call', 'id': '0', 'type': 'block'})
+    handler.started.wait(5)
+    api.process_new_api_call({'event': 'api_call', 'id': '1', 'type': 'datafiles'})
+    for id in range(2, 2 + api_module.MAX_QUEUED_API_CALLS + 1):
+        api.process_new_api_call({'event': 'api_call', 'id': str(id), 'type': 'get_sheet_data', 'sheet_index': id, 'priority': True})
+
+    handler.unblock()
+    send.wait_for([str(id) for id in range(2, 2 + api_module.MAX_QUEUED_API_CALLS + 1)] + ['1'])
+    # Priority calls are never evicted, and are handled first
+    assert handler.handled == ['0'] + [str(id) for id in range(2, 2 + api_module.MAX_QUEUED_API_CALLS + 1)] + ['1']
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the cache of the results of API calls.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.api.get_column_describe import get_column_describe
+from mitosheet.api.get_unique_value_counts import get_unique_value_counts
+from mitosheet.api_result_cache import APIResultCache
+from mitosheet.tests.test_utils import create_mito_wrapper_dfs
+
+
+def get_describe_event(sheet_index, column_id):
+    return {'event': 'api_call', 'id': 'id', 'type': 'get_column_describe', 'sheet_index': sheet_index, 'column_id': column_id}
+
+
+def get_unique_value_counts_event(sheet_index, column_id, search_string='', sort='Descending Occurence'):
+    return {
+        'event': 'api_call', 'id': 'id', 'type': 'get_unique_value_counts', 'sheet_index': sheet_index,
+        'column_id': column_id, 'search_string': search_string, 'sort': sort
+    }
+
+
+def test_api_result_cache_reuses_results():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 2, 3]}))
+    steps_manager = mito.mito_widget.steps_manager
+
+    describe = get_column_describe(get_describe_event(0, 'A'), steps_manager)
+    assert get_column_describe(get_describe_event(0, 'A'), steps_manager) == describe
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 1
+    assert steps_manager.api_result_cache.get_stats()['misses'] == 1
+
+
+def test_api_result_cache_keys_on_params():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    steps_manager = mito.mito_widget.steps_manager
+
+    get_unique_value_counts(get_unique_value_counts_event(0, 'A'), steps_manager)
+    get_unique_value_counts(get_unique_value_counts_event(0, 'A', search_string='1'), steps_manager)
+    get_unique_value_counts(get_unique_value_counts_event(0, 'B'), steps_manager)
+    get_column_describe(get_describe_event(0, 'A'), steps_manager)
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 0
+    assert steps_manager.api_result_cache.get_stats()['misses'] == 4
+
+
+def test_api_result_cache_is_invalidated_when_sheet_changes():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'A': [1, 2, 3]}))
+    steps_manager = mito.mito_widget.steps_manager
+
+    describe = json.loads(get_column_describe(get_describe_event(0, 'A'), steps_manager))
+    other_describe = json.loads(get_column_describe(get_describe_event(1, 'A'), steps_manager))
+
+    mito.set_cell_value(0, 'A', 0, 10)
+    new_describe = json.loads(get_column_describe(get_describe_event(0, 'A'), steps_manager))
+    assert new_describe['sum'] == '15'
+    assert describe['sum'] == '6'
+
+    # The other sheet did not change, so its result is reused
+    assert json.loads(get_column_describe(get_describe_event(1, 'A'), steps_manager)) == other_describe
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 1
+
+    # And undoing goes back to the cached result of the old sheet
+    mito.undo()
+    assert json.loads(get_column_describe(get_describe_event(0, 'A'), steps_manager)) == describe
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 2
+
+
+def test_api_result_cache_evicts_least_recently_used_results():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6], 'C': [7, 8, 9]}))
+    steps_manager = mito.mito_widget.steps_manager
+    max_bytes = len(get_column_describe(get_describe_event(0, 'A'), steps_manager)) + len(get_column_describe(get_describe_event(0, 'C'), steps_manager))
+    steps_manager.api_result_cache = APIResultCache(max_bytes=max_bytes)
+
+    get_column_describe(get_describe_event(0, 'A'), steps_manager)
+    get_column_describe(get_describe_event(0, 'B'), steps_manager)
+    get_column_describe(get_describe_event(0, 'A'), steps_manager)
+    get_column_describe(get_describe_event(0, 'C'), steps_manager)
+    assert steps_manager.api_result_cache.get_stats()['size'] == 2
+    assert steps_manager.api_result_cache.get_stats()['num_bytes'] == max_bytes
+
+    # B was evicted, and A was not
+    get_column_describe(get_describe_event(0, 'A'), steps_manager)
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 2
+    get_column_describe(get_describe_event(0, 'B'), steps_manager)
+    assert steps_manager.api_result_cache.get_stats()['hits'] == 2
+
+
+def test_unique_value_counts_percents():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 1, 2, np.NaN]}))
+    steps_manager = mito.mito_widget.steps_manager
+
+    sheet_data = json.loads(get_unique_value_counts(get_unique_value_counts_event(0, 'A'), steps_manager))['uniqueValueCountsSheetData']
+    columns = {column['columnHeader']: column['columnData'] for column in sheet_data['data']}
+    assert columns['counts'] == [2, 1, 1]
+    assert columns['percents'] == ['0.5', '0.25', '0.25']
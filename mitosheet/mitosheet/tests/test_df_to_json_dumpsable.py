@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for turning dataframes into the sheet data sent to the front-end.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+from mitosheet.sheet_functions.types.utils import get_float_dt_td_columns
+from mitosheet.utils import MAX_ROWS, df_to_json_dumpsable
+
+
+def to_json_df_to_json_dumpsable(df: pd.DataFrame, max_length: Optional[int]=MAX_ROWS) -> Tuple[List[List[Any]], List[Any]]:
+    """
+    Turns the data and index of the dataframe into JSON with df.to_json, 
+    which is what df_to_json_dumpsable used to do.
+    """
+    df = df.head(max_length).copy(deep=True)
+    float_columns, date_columns, timedelta_columns = get_float_dt_td_columns(df)
+    for column_header in date_columns:
+        df[column_header] = df[column_header].dt.strftime('%Y-%m-%d %X')
+    for column_header in timedelta_columns:
+        df[column_header] = df[column_header].apply(lambda x: str(x))
+    for column_header in float_columns:
+        df[column_header] = df[column_header].apply(lambda x: x if np.isnan(x) else str(x))
+
+    json_obj = json.loads(df.to_json(orient="split"))
+    for d in json_obj['data']:
+        for idx, e in enumerate(d):
+            if e is None:
+                d[idx] = 'NaN'
+
+    return [[row[column_index] for row in json_obj['data']] for column_index in range(len(df.columns))], json_obj['index']
+
+
+def get_sheet_data(df: pd.DataFrame, max_length: Optional[int]=MAX_ROWS) -> Tuple[List[List[Any]], List[Any]]:
+    sheet_data = df_to_json_dumpsable(
+        df, 'df', 'passed', {}, {}, {column_header: str(column_header) for column_header in df.columns}, {}, max_length=max_length
+    )
+    # Make sure this is exactly what is sent to the front-end
+    sheet_data = json.loads(json.dumps(sheet_data))
+    return [column['columnData'] for column in sheet_data['data']], sheet_data['index']
+
+
+MIXED_DF = pd.DataFrame({
+    'int': [1, -2, 3, 4],
+    'uint': np.array([1, 2, 3, 2 ** 63], dtype='uint64'),
+    'bool': [True, False, True, False],
+    'float': [1.0, np.NaN, 1 / 3, 1e20],
+    'float_inf': [np.inf, -np.inf, -0.0, 1e-7],
+    'float32': np.array([0.1, 2.5, np.NaN, 3], dtype='float32'),
+    'string': ['a', 'b"c', 'é\n\\', ''],
+    'string_nan': ['a', None, np.NaN, 'd'],
+    'mixed': ['a', 1, 1.123456789123, None],
+    'mixed_objects': [Decimal('1.5'), date(2020, 1, 2), datetime(2020, 1, 2, 3), [1, 2]],
+    'object_floats': pd.Series([1.5, np.inf, np.NaN, 2], dtype=object),
+    'datetime': pd.to_datetime(['2020-01-01', '2021-02-03 04:05:06', None, '1999-12-31']),
+    'datetime_tz': pd.to_datetime(['2020-01-01', '2021-02-03 04:05:06', None, '1999-12-31']).tz_localize('US/Eastern'),
+    'timedelta': pd.to_timedelta(['1 days', '-3 hours', None, '2 days 00:00:01']),
+    'category': pd.Series(['a', 'b', 'a', None], dtype='category'),
+    'nullable_int': pd.Series([1, None, 3, 4], dtype='Int64'),
+    'nullable_bool': pd.Series([True, None, False, True], dtype='boolean'),
+    'string_dtype': pd.Series(['a', None, 'c', 'd'], dtype='string'),
+    'period': pd.period_range('2020-01', periods=4, freq='M'),
+    'empty_strings': pd.Series([None, None, None, None], dtype=object),
+})
+
+
+@pytest.mark.parametrize("df", [
+    MIXED_DF,
+    MIXED_DF.set_index('string'),
+    MIXED_DF.set_index('float'),
+    MIXED_DF.set_index('datetime'),
+    MIXED_DF.set_index(['int', 'string']),
+    MIXED_DF.iloc[[3, 1, 0]],
+    MIXED_DF.iloc[:0],
+    MIXED_DF.set_index(pd.Index([0, 0, 1, 1])),
+    pd.DataFrame({1: [1, 2], 2.5: [3, 4], True: ['a', 'b']}),
+])
+def test_df_to_json_dumpsable_matches_to_json(df):
+    assert get_sheet_data(df) == to_json_df_to_json_dumpsable(df)
+
+
+def test_df_to_json_dumpsable_formats_dates_and_timedeltas_like_pandas():
+    np.random.seed(0)
+    # Round some of the values, so there are values with no nanoseconds, microseconds, etc.
+    round_to = 10 ** np.random.randint(0, 15, 5000)
+    nanoseconds = np.concatenate([
+        np.random.randint(-10 ** 18, 10 ** 18, 5000, dtype='int64'),
+        np.random.randint(-10 ** 15, 10 ** 15, 5000, dtype='int64') // round_to * round_to,
+        np.array([0, 1, -1, 10 ** 9, -10 ** 9, 86400 * 10 ** 9, -86400 * 10 ** 9, 9 * 10 ** 18, -9 * 10 ** 18])
+    ])
+    df = pd.DataFrame({
+        'datetime': pd.to_datetime(nanoseconds),
+        'datetime_tz': pd.to_datetime(nanoseconds).tz_localize('UTC').tz_convert('Asia/Kolkata'),
+        'timedelta': pd.to_timedelta(nanoseconds),
+    })
+    df.loc[5, :] = None
+    assert get_sheet_data(df, None) == to_json_df_to_json_dumpsable(df, len(df))
+
+
+def test_df_to_json_dumpsable_only_sends_max_length_rows():
+    df = pd.DataFrame({'A': np.arange(MAX_ROWS * 2, dtype='float64'), 'B': 'abc'})
+    assert get_sheet_data(df) == to_json_df_to_json_dumpsable(df)
+    assert get_sheet_data(df, 10) == to_json_df_to_json_dumpsable(df, 10)
+
+
+def get_column_data_from_buffers(column_data_buffers, buffers):
+    """
+    Decodes the column data from the buffers, as the front-end does in getColumnDataFromBuffers.
+    """
+    data = buffers[column_data_buffers['data']]
+    if column_data_buffers['type'] == 'string':
+        offsets = np.frombuffer(buffers[column_data_buffers['offsets']], dtype='<i4').tolist()
+        strings = [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        if 'validity' in column_data_buffers:
+            is_valid = np.unpackbits(np.frombuffer(buffers[column_data_buffers['validity']], dtype='uint8'), bitorder='little')
+            strings = [string if is_valid[index] else 'NaN' for index, string in enumerate(strings)]
+        return strings
+    elif column_data_buffers['type'] == 'bool':
+        return [value != 0 for value in data]
+    elif column_data_buffers['type'] == 'float64':
+        return ['NaN' if value != value else str(value) for value in np.frombuffer(data, dtype='<f8').tolist()]
+    return np.frombuffer(data, dtype=np.dtype(column_data_buffers['type']).newbyteorder('<')).tolist()
+
+
+@pytest.mark.parametrize("df", [
+    MIXED_DF,
+    MIXED_DF.iloc[[3, 1, 0]],
+    MIXED_DF.iloc[:0],
+    pd.DataFrame({
+        'int8': np.array([-1, 2], dtype='int8'), 
+        'uint32': np.array([1, 2 ** 32 - 1], dtype='uint32'), 
+        'int64': np.array([2 ** 62, -2 ** 63], dtype='int64'), 
+    })
+])
+def test_df_to_json_dumpsable_with_buffers_matches_json(df):
+    column_data, _ = get_sheet_data(df)
+
+    buffers: List[bytes] = []
+    sheet_data = df_to_json_dumpsable(
+        df, 'df', 'passed', {}, {}, {column_header: str(column_header) for column_header in df.columns}, {}, buffers=buffers
+    )
+    sheet_data = json.loads(json.dumps(sheet_data))
+    
+    buffer_column_data = [
+        get_column_data_from_buffers(column['columnDataBuffers'], buffers) if 'columnDataBuffers' in column else column['columnData']
+        for column in sheet_data['data']
+    ]
+    assert buffer_column_data == column_data
+    # All numeric, string, and date columns are sent in buffers
+    assert all(column['columnData'] == [] for column in sheet_data['data'] if column['columnID'] in ['int', 'float', 'string', 'datetime', 'timedelta'])
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for optimizing the dtypes of imported dataframes.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.dtype_optimization import (get_optimized_dtype,
+                                          optimize_dtypes,
+                                          set_optimize_imported_dtypes)
+from mitosheet.tests.test_utils import create_mito_wrapper_dfs
+
+TEST_FILE = 'test_dtype_optimization.csv'
+TEST_EXCEL_FILE = 'test_dtype_optimization.xlsx'
+
+NUM_ROWS = 1_000
+TEST_DF = pd.DataFrame({
+    'state': ['NY', 'CA', 'TX', 'NY'] * (NUM_ROWS // 4),
+    'name': [f'name {i}' for i in range(NUM_ROWS)],
+    'count': np.arange(NUM_ROWS),
+    'price': np.arange(NUM_ROWS) / 4,
+    'ratio': np.arange(NUM_ROWS) / 10,
+})
+
+
+@pytest.fixture
+def optimize_imported_dtypes():
+    set_optimize_imported_dtypes(True)
+    try:
+        yield
+    finally:
+        set_optimize_imported_dtypes(False)
+
+
+@pytest.mark.parametrize("series, optimized_dtype", [
+    (pd.Series([1, 2, 3]), None),
+    (pd.Series([1, 2 ** 40]), None),
+    (pd.Series([1.5, np.nan, -2.25]), None),
+    (pd.Series([0.1, 0.2]), None),
+    (pd.Series(['a', 'b', 'a', 'a', None]), 'category'),
+    (pd.Series(['a', 'b', 'c']), None),
+    (pd.Series(['a', 1, 'a', 'a']), None),
+    (pd.Series([True, False, True]), None),
+    (pd.Series([None, None], dtype='object'), None),
+])
+def test_get_optimized_dtype(series, optimized_dtype):
+    assert get_optimized_dtype(series) == optimized_dtype
+
+
+def test_optimize_dtypes_saves_memory_without_changing_values():
+    df, optimized_dtypes, num_bytes_saved = optimize_dtypes(TEST_DF)
+
+    assert optimized_dtypes == {'state': 'category'}
+    assert num_bytes_saved == TEST_DF.memory_usage(deep=True).sum() - df.memory_usage(deep=True).sum()
+    assert num_bytes_saved > 0
+    assert df.astype(TEST_DF.dtypes.to_dict()).equals(TEST_DF)
+
+
+def test_optimize_dtypes_only_changes_columns_that_get_smaller():
+    # A category of a short column takes up more memory than the strings
+    df = pd.DataFrame({'A': ['a', 'a']})
+    optimized_df, optimized_dtypes, num_bytes_saved = optimize_dtypes(df)
+    assert optimized_df is df
+    assert optimized_dtypes == {}
+    assert num_bytes_saved == 0
+
+
+def test_simple_import_does_not_optimize_dtypes_by_default():
+    TEST_DF.to_csv(TEST_FILE, index=False)
+
+    mito = create_mito_wrapper_dfs()
+    mito.simple_import([TEST_FILE])
+
+    assert mito.dfs[0].dtypes.equals(TEST_DF.dtypes)
+    assert len(mito.transpiled_code) == 2
+
+    os.remove(TEST_FILE)
+
+
+def test_simple_import_optimizes_dtypes(optimize_imported_dtypes):
+    TEST_DF.to_csv(TEST_FILE, index=False)
+
+    mito = create_mito_wrapper_dfs()
+    mito.simple_import([TEST_FILE])
+
+    assert str(mito.dfs[0]['state'].dtype) == 'category'
+    assert str(mito.dfs[0]['name'].dtype) == 'object'
+    assert str(mito.dfs[0]['count'].dtype) == 'int64'
+    assert str(mito.dfs[0]['price'].dtype) == 'float64'
+    assert str(mito.dfs[0]['ratio'].dtype) == 'float64'
+    assert mito.transpiled_code[-1] == \
+        "test_dtype_optimization = test_dtype_optimization.astype({'state': 'category'})"
+    assert mito.curr_step.get_code_chunks()[0].get_description_comment().startswith(
+        'Imported test_dtype_optimization.csv and optimized their dtypes to save'
+    )
+
+    # Then we edit the optimized columns
+    mito.set_formula('=CONCAT(state, "!")', 0, 'state_2', add_column=True)
+    mito.set_cell_value(0, 'state', 0, 'WA')
+    mito.set_cell_value(0, 'count', 1, '5')
+    assert mito.dfs[0]['state_2'].tolist()[:2] == ['WA!', 'CA!']
+    assert mito.dfs[0]['state'].tolist()[:2] == ['WA', 'CA']
+
+    os.remove(TEST_FILE)
+
+
+def test_excel_import_optimizes_dtypes(optimize_imported_dtypes):
+    TEST_DF.to_excel(TEST_EXCEL_FILE, index=False)
+
+    mito = create_mito_wrapper_dfs()
+    mito.excel_import(TEST_EXCEL_FILE, sheet_names=['Sheet1'], has_headers=True, skiprows=0)
+
+    assert str(mito.dfs[0]['state'].dtype) == 'category'
+    assert str(mito.dfs[0]['count'].dtype) == 'int64'
+    assert mito.transpiled_code[-1] == \
+        "Sheet1 = Sheet1.astype({'state': 'category'})"
+
+    os.remove(TEST_EXCEL_FILE)
+
+
+def test_passed_dataframes_optimize_dtypes(optimize_imported_dtypes):
+    df = TEST_DF.copy()
+
+    mito = create_mito_wrapper_dfs(df)
+    mito.add_column(0, 'new_column')
+
+    assert str(mito.dfs[0]['state'].dtype) == 'category'
+    assert mito.transpiled_code[:2] == [
+        '# Optimize the dtypes of the passed dataframes to save ' + mito.transpiled_code[0].split(' to save ')[1],
+        "df1 = df1.astype({'state': 'category'})",
+    ]
+    # The passed dataframe is not changed
+    assert df.equals(TEST_DF)
+
+
+def test_formulas_on_optimized_numbers_do_not_overflow_or_lose_precision(optimize_imported_dtypes):
+    df = pd.DataFrame({'A': [50_000, 60_000, 70_000], 'F': [0.5, 1.5, 2.5]})
+    mito = create_mito_wrapper_dfs(df)
+
+    mito.set_formula('=A * A', 0, 'B', add_column=True)
+    mito.set_formula('=F / 3', 0, 'G', add_column=True)
+
+    assert mito.get_column(0, 'B', as_list=True) == [2_500_000_000, 3_600_000_000, 4_900_000_000]
+    assert mito.get_column(0, 'G', as_list=True) == [0.5 / 3, 1.5 / 3, 2.5 / 3]
+    # The generated code gets the same results
+    code_globals = {'df1': df.copy()}
+    exec('\n'.join(mito.transpiled_code), code_globals)
+    code_df = code_globals['df1']
+    assert code_df['B'].tolist() == [2_500_000_000, 3_600_000_000, 4_900_000_000]
+    assert code_df['G'].tolist() == [0.5 / 3, 1.5 / 3, 2.5 / 3]
@@ -8,7 +8,7 @@ from copy import deepcopy
 
 import pandas as pd
 from mitosheet.errors import MitoError
-from mitosheet.evaluation_graph_utils import create_column_evaluation_graph, topological_sort_columns, creates_circularity
+from mitosheet.evaluation_graph_utils import create_column_evaluation_graph, get_column_evaluation_graph, topological_sort_columns, creates_circularity
 from mitosheet.tests.test_utils import create_mito_wrapper_dfs
 
 def test_create_column_evaluation_graph():
@@ -35,8 +35,53 @@ def test_create_column_evaluation_graph_complex():
     ) == {'A': {'AAAA'}, 'AAAA': {'C', 'D'}, 'C': {'D'}, 'D': set()}
 
 
+def _check_stored_graphs_match_formulas(mito):
+    for step in mito.steps:
+        state = step.post_state
+        for sheet_index, graph in enumerate(state.column_evaluation_graph):
+            if graph is not None:
+                assert graph == create_column_evaluation_graph(state, sheet_index)
+
+def test_column_evaluation_graph_updated_incrementally():
+    df = pd.DataFrame({'A': [123]})
+    mito = create_mito_wrapper_dfs(df, df.copy())
+    mito.set_formula('=A', 0, 'B', add_column=True)
+    mito.set_formula('=A + B', 0, 'C', add_column=True)
+    mito.set_formula('=B', 0, 'C')
+    mito.rename_column(0, 'B', 'BB')
+    mito.set_formula('=A', 0, 'D', add_column=True)
+    mito.delete_columns(0, ['C', 'D'])
+    mito.duplicate_dataframe(0)
+    mito.merge_sheets('lookup', 0, 'A', ['A', 'BB'], 1, 'A', ['A'])
+    mito.delete_dataframe(1)
+    mito.set_formula('=A + 1', 1, 'E', add_column=True)
+
+    assert get_column_evaluation_graph(mito.curr_step.post_state, 0) == {'A': {'B'}, 'B': set()}
+    assert get_column_evaluation_graph(mito.curr_step.post_state, 1) == {'A': {'E'}, 'BB': set(), 'E': set()}
+    _check_stored_graphs_match_formulas(mito)
+
+    mito.undo()
+    mito.undo()
+    _check_stored_graphs_match_formulas(mito)
+
+def test_column_evaluation_graph_not_shared_with_previous_steps():
+    df = pd.DataFrame({'A': [123]})
+    mito = create_mito_wrapper_dfs(df)
+    mito.set_formula('=A', 0, 'B', add_column=True)
+    graph = get_column_evaluation_graph(mito.curr_step.post_state, 0)
+    mito.set_formula('=0', 0, 'B')
+
+    assert graph == {'A': {'B'}, 'B': set()}
+    assert get_column_evaluation_graph(mito.curr_step.post_state, 0) == {'A': set(), 'B': set()}
+
+
 # Test circularity detection works
 
+def test_creates_circularity_ignores_removed_dependencies():
+    column_evaluation_graph = {'A': set(['B']), 'B': set(['C']), 'C': set([])}
+    assert creates_circularity(column_evaluation_graph, 'B', ['A'], ['C'])
+    assert not creates_circularity(column_evaluation_graph, 'B', ['A'], [])
+
 def test_creates_circularity_self_reference():
     column_evaluation_graph = {'A': set([]), 'B': set([]), 'C': set([])}
     should_not_modify = deepcopy(column_evaluation_graph)
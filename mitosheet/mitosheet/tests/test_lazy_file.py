@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for importing files lazily.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet import lazy_file
+from mitosheet.api.get_column_describe import get_column_describe
+from mitosheet.api.get_dataframe_as_csv import get_dataframe_as_csv
+from mitosheet.api.get_search_matches import get_search_matches
+from mitosheet.api.get_unique_value_counts import get_unique_value_counts
+from mitosheet.lazy_file import LAZY_FILE_WINDOW_NUM_ROWS
+from mitosheet.sheet_data import get_sheet_data_window
+from mitosheet.step_performers.import_steps.simple_import import set_lazy_import_min_file_size
+from mitosheet.steps_manager import StepsManager
+from mitosheet.tests.test_utils import create_mito_wrapper_dfs
+from mitosheet.utils import df_to_json_dumpsable
+
+TEST_FILE = 'test_lazy_file.csv'
+NUM_ROWS = LAZY_FILE_WINDOW_NUM_ROWS * 2 + 500
+
+TEST_DF = pd.DataFrame({
+    'A': np.arange(NUM_ROWS),
+    'B': ['apple', 'banana', 'cherry', None] * (NUM_ROWS // 4),
+    'C': np.arange(NUM_ROWS) % 997 / 4,
+})
+
+
+@pytest.fixture
+def lazy_import_file(monkeypatch):
+    # Small chunks, so that streaming over the file reads it in multiple chunks
+    monkeypatch.setattr(lazy_file, 'LAZY_FILE_CHUNK_NUM_ROWS', 7_000)
+    TEST_DF.to_csv(TEST_FILE, index=False)
+    set_lazy_import_min_file_size(1)
+    try:
+        yield TEST_FILE
+    finally:
+        set_lazy_import_min_file_size(None)
+        os.remove(TEST_FILE)
+
+
+def get_lazy_import(file_name):
+    mito = create_mito_wrapper_dfs()
+    mito.simple_import([file_name])
+    return mito
+
+
+def test_files_are_not_imported_lazily_by_default():
+    TEST_DF.to_csv(TEST_FILE, index=False)
+
+    mito = get_lazy_import(TEST_FILE)
+    assert mito.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files == [None]
+    assert len(mito.dfs[0]) == NUM_ROWS
+
+    os.remove(TEST_FILE)
+
+
+def test_lazy_import_reads_first_rows(lazy_import_file):
+    mito = get_lazy_import(lazy_import_file)
+    state = mito.mito_widget.steps_manager.curr_step.final_defined_state
+
+    assert state.lazy_files[0] is not None
+    assert len(mito.dfs[0]) == LAZY_FILE_WINDOW_NUM_ROWS
+    assert mito.dfs[0].equals(pd.read_csv(TEST_FILE).head(LAZY_FILE_WINDOW_NUM_ROWS))
+
+    # The number of rows is estimated from the size of the first rows
+    sheet_data = get_sheet_data_window(state, 0, (0, 100, 0, 10))
+    assert abs(sheet_data['numRows'] - NUM_ROWS) < NUM_ROWS * 0.1
+
+    # And the generated code reads the whole file
+    assert mito.transpiled_code == [
+        'import pandas as pd',
+        "test_lazy_file = pd.read_csv(r'test_lazy_file.csv')",
+    ]
+
+
+@pytest.mark.parametrize("window", [
+    (0, 100, 0, 10),
+    (LAZY_FILE_WINDOW_NUM_ROWS - 50, LAZY_FILE_WINDOW_NUM_ROWS + 50, 0, 10),
+    (NUM_ROWS - 100, NUM_ROWS + 100, 1, 10),
+])
+def test_lazy_import_reads_windows_of_rows(lazy_import_file, window):
+    mito = get_lazy_import(lazy_import_file)
+    state = mito.mito_widget.steps_manager.curr_step.final_defined_state
+    full_df = pd.read_csv(TEST_FILE)
+
+    sheet_data = get_sheet_data_window(state, 0, window)
+
+    row_start, row_end, column_start, column_end = window
+    expected_sheet_data = df_to_json_dumpsable(
+        full_df,
+        state.df_names[0],
+        state.df_sources[0],
+        state.column_spreadsheet_code[0],
+        state.column_filters[0],
+        state.column_ids.column_header_to_column_id[0],
+        state.column_format_types[0],
+        max_length=row_end - row_start,
+        max_columns=column_end - column_start,
+        row_start=row_start,
+        column_start=column_start,
+    )
+    assert sheet_data['data'] == expected_sheet_data['data']
+    assert sheet_data['index'] == expected_sheet_data['index']
+    assert sheet_data['rowStart'] == row_start
+    # The file is not read fully to display it
+    assert state.lazy_files[0].df is None
+
+
+def test_lazy_import_value_counts_and_describe_stream_over_file(lazy_import_file):
+    mito = get_lazy_import(lazy_import_file)
+    steps_manager = mito.mito_widget.steps_manager
+    full_df = pd.read_csv(TEST_FILE)
+
+    value_counts = json.loads(get_unique_value_counts({
+        'event': 'api_call', 'id': 'id', 'type': 'get_unique_value_counts', 'sheet_index': 0,
+        'column_id': 'B', 'search_string': '', 'sort': 'Descending Occurence'
+    }, steps_manager))['uniqueValueCountsSheetData']
+    values, _, counts = [column['columnData'] for column in value_counts['data']]
+    expected_value_counts = full_df['B'].value_counts(dropna=False)
+    assert dict(zip(values, counts)) == {
+        value if isinstance(value, str) else 'NaN': count for value, count in expected_value_counts.items()
+    }
+
+    describe = json.loads(get_column_describe({
+        'event': 'api_call', 'id': 'id', 'type': 'get_column_describe', 'sheet_index': 0, 'column_id': 'C'
+    }, steps_manager))
+    assert describe['count'] == str(float(NUM_ROWS))
+    assert describe['sum'] == str(round(full_df['C'].sum(), 2))
+
+    assert steps_manager.curr_step.final_defined_state.lazy_files[0].df is None
+    # Streaming over the file counts its rows
+    assert steps_manager.curr_step.final_defined_state.lazy_files[0].get_num_rows() == NUM_ROWS
+
+
+def test_edit_reads_lazy_file_fully(lazy_import_file):
+    mito = get_lazy_import(lazy_import_file)
+    mito.add_column(0, 'D')
+
+    assert len(mito.dfs[0]) == NUM_ROWS
+    assert mito.dfs[0].drop(columns=['D']).equals(pd.read_csv(TEST_FILE))
+    assert all(lazy_file is None for lazy_file in mito.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files)
+
+    # The import step now displays the whole file as well
+    mito.undo()
+    assert len(mito.dfs[0]) == NUM_ROWS
+
+
+def test_rename_and_delete_do_not_read_lazy_file(lazy_import_file):
+    mito = get_lazy_import(lazy_import_file)
+    lazy_file = mito.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files[0]
+
+    mito.rename_dataframe(0, 'new_name')
+    assert mito.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files == [lazy_file]
+
+    mito.delete_dataframe(0)
+    assert len(mito.dfs) == 0
+    assert lazy_file.df is None
+
+
+def test_search_and_export_read_lazy_file_fully_without_changing_state(lazy_import_file):
+    mito = get_lazy_import(lazy_import_file)
+    steps_manager = mito.mito_widget.steps_manager
+    state = steps_manager.curr_step.final_defined_state
+    lazy_file = state.lazy_files[0]
+
+    matches = json.loads(get_search_matches({'sheet_index': 0, 'search_string': str(NUM_ROWS - 1)}, steps_manager))
+    assert {'rowIndex': NUM_ROWS - 1, 'columnIndex': 0} in matches['cellIndexes']
+
+    csv_string = get_dataframe_as_csv({'sheet_index': 0}, steps_manager)
+    assert csv_string == pd.read_csv(TEST_FILE).to_csv(index=False)
+
+    # The API calls run on other threads, and so do not change the state
+    assert state.lazy_files == [lazy_file]
+    assert len(mito.dfs[0]) == LAZY_FILE_WINDOW_NUM_ROWS
+
+
+def test_sheet_call_reads_file_lazily(lazy_import_file):
+    steps_manager = StepsManager([lazy_import_file])
+    state = steps_manager.curr_step.final_defined_state
+
+    assert state.lazy_files[0] is not None
+    assert len(steps_manager.dfs[0]) == LAZY_FILE_WINDOW_NUM_ROWS
+    assert steps_manager.dfs[0].equals(pd.read_csv(TEST_FILE).head(LAZY_FILE_WINDOW_NUM_ROWS))
@@ -3,7 +3,10 @@
 
 # Copyright (c) Mito.
 # Distributed under the terms of the Modified BSD License.
+import json
 import os
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -123,4 +126,30 @@ def test_can_call_with_indexes():
     sheet(string_index)
 
     multi_index = df.set_index(['B', 'D'])
-    sheet(multi_index)
\ No newline at end of file
+    sheet(multi_index)
+
+def test_sheet_with_binary_sheet_data_sends_buffers():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [1.5, None, 2.0], 'C': ['a', None, 'c'], 'D': [[1], [2], [3]]})
+    mito = sheet(df, pd.DataFrame({'A': [True]}), binary_sheet_data=True)
+
+    sheet_data_array = json.loads(mito.sheet_data_patch_json)['sheetDataArray']
+    assert [column.get('columnDataBuffers') for column in sheet_data_array[0]['data']] == [
+        {'type': 'int64', 'data': 0},
+        {'type': 'float64', 'data': 1},
+        {'type': 'string', 'data': 2, 'offsets': 3, 'validity': 4},
+        None
+    ]
+    assert sheet_data_array[0]['data'][0]['columnData'] == []
+    assert sheet_data_array[0]['data'][3]['columnData'] == [[1], [2], [3]]
+
+    assert len(mito.sheet_data_buffers) == 2
+    assert mito.sheet_data_buffers[0][0] == np.array([1, 2, 3], dtype='<i8').tobytes()
+    assert mito.sheet_data_buffers[0][2] == b'ac'
+    assert mito.sheet_data_buffers[0][4] == bytes([0b101])
+    assert mito.sheet_data_buffers[1] == [bytes([1])]
+
+
+def test_sheet_without_binary_sheet_data_sends_no_buffers():
+    mito = sheet(pd.DataFrame({'A': [1, 2, 3]}))
+    assert json.loads(mito.sheet_data_json)[0]['data'][0]['columnData'] == [1, 2, 3]
+    assert mito.sheet_data_buffers == [[]]
@@ -4,10 +4,11 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 from typing import Any
+import pandas as pd
 import pytest
 
 from mitosheet.errors import MitoError
-from mitosheet.parser import parse_formula, safe_replace, safe_contains
+from mitosheet.parser import clear_parsed_formula_cache, get_parsed_formula_cache_stats, parse_and_compile_formula, parse_formula, safe_replace, safe_contains
 
 CONSTANT_TEST_CASES: Any = [
     (
@@ -390,4 +391,48 @@ SAFE_CONTAINS_TESTS = [
 
 @pytest.mark.parametrize('formula,substring,contains', SAFE_CONTAINS_TESTS)
 def test_safe_contains(formula, substring, contains):
-    assert safe_contains(formula, substring, ['A', 'B']) == contains
\ No newline at end of file
+    assert safe_contains(formula, substring, ['A', 'B']) == contains
+
+
+def test_parse_formula_cache_hits_and_misses():
+    clear_parsed_formula_cache()
+    parse_formula('=A + 1', 'B', ['A', 'B'])
+    parse_formula('=A + 1', 'B', ['B', 'A'])
+    parse_formula('=A + 1', 'C', ['A', 'B', 'C'])
+    stats = get_parsed_formula_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['size'] == 2
+
+
+def test_parse_formula_cache_returns_copies():
+    clear_parsed_formula_cache()
+    _, functions, dependencies = parse_formula('=SUM(A)', 'B', ['A', 'B'])
+    functions.add('TEST')
+    dependencies.add('TEST')
+    assert parse_formula('=SUM(A)', 'B', ['A', 'B']) == ('df[\'B\'] = SUM(df[\'A\'])', set(['SUM']), set(['A']))
+
+
+def test_parse_formula_cache_does_not_confuse_equal_column_headers():
+    clear_parsed_formula_cache()
+    assert parse_formula('=1 + 1', 'B', [1, 'B']) == ('df[\'B\'] = df[1] + df[1]', set(), set([1]))
+    assert parse_formula('=1 + 1', 'B', [True, 'B']) == ('df[\'B\'] = 1 + 1', set(), set())
+
+
+def test_parse_formula_cache_does_not_cache_errors():
+    clear_parsed_formula_cache()
+    for _ in range(2):
+        with pytest.raises(MitoError):
+            parse_formula('=SUM(A', 'B', ['A', 'B'])
+    assert parse_formula('=SUM(A', 'B', ['A', 'B'], throw_errors=False)[2] == set(['A'])
+    assert get_parsed_formula_cache_stats()['size'] == 1
+
+
+def test_parse_and_compile_formula_reuses_compiled_code():
+    clear_parsed_formula_cache()
+    compiled_code, dependencies = parse_and_compile_formula('=A + 1', 'B', ['A', 'B'])
+    assert dependencies == set(['A'])
+    assert parse_and_compile_formula('=A + 1', 'B', ['A', 'B'])[0] is compiled_code
+    df = pd.DataFrame({'A': [1, 2], 'B': [0, 0]})
+    exec(compiled_code, {'df': df})
+    assert df['B'].tolist() == [2, 3]
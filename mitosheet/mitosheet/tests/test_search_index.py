@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the search index of the sheets.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_search_matches import get_search_matches
+from mitosheet.search_index import SearchIndexCache, get_search_cell_indexes
+from mitosheet.tests.test_utils import create_mito_wrapper_dfs
+
+
+def get_search_cell_indexes_one_cell_at_a_time(df, search_string):
+    search_string = search_string.lower()
+    cell_indexes = []
+    for column_index, column in enumerate(df.columns):
+        matches = df[column].apply(str).str.lower().str.contains(search_string).to_numpy()
+        cell_indexes.extend((row_index, column_index) for row_index in np.flatnonzero(matches).tolist())
+    return sorted(cell_indexes)
+
+
+SEARCH_DF = pd.DataFrame({
+    'ints': [1, -10, 100, 5, 21, 0],
+    'floats': [1.5, -0.0, 0.0, np.NaN, 10.25, 1e20],
+    'bools': [True, False, True, True, False, False],
+    'strings': ['Apple', 'banana', None, np.NaN, 'Cherry pie', 'APPLE'],
+    'mixed': [1, 1.0, True, '1', None, 'one'],
+    'dates': pd.to_datetime(['2020-01-01', '2021-10-12', None, '2020-01-01', '2000-12-31', '2021-01-01']),
+    'categories': pd.Series(['a', 'B', 'a', 'c', 'B', 'a']).astype('category'),
+    'nullable_ints': pd.array([1, None, 3, 1, None, 10], dtype='Int64'),
+})
+
+@pytest.mark.parametrize("search_string", [
+    '1', '-', '0', '0.0', 'nan', 'none', 'true', 'a', 'APP', 'apple', 'e+', '2020-01', '<na>', 'nat', 'pie', '^1', 'zzz'
+])
+def test_search_cell_indexes_matches_searching_each_cell(search_string):
+    cell_indexes, num_cell_matches = get_search_cell_indexes(SEARCH_DF, search_string, SearchIndexCache())
+    expected_cell_indexes = get_search_cell_indexes_one_cell_at_a_time(SEARCH_DF, search_string)
+    assert cell_indexes == expected_cell_indexes
+    assert num_cell_matches == len(expected_cell_indexes)
+
+
+def test_search_cell_indexes_are_capped():
+    df = pd.DataFrame({'A': ['a'] * 10, 'B': ['ab'] * 10})
+    cell_indexes, num_cell_matches = get_search_cell_indexes(df, 'a', SearchIndexCache(), max_matches=5)
+    assert cell_indexes == [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0)]
+    assert num_cell_matches == 20
+
+
+def test_search_cell_indexes_from_starting_row_index():
+    df = pd.DataFrame({'A': ['a', 'b', 'a', 'a']})
+    cell_indexes, num_cell_matches = get_search_cell_indexes(df, 'a', SearchIndexCache(), starting_row_index=1)
+    assert cell_indexes == [(2, 0), (3, 0)]
+    assert num_cell_matches == 2
+
+
+def test_search_cell_indexes_of_empty_df():
+    assert get_search_cell_indexes(pd.DataFrame({'A': []}), 'a', SearchIndexCache()) == ([], 0)
+    assert get_search_cell_indexes(pd.DataFrame(), 'a', SearchIndexCache()) == ([], 0)
+
+
+def test_search_index_only_reindexes_changed_columns():
+    df = pd.DataFrame({'A': ['abc', 'def'], 'B': [1, 2], 'C': [1.5, 2.5]})
+    mito = create_mito_wrapper_dfs(df)
+    steps_manager = mito.mito_widget.steps_manager
+    search_index_cache = steps_manager.search_index_cache
+
+    event = {'event': 'api_call', 'id': 'id', 'type': 'get_search_matches', 'sheet_index': 0, 'search_string': '2'}
+    get_search_matches(event, steps_manager)
+    assert search_index_cache.get_stats()['misses'] == 3
+
+    get_search_matches({**event, 'search_string': 'd'}, steps_manager)
+    assert search_index_cache.get_stats()['misses'] == 3
+    assert search_index_cache.get_stats()['hits'] == 3
+
+    mito.set_cell_value(0, 'B', 0, 22)
+    matches = json.loads(get_search_matches(event, steps_manager))
+    assert search_index_cache.get_stats()['misses'] == 4
+    assert matches['cellIndexes'] == [
+        {'rowIndex': 0, 'columnIndex': 1},
+        {'rowIndex': 1, 'columnIndex': 1},
+        {'rowIndex': 1, 'columnIndex': 2},
+    ]
+
+
+def test_get_search_matches():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'Name': ['Nate', 'Aaron', 'Jake'], 'Age': [25, 1, 40]}))
+    matches = json.loads(get_search_matches(
+        {'event': 'api_call', 'id': 'id', 'type': 'get_search_matches', 'sheet_index': 0, 'search_string': 'a'},
+        mito.mito_widget.steps_manager
+    ))
+    assert matches == {
+        'columnHeaderIndexes': [{'rowIndex': -1, 'columnIndex': 0}, {'rowIndex': -1, 'columnIndex': 1}],
+        'cellIndexes': [
+            {'rowIndex': 0, 'columnIndex': 0},
+            {'rowIndex': 1, 'columnIndex': 0},
+            {'rowIndex': 2, 'columnIndex': 0},
+        ],
+        'numCellMatches': 3
+    }
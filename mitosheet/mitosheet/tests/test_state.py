@@ -6,9 +6,12 @@
 """
 Contains tests for the state class
 """
-from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, DATAFRAME_SOURCE_PASSED, State
+import numpy as np
 import pandas as pd
 
+from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, DATAFRAME_SOURCE_PASSED, State
+from mitosheet.tests.test_utils import create_mito_wrapper, make_multi_index_header_df
+
 def test_state_can_add_df_to_end():
     df = pd.DataFrame({'A': [123]})
     state = State([df])
@@ -29,3 +32,61 @@ def test_state_can_add_df_to_middle():
     
     assert state.df_sources == [DATAFRAME_SOURCE_IMPORTED]
 
+
+def test_state_copy_shares_columns_that_are_not_copied():
+    df = pd.DataFrame({'A': [1.0, 2.0], 'B': [3.0, 4.0], 'C': ['a', 'b']})
+    state = State([df])
+    new_state = state.copy(column_ids_to_copy={0: ['B']})
+
+    new_df = new_state.dfs[0]
+    assert np.shares_memory(new_df['A'].values, df['A'].values)
+    assert not np.shares_memory(new_df['B'].values, df['B'].values)
+    assert list(new_df.columns) == ['A', 'B', 'C']
+
+def test_state_copy_writing_copied_columns_does_not_change_original():
+    df = pd.DataFrame({'A': [1.0, 2.0], 'B': [3.0, 4.0]})
+    state = State([df])
+    new_state = state.copy(column_ids_to_copy={0: ['B']})
+
+    new_state.dfs[0]['B'] = pd.Series([5.0, 6.0])
+    new_state.dfs[0].at[0, 'B'] = 7.0
+
+    assert df.equals(pd.DataFrame({'A': [1.0, 2.0], 'B': [3.0, 4.0]}))
+    assert new_state.dfs[0].equals(pd.DataFrame({'A': [1.0, 2.0], 'B': [7.0, 6.0]}))
+
+def test_state_copy_only_copies_metadata_of_modified_sheets():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df, df])
+    new_state = state.copy(modified_sheet_indexes=[1])
+
+    assert new_state.column_spreadsheet_code[0] is state.column_spreadsheet_code[0]
+    assert new_state.column_ids.get_column_ids_map(0) is state.column_ids.get_column_ids_map(0)
+    assert new_state.column_spreadsheet_code[1] is not state.column_spreadsheet_code[1]
+    assert new_state.column_ids.get_column_ids_map(1) is not state.column_ids.get_column_ids_map(1)
+
+    new_state.column_spreadsheet_code[1]['A'] = '=1'
+    assert state.column_spreadsheet_code[1]['A'] == ''
+
+def test_state_copy_private_columns_with_multi_index_headers():
+    df = make_multi_index_header_df({0: [1], 1: [2]}, [('A', 'a'), ('B', 'b')])
+    state = State([df])
+    column_id = state.column_ids.get_column_id_by_header(0, ('B', 'b'))
+    new_state = state.copy(column_ids_to_copy={0: [column_id]})
+
+    new_state.dfs[0][('B', 'b')] = 3
+    assert df[('B', 'b')].tolist() == [2]
+    assert new_state.dfs[0].columns.equals(df.columns)
+
+def test_set_formula_does_not_change_previous_states():
+    mito = create_mito_wrapper([1, 2, 3])
+    mito.add_column(0, 'B')
+    mito.set_formula('=A', 0, 'B')
+    mito.add_column(0, 'C')
+    mito.set_formula('=B + 1', 0, 'C')
+    mito.set_formula('=A * 10', 0, 'B')
+    mito.set_cell_value(0, 'A', 0, 100)
+
+    assert mito.steps[2].dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [1, 2, 3]}))
+    assert mito.steps[4].dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [1, 2, 3], 'C': [2, 3, 4]}))
+    assert mito.steps[5].dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [10, 20, 30], 'C': [11, 21, 31]}))
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [100, 2, 3], 'B': [1000, 20, 30], 'C': [1001, 21, 31]}))
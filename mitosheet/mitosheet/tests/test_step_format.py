@@ -29,6 +29,7 @@ from mitosheet.step_performers import (
     DataframeRenameStepPerformer,
     BulkOldRenameStepPerformer, 
     ExcelImportStepPerformer,
+    ParquetImportStepPerformer,
     DropDuplicatesStepPerformer,
     GraphStepPerformer,
     ConcatStepPerformer
@@ -180,6 +181,12 @@ def test_params_static():
         'excel_import'
     )
 
+    check_step(
+        ParquetImportStepPerformer,
+        1,
+        'parquet_import'
+    )
+
     check_step(
         DropDuplicatesStepPerformer,
         1,
@@ -216,7 +223,7 @@ def test_params_static():
         'concat'
     )
 
-    assert len(STEP_PERFORMERS) == 24
+    assert len(STEP_PERFORMERS) == 25
 
 
 def get_fake_param(param_name):
@@ -3,13 +3,19 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import json
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from mitosheet.utils import get_new_id
+from mitosheet.mito_widget import sheet
+from mitosheet.step import Step, StepSkipIndex
+from mitosheet.utils import MAX_ROWS, get_new_id
 from mitosheet.errors import MitoError
+from mitosheet.step_performers.filter import FC_NUMBER_EXACTLY, FC_NUMBER_GREATER
 from mitosheet.steps_manager import StepsManager
-from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.tests.test_utils import MitoWidgetTestWrapper, create_mito_wrapper, create_mito_wrapper_dfs
 from mitosheet.column_headers import get_column_header_id
 
 
@@ -99,3 +105,441 @@ def test_failed_overwrite_rolls_back_to_previous_state():
     assert mito.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3], 'B': [0, 0, 0]}))
 
 
+def test_no_evictions_without_max_history_bytes():
+    mito = create_mito_wrapper([1, 2, 3])
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B', add_column=False)
+    mito.set_cell_value(0, 'A', 0, 10)
+
+    assert mito.mito_widget.steps_manager.num_state_evictions == 0
+    assert not any(step.post_state.dfs_evicted for step in mito.steps)
+
+
+def test_max_history_bytes_evicts_historical_states():
+    mito = MitoWidgetTestWrapper(sheet(pd.DataFrame({'A': [1, 2, 3]}), max_history_bytes=0))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B', add_column=False)
+    mito.set_cell_value(0, 'A', 0, 10)
+    mito.add_column(0, 'C')
+
+    steps_manager = mito.mito_widget.steps_manager
+    assert steps_manager.num_state_evictions > 0
+    assert not steps_manager.steps[0].post_state.dfs_evicted
+    assert not steps_manager.curr_step.post_state.dfs_evicted
+    # Evicted states keep their columns and dtypes
+    assert list(steps_manager.steps[2].dfs[0].keys()) == ['A', 'B']
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [10, 2, 3], 'B': [11, 3, 4], 'C': [0, 0, 0]}))
+
+
+def test_checkout_evicted_step_rematerializes_it():
+    mito = MitoWidgetTestWrapper(sheet(pd.DataFrame({'A': [1, 2, 3]}), max_history_bytes=0))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B', add_column=False)
+    mito.set_cell_value(0, 'A', 0, 10)
+    mito.add_column(0, 'C')
+
+    steps_manager = mito.mito_widget.steps_manager
+    assert steps_manager.steps[2].post_state.dfs_evicted
+
+    mito.checkout_step_by_idx(2)
+    assert steps_manager.num_state_rematerializations > 0
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]}))
+
+    mito.checkout_step_by_idx(4)
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [10, 2, 3], 'B': [11, 3, 4], 'C': [0, 0, 0]}))
+
+
+def test_undo_and_overwrite_with_evicted_states():
+    mito = MitoWidgetTestWrapper(sheet(pd.DataFrame({'A': [1, 2, 3]}), max_history_bytes=0))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B', add_column=False)
+    mito.set_cell_value(0, 'A', 0, 10)
+    mito.add_column(0, 'C')
+
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [10, 2, 3], 'B': [11, 3, 4]}))
+    mito.undo()
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]}))
+
+    # Overwriting the formula reexecutes from the evicted add column step
+    mito.set_formula('=A + 2', 0, 'B', add_column=False)
+    mito.set_formula('=A + 3', 0, 'B', add_column=False)
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+
+
+def test_transpile_change_dtype_to_datetime_with_evicted_states():
+    mito = MitoWidgetTestWrapper(sheet(pd.DataFrame({'A': ['12-22-1997', '12-23-1997', 'not a date']}), max_history_bytes=0))
+    mito.change_column_dtype(0, 'A', 'datetime')
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+
+    assert mito.mito_widget.steps_manager.steps[1].post_state.dfs_evicted
+    assert "df1['A'] = pd.to_datetime(df1['A'], format='%m-%d-%Y', errors='coerce')" in mito.transpiled_code
+
+
+def test_overwriting_filter_reuses_steps_on_other_sheets():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.add_column(1, 'B')
+    mito.set_formula('=A + 1', 1, 'B', add_column=False)
+    mito.add_column(0, 'B')
+
+    old_formula_step = mito.steps[3]
+
+    # Overwriting the filter reexecutes from before the old filter
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+
+    # The steps on the second sheet are not reexecuted
+    new_formula_step = mito.steps[3]
+    assert new_formula_step is not old_formula_step
+    assert new_formula_step.dfs[1] is old_formula_step.dfs[1]
+    assert new_formula_step.column_spreadsheet_code[1] is old_formula_step.column_spreadsheet_code[1]
+
+    # But the steps on the filtered sheet are
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [3], 'B': [0]}, index=[2]))
+    assert mito.dfs[1].equals(pd.DataFrame({'A': [4, 5, 6], 'B': [5, 6, 7]}))
+
+
+def test_reexecutes_steps_that_read_changed_sheets():
+    mito = create_mito_wrapper([1, 2, 3], [1, 2, 3])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.merge_sheets('lookup', 0, 'A', ['A'], 1, 'A', ['A'])
+    mito.add_column(2, 'B')
+
+    assert mito.dfs[2].equals(pd.DataFrame({'A': [2, 3], 'B': [0, 0]}))
+
+    # The new filter skips the old one, so the merge reads the unfiltered sheet
+    mito.filter(0, 'A', 'And', FC_NUMBER_EXACTLY, 3)
+
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [3]}, index=[2]))
+    assert mito.dfs[2].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [0, 0, 0]}))
+
+
+def test_undo_reuses_steps_on_other_sheets():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.add_column(1, 'B')
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+    
+    old_add_column_step = mito.steps[2]
+
+    # Undoing the filter that overwrote the old filter reexecutes the old filter
+    mito.undo()
+
+    assert mito.steps[2] is not old_add_column_step
+    assert mito.steps[2].dfs[1] is old_add_column_step.dfs[1]
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [2, 3]}, index=[1, 2]))
+    assert mito.dfs[1].equals(pd.DataFrame({'A': [4, 5, 6], 'B': [0, 0, 0]}))
+
+
+def _filter_step(step_id: str, sheet_index: int, column_id: str) -> Step:
+    return Step('filter_column', step_id, {'sheet_index': sheet_index, 'column_id': column_id})
+
+def _formula_step(step_id: str, sheet_index: int, column_id: str) -> Step:
+    return Step('set_column_formula', step_id, {'sheet_index': sheet_index, 'column_id': column_id})
+
+SKIP_INDEX_STEPS = [
+    Step('initialize', 'initialize', {}),
+    _filter_step('a', 0, 'A'),
+    _formula_step('b', 0, 'B'),
+    _formula_step('c', 0, 'B'),
+    _filter_step('d', 0, 'C'),
+    Step('pivot', 'e', {}),
+    _filter_step('f', 0, 'A'),
+    Step('pivot', 'e', {}),
+    _filter_step('g', 1, 'A'),
+    _formula_step('h', 0, 'B'),
+]
+
+@pytest.mark.parametrize("num_steps,step_indexes_to_skip", [
+    (1, set()),
+    (3, set()),
+    (4, {2}),
+    (6, {2}),
+    (7, {1, 2}),
+    (8, {1, 2, 5}),
+    (10, {1, 2, 5}),
+])
+def test_step_skip_index(num_steps, step_indexes_to_skip):
+    assert StepSkipIndex(SKIP_INDEX_STEPS[:num_steps]).get_step_indexes_to_skip() == step_indexes_to_skip
+    assert StepSkipIndex(SKIP_INDEX_STEPS).get_step_indexes_to_skip(num_steps) == step_indexes_to_skip
+
+
+def test_step_skip_index_update_pops_and_appends():
+    step_skip_index = StepSkipIndex(SKIP_INDEX_STEPS)
+
+    changed_step_indexes = step_skip_index.update(SKIP_INDEX_STEPS[:6])
+    assert changed_step_indexes == {1, 5}
+    assert step_skip_index.get_step_indexes_to_skip() == {2}
+
+    changed_step_indexes = step_skip_index.update(SKIP_INDEX_STEPS[:4] + [_filter_step('i', 0, 'C'), _formula_step('j', 0, 'B')])
+    assert changed_step_indexes == set()
+    assert step_skip_index.get_step_indexes_to_skip() == {2}
+
+    changed_step_indexes = step_skip_index.update(SKIP_INDEX_STEPS[:4] + [_filter_step('k', 0, 'A')])
+    assert changed_step_indexes == {1}
+    assert step_skip_index.get_step_indexes_to_skip() == {1, 2}
+    
+    assert step_skip_index.update(SKIP_INDEX_STEPS) == {1, 5}
+    assert step_skip_index.get_step_indexes_to_skip() == StepSkipIndex(SKIP_INDEX_STEPS).get_step_indexes_to_skip()
+
+
+def test_get_sheet_data_window():
+    df = pd.DataFrame({f'C{i}': range(i, i + 10) for i in range(5)})
+    steps_manager = StepsManager([df])
+
+    sheet_data = steps_manager.get_sheet_data(0, (2, 5, 1, 3))
+    assert sheet_data['numRows'] == 10
+    assert sheet_data['numColumns'] == 5
+    assert sheet_data['rowStart'] == 2
+    assert sheet_data['columnStart'] == 1
+    assert sheet_data['index'] == [2, 3, 4]
+    assert [column['columnID'] for column in sheet_data['data']] == ['C1', 'C2']
+    assert [column['columnData'] for column in sheet_data['data']] == [[3, 4, 5], [4, 5, 6]]
+
+
+def test_get_sheet_data_window_is_bounded():
+    df = pd.DataFrame({'A': range(5_000)})
+    steps_manager = StepsManager([df])
+
+    sheet_data = steps_manager.get_sheet_data(0, (-10, 5_000, 0, 10))
+    assert sheet_data['rowStart'] == 0
+    assert len(sheet_data['index']) == MAX_ROWS
+
+    sheet_data = steps_manager.get_sheet_data(0, (4_990, 6_000, 0, 10))
+    assert sheet_data['index'] == list(range(4_990, 5_000))
+
+
+def test_sheet_data_json_sends_requested_windows():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    steps_manager = mito.mito_widget.steps_manager
+
+    steps_manager.get_sheet_data(0, (1, 3, 0, 1))
+    steps_manager.get_sheet_data(1, (2, 3, 0, 1))
+    mito.add_column(0, 'B')
+
+    sheet_data_array = json.loads(mito.mito_widget.sheet_data_json)
+    assert sheet_data_array[0]['index'] == [1, 2]
+    assert sheet_data_array[0]['data'][0]['columnData'] == [2, 3]
+    # The window of the unmodified sheet changed, so it is sent again too
+    assert sheet_data_array[1]['index'] == [2]
+    assert sheet_data_array[1]['data'][0]['columnData'] == [6]
+
+
+def test_sheet_data_windows_are_cached():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    steps_manager = mito.mito_widget.steps_manager
+    cache = steps_manager.sheet_data_window_cache
+    cache.clear()
+
+    sheet_data = steps_manager.get_sheet_data(1, (0, 2, 0, 1))
+    assert steps_manager.get_sheet_data(1, (0, 2, 0, 1)) is sheet_data
+    assert cache.get_stats()['hits'] == 1
+
+    # Changing another sheet does not change the window of this sheet
+    mito.add_column(0, 'B')
+    assert steps_manager.get_sheet_data(1, (0, 2, 0, 1)) is sheet_data
+
+    # But changing this sheet does
+    mito.add_column(1, 'B')
+    new_sheet_data = steps_manager.get_sheet_data(1, (0, 2, 0, 1))
+    assert new_sheet_data is not sheet_data
+    assert [column['columnID'] for column in new_sheet_data['data']] == ['A']
+    
+    # And undoing gets the cached window back
+    mito.undo()
+    assert steps_manager.get_sheet_data(1, (0, 2, 0, 1)) is sheet_data
+
+
+def test_sheet_data_patch_only_has_changed_columns_in_buffers():
+    steps_manager = StepsManager([pd.DataFrame({'A': [1.5, 2.5]}), pd.DataFrame({'B': ['x', 'y']})], binary_sheet_data=True)
+    sheet_data_patch = json.loads(steps_manager.get_sheet_data_patch_json())
+    assert sheet_data_patch['baseVersion'] is None
+    assert steps_manager.sheet_data_patch_buffers[0] == [np.array([1.5, 2.5]).tobytes()]
+    assert steps_manager.sheet_data_patch_buffers[1] == [b'xy', np.array([0, 1, 2], dtype='<i4').tobytes()]
+
+    steps_manager.handle_edit_event({
+        'event': 'edit_event',
+        'id': get_new_id(),
+        'type': 'add_column_edit',
+        'step_id': get_new_id(),
+        'params': {'sheet_index': 0, 'column_header': 'C', 'column_header_index': -1}
+    })
+    new_sheet_data_patch = json.loads(steps_manager.get_sheet_data_patch_json())
+    assert new_sheet_data_patch['baseVersion'] == sheet_data_patch['version']
+    assert new_sheet_data_patch['sheetDataArray'][1] is None
+    columns = new_sheet_data_patch['sheetDataArray'][0]['data']
+    assert columns[0]['columnDataUnchanged'] and 'columnDataBuffers' not in columns[0]
+    assert columns[1]['columnDataBuffers'] == {'type': 'int64', 'data': 0}
+    assert steps_manager.sheet_data_patch_buffers == [[np.array([0, 0]).tobytes()], []]
+
+
+def test_sheet_data_patch_only_has_changed_columns():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B', add_column=False)
+
+    sheet_data_patch = json.loads(mito.mito_widget.sheet_data_patch_json)
+    assert sheet_data_patch['sheetDataArray'][1] is None
+    columns = sheet_data_patch['sheetDataArray'][0]['data']
+    assert [column.get('columnDataUnchanged', False) for column in columns] == [True, False]
+    assert columns[0]['columnData'] == []
+    assert columns[1]['columnData'] == [2, 3, 4]
+
+    mito.undo()
+    sheet_data_patch = json.loads(mito.mito_widget.sheet_data_patch_json)
+    columns = sheet_data_patch['sheetDataArray'][0]['data']
+    assert [column.get('columnDataUnchanged', False) for column in columns] == [True, False]
+    assert columns[1]['columnData'] == [0, 0, 0]
+
+    mito.redo()
+    assert mito.front_end_sheet_data_array[0]['data'][1]['columnData'] == [2, 3, 4]
+
+
+def test_sheet_data_patch_sends_all_columns_for_new_window():
+    mito = create_mito_wrapper([1, 2, 3])
+    steps_manager = mito.mito_widget.steps_manager
+    steps_manager.get_sheet_data(0, (1, 3, 0, 2))
+    mito.add_column(0, 'B')
+
+    sheet_data_patch = json.loads(mito.mito_widget.sheet_data_patch_json)
+    columns = sheet_data_patch['sheetDataArray'][0]['data']
+    assert [column['columnData'] for column in columns] == [[2, 3], [0, 0]]
+    assert not any(column.get('columnDataUnchanged') for column in columns)
+
+
+def test_deleting_dataframe_moves_sheet_data_windows():
+    mito = create_mito_wrapper_dfs(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'A': [4, 5, 6]}), pd.DataFrame({'A': [7, 8, 9]}))
+    steps_manager = mito.mito_widget.steps_manager
+    steps_manager.get_sheet_data(0, (1, 3, 0, 1))
+    steps_manager.get_sheet_data(2, (2, 3, 0, 1))
+
+    mito.delete_dataframe(0)
+    assert steps_manager.sheet_data_windows == {1: (2, 3, 0, 1)}
+    sheet_data_array = json.loads(mito.mito_widget.sheet_data_json)
+    assert sheet_data_array[0]['index'] == [0, 1, 2]
+    assert sheet_data_array[1]['index'] == [2]
+    assert sheet_data_array[1]['data'][0]['columnData'] == [9]
+
+
+def test_undoing_delete_dataframe_clears_sheet_data_windows():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    steps_manager = mito.mito_widget.steps_manager
+    mito.delete_dataframe(0)
+    steps_manager.get_sheet_data(0, (1, 3, 0, 1))
+
+    mito.undo()
+    assert steps_manager.sheet_data_windows == {}
+    sheet_data_array = json.loads(mito.mito_widget.sheet_data_json)
+    assert sheet_data_array[0]['data'][0]['columnData'] == [1, 2, 3]
+    assert sheet_data_array[1]['data'][0]['columnData'] == [4, 5, 6]
+
+
+def test_get_sheet_data_windows_is_a_snapshot():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    steps_manager = mito.mito_widget.steps_manager
+    steps_manager.get_sheet_data(0, (1, 3, 0, 1))
+
+    # The windows are set by API calls on another thread, so the snapshot does not 
+    # change while it is iterated over
+    sheet_data_windows = steps_manager.get_sheet_data_windows()
+    steps_manager.get_sheet_data(1, (2, 3, 0, 1))
+    assert sheet_data_windows == {0: (1, 3, 0, 1)}
+    assert steps_manager.get_sheet_data_windows() == {0: (1, 3, 0, 1), 1: (2, 3, 0, 1)}
+
+
+def test_get_sent_sheet_data_json_has_all_sheet_data():
+    mito = create_mito_wrapper([1, 2, 3], [4, 5, 6])
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+
+    sent_sheet_data = json.loads(mito.mito_widget.steps_manager.get_sent_sheet_data_json())
+    assert sent_sheet_data['version'] == json.loads(mito.mito_widget.sheet_data_patch_json)['version']
+    assert sent_sheet_data['sheetDataArray'] == json.loads(mito.mito_widget.sheet_data_json)
+
+
+def get_copy_test_df():
+    return pd.DataFrame({
+        'A': [1, 2, 3],
+        'B': [1.5, 2.5, 3.5],
+        'C': ['a', 'b', 'c'],
+        'D': [True, False, True],
+        'E': pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03']),
+        'F': pd.Series([1, None, 3], dtype='Int64'),
+    })
+
+
+def test_sheet_without_copy_shares_memory_with_passed_dataframe():
+    df = get_copy_test_df()
+    mito = MitoWidgetTestWrapper(sheet(df, copy=False))
+
+    for column_header in ['A', 'B', 'D', 'E']:
+        assert np.shares_memory(mito.dfs[0][column_header].to_numpy(), df[column_header].to_numpy())
+    # The default copies the dataframe
+    mito_copy = MitoWidgetTestWrapper(sheet(df))
+    assert not np.shares_memory(mito_copy.dfs[0]['A'].to_numpy(), df['A'].to_numpy())
+
+
+def test_sheet_without_copy_cannot_write_to_passed_dataframe():
+    df = get_copy_test_df()
+    mito = MitoWidgetTestWrapper(sheet(df, copy=False))
+
+    with pytest.raises(ValueError):
+        mito.dfs[0].at[0, 'A'] = 10
+    with pytest.raises(ValueError):
+        mito.dfs[0].iloc[0, 1] = 10.5
+    assert df.equals(get_copy_test_df())
+
+    # The user can still write to their dataframe
+    df.at[0, 'A'] = 10
+    assert df.at[0, 'A'] == 10
+
+
+def test_sheet_without_copy_never_changes_passed_dataframe():
+    df = get_copy_test_df()
+    mito = MitoWidgetTestWrapper(sheet(df, copy=False))
+
+    mito.set_cell_value(0, 'A', 0, 10)
+    mito.set_cell_value(0, 'B', 1, 10.5)
+    mito.set_cell_value(0, 'C', 2, 'z')
+    mito.set_cell_value(0, 'D', 0, False)
+    mito.set_formula('=A * 2', 0, 'A', add_column=False)
+    mito.set_formula('=CONCAT(C, "!")', 0, 'G', add_column=True)
+    mito.change_column_dtype(0, 'B', 'int')
+    mito.sort(0, 'A', 'descending')
+    mito.filter(0, 'A', 'Or', FC_NUMBER_GREATER, 5)
+    mito.rename_column(0, 'C', 'C_renamed')
+    mito.delete_columns(0, ['E'])
+    mito.duplicate_dataframe(0)
+    mito.set_cell_value(1, 'F', 0, 5)
+
+    assert df.equals(get_copy_test_df())
+
+    # And the sheet is the same as if the dataframe was copied
+    mito_copy = create_mito_wrapper_dfs(get_copy_test_df())
+    for step in mito.steps[1:]:
+        mito_copy.mito_widget.steps_manager.handle_edit_event({
+            'event': 'edit_event', 'id': get_new_id(), 'type': step.step_type + '_edit',
+            'step_id': get_new_id(), 'params': step.params
+        })
+    assert len(mito.dfs) == len(mito_copy.dfs) == 2
+    for df_without_copy, df_with_copy in zip(mito.dfs, mito_copy.dfs):
+        assert df_without_copy.equals(df_with_copy)
+
+    mito.undo()
+    mito.clear()
+    mito.redo()
+    assert df.equals(get_copy_test_df())
+
+
+def test_sheet_without_copy_still_transpiles():
+    df = get_copy_test_df()
+    mito = create_mito_wrapper_dfs(df)
+    mito_without_copy = MitoWidgetTestWrapper(sheet(df, copy=False))
+
+    for m in [mito, mito_without_copy]:
+        m.set_cell_value(0, 'A', 0, 10)
+    
+    assert mito.transpiled_code == mito_without_copy.transpiled_code
+    assert mito_without_copy.dfs[0]['A'].tolist() == [10, 2, 3]
+    assert df.equals(get_copy_test_df())
@@ -228,4 +228,63 @@ def test_transpile_merge_then_sort():
         'temp_df = df2.drop_duplicates(subset=\'Name\') # Remove duplicates so lookup merge only returns first match',
         'df3 = df1.merge(temp_df, left_on=[\'Name\'], right_on=[\'Name\'], how=\'left\', suffixes=[\'_df1\', \'_df2\'])',
         'df3 = df3.sort_values(by=\'Number\', ascending=True, na_position=\'first\')',
-    ]
\ No newline at end of file
+    ]
+
+def test_transpile_reuses_code_chunks_of_steps():
+    mito = create_mito_wrapper(['abc'])
+    mito.add_column(0, 'B')
+    step = mito.curr_step
+
+    code_chunks = step.get_code_chunks()
+    mito.add_column(0, 'C')
+    assert mito.steps[1] is step
+    assert step.get_code_chunks() is code_chunks
+
+    # Executing the step again transpiles it again
+    step.set_prev_state_and_execute(step.prev_state)
+    assert step.get_code_chunks() is not code_chunks
+
+
+def test_transpile_only_optimizes_new_steps():
+    mito = create_mito_wrapper(['abc'])
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+    optimized_code_chunks = mito.mito_widget.steps_manager.code_chunks_optimizer.optimized[-1][1]
+
+    mito.add_column(0, 'D')
+    new_optimized_code_chunks = mito.mito_widget.steps_manager.code_chunks_optimizer.optimized[-1][1]
+    assert new_optimized_code_chunks[:2] == optimized_code_chunks
+    assert mito.transpiled_code == [
+        'df1.insert(1, \'B\', 0)',
+        'df1.insert(2, \'C\', 0)',
+        'df1.insert(3, \'D\', 0)',
+    ]
+
+    # And undoing gets the optimized code back
+    mito.undo()
+    assert mito.mito_widget.steps_manager.code_chunks_optimizer.optimized[-1][1] is optimized_code_chunks
+
+
+def test_transpile_optimizes_all_steps_when_new_steps_combine_with_them():
+    df1 = pd.DataFrame(data={'A': [1]})
+    mito = create_mito_wrapper_dfs(df1)
+    mito.duplicate_dataframe(0)
+    mito.add_column(1, 'B')
+    mito.rename_column(1, 'A', 'C')
+    mito.delete_dataframe(1)
+
+    assert mito.transpiled_code == []
+    optimized_code_chunks = mito.mito_widget.steps_manager.code_chunks_optimizer.optimized[-1][1]
+    assert [type(code_chunk) for code_chunk in optimized_code_chunks] == [type(code_chunk) for code_chunk in mito.optimized_code_chunks]
+
+
+def test_transpile_optimizes_nested_steps():
+    mito = create_mito_wrapper(['abc'])
+    for column_header in ['B', 'C', 'D']:
+        mito.add_column(0, column_header)
+    for column_header in ['D', 'C']:
+        mito.delete_columns(0, [column_header])
+
+    assert mito.transpiled_code == [
+        'df1.insert(1, \'B\', 0)',
+    ]
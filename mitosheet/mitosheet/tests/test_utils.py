@@ -17,6 +17,7 @@ from numpy import number
 import pandas as pd
 from mitosheet.mito_widget import MitoWidget, sheet
 from mitosheet.parser import parse_formula
+from mitosheet.sheet_data import get_sheet_data_window
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.types import ColumnHeader, ColumnID, GraphID, MultiLevelColumnHeader
 from mitosheet.utils import dfs_to_array_for_json, get_new_id
@@ -61,6 +62,7 @@ def check_dataframes_equal(test_wrapper):
             test_wrapper.mito_widget.steps_manager.original_args,
             test_wrapper.mito_widget.steps_manager.steps[0].df_names
         )
+        if isinstance(df, pd.DataFrame)
     }
     final_dfs = {
         df_name: df.copy(deep=True) for df, df_name in 
@@ -72,7 +74,18 @@ def check_dataframes_equal(test_wrapper):
 
     # Then, construct code that is just the code we expect, except at the end
     # it compares the dataframe to the final dataframe we expect
+    # The sheets backed by lazy files only have the first rows of the file
+    lazy_df_names = {
+        df_name for lazy_file, df_name in 
+        zip(
+            test_wrapper.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files,
+            test_wrapper.mito_widget.steps_manager.curr_step.df_names
+        )
+        if lazy_file is not None
+    }
     def check_final_dataframe(df_name, df):
+        if df_name in lazy_df_names:
+            df = df.head(len(final_dfs[df_name]))
         assert final_dfs[df_name].equals(df)
 
     code = "\n".join(
@@ -97,7 +110,7 @@ def check_dataframes_equal(test_wrapper):
 
     # We then check that the sheet data json that is saved by the widget, which 
     # notably uses caching, does not get incorrectly cached and is written correctly
-    assert test_wrapper.mito_widget.sheet_data_json == json.dumps(dfs_to_array_for_json(
+    expected_sheet_data_array = dfs_to_array_for_json(
         set(i for i in range(len(test_wrapper.mito_widget.steps_manager.curr_step.dfs))),
         [],
         test_wrapper.mito_widget.steps_manager.curr_step.dfs,
@@ -106,8 +119,44 @@ def check_dataframes_equal(test_wrapper):
         test_wrapper.mito_widget.steps_manager.curr_step.column_spreadsheet_code,
         test_wrapper.mito_widget.steps_manager.curr_step.column_filters,
         test_wrapper.mito_widget.steps_manager.curr_step.column_ids,
-        test_wrapper.mito_widget.steps_manager.curr_step.column_format_types
-    ))
+        test_wrapper.mito_widget.steps_manager.curr_step.column_format_types,
+        test_wrapper.mito_widget.steps_manager.get_sheet_data_windows()
+    )
+    for sheet_index, lazy_file in enumerate(test_wrapper.mito_widget.steps_manager.curr_step.final_defined_state.lazy_files):
+        if lazy_file is not None:
+            expected_sheet_data_array[sheet_index] = get_sheet_data_window(
+                test_wrapper.mito_widget.steps_manager.curr_step.final_defined_state, 
+                sheet_index, 
+                test_wrapper.mito_widget.steps_manager.get_sheet_data_window(sheet_index)
+            )
+    assert test_wrapper.mito_widget.sheet_data_json == json.dumps(expected_sheet_data_array)
+
+    # And that the front-end ends up with the same sheet data from the patches it is sent
+    assert test_wrapper.front_end_sheet_data_array == json.loads(json.dumps(expected_sheet_data_array))
+
+
+def apply_sheet_data_patch(sheet_data_array: List[Dict[str, Any]], sheet_data_patch: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Applies a patch from the sheet_data_patch_json to the sheet data array, as
+    the front-end does.
+    """
+    new_sheet_data_array = []
+    for sheet_index, sheet_data in enumerate(sheet_data_patch['sheetDataArray']):
+        if sheet_data is None:
+            new_sheet_data_array.append(sheet_data_array[sheet_index])
+            continue
+        
+        previous_column_data = {
+            column['columnID']: column['columnData'] for column in sheet_data_array[sheet_index]['data']
+        } if sheet_index < len(sheet_data_array) else {}
+        new_data = []
+        for column in sheet_data['data']:
+            if column.get('columnDataUnchanged'):
+                column = {key: value for key, value in column.items() if key != 'columnDataUnchanged'}
+                column['columnData'] = previous_column_data[column['columnID']]
+            new_data.append(column)
+        new_sheet_data_array.append({**sheet_data, 'data': new_data})
+    return new_sheet_data_array
 
 
 class MitoWidgetTestWrapper:
@@ -121,6 +170,25 @@ class MitoWidgetTestWrapper:
 
     def __init__(self, mito_widget: MitoWidget):
         self.mito_widget = mito_widget
+        self.front_end_sheet_data_version: Optional[int] = None
+        self._front_end_sheet_data_array: List[Dict[str, Any]] = []
+
+    @property
+    def front_end_sheet_data_array(self) -> List[Dict[str, Any]]:
+        """
+        The sheet data array that the front-end has, after applying the last
+        patch sent to it, or getting all of the sheet data if it cannot.
+        """
+        sheet_data_patch = json.loads(self.mito_widget.sheet_data_patch_json)
+        if sheet_data_patch['version'] != self.front_end_sheet_data_version:
+            if sheet_data_patch['baseVersion'] is None or sheet_data_patch['baseVersion'] == self.front_end_sheet_data_version:
+                self._front_end_sheet_data_array = apply_sheet_data_patch(self._front_end_sheet_data_array, sheet_data_patch)
+                self.front_end_sheet_data_version = sheet_data_patch['version']
+            else:
+                sent_sheet_data = json.loads(self.mito_widget.steps_manager.get_sent_sheet_data_json())
+                self._front_end_sheet_data_array = sent_sheet_data['sheetDataArray']
+                self.front_end_sheet_data_version = sent_sheet_data['version']
+        return self._front_end_sheet_data_array
 
     @property
     def transpiled_code(self):
@@ -602,6 +670,23 @@ class MitoWidgetTestWrapper:
             }
         )
 
+    @check_transpiled_code_after_call
+    def parquet_import(self, file_name: str, columns: Optional[List[str]]=None, filters: Optional[List[List[Any]]]=None) -> bool:
+        return self.mito_widget.receive_message(
+            self.mito_widget,
+            {
+                'event': 'edit_event',
+                'id': get_new_id(),
+                'type': 'parquet_import_edit',
+                'step_id': get_new_id(),
+                'params': {
+                    'file_name': file_name,
+                    'columns': columns,
+                    'filters': filters,
+                }   
+            }
+        )
+
     @check_transpiled_code_after_call
     def bulk_old_rename(self, move_to_deprecated_id_algorithm: bool=False) -> bool:
         return self.mito_widget.receive_message(
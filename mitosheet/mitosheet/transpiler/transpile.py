@@ -43,7 +43,12 @@ def transpile(
             code.extend(preprocess_code)
 
     # We only transpile up to the currently checked out step
-    all_code_chunks: List[CodeChunk] = get_code_chunks(steps_manager.steps[:steps_manager.curr_step_idx + 1], optimize=optimize)
+    all_code_chunks: List[CodeChunk] = get_code_chunks(
+        steps_manager.steps[:steps_manager.curr_step_idx + 1], 
+        optimize=optimize,
+        step_indexes_to_skip=steps_manager.get_step_indexes_to_skip(steps_manager.curr_step_idx),
+        code_chunks_optimizer=steps_manager.code_chunks_optimizer
+    )
     
     for code_chunk in all_code_chunks:
         comment = '# ' + code_chunk.get_description_comment()
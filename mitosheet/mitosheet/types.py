@@ -23,6 +23,9 @@ MultiLevelColumnHeader = Union[Tuple[PrimativeColumnHeader, ...], List[Primative
 # To a tuple of primative types (TODO: does this nest further?).
 ColumnHeader = Union[PrimativeColumnHeader, MultiLevelColumnHeader]
 
+# A window of the rows and columns of a sheet: (row_start, row_end, column_start, column_end)
+SheetDataWindow = Tuple[int, int, int, int]
+
 # To resolve circular dependencies, we create a StepsManagerType here
 if TYPE_CHECKING:
     from mitosheet.steps_manager import StepsManager
@@ -22,7 +22,7 @@ def execute_checkout_step_by_idx_update(
     """
     Checks out a specific step by index
     """
-    steps_manager.curr_step_idx = step_idx
+    steps_manager.execute_checkout_step_by_idx(step_idx)
 
 CHECKOUT_STEP_BY_IDX_UPDATE = {
     'event_type': CHECKOUT_STEP_BY_IDX_UPDATE_EVENT,
@@ -8,21 +8,35 @@ Contains helpful utility functions
 """
 import json
 import re
+import time
 import uuid
-from typing import Any, Dict, List, Optional, Set, Tuple
-from mitosheet.types import ColumnHeader, ColumnID
+import weakref
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+from mitosheet.types import ColumnHeader, ColumnID, SheetDataWindow
 
 import numpy as np
 import pandas as pd
 
 from mitosheet.column_headers import ColumnIDMap
-from mitosheet.sheet_functions.types.utils import get_float_dt_td_columns
+from mitosheet.sheet_functions.types.utils import (is_datetime_dtype,
+                                                   is_float_dtype,
+                                                   is_string_dtype,
+                                                   is_timedelta_dtype)
 
 # We only send the first 1500 rows of a dataframe; note that this
 # must match this variable defined on the front-end
 MAX_ROWS = 1_500
 MAX_COLUMNS = 1_500
 
+# The data of a column that is sent to the front-end: the columnData, and if the
+# column is sent in binary buffers, the description of the buffers, where the
+# indexes are into the buffers of just this column, and these buffers
+ColumnData = Tuple[List[Any], Optional[Dict[str, Any]], List[bytes]]
+
+# The fingerprint of the data of a column, a weak reference to the array 
+# that the fingerprint is of, and the data of the column in a window. See get_column_data_fingerprint
+RenderedColumn = Tuple[Optional[Hashable], Optional[weakref.ref], ColumnData]
+
 def get_first_unused_dataframe_name(existing_df_names: List[str], new_dataframe_name: str) -> str:
     """
     Appends _1, _2, .. to df name until it finds an unused 
@@ -91,12 +105,17 @@ def dfs_to_array_for_json(
         column_spreadsheet_code_array: List[Dict[ColumnID, str]],
         column_filters_array: List[Dict[ColumnID, Any]],
         column_ids: ColumnIDMap,
-        column_format_types: List[Dict[ColumnID, Dict[str, str]]]
+        column_format_types: List[Dict[ColumnID, Dict[str, str]]],
+        sheet_data_windows: Optional[Dict[int, SheetDataWindow]]=None
     ) -> List:
 
     new_array = []
     for sheet_index, df in enumerate(dfs):
         if sheet_index in modified_sheet_indexes:
+            # By default, we only send the first 1500 rows and 1500 columns
+            row_start, row_end, column_start, column_end = (sheet_data_windows or {}).get(
+                sheet_index, (0, MAX_ROWS, 0, MAX_COLUMNS)
+            )
             new_array.append(
                 df_to_json_dumpsable(
                     df, 
@@ -106,9 +125,10 @@ def dfs_to_array_for_json(
                     column_filters_array[sheet_index],
                     column_ids.column_header_to_column_id[sheet_index],
                     column_format_types[sheet_index],
-                    # We only send the first 1500 rows and 1500 columns
-                    max_length=MAX_ROWS,
-                    max_columns=MAX_COLUMNS
+                    max_length=row_end - row_start,
+                    max_columns=column_end - column_start,
+                    row_start=row_start,
+                    column_start=column_start
                 ) 
             )
         else:
@@ -126,7 +146,12 @@ def df_to_json_dumpsable(
         column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
         column_format_types: Dict[ColumnID, Dict[ColumnID, str]],
         max_length: Optional[int]=MAX_ROWS, # How many items you want to display. None when using this function to get unique value counts
-        max_columns: int=MAX_COLUMNS # How many columns you want to display. Unlike max_length, this is always defined
+        max_columns: int=MAX_COLUMNS, # How many columns you want to display. Unlike max_length, this is always defined
+        row_start: int=0, # The first row to display
+        column_start: int=0, # The first column to display
+        buffers: Optional[List[bytes]]=None, # If passed, the column data is sent in these binary buffers where possible
+        rendered_columns: Optional[List[RenderedColumn]]=None, # If passed, the fingerprint and data of each column is added to it
+        reusable_column_data: Optional[Dict[Hashable, ColumnData]]=None # The data of columns with these fingerprints is reused
     ) -> Dict[str, Any]:
     """
     Returns a dataframe represented in a way that can be turned into a 
@@ -150,70 +175,49 @@ def df_to_json_dumpsable(
         columnnDtypeMap: Record<ColumnID, string>;
         index: (string | number)[];
         columnFormatTypeObjMap: ColumnFormatTypeObjMap;
+        rowStart: number;
+        columnStart: number;
     }
+
+    where data and index only contain the max_length rows starting at row_start,
+    and the max_columns columns starting at column_start.
+
+    If buffers is passed, then for each column that can be sent in binary buffers, 
+    the buffers are added to buffers, the columnData is empty, and the column has
+    columnDataBuffers, as described in get_column_data_buffers.
+
+    If rendered_columns is passed, the fingerprint and data of each column is added 
+    to it, and the data of any column whose fingerprint is in reusable_column_data is 
+    reused, rather than turning the column into JSON again.
     """
 
     (num_rows, num_columns) = original_df.shape 
 
     if max_length is None:
-        df = original_df.copy(deep=True) 
+        row_end = num_rows
     else:
-        # we only show the first max_length rows!
-        df = original_df.head(n=max_length if max_length else num_rows).copy(deep=True)
-
-    # we only show the first max_columns columns!
-    df = df.iloc[: , :max_columns]
-
-    float_columns, date_columns, timedelta_columns = get_float_dt_td_columns(df)
-    # Second, we figure out which of the columns contain dates, and we
-    # convert them to string columns (for formatting reasons).
-    # NOTE: we don't use date_format='iso' in df.to_json call as it appends seconds to the object, 
-    # see here: https://stackoverflow.com/questions/52730953/pandas-to-json-output-date-format-in-specific-form
-    for column_header in date_columns:
-        df[column_header] = df[column_header].dt.strftime('%Y-%m-%d %X')
-
-    # Third, we figure out which of the columns contain timedeltas, and 
-    # we format the timedeltas as strings to make them readable
-    for column_header in timedelta_columns:
-        df[column_header] = df[column_header].apply(lambda x: str(x))
-
-    # Then, we get all the float columns and actually make them 
-    # look like floating point values, by converting them to strings
-    for column_header in float_columns:
-        # Convert the value to a string if it is a number, but leave it alone if its a NaN 
-        # as to preserve the formatting of NaN values. 
-        df[column_header] = df[column_header].apply(lambda x: x if np.isnan(x) else str(x))
-
-    json_obj = json.loads(df.to_json(orient="split"))
-    # Then, we go through and find all the null values (which are infinities),
-    # and set them to 'NaN' for display in the frontend.
-    for d in json_obj['data']:
-        for idx, e in enumerate(d):
-            if e is None:
-                d[idx] = 'NaN'
+        # we only show max_length rows!
+        row_end = row_start + (max_length if max_length else num_rows)
+
+    # we only show max_columns columns! NOTE: we never change this window, 
+    # so we don't need to copy it
+    df = original_df.iloc[row_start:row_end, column_start:column_start + max_columns]
 
     final_data = []
     column_dtype_map = {}
-    for column_index, column_header in enumerate(json_obj['columns']):
-        # Because turning the headers to json takes multi-index columns and converts
-        # them into lists, we need to turn them back to tuples so we can index into the
-        # mappings appropriately
-        if isinstance(column_header, list):
-            column_header = tuple(column_header)
-
+    for column_header in df.keys():
         column_id = column_headers_to_column_ids[column_header]
+        column_dtype = str(df[column_header].dtype)
 
-        column_final_data = {
-            'columnID': column_id,
-            'columnHeader': column_header,
-            'columnDtype': str(original_df[column_header].dtype),
-            'columnData': []
-        }
-        column_dtype_map[column_id] = str(original_df[column_header].dtype)
-        for row in json_obj['data']:
-            column_final_data['columnData'].append(row[column_index])
-        
-        final_data.append(column_final_data)     
+        fingerprint, fingerprint_array_ref = get_column_data_fingerprint(original_df[column_header]) if rendered_columns is not None else (None, None)
+        column_data = reusable_column_data.get(fingerprint) if reusable_column_data is not None and fingerprint is not None else None
+        if column_data is None:
+            column_data = get_column_data(df[column_header], binary=buffers is not None)
+        if rendered_columns is not None:
+            rendered_columns.append((fingerprint, fingerprint_array_ref, column_data))
+
+        final_data.append(get_column_final_data(column_id, column_header, column_dtype, column_data, buffers))
+        column_dtype_map[column_id] = column_dtype
     
     return {
         "dfName": df_name,
@@ -230,11 +234,230 @@ def df_to_json_dumpsable(
         'columnSpreadsheetCodeMap': column_spreadsheet_code,
         'columnFiltersMap': column_filters,
         'columnDtypeMap': column_dtype_map,
-        'index': json_obj['index'],
-        'columnFormatTypeObjMap': column_format_types
+        'index': get_index_json_dumpsable(df.index),
+        'columnFormatTypeObjMap': column_format_types,
+        'rowStart': row_start,
+        'columnStart': column_start
     }
 
 
+def get_column_data(series: pd.Series, binary: bool=False) -> ColumnData:
+    """
+    Returns the data of the column that is sent to the front-end, which is sent
+    in binary buffers if binary is True and the column can be.
+    """
+    if binary:
+        column_buffers: List[bytes] = []
+        column_data_buffers = get_column_data_buffers(series, column_buffers)
+        if column_data_buffers is not None:
+            return [], column_data_buffers, column_buffers
+    return get_column_data_json_dumpsable(series), None, []
+
+
+def get_column_final_data(
+        column_id: ColumnID, 
+        column_header: ColumnHeader, 
+        column_dtype: str, 
+        column_data: ColumnData, 
+        buffers: Optional[List[bytes]]
+    ) -> Dict[str, Any]:
+    """
+    Returns the column in the format of the data in df_to_json_dumpsable, adding
+    any buffers of the column to buffers.
+    """
+    column_data_list, column_data_buffers, column_buffers = column_data
+    column_final_data: Dict[str, Any] = {
+        'columnID': column_id,
+        'columnHeader': column_header,
+        'columnDtype': column_dtype,
+        'columnData': column_data_list
+    }
+    if column_data_buffers is not None and buffers is not None:
+        # The indexes of the buffers of this column are now after the buffers already added
+        column_final_data['columnDataBuffers'] = {
+            key: value + len(buffers) if key in ('data', 'offsets', 'validity') else value
+            for key, value in column_data_buffers.items()
+        }
+        buffers.extend(column_buffers)
+    return column_final_data
+
+
+def get_column_data_fingerprint(series: pd.Series) -> Tuple[Optional[Hashable], Optional[weakref.ref]]:
+    """
+    Returns a fingerprint for the data of the column, which is the same only if the
+    data of the column is the same, as well as a weak reference to the array that 
+    owns the memory the fingerprint is of.
+    
+    As states are copy-on-write at the column level, a step that changes the values 
+    of a column writes them into new memory, and so the fingerprint is the dtype of
+    the column and the memory its values are in. The fingerprint is only valid while
+    the weak reference is alive, as otherwise the memory might be reused for other
+    values. We don't keep the array itself, so we don't keep old dataframes in memory.
+
+    If the values of the column are not in a numpy array, returns (None, None), as we
+    cannot fingerprint them.
+    """
+    values = series.values
+    if not isinstance(values, np.ndarray):
+        return None, None
+    base = values
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    if base.base is not None:
+        # The memory is owned by some other object, which we cannot reference
+        return None, None
+    return (str(series.dtype), values.dtype.str, values.__array_interface__['data'][0], values.strides, values.shape), weakref.ref(base)
+
+
+def get_column_data_json_dumpsable(series: pd.Series) -> List[Any]:
+    """
+    Returns the values of the series as a list that can be turned into a 
+    JSON array with json.dumps, formatted for display in the front-end:
+    1.  Floats are turned into strings, so they look like floating point values
+    2.  Dates are formatted with strftime. NOTE: we don't use the iso format, as it 
+        appends seconds to the object, see here: https://stackoverflow.com/questions/52730953/pandas-to-json-output-date-format-in-specific-form
+    3.  Timedeltas are turned into strings to make them readable
+    4.  Missing values are turned into 'NaN' 
+
+    We convert each column directly from its values depending on its dtype, rather than 
+    turning the dataframe into JSON and back, as this is much faster. Any column we
+    don't have a conversion for (e.g. categories, or objects that aren't strings) is 
+    turned into JSON by pandas, so all columns are displayed as they always were.
+    """
+    dtype = str(series.dtype)
+
+    if is_float_dtype(dtype) and isinstance(series.dtype, np.dtype):
+        values = series.to_numpy(dtype='float64').tolist()
+        return ['NaN' if value != value else str(value) for value in values]
+    elif is_datetime_dtype(dtype):
+        return _format_datetimes(series)
+    elif is_timedelta_dtype(dtype):
+        return _format_timedeltas(series)
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iub':
+        return series.to_numpy().tolist()
+    elif is_string_dtype(dtype) and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+        return _replace_missing_values(series)
+
+    # NOTE: the null values are infinities or missing values, which we display as 'NaN'
+    return ['NaN' if value is None else value for value in json.loads(series.to_json(orient='values'))]
+
+
+def _replace_missing_values(series: pd.Series) -> List[Any]:
+    is_missing = series.isna().to_numpy()
+    values = series.to_numpy(dtype=object)
+    if is_missing.any():
+        values = values.copy()
+        values[is_missing] = 'NaN'
+    return values.tolist()
+
+
+def _format_datetimes(series: pd.Series) -> List[str]:
+    """
+    Formats the dates as strftime('%Y-%m-%d %X') would. As strftime formats
+    one date at a time, we instead format them all at once with numpy, unless
+    the locale has a different time format.
+    """
+    if time.strftime('%X', (2000, 1, 1, 13, 2, 3, 0, 1, 0)) != '13:02:03':
+        return _replace_missing_values(series.dt.strftime('%Y-%m-%d %X'))
+
+    if series.dt.tz is not None:
+        # Dates with a timezone are displayed in that timezone
+        series = series.dt.tz_localize(None)
+    
+    strings = series.to_numpy().astype('datetime64[s]').astype('str').tolist()
+    return ['NaN' if string == 'NaT' else string[:10] + ' ' + string[11:] for string in strings]
+
+
+NANOSECONDS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+
+def _format_timedeltas(series: pd.Series) -> List[str]:
+    """
+    Formats the timedeltas as str(pd.Timedelta) would, e.g. '-1 days +05:12:00.500000', 
+    but from the components of all the timedeltas at once, as this is much faster than
+    creating a pd.Timedelta for each value.
+    """
+    values = series.to_numpy().view('int64')
+    is_nat = series.isna().to_numpy().tolist()
+
+    # NOTE: the days are rounded down, so the rest of the components are never negative
+    days, remainder = np.divmod(values, NANOSECONDS_PER_DAY)
+    seconds, subseconds = np.divmod(remainder, 10 ** 9)
+    hours, seconds = np.divmod(seconds, 60 * 60)
+    minutes, seconds = np.divmod(seconds, 60)
+    microseconds, nanoseconds = np.divmod(subseconds, 1000)
+
+    return [
+        'NaT' if nat else
+        f'{day} days{" +" if day < 0 else " "}{hour:02}:{minute:02}:{second:02}' + (
+            '' if not subsecond else f'.{microsecond:06}' if not nanosecond else f'.{microsecond:06}{nanosecond:03}'
+        )
+        for nat, day, hour, minute, second, subsecond, microsecond, nanosecond in zip(
+            is_nat, days.tolist(), hours.tolist(), minutes.tolist(), seconds.tolist(), 
+            subseconds.tolist(), microseconds.tolist(), nanoseconds.tolist()
+        )
+    ]
+
+
+def get_column_data_buffers(series: pd.Series, buffers: List[bytes]) -> Optional[Dict[str, Any]]:
+    """
+    If the values of the series can be sent to the front-end as binary buffers,
+    adds these buffers to buffers and returns a description of them:
+    {
+        type: 'float64' | 'int8' | 'uint8' | ... | 'int64' | 'uint64' | 'bool' | 'string';
+        data: number; // the index of the buffer with the values, as a little-endian array of type
+        offsets?: number; // for strings, the index of a buffer of little-endian int32 offsets into data, one per value plus one
+        validity?: number; // the index of a bitmap with a 0 bit for each missing value, which is displayed as 'NaN'
+    }
+    Strings are encoded as utf-8, and the bitmap is least significant bit first, as 
+    in Arrow. Floats are sent as is, and formatted in the front-end. 
+    
+    Otherwise, returns None, and the values should be sent with get_column_data_json_dumpsable.
+    """
+    dtype = str(series.dtype)
+    if not isinstance(series.dtype, np.dtype):
+        return None
+
+    if series.dtype.kind in 'iuf':
+        # NOTE: we send all floats as float64, so the front-end can format them as Python would
+        buffer_dtype = series.dtype.newbyteorder('<') if series.dtype.kind in 'iu' else np.dtype('<f8')
+        buffers.append(series.to_numpy(dtype=buffer_dtype).tobytes())
+        return {'type': buffer_dtype.name, 'data': len(buffers) - 1}
+    elif series.dtype.kind == 'b':
+        buffers.append(series.to_numpy(dtype='uint8').tobytes())
+        return {'type': 'bool', 'data': len(buffers) - 1}
+    elif is_datetime_dtype(dtype) or is_timedelta_dtype(dtype) or (
+        is_string_dtype(dtype) and pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')
+    ):
+        is_missing = series.isna().to_numpy() if not is_timedelta_dtype(dtype) else np.zeros(len(series), dtype=bool)
+        strings = get_column_data_json_dumpsable(series)
+        encoded_strings = [
+            string.encode('utf-8', errors='surrogatepass') if not missing else b'' 
+            for string, missing in zip(strings, is_missing.tolist())
+        ]
+        offsets = np.zeros(len(encoded_strings) + 1, dtype='<i4')
+        np.cumsum([len(encoded_string) for encoded_string in encoded_strings], out=offsets[1:])
+
+        buffers.append(b''.join(encoded_strings))
+        buffers.append(offsets.tobytes())
+        column_data_buffers = {'type': 'string', 'data': len(buffers) - 2, 'offsets': len(buffers) - 1}
+        if is_missing.any():
+            buffers.append(np.packbits(~is_missing, bitorder='little').tobytes())
+            column_data_buffers['validity'] = len(buffers) - 1
+        return column_data_buffers
+    
+    return None
+
+
+def get_index_json_dumpsable(index: pd.Index) -> List[Any]:
+    """
+    Returns the index as a list that can be turned into a JSON array with json.dumps,
+    in the same format that pandas turns it into JSON.
+    """
+    if (isinstance(index.dtype, np.dtype) and index.dtype.kind in 'iub') or (index.dtype.kind == 'O' and pd.api.types.infer_dtype(index, skipna=False) == 'string'):
+        return index.tolist()
+    return json.loads(index.to_series().to_json(orient='values'))
+
+
 def get_random_id() -> str:
     """
     Creates a new random ID for the user, which for any given user,
@@ -125,7 +125,9 @@ if name == 'mitosheet2':
                 'pytest',
                 'flake8',
                 'types-chardet',
-                'mypy'
+                'mypy',
+                # For testing Parquet and Feather imports
+                'pyarrow'
             ],
             'deploy': [
                 'wheel', 
@@ -235,7 +237,9 @@ elif name == 'mitosheet' or name == 'mitosheet3' or name == 'mitosheet-private':
                 'pytest',
                 'flake8',
                 'types-chardet',
-                'mypy'
+                'mypy',
+                # For testing Parquet and Feather imports
+                'pyarrow'
             ],
             'deploy': [
                 'wheel', 
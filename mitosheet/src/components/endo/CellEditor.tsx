@@ -7,7 +7,7 @@ import { focusGrid } from './focusUtils';
 import { getColumnHeadersInSelection, getNewSelectionAfterKeyPress, isNavigationKeyPressed } from './selectionUtils';
 import { calculateCurrentSheetView, getCellInColumn, getCellInRow } from './sheetViewUtils';
 import { EditorState, GridState, MitoError, SheetData } from '../../types';
-import { firstNonNullOrUndefined, getCellDataFromCellIndexes } from './utils';
+import { firstNonNullOrUndefined, getCellDataFromCellIndexes, getRowIndexInSheetData } from './utils';
 import { classNames } from '../../utils/classNames';
 import fscreen from 'fscreen';
 import { ensureCellVisible } from './visibilityUtils';
@@ -454,7 +454,7 @@ const CellEditor = (props: {
 
         const columnID = props.sheetData.data[props.editorState.columnIndex].columnID;
         const columnHeader = props.sheetData.data[props.editorState.columnIndex].columnHeader;
-        const index = props.sheetData.index[props.editorState.rowIndex];
+        const index = props.sheetData.index[getRowIndexInSheetData(props.sheetData, props.editorState.rowIndex)];
         const formula = getFullFormula(props.editorState.formula, columnHeader, props.editorState.pendingSelectedColumns)
 
         // Mark this as loading
@@ -26,6 +26,10 @@ export const MIN_WIDTH = 50;
 // The maximum number of rows sent in the sheet data by the backend
 export const MAX_ROWS = 1500;
 
+// The maximum number of rows the user can scroll through. Browsers do not
+// render elements taller than this many rows, so we don't go beyond it
+export const MAX_DISPLAYED_ROWS = 500000;
+
 
 export const KEYS_TO_IGNORE_IF_PRESSED_ALONE = [
     'Shift',
@@ -101,7 +105,7 @@ function EndoGrid(props: {
 
     const totalSize: Dimension = {
         width: gridState.widthDataArray[gridState.sheetIndex]?.totalWidth || 0,
-        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_ROWS)
+        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_DISPLAYED_ROWS)
     }
     
     const currentSheetView: SheetView = useMemo(() => {
@@ -169,6 +173,49 @@ function EndoGrid(props: {
         }
     }, [setGridState])
 
+    /* 
+        An effect that loads the rows the user scrolls to. The sheet data only has
+        the MAX_ROWS rows in the window the backend sent, so if the rendered rows 
+        are not in this window, we load the window around them.
+
+        We store the window we are loading, so that we don't load it again on 
+        every scroll while we wait for it.
+    */
+    const loadingRowStartRef = useRef<{sheetIndex: number, rowStart: number} | undefined>(undefined);
+    useEffect(() => {
+        if (sheetData === undefined) {
+            return;
+        }
+
+        const startingRowIndex = currentSheetView.startingRowIndex;
+        const endingRowIndex = Math.min(startingRowIndex + currentSheetView.numRowsRendered, sheetData.numRows);
+        const isRowInWindow = (rowStart: number, rowEnd: number): boolean => {
+            return startingRowIndex >= rowStart && endingRowIndex <= rowEnd;
+        }
+
+        if (isRowInWindow(sheetData.rowStart, sheetData.rowStart + sheetData.index.length)) {
+            return;
+        }
+        const loadingRowStart = loadingRowStartRef.current;
+        if (loadingRowStart !== undefined && loadingRowStart.sheetIndex === sheetIndex && isRowInWindow(loadingRowStart.rowStart, loadingRowStart.rowStart + MAX_ROWS)) {
+            return;
+        }
+
+        const rowStart = Math.max(0, Math.floor((startingRowIndex + endingRowIndex - MAX_ROWS) / 2));
+        loadingRowStartRef.current = {sheetIndex: sheetIndex, rowStart: rowStart};
+        void mitoAPI.loadSheetDataWindow(
+            sheetIndex, 
+            rowStart, 
+            rowStart + MAX_ROWS, 
+            sheetData.columnStart, 
+            sheetData.columnStart + sheetData.numColumns
+        ).then(() => {
+            if (loadingRowStartRef.current?.sheetIndex === sheetIndex && loadingRowStartRef.current?.rowStart === rowStart) {
+                loadingRowStartRef.current = undefined;
+            }
+        })
+    }, [sheetData, sheetIndex, currentSheetView, mitoAPI])
+
     // Handles a scroll inside the grid 
     const onGridScroll = (e: React.UIEvent<HTMLDivElement, UIEvent>) => {
         const newScrollPosition = calculateNewScrollPosition(
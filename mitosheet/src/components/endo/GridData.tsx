@@ -4,7 +4,7 @@ import { getBorderStyle, getIsCellSelected } from './selectionUtils';
 import { calculateCurrentSheetView } from './sheetViewUtils';
 import { EditorState, GridState, SheetData, UIState } from '../../types';
 import { classNames } from '../../utils/classNames';
-import { cellInSearch, getColumnIDsArrayFromSheetDataArray } from './utils';
+import { cellInSearch, getColumnIDsArrayFromSheetDataArray, getRowIndexInSheetData } from './utils';
 import { TaskpaneType } from '../taskpanes/taskpanes';
 import { formatCellData } from '../../utils/formatColumns';
 import { isNumberDtype } from '../../utils/dtypes';
@@ -38,7 +38,7 @@ const GridData = (props: {
                             const columnID = columnIDs[columnIndex]
                             const columnDtype = props.sheetData?.data[columnIndex]?.columnDtype;
                             const columnFormatType = sheetData.columnFormatTypeObjMap[columnID]
-                            const cellData = props.sheetData?.data[columnIndex]?.columnData[rowIndex];
+                            const cellData = props.sheetData?.data[columnIndex]?.columnData[getRowIndexInSheetData(sheetData, rowIndex)];
 
                             if (cellData === undefined || columnDtype == undefined) {
                                 return null;
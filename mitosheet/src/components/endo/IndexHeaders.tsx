@@ -4,6 +4,7 @@ import { getBorderStyle, getIsCellSelected } from './selectionUtils';
 import { calculateCurrentSheetView, calculateTranslate } from './sheetViewUtils';
 import { GridState, SheetData } from '../../types';
 import { classNames } from '../../utils/classNames';
+import { getRowIndexInSheetData } from './utils';
 
 /* 
     The headers on the side of the sheet that display
@@ -34,7 +35,9 @@ const IndexHeaders = (props: {
                                 -1
                             );
                             const className = classNames('index-header-container', 'text-overflow-hide', {'index-header-selected': selected});
-                            const indexHeader = rowIndex >= props.sheetData.numRows ? '' : props.sheetData.index[rowIndex];
+                            // Rows outside of the window of the sheet data are empty until the window is loaded
+                            const rowIndexInSheetData = getRowIndexInSheetData(props.sheetData, rowIndex);
+                            const indexHeader = rowIndexInSheetData < 0 || rowIndexInSheetData >= props.sheetData.index.length ? '' : props.sheetData.index[rowIndexInSheetData];
 
                             return (
                                 <div
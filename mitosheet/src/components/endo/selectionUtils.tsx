@@ -1,6 +1,6 @@
 import { BorderStyle, ColumnHeader, ColumnID, MitoSelection, SheetData } from '../../types';
 import { isNumberDtype } from '../../utils/dtypes';
-import { MAX_ROWS } from './EndoGrid';
+import { MAX_DISPLAYED_ROWS } from './EndoGrid';
 
 
 /**
@@ -169,8 +169,8 @@ export const getNewSelectionAfterKeyPress = (selection: MitoSelection, e: Keyboa
     let startingColumnIndex = selection.startingColumnIndex;
     let endingColumnIndex = selection.endingColumnIndex;
 
-    // As we have at most MAX_ROWS rows in the sheet, don't go beyond that
-    const numRows = Math.min(sheetData?.numRows || 0, MAX_ROWS);
+    // As the user can scroll through at most MAX_DISPLAYED_ROWS rows, don't go beyond that
+    const numRows = Math.min(sheetData?.numRows || 0, MAX_DISPLAYED_ROWS);
     const numColumns = sheetData?.numColumns || 0;
     
     // If shift down, we extend, otherwise we bump
@@ -84,6 +84,15 @@ export const getTypeIdentifier = (columnDtype: string, purpleOrDark?: 'purple' |
 }
 
 
+/**
+ * The sheet data only has the rows in the window of the sheet that the 
+ * backend sent, starting at rowStart. Returns the index in the sheet data 
+ * of the row at rowIndex in the sheet.
+ */
+export const getRowIndexInSheetData = (sheetData: SheetData | undefined, rowIndex: number): number => {
+    return rowIndex - (sheetData?.rowStart || 0);
+}
+
 /**
  * A helper function to get data describing a cell from
  * indexes, in a type safe way.
@@ -102,7 +111,7 @@ export const getCellDataFromCellIndexes = (sheetData: SheetData | undefined, row
     const columnFormula = columnID !== undefined ? sheetData?.columnSpreadsheetCodeMap[columnID] : undefined;
     const columnDtype = columnID !== undefined ? sheetData?.data[columnIndex].columnDtype : undefined;
     const columnFilters = columnID !== undefined ? sheetData?.columnFiltersMap[columnID] : undefined;
-    const cellValue = columnID !== undefined ? sheetData?.data[columnIndex].columnData[rowIndex] : undefined;
+    const cellValue = columnID !== undefined ? sheetData?.data[columnIndex].columnData[getRowIndexInSheetData(sheetData, rowIndex)] : undefined;
     const columnFormatType = columnID !== undefined ? sheetData?.columnFormatTypeObjMap[columnID] : undefined;
 
     return {
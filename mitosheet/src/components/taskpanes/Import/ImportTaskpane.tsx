@@ -15,7 +15,7 @@ import XLSXImport from './XLSXImport';
 import '../../../../css/taskpanes/Import/ImportTaskpane.css'
 import DefaultTaskpaneHeader from '../DefaultTaskpane/DefaultTaskpaneHeader';
 import DefaultTaskpaneBody from '../DefaultTaskpane/DefaultTaskpaneBody';
-import { getElementsToDisplay, getFileEnding, getImportButtonStatus } from './importUtils';
+import { getElementsToDisplay, getFileEnding, getImportButtonStatus, isParquetFile } from './importUtils';
 
 interface ImportTaskpaneProps {
     mitoAPI: MitoAPI;
@@ -152,7 +152,11 @@ function ImportTaskpane(props: ImportTaskpaneProps): JSX.Element {
                 loadingImport: true
             }
         })
-        await props.mitoAPI.editSimpleImport([joinedPath])
+        if (isParquetFile(element.name)) {
+            await props.mitoAPI.editParquetImport(joinedPath)
+        } else {
+            await props.mitoAPI.editSimpleImport([joinedPath])
+        }
         setImportState(prevImportState => {
             return {
                 ...prevImportState,
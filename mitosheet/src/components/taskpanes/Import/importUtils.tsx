@@ -37,6 +37,9 @@ export const getInvalidFileError = (selectedElement: FileElement, excelImportEna
         'tsv',
         'txt',
         'tab',
+        'parquet',
+        'feather',
+        'arrow',
     ]
 
     // If excel import is enabled, then add it as a valid ending
@@ -62,6 +65,16 @@ export const getInvalidFileError = (selectedElement: FileElement, excelImportEna
     }
 }
 
+/* 
+    Helper function that returns if the file is a Parquet or Feather 
+    file, which are imported with a parquet import rather than a simple 
+    import.
+*/
+export const isParquetFile = (elementName: string): boolean => {
+    const fileEnding = getFileEnding(elementName.toLowerCase());
+    return fileEnding === 'parquet' || fileEnding === 'feather' || fileEnding === 'arrow';
+}
+
 /* 
     Helper function that returns if the import button is usable, 
     and also the message to display on the button based on which
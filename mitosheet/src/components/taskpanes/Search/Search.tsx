@@ -10,7 +10,8 @@ import SearchNavigateIcon from '../../icons/SearchNavigateIcon';
 
 const EMPTY_SEARCH_MATCHES = {
     columnHeaderIndexes: [],
-    cellIndexes: []
+    cellIndexes: [],
+    numCellMatches: 0
 }
 
 /* 
@@ -40,17 +41,16 @@ const Search = (props: {
     const [matchIndex, setMatchIndex] = useState(-1);
 
     /* 
-        We load search matches in a paginated fashion, so that loading
-        them does not slow down and ultimately crash the entire sheet. We
-        load these in sections of rows.
+        The backend finds all of the matches in the sheet at once, using a search
+        index of the sheet that it builds the first time the sheet is searched. 
 
         Because this may take a while to run, we need to make sure that if
-        the user changes the search term / sheet while it is still running, we cancel
-        the rest of the paginated results.
+        the user changes the search term / sheet while it is still running, we 
+        ignore the matches of the old search.
 
         To do this, we store a ref of the current search params, and update it
-        when we start searching. Then, before each paginated api call, we
-        check this ref, and stop the loop if it is not what we expect.
+        when we start searching. Then, when the matches are loaded, we check 
+        this ref, and ignore the matches if it is not what we expect.
     */
     const searchParamsRef = useRef([0, '']);
     const loadSearchMatches = async (searchString: string, sheetIndex: number): Promise<void> => {
@@ -60,35 +60,15 @@ const Search = (props: {
         setMatchIndex(-1);
         
         if (searchString !== '') {
+            const matches = await props.mitoAPI.getSearchMatches(sheetIndex, searchString);
 
-            // This is where we go and actually get the data
-            for (let startingRowIndex = 0; startingRowIndex < (props.sheetData?.numRows || 0) + 2000; startingRowIndex += 2000) {
-                // Otherwise, keep loading matches
-                const matches = await props.mitoAPI.getSearchMatches(sheetIndex, searchString, startingRowIndex);
-
-                /* 
-                    If another, newer search is going on, break out of this loop, and stop loading things.
-                    We also want to break out of this search if the taskpane is closed, but I can't figure out how to. 
-                    When this component unmounts, the state variables that it relies on are set -- I can't update them.
-                    See an explanation here: https://stackoverflow.com/questions/70283865/stop-my-react-for-loop-from-executing-when-component-umounts
-                */
-                if (searchParamsRef.current[0] !== sheetIndex || searchParamsRef.current[1] !== searchString) {
-                    return;
-                }
+            // If another, newer search is going on, then ignore these matches
+            if (searchParamsRef.current[0] !== sheetIndex || searchParamsRef.current[1] !== searchString) {
+                return;
+            }
 
-                if (matches !== undefined) {
-                    setSearchMatches(oldMatches => {
-                        // NOTE: we use a slice here rather than spread syntax for reasons described in the first
-                        // answer here: https://stackoverflow.com/questions/52948823/rangerror-too-many-arguments-provided-for-a-function-call
-                        // namely, there is a max # of elements you can use the .slice syntax with 
-                        const cellIndexes = oldMatches.cellIndexes.slice();
-                        cellIndexes.push(...matches.cellIndexes);
-                        return {
-                            columnHeaderIndexes: matches.columnHeaderIndexes,
-                            cellIndexes: cellIndexes
-                        }
-                    });
-                }
+            if (matches !== undefined) {
+                setSearchMatches(matches);
             }
 
             // Log that we searched
@@ -117,7 +97,7 @@ const Search = (props: {
     // eitherre than 100k matches, in which case spread syntax can cause issues
     const allMatches = searchMatches.cellIndexes.slice()
     allMatches.unshift(...searchMatches.columnHeaderIndexes); // Put the column headers at the start of the array
-    const numMatches = searchMatches.columnHeaderIndexes.length + searchMatches.cellIndexes.length;
+    const numMatches = searchMatches.columnHeaderIndexes.length + searchMatches.numCellMatches;
     const adjustedIndex = numMatches > 0 ? (matchIndex + 1) % allMatches.length : 0;
     const match = allMatches[adjustedIndex];
 
@@ -127,7 +107,7 @@ const Search = (props: {
     */
     const moveToMatch = (increment: boolean) => {
 
-        if (numMatches === 0) {
+        if (allMatches.length === 0) {
             return;
         }
 
@@ -69,6 +69,9 @@ export function getStepIcon(stepType: StepType): JSX.Element {
         case StepType.ExcelImport: return (
             <ImportIcon/>
         )
+        case StepType.ParquetImport: return (
+            <ImportIcon/>
+        )
         case StepType.Sort: return (
             <EditIcon/>
         )
@@ -88,6 +88,8 @@ export default class MitoAPI {
     _send: (msg: Record<string, unknown>) => void;
     updateMitoState: () => void;
     setErrorModal: (error: MitoError) => void;
+    getSheetDataVersion: () => number | undefined;
+    setSheetData: (sheetIndex: number, sheetData: SheetData) => void;
     unconsumedResponses: Record<string, unknown>[];
 
     constructor(
@@ -95,11 +97,15 @@ export default class MitoAPI {
         send: (msg: Record<string, unknown>) => void,
         updateMitoState: () => void,
         setErrorModal: (error: MitoError) => void,
+        getSheetDataVersion: () => number | undefined,
+        setSheetData: (sheetIndex: number, sheetData: SheetData) => void,
     ) {
         this.model_id = model_id;
         this._send = send;
         this.updateMitoState = updateMitoState;
         this.setErrorModal = setErrorModal;
+        this.getSheetDataVersion = getSheetDataVersion;
+        this.setSheetData = setSheetData;
 
         this.unconsumedResponses = [];
     }
@@ -227,6 +233,11 @@ export default class MitoAPI {
                     const response = this.unconsumedResponses[index];
                     this.unconsumedResponses.splice(index, 1);
 
+                    // If a newer API call superseded this one, the backend does not handle it
+                    if (response['superseded']) {
+                        return resolve(undefined);
+                    }
+
                     return resolve(response['data'] as Type); // return to end execution
                 } else {
                     console.log("Still waiting")
@@ -485,12 +496,12 @@ export default class MitoAPI {
 
     /*
         Gets the search matches for the dataframe headers and 
-        and 2k rows starting at the startingRowIndex
+        all the rows starting at the startingRowIndex
     */
     async getSearchMatches(
         sheetIndex: number,
         searchString: string,
-        startingRowIndex: number
+        startingRowIndex = 0
     ): Promise<SearchMatches | undefined> {
 
         const searchMatchesString = await this.send<string>({
@@ -507,6 +518,75 @@ export default class MitoAPI {
         return undefined;
     }
 
+    /**
+     * Returns the sheet data for the rows [rowStart, rowEnd) and the columns
+     * [columnStart, columnEnd) of the sheet at sheetIndex. The backend then 
+     * sends this window of the sheet after every edit.
+     */
+    async getSheetData(
+        sheetIndex: number,
+        rowStart: number,
+        rowEnd: number,
+        columnStart: number,
+        columnEnd: number
+    ): Promise<SheetData | undefined> {
+
+        const sheetDataString = await this.send<string>({
+            'event': 'api_call',
+            'type': 'get_sheet_data',
+            'sheet_index': sheetIndex,
+            'row_start': rowStart,
+            'row_end': rowEnd,
+            'column_start': columnStart,
+            'column_end': columnEnd,
+            // Loading the data the user scrolls to is handled before other calls
+            'priority': true
+        }, {})
+
+        if (sheetDataString !== undefined && sheetDataString !== '') {
+            return JSON.parse(sheetDataString);
+        }
+        return undefined;
+    }
+
+    /**
+     * Loads the given window of the sheet at sheetIndex, and displays it in 
+     * the sheet. If the sheet data changed while we were loading the window,
+     * the window we got may be out of date, and so we do not display it.
+     */
+    async loadSheetDataWindow(
+        sheetIndex: number,
+        rowStart: number,
+        rowEnd: number,
+        columnStart: number,
+        columnEnd: number
+    ): Promise<void> {
+        const sheetDataVersion = this.getSheetDataVersion();
+        const sheetData = await this.getSheetData(sheetIndex, rowStart, rowEnd, columnStart, columnEnd);
+        if (sheetData !== undefined && sheetDataVersion === this.getSheetDataVersion()) {
+            this.setSheetData(sheetIndex, sheetData);
+        }
+    }
+
+    /**
+     * Returns all of the sheet data that was last sent to the frontend, along
+     * with its version. The frontend usually only receives patches to the sheet
+     * data it has, and so it gets this when it does not have the sheet data that
+     * a patch applies to.
+     */
+    async getSheetDataArray(): Promise<{version: number, sheetDataArray: SheetData[]} | undefined> {
+
+        const sheetDataArrayString = await this.send<string>({
+            'event': 'api_call',
+            'type': 'get_sheet_data_array'
+        }, {})
+
+        if (sheetDataArrayString !== undefined && sheetDataArrayString !== '') {
+            return JSON.parse(sheetDataArrayString);
+        }
+        return undefined;
+    }
+
 
     /**
      * A general utility function for sending an edit event with some
@@ -1030,6 +1110,35 @@ export default class MitoAPI {
         return stepID;
     }
 
+    /*
+        Imports the given Parquet or Feather file, reading only the given columns
+        and the rows that match all the filters, if they are passed.
+    */
+    async editParquetImport(
+        fileName: string,
+        columns?: string[],
+        filters?: [string, string, unknown][],
+        stepID?: string
+    ): Promise<string> {
+
+        if (stepID === undefined || stepID == '') {
+            stepID = getRandomId();
+        }
+
+        await this.send({
+            'event': 'edit_event',
+            'type': 'parquet_import_edit',
+            'step_id': stepID,
+            'params': {
+                'file_name': fileName,
+                'columns': columns,
+                'filters': filters,
+            }
+        }, { maxRetries: 1000 }) // Large files can take a while to import, so set a long delay
+
+        return stepID;
+    }
+
     /*
         Sends an undo message, which removes the last step that was created. 
     */
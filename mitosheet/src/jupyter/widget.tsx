@@ -57,14 +57,21 @@ declare global {
 }
 
 import MitoAPI from './api';
-import { AnalysisData, MitoError, MitoStateUpdaters, SheetData, UserProfile } from '../types';
+import { AnalysisData, MitoError, MitoStateUpdaters, SheetData, SheetDataPatch, UserProfile } from '../types';
 import { ModalEnum } from '../components/modals/modals';
+import { addColumnDataFromBuffers } from '../utils/sheetDataBuffers';
+import { applySheetDataPatch } from '../utils/sheetDataPatch';
 
 export class ExampleView extends DOMWidgetView {
     // Used to make code in the notebook not flash when read in for replaying.
     // See write-code-to-cell below.
     creationSeconds: undefined | number;
 
+    // The sheet data array we have, and its version, which the backend 
+    // sends us patches to. See getSheetDataArray below.
+    sheetDataArray: SheetData[] = [];
+    sheetDataVersion: undefined | number;
+
     initialize(parameters: WidgetView.InitializeParameters): void {
         super.initialize(parameters);
 
@@ -72,6 +79,8 @@ export class ExampleView extends DOMWidgetView {
         this.send = this.send.bind(this);
         this.updateMitoState = this.updateMitoState.bind(this);
         this.setErrorModal = this.setErrorModal.bind(this);
+        this.getSheetDataVersion = this.getSheetDataVersion.bind(this);
+        this.setSheetData = this.setSheetData.bind(this);
         this.creationSeconds = new Date().getSeconds();
     }
 
@@ -86,7 +95,7 @@ export class ExampleView extends DOMWidgetView {
     render(): void {
 
         const model_id = this.model.model_id;
-        const mitoAPI = new MitoAPI(model_id, this.send, this.updateMitoState, this.setErrorModal);
+        const mitoAPI = new MitoAPI(model_id, this.send, this.updateMitoState, this.setErrorModal, this.getSheetDataVersion, this.setSheetData);
 
         // Store the API in a global map so we can receive messages on it
         if (window.mitoAPIMap === undefined) {
@@ -170,9 +179,57 @@ export class ExampleView extends DOMWidgetView {
         mitoAPI?.receiveResponse(message);
     }
 
+    /* 
+        The backend only sends us a patch to the sheet data array that we have,
+        which we apply to get the new sheet data array. If we don't have the 
+        sheet data array that the patch applies to, we get all of the sheet 
+        data from the backend, and update the sheet when we get it.
+    */
     getSheetDataArray(): SheetData[] {
-        const unparsed = this.model.get('sheet_data_json')
-        return JSON.parse(unparsed);
+        const unparsed = this.model.get('sheet_data_patch_json')
+        // The data of some columns may be sent in binary buffers, see get_column_data_buffers
+        const sheetDataPatch: SheetDataPatch = JSON.parse(unparsed);
+        
+        if (sheetDataPatch.version === this.sheetDataVersion) {
+            return this.sheetDataArray;
+        } else if (sheetDataPatch.baseVersion === null || sheetDataPatch.baseVersion === this.sheetDataVersion) {
+            sheetDataPatch.sheetDataArray = addColumnDataFromBuffers(sheetDataPatch.sheetDataArray, this.model.get('sheet_data_buffers'));
+            this.sheetDataArray = applySheetDataPatch(this.sheetDataArray, sheetDataPatch);
+            this.sheetDataVersion = sheetDataPatch.version;
+            return this.sheetDataArray;
+        }
+
+        void this.updateSheetDataArray();
+        return this.sheetDataArray;
+    }
+
+    async updateSheetDataArray(): Promise<void> {
+        const model_id = this.model.model_id;
+        const sentSheetData = await window.mitoAPIMap?.get(model_id)?.getSheetDataArray();
+        if (sentSheetData === undefined || (this.sheetDataVersion !== undefined && sentSheetData.version < this.sheetDataVersion)) {
+            return;
+        }
+
+        this.sheetDataArray = sentSheetData.sheetDataArray;
+        this.sheetDataVersion = sentSheetData.version;
+        window.setMitoStateMap?.get(model_id)?.setSheetDataArray(this.sheetDataArray);
+    }
+
+    getSheetDataVersion(): number | undefined {
+        return this.sheetDataVersion;
+    }
+
+    /* 
+        Sets the sheet data of the sheet at sheetIndex, which is a new window of
+        the sheet that the backend sent us. The backend sends this window with 
+        the sheet data from now on, so the patches it sends us still apply.
+    */
+    setSheetData(sheetIndex: number, sheetData: SheetData): void {
+        const model_id = this.model.model_id;
+        this.sheetDataArray = this.sheetDataArray.map((oldSheetData, index) => {
+            return index === sheetIndex ? sheetData : oldSheetData;
+        });
+        window.setMitoStateMap?.get(model_id)?.setSheetDataArray(this.sheetDataArray);
     }
 
     getUserProfile(): UserProfile {
@@ -30,6 +30,7 @@ export enum StepType {
     SetCellValue = 'set_cell_value',
     BulkOldRename = 'bulk_old_rename',
     ExcelImport = 'excel_import',
+    ParquetImport = 'parquet_import',
     Graph = 'graph',
     GraphDuplicate = 'graph_duplicate',
     GraphDelete = 'graph_delete',
@@ -162,14 +163,27 @@ export type ColumnID = string;
  */
 export type ColumnIDsMap = Record<ColumnID, ColumnHeader>;
 
+/**
+ * A description of the binary buffers the data of a column is sent in, where
+ * data, offsets and validity are the indexes of the buffers. See get_column_data_buffers.
+ */
+export type ColumnDataBuffers = {
+    type: 'float64' | 'int8' | 'int16' | 'int32' | 'int64' | 'uint8' | 'uint16' | 'uint32' | 'uint64' | 'bool' | 'string';
+    data: number;
+    offsets?: number;
+    validity?: number;
+};
+
 /**
  * Data that will be displayed in the sheet itself.
  * 
  * @param dfName - the name of the dataframe
  * @param dfSource - the source of the dataframe
  * @param numRows - the number of rows in the data. Should be equal to data[0].length
- * @param numColumns - the number of columns in the data. Should be equal to data.length
- * @param data - a list of the columns to display in the sheet, including their id and header, their dtype, as well as a list of columnData (which is the actual data in this column)
+ * @param numColumns - the number of columns in the dataframe. The data only contains the columns in the window
+ * @param rowStart - the index of the first row of the dataframe that is in the data
+ * @param columnStart - the index of the first column of the dataframe that is in the data
+ * @param data - a list of the columns to display in the sheet, including their id and header, their dtype, as well as a list of columnData (which is the actual data in this column). If the columnData is sent in binary buffers, the column has columnDataBuffers instead. In a SheetDataPatch, if the columnData did not change, the column has columnDataUnchanged instead
  * @param columnIDsMap - for this dataframe, a map from column id -> column headers
  * @param columnSpreadsheetCodeMap - for this dataframe, a map from column id -> spreadsheet formula
  * @param columnFiltersMap - for this dataframe, a map from column id -> filter objects
@@ -182,11 +196,15 @@ export type SheetData = {
     dfSource: DFSource;
     numRows: number,
     numColumns: number,
+    rowStart: number,
+    columnStart: number,
     data: {
         columnID: ColumnID;
         columnHeader: ColumnHeader;
         columnDtype: string;
         columnData: (string | number | boolean)[];
+        columnDataBuffers?: ColumnDataBuffers;
+        columnDataUnchanged?: boolean;
     }[];
     columnIDsMap: ColumnIDsMap;
     columnSpreadsheetCodeMap: Record<ColumnID, string>;
@@ -196,6 +214,20 @@ export type SheetData = {
     columnFormatTypeObjMap: ColumnFormatTypeObjMap
 };
 
+/**
+ * A patch to the sheet data array the front-end has, which is sent rather than
+ * the entire sheet data array. See get_sheet_data_patch_json.
+ * 
+ * @param version - the version of the sheet data array after the patch is applied
+ * @param baseVersion - the version of the sheet data array the patch applies to, or null if it has all of the sheet data
+ * @param sheetDataArray - the sheet data of each sheet, or null if the sheet data is unchanged
+ */
+export type SheetDataPatch = {
+    version: number;
+    baseVersion: number | null;
+    sheetDataArray: (SheetData | null)[];
+};
+
 
 export type GraphPreprocessingParams = {
     safety_filter_turned_on_by_user: boolean
@@ -621,6 +653,8 @@ export interface UIState {
 export interface SearchMatches {
     columnHeaderIndexes: { rowIndex: number, columnIndex: number }[];
     cellIndexes: { rowIndex: number, columnIndex: number }[];
+    // The number of matching cells, as the backend only sends the first 100k cellIndexes
+    numCellMatches: number;
 }
 
 /**
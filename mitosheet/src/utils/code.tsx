@@ -135,6 +135,22 @@ export const getArgsFromMitosheetCallCode = (codeText: string): string[] => {
         nameString = nameString.split('view_df')[0].trim();
     }
 
+    // If there is a max_history_bytes parameter, we ignore it
+    if (nameString.includes('max_history_bytes')) {
+        nameString = nameString.split('max_history_bytes')[0].trim();
+    }
+
+    // If there is a binary_sheet_data parameter, we ignore it
+    if (nameString.includes('binary_sheet_data')) {
+        nameString = nameString.split('binary_sheet_data')[0].trim();
+    }
+
+    // If there is a copy parameter, we ignore it. We match the =, as dataframe names can include copy
+    const copyParameterIndex = nameString.search(/\bcopy\s*=/);
+    if (copyParameterIndex !== -1) {
+        nameString = nameString.substring(0, copyParameterIndex).trim();
+    }
+
     // Get the args and trim them up
     let args = nameString.split(',').map(dfName => dfName.trim());
     
@@ -16,7 +16,7 @@ export function isFloatDtype(dtype: string): boolean {
 }
 
 export function isStringDtype(dtype: string): boolean {
-    return dtype == 'object' || dtype == 'str' || dtype == 'string';
+    return dtype == 'object' || dtype == 'str' || dtype == 'string' || dtype == 'category';
 
 }
 
@@ -0,0 +1,103 @@
+import { ColumnDataBuffers, SheetData } from "../types";
+
+
+// For each type, the number of bytes in each value, and how to read a value 
+const VALUE_READERS: Record<string, [number, (data: DataView, byteOffset: number) => number]> = {
+    'int8': [1, (data, byteOffset) => data.getInt8(byteOffset)],
+    'int16': [2, (data, byteOffset) => data.getInt16(byteOffset, true)],
+    'int32': [4, (data, byteOffset) => data.getInt32(byteOffset, true)],
+    'uint8': [1, (data, byteOffset) => data.getUint8(byteOffset)],
+    'uint16': [2, (data, byteOffset) => data.getUint16(byteOffset, true)],
+    'uint32': [4, (data, byteOffset) => data.getUint32(byteOffset, true)],
+    'float64': [8, (data, byteOffset) => data.getFloat64(byteOffset, true)],
+    // NOTE: 64 bit ints are rounded to the nearest number, just as JSON.parse does
+    'int64': [8, (data, byteOffset) => data.getInt32(byteOffset + 4, true) * 2 ** 32 + data.getUint32(byteOffset, true)],
+    'uint64': [8, (data, byteOffset) => data.getUint32(byteOffset + 4, true) * 2 ** 32 + data.getUint32(byteOffset, true)],
+}
+
+const textDecoder = new TextDecoder('utf-8');
+
+
+/**
+ * Formats a float the same way as str(float) does in Python, so that floats
+ * sent in binary buffers are displayed exactly as floats sent as JSON are.
+ * 
+ * Both toExponential (with no argument) and Python use the shortest digits
+ * that turn back into the same float, so we just need to place the decimal
+ * point where Python does. 
+ */
+export const formatFloatLikePython = (value: number): string => {
+    if (isNaN(value)) {
+        return 'NaN';
+    } else if (value === Infinity) {
+        return 'inf';
+    } else if (value === -Infinity) {
+        return '-inf';
+    }
+
+    const sign = value < 0 || Object.is(value, -0) ? '-' : '';
+    const [mantissa, exponentString] = Math.abs(value).toExponential().split('e');
+    const digits = mantissa.replace('.', '');
+    const exponent = parseInt(exponentString);
+
+    // Python only uses scientific notation for very small and very large floats
+    if (exponent < -4 || exponent >= 16) {
+        return `${sign}${mantissa}e${exponent < 0 ? '-' : '+'}${Math.abs(exponent) < 10 ? '0' : ''}${Math.abs(exponent)}`;
+    } else if (exponent < 0) {
+        return `${sign}0.${'0'.repeat(-exponent - 1)}${digits}`;
+    } else if (digits.length <= exponent + 1) {
+        return `${sign}${digits}${'0'.repeat(exponent + 1 - digits.length)}.0`;
+    } 
+    return `${sign}${digits.slice(0, exponent + 1)}.${digits.slice(exponent + 1)}`;
+}
+
+
+/**
+ * Returns the data of a column that was sent in the binary buffers.
+ */
+export const getColumnDataFromBuffers = (columnDataBuffers: ColumnDataBuffers, buffers: DataView[]): (string | number | boolean)[] => {
+    const data = buffers[columnDataBuffers.data];
+    const validity = columnDataBuffers.validity !== undefined ? buffers[columnDataBuffers.validity] : undefined;
+    const isValid = (index: number): boolean => {
+        return validity === undefined || (validity.getUint8(index >> 3) & (1 << (index & 7))) !== 0;
+    }
+
+    if (columnDataBuffers.type === 'string' && columnDataBuffers.offsets !== undefined) {
+        const offsets = buffers[columnDataBuffers.offsets];
+        const bytes = new Uint8Array(data.buffer, data.byteOffset, data.byteLength);
+
+        const columnData: string[] = [];
+        for (let i = 0; i < offsets.byteLength / 4 - 1; i++) {
+            const start = offsets.getInt32(i * 4, true);
+            const end = offsets.getInt32((i + 1) * 4, true);
+            columnData.push(isValid(i) ? textDecoder.decode(bytes.subarray(start, end)) : 'NaN');
+        }
+        return columnData;
+    } else if (columnDataBuffers.type === 'bool') {
+        return Array.from(new Uint8Array(data.buffer, data.byteOffset, data.byteLength), value => value !== 0);
+    } 
+    
+    const [numBytes, readValue] = VALUE_READERS[columnDataBuffers.type];
+    const columnData: (string | number)[] = [];
+    for (let byteOffset = 0; byteOffset < data.byteLength; byteOffset += numBytes) {
+        const value = readValue(data, byteOffset);
+        columnData.push(columnDataBuffers.type === 'float64' ? formatFloatLikePython(value) : value);
+    }
+    return columnData;
+}
+
+
+/**
+ * Fills in the columnData of the columns of each sheet that were sent in 
+ * the binary buffers of that sheet.
+ */
+export const addColumnDataFromBuffers = <T extends SheetData | null>(sheetDataArray: T[], sheetDataBuffers: DataView[][] | undefined): T[] => {
+    sheetDataArray.forEach((sheetData, sheetIndex) => {
+        sheetData?.data.forEach(column => {
+            if (column.columnDataBuffers !== undefined && sheetDataBuffers !== undefined) {
+                column.columnData = getColumnDataFromBuffers(column.columnDataBuffers, sheetDataBuffers[sheetIndex]);
+            }
+        })
+    })
+    return sheetDataArray;
+}
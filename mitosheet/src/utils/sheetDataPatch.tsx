@@ -0,0 +1,36 @@
+import { ColumnID, SheetData, SheetDataPatch } from "../types";
+
+
+/**
+ * Returns the sheet data array that results from applying the patch to the 
+ * sheet data array, which must be the version of the sheet data array that 
+ * the patch applies to. 
+ * 
+ * Sheets that are null in the patch are unchanged, and columns with 
+ * columnDataUnchanged take the columnData of the column with the same 
+ * id in the sheet data array.
+ */
+export const applySheetDataPatch = (sheetDataArray: SheetData[], sheetDataPatch: SheetDataPatch): SheetData[] => {
+    return sheetDataPatch.sheetDataArray.map((sheetData, sheetIndex) => {
+        if (sheetData === null) {
+            return sheetDataArray[sheetIndex];
+        }
+
+        const previousColumnData: Record<ColumnID, (string | number | boolean)[]> = {};
+        sheetDataArray[sheetIndex]?.data.forEach(column => {
+            previousColumnData[column.columnID] = column.columnData;
+        })
+
+        return {
+            ...sheetData,
+            data: sheetData.data.map(column => {
+                if (!column.columnDataUnchanged) {
+                    return column;
+                }
+                // eslint-disable-next-line @typescript-eslint/no-unused-vars
+                const {columnDataUnchanged, ...unchangedColumn} = column;
+                return {...unchangedColumn, columnData: previousColumnData[column.columnID]};
+            })
+        }
+    })
+}